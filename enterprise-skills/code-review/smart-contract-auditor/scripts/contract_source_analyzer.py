@@ -14,6 +14,13 @@ import urllib.request
 import urllib.error
 import re
 
+# Single-pass scan engine shared with the security-vulnerability-scanner
+# skill, when its scripts are on PYTHONPATH
+try:
+    from scan_engine import Rule, ScanEngine
+except ImportError:
+    Rule = ScanEngine = None
+
 SOURCIFY_API = "https://sourcify.dev/server"
 
 CHAIN_IDS = {
@@ -206,8 +213,46 @@ VULNERABILITY_PATTERNS = [
 ]
 
 
+_ENGINE = None
+
+
+def _get_engine():
+    """Compile VULNERABILITY_PATTERNS into a scan engine once per process."""
+    global _ENGINE
+    if _ENGINE is None and ScanEngine is not None:
+        _ENGINE = ScanEngine([
+            Rule(
+                id=name,
+                pattern=regex,
+                meta={
+                    "severity": severity,
+                    "description": description,
+                    "recommendation": recommendation,
+                },
+            )
+            for name, severity, regex, description, recommendation in VULNERABILITY_PATTERNS
+        ])
+    return _ENGINE
+
+
 def scan_source_code(source_code: str, filename: str) -> list:
     """Scan source code for vulnerability patterns."""
+    engine = _get_engine()
+    if engine is not None:
+        findings = []
+        for match in engine.scan(source_code, syntax="c"):
+            meta = engine.rules_by_id[match.rule_id].meta
+            findings.append({
+                "severity": meta["severity"],
+                "pattern": match.rule_id,
+                "description": meta["description"],
+                "detail": match.snippet,
+                "file": filename,
+                "line": match.line,
+                "recommendation": meta["recommendation"],
+            })
+        return findings
+
     findings = []
     lines = source_code.split("\n")
 
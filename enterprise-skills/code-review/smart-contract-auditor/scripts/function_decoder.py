@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """
 Function Decoder
-Decodes function selectors from a contract's ABI using 4byte.directory.
-Identifies dangerous, admin, and suspicious function signatures.
+Decodes function selectors from a contract's ABI using the evm-tx-debugger
+signature database (offline) when it is importable, and 4byte.directory for
+selectors it does not know. Identifies dangerous, admin, and suspicious
+function signatures.
 
 Author: Nihal Nihalani
 Version: 1.0.0
@@ -15,6 +17,13 @@ import urllib.error
 import re
 import hashlib
 
+# Optional offline selector database from the evm-tx-debugger skill; importable
+# when its scripts directory is on PYTHONPATH (see SKILL.md)
+try:
+    from signature_db import get_signature_db
+except ImportError:
+    get_signature_db = None
+
 FOURBYTE_API = "https://www.4byte.directory/api/v1"
 
 BLOCKSCOUT_CHAINS = {
@@ -179,7 +188,14 @@ def compute_selector(signature: str) -> str:
 
 
 def decode_selector_4byte(hex_selector: str) -> str:
-    """Decode a 4-byte function selector using 4byte.directory."""
+    """Decode a 4-byte function selector, offline when the signature database is available."""
+    db = get_signature_db() if get_signature_db is not None else None
+    if db is not None:
+        signature = db.lookup(hex_selector)
+        # A remote-enabled database has already asked 4byte.directory
+        if signature or db.remote:
+            return signature
+
     url = (
         f"{FOURBYTE_API}/signatures/"
         f"?hex_signature={hex_selector}&format=json"
@@ -190,6 +206,8 @@ def decode_selector_4byte(hex_selector: str) -> str:
             # Return the canonical (lowest id) signature
             results = data["results"]
             canonical = min(results, key=lambda r: r["id"])
+            if db is not None:
+                db.add({hex_selector: canonical["text_signature"]}, rank=int(canonical["id"]))
             return canonical["text_signature"]
     except (ConnectionError, KeyError):
         pass
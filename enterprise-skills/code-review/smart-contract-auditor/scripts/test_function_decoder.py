@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Unit tests for selector decoding in function_decoder."""
+
+import function_decoder
+
+TRANSFER = "0xa9059cbb"
+
+
+class _SignatureDB:
+    """In-memory stand-in for evm-tx-debugger's SignatureDB."""
+
+    def __init__(self, signatures=None, remote=False):
+        self.signatures = dict(signatures or {})
+        self.remote = remote
+        self.added = []
+
+    def lookup(self, selector):
+        return self.signatures.get(selector)
+
+    def add(self, signatures, rank=0):
+        self.added.append((signatures, rank))
+        self.signatures.update(signatures)
+
+
+def _fourbyte(monkeypatch, results):
+    calls = []
+
+    def fetch(url, timeout=15):
+        calls.append(url)
+        return {"results": results}
+
+    monkeypatch.setattr(function_decoder, "fetch_json", fetch)
+    return calls
+
+
+def test_database_hit_skips_4byte(monkeypatch):
+    db = _SignatureDB({TRANSFER: "transfer(address,uint256)"})
+    monkeypatch.setattr(function_decoder, "get_signature_db", lambda: db)
+    calls = _fourbyte(monkeypatch, [])
+
+    assert function_decoder.decode_selector_4byte(TRANSFER) == "transfer(address,uint256)"
+    assert calls == []
+
+
+def test_database_miss_falls_back_to_4byte_and_persists(monkeypatch):
+    db = _SignatureDB()
+    monkeypatch.setattr(function_decoder, "get_signature_db", lambda: db)
+    calls = _fourbyte(monkeypatch, [
+        {"id": 9000, "text_signature": "collision(uint8)"},
+        {"id": 145, "text_signature": "transfer(address,uint256)"},
+    ])
+
+    assert function_decoder.decode_selector_4byte(TRANSFER) == "transfer(address,uint256)"
+    assert db.added == [({TRANSFER: "transfer(address,uint256)"}, 145)]
+    assert function_decoder.decode_selector_4byte(TRANSFER) == "transfer(address,uint256)"
+    assert len(calls) == 1
+
+
+def test_remote_database_miss_is_final(monkeypatch):
+    db = _SignatureDB(remote=True)
+    monkeypatch.setattr(function_decoder, "get_signature_db", lambda: db)
+    calls = _fourbyte(monkeypatch, [{"id": 145, "text_signature": "transfer(address,uint256)"}])
+
+    assert function_decoder.decode_selector_4byte(TRANSFER) is None
+    assert calls == []
+
+
+def test_without_database_uses_4byte(monkeypatch):
+    monkeypatch.setattr(function_decoder, "get_signature_db", None)
+    _fourbyte(monkeypatch, [{"id": 145, "text_signature": "transfer(address,uint256)"}])
+
+    assert function_decoder.decode_selector_4byte(TRANSFER) == "transfer(address,uint256)"
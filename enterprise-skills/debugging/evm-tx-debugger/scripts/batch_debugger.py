@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+EVM Batch Transaction Debugger
+Debugs many transactions in one pass: each transaction and its logs are
+fetched once from Blockscout, then decode, error classification, gas
+profiling and event parsing all run on the same response. Results stream
+out as NDJSON (one line per transaction, completion order) followed by a
+summary line, which suits incident post-mortems over thousands of hashes.
+
+Requests run concurrently over keep-alive connections (one per worker
+thread and host) behind a per-host rate limiter. A shared response cache
+de-duplicates concurrent requests for the same URL, so repeated hashes and
+the per-chain network stats are fetched once per run.
+
+Input (JSON via stdin):
+{
+    "tx_hashes": ["0x...", {"tx_hash": "0x...", "chain": "base"}],
+    "path": "hashes.txt",            # optional, one "hash[,chain]" per line
+    "chain": "ethereum",             # default chain for bare hashes
+    "analysis_type": "full",         # full | decode | errors | gas | events, or a list
+    "max_workers": 8
+}
+
+Output (NDJSON via stdout):
+{"index": 0, "tx_hash": "0x...", "chain": "ethereum", "success": true, "decode": {...}, "errors": {...}, "gas": {...}, "events": {...}}
+...
+{"summary": {"total": 1000, "succeeded": 998, "failed": 2, "requests": 2001, ...}}
+
+Environment:
+    BLOCKSCOUT_RATE_LIMIT     Requests per second per Blockscout host (default 5)
+
+Author: Nihal Nihalani
+Version: 1.0.0
+"""
+
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from error_classifier import classify_error
+from event_parser import parse_events
+from gas_profiler import profile_gas
+from tx_decoder import BLOCKSCOUT_CHAINS, _validate_chain, _validate_tx_hash, decode_transaction
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+ANALYSES: Tuple[str, ...] = ("decode", "errors", "gas", "events")
+
+DEFAULT_MAX_WORKERS: int = 8
+MAX_WORKERS_LIMIT: int = 64
+DEFAULT_RATE_LIMIT: float = 5.0
+# Completed responses kept for de-duplication (network stats stay hot)
+RESPONSE_CACHE_SIZE: int = 2048
+# Transactions in flight per worker; bounds memory for very large batches
+WINDOW_PER_WORKER: int = 4
+
+REQUEST_TIMEOUT: int = 15
+MAX_RETRIES: int = 3
+RETRY_BACKOFF: float = 1.0
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Thread-safe token bucket for one Blockscout host."""
+
+    def __init__(self, rate: float):
+        self.rate = max(0.1, rate)
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = (1 - self.tokens) / self.rate
+            time.sleep(wait_for)
+
+
+class _Pending:
+    """A request another thread is already making."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[Exception] = None
+
+
+class BlockscoutPool:
+    """Keep-alive HTTP(S) connections with a shared, de-duplicating response cache.
+
+    Args:
+        rate_limit: Requests per second per host.
+        cache_size: Completed responses kept in the LRU cache.
+    """
+
+    def __init__(self, rate_limit: float = DEFAULT_RATE_LIMIT, cache_size: int = RESPONSE_CACHE_SIZE):
+        self.rate_limit = rate_limit
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.cache: "OrderedDict[str, Any]" = OrderedDict()
+        self.inflight: Dict[str, _Pending] = {}
+        self.limiters: Dict[str, RateLimiter] = {}
+        self.local = threading.local()
+        self.stats: Dict[str, int] = {"requests": 0, "cache_hits": 0, "shared_waits": 0, "retries": 0}
+
+    def get_json(self, url: str) -> Optional[Any]:
+        """Return the decoded JSON for *url*, None on 404.
+
+        Raises:
+            ConnectionError: When the request fails after retries.
+        """
+        with self.lock:
+            if url in self.cache:
+                self.cache.move_to_end(url)
+                self.stats["cache_hits"] += 1
+                return self.cache[url]
+            pending = self.inflight.get(url)
+            owner = pending is None
+            if owner:
+                pending = self.inflight[url] = _Pending()
+            else:
+                self.stats["shared_waits"] += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.error:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = self._request(url)
+            with self.lock:
+                self.cache[url] = pending.value
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            return pending.value
+        except Exception as exc:
+            pending.error = exc
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(url, None)
+            pending.done.set()
+
+    def _connection(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        """This thread's keep-alive connection to *host*."""
+        connections = getattr(self.local, "connections", None)
+        if connections is None:
+            connections = self.local.connections = {}
+        key = (scheme, host)
+        conn = connections.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = connections[key] = conn_class(host, timeout=REQUEST_TIMEOUT)
+        return conn
+
+    def _drop_connection(self, scheme: str, host: str) -> None:
+        conn = getattr(self.local, "connections", {}).pop((scheme, host), None)
+        if conn is not None:
+            conn.close()
+
+    def _limiter(self, host: str) -> RateLimiter:
+        with self.lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = self.limiters[host] = RateLimiter(self.rate_limit)
+            return limiter
+
+    def _request(self, url: str) -> Optional[Any]:
+        """GET *url* with retry on 429/5xx and dropped connections."""
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        limiter = self._limiter(parts.netloc)
+        last_err: Optional[Exception] = None
+
+        for attempt in range(MAX_RETRIES):
+            limiter.acquire()
+            with self.lock:
+                self.stats["requests"] += 1
+                if attempt:
+                    self.stats["retries"] += 1
+            try:
+                conn = self._connection(parts.scheme, parts.netloc)
+                conn.request("GET", path, headers={
+                    "User-Agent": "EVMTxDebugger/1.0",
+                    "Accept": "application/json",
+                })
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError) as exc:
+                # Server closed the keep-alive connection or the network failed
+                self._drop_connection(parts.scheme, parts.netloc)
+                last_err = exc
+                continue
+
+            if resp.status == 200:
+                try:
+                    return json.loads(body.decode())
+                except ValueError as exc:
+                    raise ConnectionError(f"API request failed: invalid JSON from {url}: {exc}")
+            if resp.status == 404:
+                return None
+            last_err = ConnectionError(f"HTTP {resp.status} {resp.reason}")
+            if resp.status == 429 or resp.status >= 500:
+                # Jitter keeps workers that were throttled together from retrying together
+                time.sleep(RETRY_BACKOFF * (2 ** attempt) * (1 + random.random()))
+                continue
+            break
+
+        raise ConnectionError(f"API request failed: {last_err}")
+
+
+# ---------------------------------------------------------------------------
+# Per-transaction pipeline
+# ---------------------------------------------------------------------------
+
+def _strip_envelope(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the per-script envelope fields repeated in every section."""
+    return {k: v for k, v in result.items() if k not in ("success", "scan_type")}
+
+
+def debug_transaction(
+    pool: BlockscoutPool,
+    tx_hash: str,
+    chain: str,
+    analyses: Iterable[str] = ANALYSES,
+) -> Dict[str, Any]:
+    """Fetch a transaction once and run the requested analyses on it.
+
+    Args:
+        pool: Shared connection pool and response cache.
+        tx_hash: Transaction hash (0x + 64 hex).
+        chain: Blockchain network name.
+        analyses: Subset of decode, errors, gas, events.
+
+    Returns:
+        One NDJSON record with a section per analysis.
+
+    Raises:
+        ValueError: Invalid hash/chain or transaction not found.
+        ConnectionError: Blockscout unreachable.
+    """
+    tx_hash = _validate_tx_hash(tx_hash)
+    chain = _validate_chain(chain)
+    base_url = BLOCKSCOUT_CHAINS[chain]
+
+    tx_data = pool.get_json(f"{base_url}/api/v2/transactions/{tx_hash}")
+    if not tx_data:
+        raise ValueError(
+            f"Transaction {tx_hash} not found on {chain}. "
+            "Verify the hash and chain are correct."
+        )
+
+    record: Dict[str, Any] = {"tx_hash": tx_hash, "chain": chain, "success": True}
+    for analysis in analyses:
+        try:
+            if analysis == "decode":
+                section = decode_transaction(tx_hash, chain, tx_data=tx_data)
+            elif analysis == "errors":
+                section = classify_error(tx_hash, chain, tx_data=tx_data)
+            elif analysis == "gas":
+                try:
+                    stats = pool.get_json(f"{base_url}/api/v2/stats") or {}
+                except ConnectionError:
+                    stats = {}
+                section = profile_gas(tx_hash, chain, tx_data=tx_data, network_stats=stats)
+            else:
+                logs_data = pool.get_json(f"{base_url}/api/v2/transactions/{tx_hash}/logs") or {}
+                section = parse_events(tx_hash, chain, tx_data=tx_data, logs_data=logs_data)
+            record[analysis] = _strip_envelope(section)
+        except ConnectionError as exc:
+            record["success"] = False
+            record[analysis] = {"error": str(exc), "error_type": "API_ERROR"}
+        except Exception as exc:
+            record["success"] = False
+            record[analysis] = {
+                "error": f"{type(exc).__name__}: {exc}",
+                "error_type": "INTERNAL_ERROR",
+            }
+    return record
+
+
+def run_batch(
+    items: List[Tuple[str, str]],
+    analyses: Iterable[str] = ANALYSES,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    pool: Optional[BlockscoutPool] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Debug (tx_hash, chain) pairs concurrently, yielding records as they finish.
+
+    Args:
+        items: Transactions to debug.
+        analyses: Subset of decode, errors, gas, events.
+        max_workers: Concurrent transactions.
+        pool: Connection pool; a new one is created when omitted.
+
+    Yields:
+        One record per transaction, in completion order, each with its input index.
+    """
+    pool = pool or BlockscoutPool(float(os.getenv("BLOCKSCOUT_RATE_LIMIT", DEFAULT_RATE_LIMIT)))
+    analyses = tuple(analyses)
+    window = max_workers * WINDOW_PER_WORKER
+    pending: Dict[Future, Tuple[int, str, str]] = {}
+    queue = iter(enumerate(items))
+
+    def _submit(executor: ThreadPoolExecutor) -> bool:
+        try:
+            index, (tx_hash, chain) = next(queue)
+        except StopIteration:
+            return False
+        future = executor.submit(debug_transaction, pool, tx_hash, chain, analyses)
+        pending[future] = (index, tx_hash, chain)
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(pending) < window and _submit(executor):
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, tx_hash, chain = pending.pop(future)
+                try:
+                    record = future.result()
+                except ValueError as exc:
+                    record = {"tx_hash": tx_hash, "chain": chain, "success": False,
+                              "error": str(exc), "error_type": "VALIDATION_ERROR"}
+                except ConnectionError as exc:
+                    record = {"tx_hash": tx_hash, "chain": chain, "success": False,
+                              "error": str(exc), "error_type": "API_ERROR"}
+                except Exception as exc:
+                    record = {"tx_hash": tx_hash, "chain": chain, "success": False,
+                              "error": f"Unexpected error: {type(exc).__name__}: {exc}",
+                              "error_type": "INTERNAL_ERROR"}
+                yield {"index": index, **record}
+                _submit(executor)
+
+
+# ---------------------------------------------------------------------------
+# Input handling
+# ---------------------------------------------------------------------------
+
+def _parse_analyses(value: Any) -> Tuple[str, ...]:
+    """Normalise analysis_type ("full", one name, or a list) to analysis names."""
+    if value in (None, "", "full"):
+        return ANALYSES
+    names = [value] if isinstance(value, str) else list(value)
+    unknown = [n for n in names if n not in ANALYSES]
+    if unknown:
+        raise ValueError(
+            f"Unknown analysis_type: {', '.join(map(str, unknown))}. "
+            f"Use full or any of: {', '.join(ANALYSES)}"
+        )
+    return tuple(n for n in ANALYSES if n in names)
+
+
+def _collect_items(input_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Gather (tx_hash, chain) pairs from tx_hashes and/or a hash file."""
+    default_chain = input_data.get("chain", "ethereum")
+    items: List[Tuple[str, str]] = []
+
+    for entry in input_data.get("tx_hashes") or []:
+        if isinstance(entry, dict):
+            items.append((str(entry.get("tx_hash", "")), entry.get("chain", default_chain)))
+        else:
+            items.append((str(entry), default_chain))
+
+    path = input_data.get("path")
+    if path:
+        if not os.path.isfile(path):
+            raise ValueError(f"Hash file not found: {path}")
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                tx_hash, _, chain = line.partition(",")
+                items.append((tx_hash.strip(), chain.strip() or default_chain))
+    return items
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    """Entry point: read JSON from stdin, stream NDJSON records to stdout."""
+    try:
+        raw = sys.stdin.read()
+        if not raw.strip():
+            print(json.dumps({
+                "success": False,
+                "error": "No input provided. Send JSON via stdin.",
+                "error_type": "VALIDATION_ERROR",
+                "example": {"tx_hashes": ["0x..."], "chain": "ethereum"},
+            }))
+            sys.exit(1)
+
+        input_data = json.loads(raw)
+        items = _collect_items(input_data)
+        if not items:
+            print(json.dumps({
+                "success": False,
+                "error": "Missing required parameter 'tx_hashes' (or 'path').",
+                "error_type": "VALIDATION_ERROR",
+                "suggestion": "Provide hashes: {\"tx_hashes\": [\"0x...\"], \"chain\": \"ethereum\"}",
+            }))
+            sys.exit(1)
+        analyses = _parse_analyses(input_data.get("analysis_type"))
+        max_workers = max(1, min(int(input_data.get("max_workers", DEFAULT_MAX_WORKERS)), MAX_WORKERS_LIMIT))
+
+        pool = BlockscoutPool(float(os.getenv("BLOCKSCOUT_RATE_LIMIT", DEFAULT_RATE_LIMIT)))
+        started = time.perf_counter()
+        succeeded = failed = 0
+        for record in run_batch(items, analyses, max_workers, pool):
+            if record.get("success"):
+                succeeded += 1
+            else:
+                failed += 1
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+
+        elapsed = time.perf_counter() - started
+        print(json.dumps({
+            "summary": {
+                "total": len(items),
+                "succeeded": succeeded,
+                "failed": failed,
+                "analyses": list(analyses),
+                **pool.stats,
+                "elapsed_seconds": round(elapsed, 2),
+                "tx_per_second": round(len(items) / elapsed, 2) if elapsed > 0 else None,
+            }
+        }))
+
+    except json.JSONDecodeError:
+        print(json.dumps({
+            "success": False,
+            "error": "Invalid JSON input.",
+            "error_type": "VALIDATION_ERROR",
+        }))
+        sys.exit(1)
+    except ValueError as exc:
+        print(json.dumps({
+            "success": False,
+            "error": str(exc),
+            "error_type": "VALIDATION_ERROR",
+        }))
+        sys.exit(1)
+    except Exception as exc:
+        print(json.dumps({
+            "success": False,
+            "error": f"Unexpected error: {type(exc).__name__}: {exc}",
+            "error_type": "INTERNAL_ERROR",
+        }))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,8 @@ import time
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
+from signature_db import get_signature_db
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -57,8 +59,6 @@ CHAIN_IDS: Dict[str, str] = {
     "avalanche": "43114", "avax": "43114",
 }
 
-FOURBYTE_API: str = "https://www.4byte.directory/api/v1"
-
 TX_HASH_PATTERN: re.Pattern = re.compile(r"^0x[a-fA-F0-9]{64}$")
 
 MAX_RETRIES: int = 3
@@ -377,7 +377,7 @@ def _decode_revert_hex(hex_data: str) -> Tuple[str, str]:
         except (ValueError, IndexError):
             pass
 
-    # Custom error -- try to decode selector via 4byte.directory
+    # Custom error -- selector is resolved against the signature database
     if len(data) >= 8:
         selector = f"0x{data[:8]}"
         return "CUSTOM_ERROR", selector
@@ -386,17 +386,8 @@ def _decode_revert_hex(hex_data: str) -> Tuple[str, str]:
 
 
 def _lookup_custom_error(selector: str) -> Optional[str]:
-    """Look up a custom error selector via 4byte.directory."""
-    url = f"{FOURBYTE_API}/signatures/?hex_signature={selector}&format=json"
-    try:
-        data = _fetch_json(url, timeout=10, retries=2)
-        if data and data.get("results"):
-            results = data["results"]
-            canonical = min(results, key=lambda r: r.get("id", 0))
-            return canonical.get("text_signature")
-    except ConnectionError:
-        pass
-    return None
+    """Look up a custom error selector in the local signature database."""
+    return get_signature_db().lookup(selector)
 
 
 def _match_revert_pattern(reason: str) -> Optional[Dict[str, str]]:
@@ -551,12 +542,18 @@ def _compute_risk_score(error_info: Dict) -> Dict[str, Any]:
 # Main logic
 # ---------------------------------------------------------------------------
 
-def classify_error(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
+def classify_error(
+    tx_hash: str,
+    chain: str = "ethereum",
+    tx_data: Optional[Dict] = None,
+) -> Dict[str, Any]:
     """Classify and explain a transaction error.
 
     Args:
         tx_hash: Transaction hash (0x + 64 hex).
         chain: Blockchain network name.
+        tx_data: Blockscout transaction response already fetched by the
+            caller (batch_debugger); fetched here when omitted.
 
     Returns:
         Dictionary with error classification, explanation, and fixes.
@@ -566,9 +563,10 @@ def classify_error(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
     chain_id = CHAIN_IDS.get(chain, "1")
 
     # Fetch transaction
-    base_url = BLOCKSCOUT_CHAINS[chain]
-    url = f"{base_url}/api/v2/transactions/{tx_hash}"
-    tx_data = _fetch_json(url)
+    if tx_data is None:
+        base_url = BLOCKSCOUT_CHAINS[chain]
+        url = f"{base_url}/api/v2/transactions/{tx_hash}"
+        tx_data = _fetch_json(url)
     if not tx_data:
         raise ValueError(
             f"Transaction {tx_hash} not found on {chain}. "
@@ -2,7 +2,7 @@
 """
 EVM Transaction Event Parser
 Parses and decodes transaction event logs into human-readable descriptions
-using Blockscout and 4byte.directory APIs.
+using Blockscout and the local signature database (signature_db.py).
 
 Input (JSON via stdin):
 {
@@ -32,6 +32,8 @@ import time
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
+from signature_db import get_signature_db
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -57,8 +59,6 @@ CHAIN_IDS: Dict[str, str] = {
     "avalanche": "43114", "avax": "43114",
 }
 
-FOURBYTE_EVENT_API: str = "https://www.4byte.directory/api/v1/event-signatures"
-
 TX_HASH_PATTERN: re.Pattern = re.compile(r"^0x[a-fA-F0-9]{64}$")
 
 MAX_RETRIES: int = 3
@@ -177,6 +177,10 @@ KNOWN_EVENTS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+KNOWN_EVENT_SIGNATURES: Dict[str, str] = {
+    topic: info["signature"] for topic, info in KNOWN_EVENTS.items()
+}
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -293,8 +297,8 @@ def _data_word_to_address(word: str) -> str:
 # Event lookup
 # ---------------------------------------------------------------------------
 
-def _lookup_event_4byte(topic0: str) -> Optional[str]:
-    """Look up an event signature via 4byte.directory.
+def _lookup_event_signature(topic0: str) -> Optional[str]:
+    """Look up an event signature in the local signature database.
 
     Args:
         topic0: The topic0 hash (with 0x prefix).
@@ -302,16 +306,7 @@ def _lookup_event_4byte(topic0: str) -> Optional[str]:
     Returns:
         Event text signature if found, else None.
     """
-    url = f"{FOURBYTE_EVENT_API}/?hex_signature={topic0}&format=json"
-    try:
-        data = _fetch_json(url, timeout=10, retries=2)
-        if data and data.get("results"):
-            results = data["results"]
-            canonical = min(results, key=lambda r: r.get("id", 0))
-            return canonical.get("text_signature")
-    except ConnectionError:
-        pass
-    return None
+    return get_signature_db(KNOWN_EVENT_SIGNATURES).lookup(topic0)
 
 
 # ---------------------------------------------------------------------------
@@ -516,9 +511,9 @@ def _parse_single_log(log_entry: Dict, index: int) -> Dict[str, Any]:
                 decoded_params[pname] = pval
         resolved = True
 
-    # Fall back to 4byte.directory lookup
+    # Fall back to the signature database (imported 4byte dumps)
     elif topic0:
-        sig = _lookup_event_4byte(topic0)
+        sig = _lookup_event_signature(topic0)
         if sig:
             event_name = sig.split("(")[0]
             event_signature = sig
@@ -550,12 +545,21 @@ def _parse_single_log(log_entry: Dict, index: int) -> Dict[str, Any]:
 # Main logic
 # ---------------------------------------------------------------------------
 
-def parse_events(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
+def parse_events(
+    tx_hash: str,
+    chain: str = "ethereum",
+    tx_data: Optional[Dict] = None,
+    logs_data: Optional[Any] = None,
+) -> Dict[str, Any]:
     """Parse transaction event logs.
 
     Args:
         tx_hash: Transaction hash (0x + 64 hex).
         chain: Blockchain network name.
+        tx_data: Blockscout transaction response already fetched by the
+            caller (batch_debugger); fetched here when omitted.
+        logs_data: Blockscout /logs response already fetched by the caller;
+            fetched here when omitted.
 
     Returns:
         Dictionary with parsed events and summaries.
@@ -566,8 +570,9 @@ def parse_events(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
     base_url = BLOCKSCOUT_CHAINS[chain]
 
     # Fetch transaction basic info
-    tx_url = f"{base_url}/api/v2/transactions/{tx_hash}"
-    tx_data = _fetch_json(tx_url)
+    if tx_data is None:
+        tx_url = f"{base_url}/api/v2/transactions/{tx_hash}"
+        tx_data = _fetch_json(tx_url)
     if not tx_data:
         raise ValueError(
             f"Transaction {tx_hash} not found on {chain}. "
@@ -578,8 +583,9 @@ def parse_events(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
     is_success = status == "ok" or tx_data.get("result") == "success"
 
     # Fetch logs
-    logs_url = f"{base_url}/api/v2/transactions/{tx_hash}/logs"
-    logs_data = _fetch_json(logs_url)
+    if logs_data is None:
+        logs_url = f"{base_url}/api/v2/transactions/{tx_hash}/logs"
+        logs_data = _fetch_json(logs_url)
 
     raw_logs: List[Dict] = []
     if logs_data:
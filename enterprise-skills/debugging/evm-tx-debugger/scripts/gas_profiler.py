@@ -468,12 +468,21 @@ def _build_network_comparison(
 # Main logic
 # ---------------------------------------------------------------------------
 
-def profile_gas(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
+def profile_gas(
+    tx_hash: str,
+    chain: str = "ethereum",
+    tx_data: Optional[Dict] = None,
+    network_stats: Optional[Dict] = None,
+) -> Dict[str, Any]:
     """Profile gas usage for a transaction.
 
     Args:
         tx_hash: Transaction hash (0x + 64 hex).
         chain: Blockchain network name.
+        tx_data: Blockscout transaction response already fetched by the
+            caller (batch_debugger); fetched here when omitted.
+        network_stats: Blockscout /stats response shared across a batch
+            ({} if unavailable); fetched here when omitted.
 
     Returns:
         Comprehensive gas profiling dictionary.
@@ -483,9 +492,10 @@ def profile_gas(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
     chain_id = CHAIN_IDS.get(chain, "1")
 
     # Fetch transaction
-    base_url = BLOCKSCOUT_CHAINS[chain]
-    url = f"{base_url}/api/v2/transactions/{tx_hash}"
-    tx_data = _fetch_json(url)
+    if tx_data is None:
+        base_url = BLOCKSCOUT_CHAINS[chain]
+        url = f"{base_url}/api/v2/transactions/{tx_hash}"
+        tx_data = _fetch_json(url)
     if not tx_data:
         raise ValueError(
             f"Transaction {tx_hash} not found on {chain}. "
@@ -524,7 +534,8 @@ def profile_gas(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
     cost = _compute_cost(tx_data, chain)
 
     # Network comparison
-    network_stats = _fetch_network_stats(chain)
+    if network_stats is None:
+        network_stats = _fetch_network_stats(chain)
     network_info = _extract_network_gas_info(network_stats)
     comparison = _build_network_comparison(gas_used, gas_price, network_info)
 
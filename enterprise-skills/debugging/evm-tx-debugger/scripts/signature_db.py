@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+EVM Signature Database
+Local, offline store of function/error selectors (4-byte) and event topics
+(32-byte) shared by tx_decoder, event_parser, error_classifier and the
+smart-contract-auditor function decoder.
+
+Signatures live in a single SQLite table keyed by the raw hash bytes, so a
+lookup is one primary-key probe. Hot hashes are served from an in-memory LRU
+and hashes known to be missing from a negative cache, which keeps repeated
+lookups in a multicall or log-heavy transaction in the microsecond range.
+The store is seeded from the scripts' built-in tables and can import 4byte
+dumps; 4byte.directory is only queried when remote lookups are enabled.
+
+Input (JSON via stdin):
+{
+    "action": "import",            # import | lookup | stats
+    "path": "signatures.json"      # import: 4byte JSON/NDJSON/CSV dump
+}
+{
+    "action": "lookup",
+    "hashes": ["0xa9059cbb", "0xddf252ad..."]
+}
+
+Output (JSON via stdout):
+{
+    "success": true,
+    "action": "import",
+    "imported": 1250000,
+    ...
+}
+
+Environment:
+    EVM_SIGNATURE_DB          SQLite path (default ~/.cache/spoon-evm-signatures/signatures.db)
+    EVM_SIGNATURE_REMOTE      "1" to fall back to 4byte.directory on a miss (default offline)
+
+Author: Nihal Nihalani
+Version: 1.0.0
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+FOURBYTE_API: str = "https://www.4byte.directory/api/v1"
+
+SELECTOR_SIZE: int = 4
+TOPIC_SIZE: int = 32
+
+DEFAULT_CACHE_SIZE: int = 4096
+IMPORT_BATCH_SIZE: int = 10000
+# Remote misses are not retried until this many seconds have passed
+REMOTE_MISS_TTL: float = 7 * 24 * 3600.0
+
+# Seeds outrank any imported entry (4byte ids start at 1, lowest id wins)
+SEED_RANK: int = 0
+# Entries imported without an id rank after every 4byte entry
+UNRANKED: int = 1 << 62
+
+# Revert payload selectors every decoder should know about
+STANDARD_ERRORS: Dict[str, str] = {
+    "0x08c379a0": "Error(string)",
+    "0x4e487b71": "Panic(uint256)",
+}
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS signatures (
+    hash BLOB PRIMARY KEY,
+    text_signature TEXT NOT NULL,
+    rank INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS remote_misses (
+    hash BLOB PRIMARY KEY,
+    checked_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _default_db_path() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-evm-signatures", "signatures.db")
+    return os.getenv("EVM_SIGNATURE_DB", default)
+
+
+def _hash_bytes(hex_hash: str) -> Optional[bytes]:
+    """Convert a 0x-prefixed selector or topic to its raw key, None if malformed."""
+    if not isinstance(hex_hash, str):
+        return None
+    value = hex_hash.strip()
+    if value[:2].lower() == "0x":
+        value = value[2:]
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return raw if len(raw) in (SELECTOR_SIZE, TOPIC_SIZE) else None
+
+
+def _fetch_json(url: str, timeout: int = 10) -> Optional[Dict]:
+    """Fetch JSON from *url*; 404 is a miss, other failures raise ConnectionError."""
+    try:
+        req = urllib.request.Request(
+            url,
+            headers={
+                "User-Agent": "EVMTxDebugger/1.0",
+                "Accept": "application/json",
+            },
+        )
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode())
+    except urllib.error.HTTPError as exc:
+        if exc.code == 404:
+            return None
+        raise ConnectionError(f"API request failed: {exc}")
+    except urllib.error.URLError as exc:
+        raise ConnectionError(f"API request failed: {exc}")
+
+
+def _parse_record(record: Any) -> Optional[Tuple[bytes, str, int]]:
+    """Normalise one dump record to (hash, text_signature, rank)."""
+    if isinstance(record, dict):
+        hex_hash = record.get("hex_signature") or record.get("hash") or record.get("selector")
+        text = record.get("text_signature") or record.get("signature")
+        rank = record.get("id")
+    elif isinstance(record, (list, tuple)) and len(record) >= 2:
+        hex_hash, text = record[0], record[1]
+        rank = record[2] if len(record) > 2 else None
+    else:
+        return None
+
+    key = _hash_bytes(hex_hash) if hex_hash else None
+    if key is None or not text or "(" not in str(text):
+        return None
+    try:
+        rank = int(rank) if rank not in (None, "") else UNRANKED
+    except (TypeError, ValueError):
+        rank = UNRANKED
+    return key, str(text).strip(), rank
+
+
+def _iter_dump(path: str) -> Iterator[Any]:
+    """Yield raw records from a 4byte dump.
+
+    Accepts a JSON list of records, 4byte API pages ({"results": [...]}), a
+    {hash: signature} mapping, NDJSON, or CSV/TSV lines of
+    ``hex_signature,text_signature[,id]``.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        head = handle.read(1)
+        handle.seek(0)
+
+        if head in ("[", "{"):
+            try:
+                data = json.load(handle)
+            except json.JSONDecodeError:
+                # Not a single document -- treat as NDJSON
+                handle.seek(0)
+                for line in handle:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+                return
+            if isinstance(data, dict) and isinstance(data.get("results"), list):
+                data = data["results"]
+            if isinstance(data, dict):
+                yield from data.items()
+            else:
+                yield from data
+            return
+
+        dialect = "excel-tab" if "\t" in handle.readline() else "excel"
+        handle.seek(0)
+        for row in csv.reader(handle, dialect=dialect):
+            if row and not row[0].startswith("#"):
+                yield row
+
+
+# ---------------------------------------------------------------------------
+# Signature database
+# ---------------------------------------------------------------------------
+
+class SignatureDB:
+    """SQLite-backed selector/topic store with LRU and negative caches.
+
+    Args:
+        path: SQLite database path (":memory:" for a throwaway store).
+        cache_size: Entries kept in each in-memory cache.
+        remote: Query 4byte.directory on a miss; defaults to EVM_SIGNATURE_REMOTE.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        remote: Optional[bool] = None,
+    ):
+        self.path = path or _default_db_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+
+        if remote is None:
+            remote = os.getenv("EVM_SIGNATURE_REMOTE", "0").lower() in ("1", "true", "yes")
+        self.remote = remote
+        self.cache_size = max(1, cache_size)
+        self._hits: "OrderedDict[bytes, str]" = OrderedDict()
+        self._misses: "OrderedDict[bytes, None]" = OrderedDict()
+        self.stats: Dict[str, int] = {"cache_hits": 0, "negative_hits": 0, "db_hits": 0, "remote_hits": 0, "misses": 0}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------------------------------------------------------ #
+    # Lookups
+    # ------------------------------------------------------------------ #
+
+    def lookup(self, hex_hash: str) -> Optional[str]:
+        """Resolve a 4-byte selector or 32-byte event topic to its text signature.
+
+        Args:
+            hex_hash: 0x-prefixed selector (function or custom error) or topic0.
+
+        Returns:
+            Canonical text signature, or None if unknown.
+        """
+        key = _hash_bytes(hex_hash)
+        if key is None:
+            return None
+
+        with self.lock:
+            signature = self._hits.get(key)
+            if signature is not None:
+                self._hits.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return signature
+            if key in self._misses:
+                self._misses.move_to_end(key)
+                self.stats["negative_hits"] += 1
+                return None
+
+            row = self.conn.execute(
+                "SELECT text_signature FROM signatures WHERE hash = ?", (key,)
+            ).fetchone()
+            if row:
+                self.stats["db_hits"] += 1
+                self._remember(key, row[0])
+                return row[0]
+
+        signature = self._lookup_remote(key) if self.remote else None
+        with self.lock:
+            if signature:
+                self.stats["remote_hits"] += 1
+                self._remember(key, signature)
+            else:
+                self.stats["misses"] += 1
+                self._misses[key] = None
+                if len(self._misses) > self.cache_size:
+                    self._misses.popitem(last=False)
+        return signature
+
+    def lookup_many(self, hex_hashes: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolve several hashes; keys are returned lower-cased as given."""
+        return {h.lower(): self.lookup(h) for h in hex_hashes}
+
+    def _remember(self, key: bytes, signature: str) -> None:
+        self._hits[key] = signature
+        if len(self._hits) > self.cache_size:
+            self._hits.popitem(last=False)
+
+    def _lookup_remote(self, key: bytes) -> Optional[str]:
+        """Query 4byte.directory once per hash and persist the answer (or miss)."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT checked_at FROM remote_misses WHERE hash = ?", (key,)
+            ).fetchone()
+        if row and time.time() - row[0] < REMOTE_MISS_TTL:
+            return None
+
+        endpoint = "event-signatures" if len(key) == TOPIC_SIZE else "signatures"
+        url = f"{FOURBYTE_API}/{endpoint}/?hex_signature=0x{key.hex()}&format=json"
+        try:
+            data = _fetch_json(url)
+        except ConnectionError:
+            # Offline or rate limited: do not record a persistent miss
+            return None
+
+        results = (data or {}).get("results") or []
+        with self.lock:
+            if results:
+                canonical = min(results, key=lambda r: r.get("id", 0))
+                signature = canonical.get("text_signature")
+                self._upsert([(key, signature, int(canonical.get("id") or UNRANKED))])
+                self.conn.execute("DELETE FROM remote_misses WHERE hash = ?", (key,))
+                self.conn.commit()
+                return signature
+            self.conn.execute(
+                "INSERT OR REPLACE INTO remote_misses(hash, checked_at) VALUES (?, ?)",
+                (key, time.time()),
+            )
+            self.conn.commit()
+        return None
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+
+    def _upsert(self, rows: List[Tuple[bytes, str, int]]) -> None:
+        """Insert rows, keeping the lowest-ranked signature per hash."""
+        self.conn.executemany(
+            "INSERT INTO signatures(hash, text_signature, rank) VALUES (?, ?, ?) "
+            "ON CONFLICT(hash) DO UPDATE SET text_signature = excluded.text_signature, "
+            "rank = excluded.rank WHERE excluded.rank <= signatures.rank",
+            rows,
+        )
+
+    def add(self, signatures: Dict[str, str], rank: int = SEED_RANK) -> int:
+        """Add a {hash: text_signature} mapping (e.g. KNOWN_SELECTORS).
+
+        Only the added hashes are evicted from the hit and miss caches, so
+        recording one 4byte answer keeps every other cached lookup warm.
+
+        Args:
+            signatures: Selectors/topics mapped to text signatures.
+            rank: Priority; lower wins when a hash has several signatures.
+
+        Returns:
+            Number of valid entries written.
+        """
+        rows = []
+        for hex_hash, text in signatures.items():
+            parsed = _parse_record((hex_hash, text, rank))
+            if parsed:
+                rows.append(parsed)
+        with self.lock:
+            self._upsert(rows)
+            self.conn.commit()
+            for key, _, _ in rows:
+                self._hits.pop(key, None)
+                self._misses.pop(key, None)
+        return len(rows)
+
+    def import_dump(self, path: str) -> Dict[str, int]:
+        """Import a 4byte signature dump.
+
+        Args:
+            path: JSON, NDJSON or CSV/TSV dump (see _iter_dump).
+
+        Returns:
+            Counts of imported and skipped records.
+        """
+        imported = skipped = 0
+        batch: List[Tuple[bytes, str, int]] = []
+        with self.lock:
+            for record in _iter_dump(path):
+                parsed = _parse_record(record)
+                if parsed is None:
+                    skipped += 1
+                    continue
+                batch.append(parsed)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self._upsert(batch)
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                self._upsert(batch)
+                imported += len(batch)
+            self.conn.commit()
+            self._invalidate()
+        return {"imported": imported, "skipped": skipped}
+
+    def _invalidate(self) -> None:
+        self._hits.clear()
+        self._misses.clear()
+
+    def count(self) -> Dict[str, int]:
+        """Number of stored selectors and event topics."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT length(hash), COUNT(*) FROM signatures GROUP BY length(hash)"
+            ).fetchall()
+        sizes = dict(rows)
+        return {"selectors": sizes.get(SELECTOR_SIZE, 0), "events": sizes.get(TOPIC_SIZE, 0)}
+
+
+# ---------------------------------------------------------------------------
+# Shared instance
+# ---------------------------------------------------------------------------
+
+_shared_db: Optional[SignatureDB] = None
+_shared_lock = threading.Lock()
+_seeded: set = set()
+
+
+def get_signature_db(seeds: Optional[Dict[str, str]] = None) -> SignatureDB:
+    """Return the process-wide database, adding each *seeds* table once.
+
+    Falls back to an in-memory store if the default path is not writable, so
+    decoding still works (seeded tables only) on read-only filesystems.
+    """
+    global _shared_db
+    with _shared_lock:
+        if _shared_db is None:
+            try:
+                _shared_db = SignatureDB()
+            except (sqlite3.Error, OSError):
+                _shared_db = SignatureDB(":memory:")
+            _shared_db.add(STANDARD_ERRORS)
+        if seeds and id(seeds) not in _seeded:
+            _seeded.add(id(seeds))
+            _shared_db.add(seeds)
+        return _shared_db
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    """Entry point: read JSON from stdin, import or look up signatures."""
+    try:
+        raw = sys.stdin.read()
+        input_data = json.loads(raw) if raw.strip() else {}
+        action = input_data.get("action", "stats")
+        db = get_signature_db()
+
+        if action == "import":
+            path = input_data.get("path", "")
+            if not path or not os.path.isfile(path):
+                raise ValueError(f"Dump file not found: {path or '(missing path)'}")
+            started = time.perf_counter()
+            counts = db.import_dump(path)
+            result: Dict[str, Any] = {
+                "success": True,
+                "action": "import",
+                **counts,
+                "elapsed_seconds": round(time.perf_counter() - started, 2),
+                "database": db.path,
+                "totals": db.count(),
+            }
+        elif action == "lookup":
+            hashes = input_data.get("hashes") or [input_data.get("hash", "")]
+            result = {
+                "success": True,
+                "action": "lookup",
+                "signatures": db.lookup_many(h for h in hashes if h),
+            }
+        elif action == "stats":
+            result = {"success": True, "action": "stats", "database": db.path, "totals": db.count()}
+        else:
+            raise ValueError(f"Unknown action: {action}. Use import, lookup or stats.")
+        print(json.dumps(result, indent=2))
+
+    except json.JSONDecodeError:
+        print(json.dumps({
+            "success": False,
+            "error": "Invalid JSON input.",
+            "error_type": "VALIDATION_ERROR",
+        }))
+        sys.exit(1)
+    except (ValueError, OSError) as exc:
+        print(json.dumps({
+            "success": False,
+            "error": str(exc),
+            "error_type": "VALIDATION_ERROR",
+        }))
+        sys.exit(1)
+    except Exception as exc:
+        print(json.dumps({
+            "success": False,
+            "error": f"Unexpected error: {type(exc).__name__}: {exc}",
+            "error_type": "INTERNAL_ERROR",
+        }))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Unit tests for the batch debugger's connection pool and batch runner."""
+
+import threading
+import time
+
+import pytest
+
+import batch_debugger
+from batch_debugger import MAX_RETRIES, RETRY_BACKOFF, BlockscoutPool, RateLimiter, run_batch
+
+BASE = "https://eth.blockscout.com/api/v2"
+
+
+def _hash(n):
+    return "0x" + f"{n:064x}"
+
+
+def _tx(tx_hash):
+    return {"hash": tx_hash, "status": "ok", "from": {"hash": "0x1"}, "to": {"hash": "0x2"}, "value": "0"}
+
+
+class FakePool(BlockscoutPool):
+    """BlockscoutPool whose network request is a slow in-memory lookup."""
+
+    def __init__(self, responses, delay=0.0, **kwargs):
+        super().__init__(rate_limit=1000, **kwargs)
+        self.responses = responses
+        self.delay = delay
+        self.fetched = []
+        self.active = self.peak = 0
+        self.counter_lock = threading.Lock()
+
+    def _request(self, url):
+        with self.counter_lock:
+            self.fetched.append(url)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            response = self.responses.get(url)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        finally:
+            with self.counter_lock:
+                self.active -= 1
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"{}"):
+        self.status, self.reason, self.body = status, "Fake", body
+
+    def read(self):
+        return self.body
+
+
+class FakeConnection:
+    """Keep-alive connection replaying scripted responses (or raising them)."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = 0
+        self.closed = False
+
+    def request(self, method, path, headers=None):
+        self.requests += 1
+        if isinstance(self.script[0], Exception):
+            raise self.script.pop(0)
+
+    def getresponse(self):
+        return self.script.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(batch_debugger.time, "sleep", recorded.append)
+    monkeypatch.setattr(batch_debugger.random, "random", lambda: 0.0)
+    return recorded
+
+
+def _scripted_pool(monkeypatch, script):
+    pool = BlockscoutPool(rate_limit=1000)
+    conn = FakeConnection(script)
+    monkeypatch.setattr(pool, "_connection", lambda scheme, host: conn)
+    return pool, conn
+
+
+def test_identical_inflight_urls_are_fetched_once():
+    url = f"{BASE}/stats"
+    pool = FakePool({url: {"gas_prices": {"average": 1}}}, delay=0.2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get_json(url))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.fetched == [url]
+    assert results == [{"gas_prices": {"average": 1}}] * 8
+    assert pool.stats["shared_waits"] == 7
+
+    assert pool.get_json(url) == {"gas_prices": {"average": 1}}
+    assert pool.stats["cache_hits"] == 1 and pool.fetched == [url]
+
+
+def test_failed_fetch_is_shared_but_not_cached():
+    url = f"{BASE}/stats"
+    pool = FakePool({url: ConnectionError("API request failed: HTTP 503")}, delay=0.2)
+    errors = []
+
+    def fetch():
+        try:
+            pool.get_json(url)
+        except ConnectionError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["API request failed: HTTP 503"] * 4
+    assert len(pool.fetched) == 1
+    with pytest.raises(ConnectionError):
+        pool.get_json(url)
+    assert len(pool.fetched) == 2
+
+
+def test_server_errors_back_off_and_stop_at_the_retry_limit(monkeypatch, sleeps):
+    pool, conn = _scripted_pool(monkeypatch, [FakeResponse(503)] * (MAX_RETRIES + 1))
+
+    with pytest.raises(ConnectionError, match="HTTP 503"):
+        pool.get_json(f"{BASE}/transactions/{_hash(1)}")
+
+    assert conn.requests == MAX_RETRIES
+    assert sleeps == [RETRY_BACKOFF * 2 ** attempt for attempt in range(MAX_RETRIES)]
+    assert pool.stats == {"requests": MAX_RETRIES, "cache_hits": 0, "shared_waits": 0, "retries": MAX_RETRIES - 1}
+
+
+def test_retry_recovers_and_client_errors_are_not_retried(monkeypatch, sleeps):
+    pool, conn = _scripted_pool(monkeypatch, [
+        ConnectionResetError("reset by peer"), FakeResponse(429), FakeResponse(200, b'{"ok": true}'),
+    ])
+    assert pool.get_json(f"{BASE}/a") == {"ok": True}
+    assert conn.requests == 3 and sleeps == [RETRY_BACKOFF * 2]
+
+    pool, conn = _scripted_pool(monkeypatch, [FakeResponse(400), FakeResponse(200)])
+    with pytest.raises(ConnectionError, match="HTTP 400"):
+        pool.get_json(f"{BASE}/b")
+    assert conn.requests == 1
+
+    pool, conn = _scripted_pool(monkeypatch, [FakeResponse(404)])
+    assert pool.get_json(f"{BASE}/c") is None
+
+
+def test_rate_limiter_caps_request_rate():
+    limiter = RateLimiter(rate=20)
+    started = time.monotonic()
+    for _ in range(30):  # A burst of 20, then 10 more at 20 per second
+        limiter.acquire()
+    assert 0.4 < time.monotonic() - started < 1.5
+
+
+def test_batch_concurrency_is_capped_by_max_workers():
+    hashes = [_hash(n) for n in range(24)]
+    pool = FakePool({f"{BASE}/transactions/{h}": _tx(h) for h in hashes}, delay=0.02)
+
+    records = list(run_batch([(h, "ethereum") for h in hashes], ("decode",), max_workers=3, pool=pool))
+
+    assert sorted(r["index"] for r in records) == list(range(24))
+    assert all(r["success"] for r in records)
+    assert pool.peak == 3
+
+
+def test_failing_hash_yields_an_error_record():
+    good, missing, down = _hash(1), _hash(2), _hash(3)
+    pool = FakePool({
+        f"{BASE}/transactions/{good}": _tx(good),
+        f"{BASE}/transactions/{down}": ConnectionError("API request failed: HTTP 502 Bad Gateway"),
+    })
+    items = [(good, "ethereum"), ("0x1234", "ethereum"), (missing, "ethereum"), (down, "ethereum"), (good, "ethereum")]
+
+    records = {r["index"]: r for r in run_batch(items, ("decode",), max_workers=2, pool=pool)}
+
+    assert sorted(records) == [0, 1, 2, 3, 4]
+    assert records[0]["success"] and records[4]["success"]
+    assert records[0]["decode"]["transaction"]["hash"] == good
+    assert [records[i]["error_type"] for i in (1, 2, 3)] == ["VALIDATION_ERROR", "VALIDATION_ERROR", "API_ERROR"]
+    assert "not found" in records[2]["error"]
+    assert pool.fetched.count(f"{BASE}/transactions/{good}") == 1
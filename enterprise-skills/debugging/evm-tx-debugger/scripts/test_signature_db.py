@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Unit tests for the offline signature database."""
+
+import json
+
+import pytest
+
+import signature_db
+from signature_db import SignatureDB, STANDARD_ERRORS
+
+TRANSFER = "0xa9059cbb"
+TRANSFER_EVENT = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+@pytest.fixture
+def db():
+    store = SignatureDB(":memory:", remote=False)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    calls = []
+
+    def fetch(url, timeout=10):
+        calls.append(url)
+        return None
+
+    monkeypatch.setattr(signature_db, "_fetch_json", fetch)
+    return calls
+
+
+def test_seeded_selectors_and_topics(db):
+    db.add({TRANSFER: "transfer(address,uint256)", TRANSFER_EVENT: "Transfer(address,address,uint256)"})
+    db.add(STANDARD_ERRORS)
+
+    assert db.lookup(TRANSFER) == "transfer(address,uint256)"
+    assert db.lookup(TRANSFER.upper().replace("0X", "0x")) == "transfer(address,uint256)"
+    assert db.lookup(TRANSFER_EVENT) == "Transfer(address,address,uint256)"
+    assert db.lookup("0x08c379a0") == "Error(string)"
+    assert db.count() == {"selectors": 1 + len(STANDARD_ERRORS), "events": 1}
+
+
+def test_malformed_hashes_are_misses(db):
+    assert db.lookup("0x1234") is None
+    assert db.lookup("not-hex") is None
+    assert db.lookup(None) is None
+
+
+def test_lowest_rank_wins(db):
+    db.add({TRANSFER: "many_msg_babbage(bytes1)"}, rank=5000)
+    db.add({TRANSFER: "transfer(address,uint256)"}, rank=1)
+    db.add({TRANSFER: "collision(uint8)"}, rank=9000)
+    assert db.lookup(TRANSFER) == "transfer(address,uint256)"
+
+
+def test_add_clears_the_negative_cache(db):
+    assert db.lookup(TRANSFER) is None
+    assert db.lookup(TRANSFER) is None
+    assert db.stats["negative_hits"] == 1
+
+    db.add({TRANSFER: "transfer(address,uint256)"})
+    assert db.lookup(TRANSFER) == "transfer(address,uint256)"
+
+
+def test_add_evicts_only_the_added_hashes(db):
+    db.add({"0x095ea7b3": "approve(address,uint256)"})
+    assert db.lookup("0x095ea7b3") == "approve(address,uint256)"
+    assert db.lookup(TRANSFER) is None
+    assert db.lookup("0xdeadbeef") is None
+
+    db.add({TRANSFER: "transfer(address,uint256)"})
+
+    assert db.lookup(TRANSFER) == "transfer(address,uint256)"
+    assert db.lookup("0x095ea7b3") == "approve(address,uint256)"
+    assert db.lookup("0xdeadbeef") is None
+    assert (db.stats["cache_hits"], db.stats["negative_hits"]) == (1, 1)
+
+    # A better-ranked signature replaces the cached one
+    db.add({"0x095ea7b3": "collision(uint8)"}, rank=9000)
+    db.add({"0x095ea7b3": "approve_v2(address,uint256)"}, rank=0)
+    assert db.lookup("0x095ea7b3") == "approve_v2(address,uint256)"
+
+
+@pytest.mark.parametrize("name, content", [
+    ("dump.json", json.dumps([
+        {"id": 145, "hex_signature": TRANSFER, "text_signature": "transfer(address,uint256)"},
+        {"id": 31780, "hex_signature": "0x095ea7b3", "text_signature": "approve(address,uint256)"},
+    ])),
+    ("page.json", json.dumps({"results": [
+        {"id": 145, "hex_signature": TRANSFER, "text_signature": "transfer(address,uint256)"},
+        {"id": 31780, "hex_signature": "0x095ea7b3", "text_signature": "approve(address,uint256)"},
+    ]})),
+    ("dump.ndjson", "\n".join([
+        json.dumps({"hex_signature": TRANSFER, "text_signature": "transfer(address,uint256)"}),
+        json.dumps({"hex_signature": "0x095ea7b3", "text_signature": "approve(address,uint256)"}),
+    ])),
+    ("dump.csv", f'{TRANSFER},"transfer(address,uint256)",145\n0x095ea7b3,"approve(address,uint256)"\n'),
+    ("dump.tsv", f"{TRANSFER}\ttransfer(address,uint256)\n0x095ea7b3\tapprove(address,uint256)\nbad\trow\n"),
+])
+def test_import_dump_formats(db, tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+
+    result = db.import_dump(str(path))
+
+    assert result["imported"] == 2
+    assert db.lookup(TRANSFER) == "transfer(address,uint256)"
+    assert db.lookup("0x095ea7b3") == "approve(address,uint256)"
+
+
+def test_offline_by_default_never_touches_the_network(db, no_network):
+    assert db.lookup(TRANSFER) is None
+    assert no_network == []
+
+
+def test_remote_hits_are_persisted(tmp_path, monkeypatch):
+    calls = []
+
+    def fetch(url, timeout=10):
+        calls.append(url)
+        return {"results": [
+            {"id": 9000, "text_signature": "collision(uint8)"},
+            {"id": 145, "text_signature": "transfer(address,uint256)"},
+        ]}
+
+    monkeypatch.setattr(signature_db, "_fetch_json", fetch)
+    path = str(tmp_path / "signatures.db")
+    store = SignatureDB(path, remote=True)
+    assert store.lookup(TRANSFER) == "transfer(address,uint256)"
+    store.close()
+
+    reopened = SignatureDB(path, remote=True)
+    assert reopened.lookup(TRANSFER) == "transfer(address,uint256)"
+    assert len(calls) == 1
+    reopened.close()
+
+
+def test_remote_misses_are_remembered(tmp_path, no_network):
+    path = str(tmp_path / "signatures.db")
+    store = SignatureDB(path, remote=True)
+    assert store.lookup(TRANSFER) is None
+    store.close()
+
+    reopened = SignatureDB(path, remote=True)
+    assert reopened.lookup(TRANSFER) is None
+    assert len(no_network) == 1
+    reopened.close()
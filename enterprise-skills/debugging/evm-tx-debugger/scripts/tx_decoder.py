@@ -2,7 +2,7 @@
 """
 EVM Transaction Decoder
 Decodes transaction input data, method calls, and parameters using
-Blockscout and 4byte.directory APIs.
+Blockscout and the local signature database (signature_db.py).
 
 Input (JSON via stdin):
 {
@@ -32,6 +32,8 @@ import time
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
+from signature_db import get_signature_db
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -73,8 +75,6 @@ CHAIN_NATIVE_CURRENCY: Dict[str, str] = {
     "avalanche": "AVAX",
 }
 
-FOURBYTE_API: str = "https://www.4byte.directory/api/v1"
-
 TX_HASH_PATTERN: re.Pattern = re.compile(r"^0x[a-fA-F0-9]{64}$")
 
 MAX_RETRIES: int = 3
@@ -177,21 +177,12 @@ def _fetch_tx_from_blockscout(tx_hash: str, chain: str) -> Optional[Dict]:
     return _fetch_json(url)
 
 
-def _decode_selector_4byte(hex_selector: str) -> Optional[str]:
-    """Resolve a 4-byte method selector via 4byte.directory."""
+def _lookup_selector(hex_selector: str) -> Optional[str]:
+    """Resolve a 4-byte method selector via the local signature database."""
     if not hex_selector or len(hex_selector) < 10:
         return None
     selector = hex_selector[:10]  # 0x + 8 hex chars
-    url = f"{FOURBYTE_API}/signatures/?hex_signature={selector}&format=json"
-    try:
-        data = _fetch_json(url, timeout=10, retries=2)
-        if data and data.get("results"):
-            results = data["results"]
-            canonical = min(results, key=lambda r: r.get("id", 0))
-            return canonical.get("text_signature")
-    except ConnectionError:
-        pass
-    return None
+    return get_signature_db(KNOWN_SELECTORS).lookup(selector)
 
 
 # ---------------------------------------------------------------------------
@@ -254,10 +245,10 @@ def _extract_method_info(raw_input: str) -> Dict[str, Any]:
     signature = KNOWN_SELECTORS.get(selector)
     source = "known database"
 
-    # Fall back to 4byte.directory
+    # Fall back to the signature database (imported 4byte dumps)
     if not signature:
-        signature = _decode_selector_4byte(selector)
-        source = "4byte.directory"
+        signature = _lookup_selector(selector)
+        source = "signature database"
 
     if signature:
         name = signature.split("(")[0]
@@ -303,12 +294,18 @@ def _extract_contract_info(tx_data: Dict) -> Dict[str, Any]:
     }
 
 
-def decode_transaction(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
+def decode_transaction(
+    tx_hash: str,
+    chain: str = "ethereum",
+    tx_data: Optional[Dict] = None,
+) -> Dict[str, Any]:
     """Decode a transaction's input data and context.
 
     Args:
         tx_hash: Transaction hash (0x + 64 hex).
         chain: Blockchain network name.
+        tx_data: Blockscout transaction response already fetched by the
+            caller (batch_debugger); fetched here when omitted.
 
     Returns:
         Dictionary with decoded transaction information.
@@ -319,7 +316,8 @@ def decode_transaction(tx_hash: str, chain: str = "ethereum") -> Dict[str, Any]:
     native = CHAIN_NATIVE_CURRENCY.get(chain, "ETH")
 
     # Fetch transaction from Blockscout
-    tx_data = _fetch_tx_from_blockscout(tx_hash, chain)
+    if tx_data is None:
+        tx_data = _fetch_tx_from_blockscout(tx_hash, chain)
     if not tx_data:
         raise ValueError(
             f"Transaction {tx_hash} not found on {chain}. "
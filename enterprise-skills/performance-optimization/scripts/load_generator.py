@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Load Generator
+Open-model load generation with HDR-style latency histograms
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+MAX_ERROR_SAMPLES = 20
+
+
+class LatencyHistogram:
+    """Log-linear histogram over integer microseconds (HdrHistogram layout).
+
+    Values below 2**SUB_BITS are kept exactly. Above that, each power of two
+    is split into 2**(SUB_BITS - 1) equal buckets, so the relative error stays
+    under 0.8% and memory is bounded by the value range, not the sample count.
+    """
+
+    SUB_BITS = 8
+    _HALF = 1 << (SUB_BITS - 1)
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        shift = value.bit_length() - cls.SUB_BITS
+        if shift <= 0:
+            return value
+        return (1 << cls.SUB_BITS) + (shift - 1) * cls._HALF + ((value >> shift) - cls._HALF)
+
+    @classmethod
+    def _highest_equivalent(cls, index: int) -> int:
+        if index < (1 << cls.SUB_BITS):
+            return index
+        shift, offset = divmod(index - (1 << cls.SUB_BITS), cls._HALF)
+        shift += 1
+        return ((offset + cls._HALF) << shift) + (1 << shift) - 1
+
+    def record(self, value_us: float, count: int = 1) -> None:
+        value = max(0, int(value_us))
+        self.counts[self._index(value)] += count
+        self.total += count
+        self.sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if not other.total:
+            return
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentiles(self, percentiles: Iterable[float] = PERCENTILES) -> Dict[float, int]:
+        """Values (µs) at several percentiles, in one pass over the buckets."""
+        wanted = sorted(percentiles)
+        result = {p: 0 for p in wanted}
+        if not self.total:
+            return result
+        ranks = [(p, max(1, math.ceil(p / 100.0 * self.total))) for p in wanted]
+        seen = 0
+        position = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while position < len(ranks) and seen >= ranks[position][1]:
+                value = self._highest_equivalent(index)
+                result[ranks[position][0]] = min(max(value, self.min), self.max)
+                position += 1
+            if position == len(ranks):
+                break
+        return result
+
+    def summary_ms(self, prefix: str = "") -> Dict[str, float]:
+        """Mean, min, max and PERCENTILES in milliseconds."""
+        values = self.percentiles()
+        summary = {
+            f"{prefix}avg_ms": round(self.sum / self.total / 1000, 3) if self.total else 0.0,
+            f"{prefix}min_ms": round((self.min or 0) / 1000, 3),
+            f"{prefix}max_ms": round((self.max or 0) / 1000, 3),
+        }
+        for p, value in values.items():
+            label = f"{p:g}".replace(".", "")
+            summary[f"{prefix}p{label}_ms"] = round(value / 1000, 3)
+        return summary
+
+
+# ---------------------------------------------------------------------------
+# Arrival schedules
+# ---------------------------------------------------------------------------
+
+def target_rate(pattern: str, elapsed: float, duration: float, base_rate: float,
+                config: Dict[str, Any]) -> float:
+    """Requests per second the pattern asks for at `elapsed` seconds."""
+    if pattern == "ramp":
+        max_rate = config.get("max_load_rps", base_rate * 10)
+        return base_rate + (max_rate - base_rate) * min(elapsed / duration, 1.0)
+    if pattern == "spike":
+        spike_time = config.get("spike_time_seconds", duration / 2)
+        spike_rate = config.get("spike_load_rps", base_rate * 5)
+        half_width = config.get("spike_width_seconds", 10) / 2
+        return spike_rate if abs(elapsed - spike_time) < half_width else base_rate
+    if pattern == "wave":
+        period = config.get("wave_duration_seconds", 10)
+        max_rate = config.get("max_load_rps", base_rate * 5)
+        progress = (elapsed % period) / period
+        return base_rate + (max_rate - base_rate) * abs(0.5 - progress) * 2
+    return base_rate  # constant, poisson
+
+
+def arrival_times(pattern: str, duration: float, base_rate: float,
+                  config: Dict[str, Any], rng: Optional[random.Random] = None) -> Iterator[float]:
+    """Intended send offsets (seconds from start) for the whole run.
+
+    "poisson" (or config["poisson"] on any other pattern) draws exponential
+    gaps; otherwise requests are evenly spaced at the current target rate.
+    """
+    rng = rng or random.Random(config.get("seed"))
+    poisson = pattern == "poisson" or config.get("poisson", False)
+    elapsed = 0.0
+    while True:
+        rate = target_rate(pattern, elapsed, duration, base_rate, config)
+        if rate <= 0:
+            elapsed += 0.01
+        else:
+            elapsed += rng.expovariate(rate) if poisson else 1.0 / rate
+        if elapsed >= duration:
+            return
+        if rate > 0:
+            yield elapsed
+
+
+# ---------------------------------------------------------------------------
+# Generator
+# ---------------------------------------------------------------------------
+
+class LoadGenerator:
+    """Open-model load generator.
+
+    Requests are sent at their scheduled arrival times whether or not earlier
+    ones have finished. Latency is measured from the scheduled time rather
+    than the actual send, so a stalled system is charged for the requests it
+    delayed (coordinated-omission correction). Service time (actual send to
+    completion) is reported alongside.
+
+    Config keys (all optional):
+        duration_seconds, initial_load_rps, pattern
+            (constant/ramp/spike/wave/poisson), max_load_rps,
+            spike_time_seconds, spike_load_rps, spike_width_seconds,
+            wave_duration_seconds, poisson, seed
+        driver: "thread", "asyncio" or "auto" (asyncio for coroutine functions)
+        concurrency: Worker threads / max in-flight async requests (default 100)
+        interval_seconds: Reporting interval (default 1)
+    """
+
+    def __init__(self, endpoint_func: Callable, config: Dict[str, Any]):
+        self.endpoint_func = endpoint_func
+        self.config = config
+        self.duration = float(config.get("duration_seconds", 60))
+        self.base_rate = float(config.get("initial_load_rps", 10))
+        self.pattern = config.get("pattern", "constant")
+        self.interval = float(config.get("interval_seconds", 1))
+        self.concurrency = int(config.get("concurrency", 100))
+        driver = config.get("driver", "auto")
+        if driver == "auto":
+            driver = "asyncio" if asyncio.iscoroutinefunction(endpoint_func) else "thread"
+        self.driver = driver
+
+        self._lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self._intervals: Dict[int, LatencyHistogram] = {}
+        self._interval_errors: Counter = Counter()
+        self._scheduled: Counter = Counter()
+        self.errors = 0
+        self.error_samples: Counter = Counter()
+        self.max_send_lag_us = 0
+        self._start = 0.0
+        self._elapsed = 0.0
+
+    def run(self) -> Dict[str, Any]:
+        """Run the load test and return the report."""
+        if self.driver == "asyncio":
+            asyncio.run(self._run_async())
+        else:
+            self._run_threads()
+        self._elapsed = time.perf_counter() - self._start
+        return self.report()
+
+    # ----- drivers -----
+
+    def _schedule(self) -> Iterator[float]:
+        for offset in arrival_times(self.pattern, self.duration, self.base_rate, self.config):
+            self._scheduled[int(offset // self.interval)] += 1
+            yield offset
+
+    def _run_threads(self) -> None:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            self._start = time.perf_counter()
+            for offset in self._schedule():
+                due = self._start + offset
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._call_sync, due)
+
+    def _call_sync(self, due: float) -> None:
+        sent = time.perf_counter()
+        error = None
+        try:
+            self.endpoint_func()
+        except Exception as e:
+            error = e
+        self._record(due, sent, time.perf_counter(), error)
+
+    async def _run_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        self._start = time.perf_counter()
+        for offset in self._schedule():
+            due = self._start + offset
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = loop.create_task(self._call_async(due, limit))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _call_async(self, due: float, limit: asyncio.Semaphore) -> None:
+        async with limit:
+            sent = time.perf_counter()
+            error = None
+            try:
+                await self.endpoint_func()
+            except Exception as e:
+                error = e
+            self._record(due, sent, time.perf_counter(), error)
+
+    def _record(self, due: float, sent: float, done: float, error: Optional[Exception]) -> None:
+        bucket = int((done - self._start) // self.interval)
+        with self._lock:
+            self.max_send_lag_us = max(self.max_send_lag_us, int((sent - due) * 1e6))
+            if error is not None:
+                self.errors += 1
+                self._interval_errors[bucket] += 1
+                message = f"{type(error).__name__}: {error}"
+                if message in self.error_samples or len(self.error_samples) < MAX_ERROR_SAMPLES:
+                    self.error_samples[message] += 1
+                return
+            latency = (done - due) * 1e6
+            self.latency.record(latency)
+            self.service.record((done - sent) * 1e6)
+            histogram = self._intervals.get(bucket)
+            if histogram is None:
+                histogram = self._intervals[bucket] = LatencyHistogram()
+            histogram.record(latency)
+
+    # ----- reporting -----
+
+    def report(self) -> Dict[str, Any]:
+        total = self.latency.total + self.errors
+        elapsed = self._elapsed
+        scheduled = sum(self._scheduled.values())
+        intervals = []
+        for bucket in sorted(set(self._intervals) | set(self._interval_errors) | set(self._scheduled)):
+            histogram = self._intervals.get(bucket, LatencyHistogram())
+            values = histogram.percentiles((50.0, 99.0, 99.9))
+            intervals.append({
+                "start_seconds": round(bucket * self.interval, 3),
+                "target_rps": round(self._scheduled.get(bucket, 0) / self.interval, 2),
+                "throughput_rps": round((histogram.total + self._interval_errors.get(bucket, 0)) / self.interval, 2),
+                "requests": histogram.total,
+                "errors": self._interval_errors.get(bucket, 0),
+                "avg_ms": round(histogram.sum / histogram.total / 1000, 3) if histogram.total else 0.0,
+                "p50_ms": round(values[50.0] / 1000, 3),
+                "p99_ms": round(values[99.0] / 1000, 3),
+                "p999_ms": round(values[99.9] / 1000, 3),
+            })
+
+        error_rate = self.errors / total if total else 0
+        return {
+            "driver": self.driver,
+            "pattern": self.pattern,
+            "total_requests": total,
+            "successful_requests": self.latency.total,
+            "failed_requests": self.errors,
+            "error_rate": round(error_rate, 4),
+            "target_rps": round(scheduled / self.duration, 2) if self.duration else 0,
+            "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0,
+            **self.latency.summary_ms("latency_"),
+            **self.service.summary_ms("service_"),
+            "max_send_lag_ms": round(self.max_send_lag_us / 1000, 3),
+            "intervals": intervals,
+            "errors": dict(self.error_samples),
+        }
+
+
+def run_open_model(endpoint_func: Callable, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Convenience wrapper: LoadGenerator(endpoint_func, config).run()."""
+    return LoadGenerator(endpoint_func, config).run()
@@ -10,12 +10,15 @@ from typing import Dict, List, Any, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+from load_generator import LoadGenerator
+
 class LoadPattern(Enum):
     """Load test patterns."""
     CONSTANT = "constant"
     RAMP = "ramp"
     SPIKE = "spike"
     WAVE = "wave"
+    POISSON = "poisson"
 
 @dataclass
 class LoadTestResult:
@@ -38,36 +41,16 @@ class LoadTester:
         self.results = []
 
     def run_load_test(self, endpoint_func: Callable, config: Dict) -> Dict[str, Any]:
-        """Run a load test."""
-        
-        duration = config.get("duration_seconds", 60)
-        initial_load = config.get("initial_load_rps", 10)
-        pattern = config.get("pattern", "constant")
-        
-        responses = []
-        errors = []
-        start_time = time.time()
-        
-        while time.time() - start_time < duration:
-            elapsed = time.time() - start_time
-            
-            # Calculate current load based on pattern
-            current_load = self._calculate_load(pattern, elapsed, duration, initial_load, config)
-            
-            # Simulate requests for this second
-            for _ in range(int(current_load)):
-                try:
-                    req_start = time.time()
-                    endpoint_func()
-                    req_time = (time.time() - req_start) * 1000
-                    responses.append(req_time)
-                except Exception as e:
-                    errors.append(str(e))
-            
-            time.sleep(1)
-        
-        # Analyze results
-        return self._analyze_results(responses, errors, start_time, duration)
+        """Run a load test.
+
+        Requests are issued at the pattern's arrival times from a thread pool
+        (or an asyncio loop for coroutine endpoints), independent of how long
+        earlier requests take. See load_generator.LoadGenerator for config keys.
+        """
+        
+        report = LoadGenerator(endpoint_func, config).run()
+        self.results.append(report)
+        return self._analyze_results(report)
 
     def stress_test(self, endpoint_func: Callable, config: Dict) -> Dict[str, Any]:
         """Run stress test - gradually increase load until failure."""
@@ -84,34 +67,27 @@ class LoadTester:
         while current_load <= max_load:
             print(f"Testing at {current_load} RPS...")
             
-            responses = []
-            errors = []
-            start_time = time.time()
-            
-            while time.time() - start_time < duration_per_step:
-                for _ in range(int(current_load)):
-                    try:
-                        req_start = time.time()
-                        endpoint_func()
-                        responses.append((time.time() - req_start) * 1000)
-                    except Exception as e:
-                        errors.append(str(e))
-                
-                time.sleep(0.1)
+            report = LoadGenerator(endpoint_func, {
+                **config,
+                "duration_seconds": duration_per_step,
+                "initial_load_rps": current_load,
+                "pattern": "constant",
+            }).run()
+            error_rate = report["error_rate"]
             
             # Check for failure
-            error_rate = len(errors) / (len(responses) + len(errors)) if (responses or errors) else 0
-            
             if error_rate > 0.05:  # 5% error rate threshold
                 breakpoint = current_load
                 break
             
             result = {
                 "load_rps": current_load,
-                "requests": len(responses),
-                "errors": len(errors),
+                "achieved_rps": report["throughput_rps"],
+                "requests": report["successful_requests"],
+                "errors": report["failed_requests"],
                 "error_rate": error_rate,
-                "avg_time_ms": sum(responses) / len(responses) if responses else 0
+                "avg_time_ms": report["latency_avg_ms"],
+                "p99_time_ms": report["latency_p99_ms"]
             }
             results.append(result)
             
@@ -130,34 +106,23 @@ class LoadTester:
         duration_seconds = duration_hours * 3600
         sample_interval = 300  # Sample every 5 minutes
         
-        samples = []
-        errors = []
-        start_time = time.time()
-        
-        while time.time() - start_time < duration_seconds:
-            sample_responses = []
-            sample_start = time.time()
-            
-            # Run for sample interval
-            while time.time() - sample_start < sample_interval:
-                for _ in range(load_rps):
-                    try:
-                        req_start = time.time()
-                        endpoint_func()
-                        sample_responses.append((time.time() - req_start) * 1000)
-                    except Exception as e:
-                        errors.append(str(e))
-                
-                time.sleep(0.1)
-            
-            # Record sample
-            avg_time = sum(sample_responses) / len(sample_responses) if sample_responses else 0
-            samples.append({
-                "elapsed_seconds": time.time() - start_time,
-                "avg_response_ms": avg_time,
-                "requests": len(sample_responses),
-                "errors": len(errors)
-            })
+        report = LoadGenerator(endpoint_func, {
+            "duration_seconds": duration_seconds,
+            "initial_load_rps": load_rps,
+            "pattern": "constant",
+            "interval_seconds": sample_interval,
+        }).run()
+        
+        samples = [
+            {
+                "elapsed_seconds": interval["start_seconds"] + sample_interval,
+                "avg_response_ms": interval["avg_ms"],
+                "p99_response_ms": interval["p99_ms"],
+                "requests": interval["requests"],
+                "errors": interval["errors"]
+            }
+            for interval in report["intervals"]
+        ]
         
         # Detect memory leaks or degradation
         trend = self._analyze_trend(samples)
@@ -166,7 +131,7 @@ class LoadTester:
             "duration_hours": duration_hours,
             "load_rps": load_rps,
             "samples": samples,
-            "total_errors": len(errors),
+            "total_errors": report["failed_requests"],
             "performance_trend": trend,
             "stability": "STABLE" if trend == "FLAT" else "DEGRADING"
         }
@@ -241,63 +206,28 @@ class LoadTester:
 
     # ===== Private Methods =====
 
-    def _calculate_load(self, pattern: str, elapsed: float, duration: float, base_load: int, config: Dict) -> int:
-        """Calculate current load based on pattern."""
-        
-        if pattern == "constant":
-            return base_load
-        
-        elif pattern == "ramp":
-            max_load = config.get("max_load_rps", base_load * 10)
-            progress = elapsed / duration
-            return int(base_load + (max_load - base_load) * progress)
-        
-        elif pattern == "spike":
-            spike_time = config.get("spike_time_seconds", duration / 2)
-            spike_load = config.get("spike_load_rps", base_load * 5)
-            if abs(elapsed - spike_time) < 5:
-                return spike_load
-            return base_load
-        
-        elif pattern == "wave":
-            wave_duration = config.get("wave_duration_seconds", 10)
-            progress = (elapsed % wave_duration) / wave_duration
-            max_load = config.get("max_load_rps", base_load * 5)
-            return int(base_load + (max_load - base_load) * abs(0.5 - progress) * 2)
-        
-        return base_load
-
-    def _analyze_results(self, responses: List[float], errors: List[str], start_time: float, duration: float) -> Dict[str, Any]:
+    def _analyze_results(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze test results."""
         
-        total = len(responses) + len(errors)
-        error_rate = len(errors) / total if total > 0 else 0
-        
-        if responses:
-            responses.sort()
-            avg = sum(responses) / len(responses)
-            min_time = responses[0]
-            max_time = responses[-1]
-            p95 = responses[int(len(responses) * 0.95)]
-            p99 = responses[int(len(responses) * 0.99)]
-        else:
-            avg = min_time = max_time = p95 = p99 = 0
-        
-        elapsed = time.time() - start_time
-        throughput = total / elapsed if elapsed > 0 else 0
-        
         return {
-            "total_requests": total,
-            "successful_requests": len(responses),
-            "failed_requests": len(errors),
-            "error_rate": round(error_rate, 4),
-            "avg_response_time_ms": round(avg, 2),
-            "min_response_time_ms": round(min_time, 2),
-            "max_response_time_ms": round(max_time, 2),
-            "p95_response_time_ms": round(p95, 2),
-            "p99_response_time_ms": round(p99, 2),
-            "throughput_rps": round(throughput, 2),
-            "status": "PASS" if error_rate < 0.01 else "FAIL"
+            "total_requests": report["total_requests"],
+            "successful_requests": report["successful_requests"],
+            "failed_requests": report["failed_requests"],
+            "error_rate": report["error_rate"],
+            "avg_response_time_ms": report["latency_avg_ms"],
+            "min_response_time_ms": report["latency_min_ms"],
+            "max_response_time_ms": report["latency_max_ms"],
+            "p50_response_time_ms": report["latency_p50_ms"],
+            "p95_response_time_ms": report["latency_p95_ms"],
+            "p99_response_time_ms": report["latency_p99_ms"],
+            "p999_response_time_ms": report["latency_p999_ms"],
+            "target_rps": report["target_rps"],
+            "throughput_rps": report["throughput_rps"],
+            "service_time": {k[len("service_"):]: v for k, v in report.items() if k.startswith("service_")},
+            "max_send_lag_ms": report["max_send_lag_ms"],
+            "intervals": report["intervals"],
+            "errors": report["errors"],
+            "status": "PASS" if report["error_rate"] < 0.01 else "FAIL"
         }
 
     def _analyze_trend(self, samples: List[Dict]) -> str:
@@ -8,10 +8,12 @@ import time
 import psutil
 import os
 from typing import Dict, List, Any, Callable
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 
+from sampling_profiler import DEFAULT_INTERVAL, profile_call, stack_hotspots
+
 @dataclass
 class ProfileResult:
     """Performance profile result."""
@@ -60,6 +62,21 @@ class PerformanceProfiler:
             "result": result
         }
 
+    def sample_function(self, func: Callable, *args, interval: float = DEFAULT_INTERVAL,
+                        track_allocations: bool = False, **kwargs) -> Dict[str, Any]:
+        """Profile a call with the stack sampler and tracemalloc.
+
+        Returns the profile_function fields plus "stacks" (collapsed stack ->
+        sample count), "hotspots" and, with track_allocations, "allocations"
+        (allocation sites by net growth). tracemalloc slows allocation-heavy
+        code several-fold, so allocation tracking is opt-in.
+        """
+        
+        profile = profile_call(func, *args, interval=interval,
+                               track_allocations=track_allocations, **kwargs)
+        self.profiles[profile["function"]].append(profile)
+        return profile
+
     def batch_profile(self, functions: List[Dict]) -> Dict[str, Any]:
         """Profile multiple functions."""
         
@@ -131,12 +148,14 @@ class PerformanceProfiler:
         start_time = time.time()
         
         while time.time() - start_time < duration_seconds:
-            samples.append({
-                "timestamp": datetime.now().isoformat(),
-                "memory_mb": round(self.process.memory_info().rss / 1024 / 1024, 2),
-                "cpu_percent": round(self.process.cpu_percent(), 1),
-                "threads": self.process.num_threads()
-            })
+            # oneshot() reads /proc once for all three metrics
+            with self.process.oneshot():
+                samples.append({
+                    "timestamp": datetime.now().isoformat(),
+                    "memory_mb": round(self.process.memory_info().rss / 1024 / 1024, 2),
+                    "cpu_percent": round(self.process.cpu_percent(), 1),
+                    "threads": self.process.num_threads()
+                })
             time.sleep(interval)
         
         memory_values = [s["memory_mb"] for s in samples]
@@ -195,7 +214,16 @@ class PerformanceProfiler:
         }
 
     def identify_hotspots(self, profiles: List[Dict]) -> Dict[str, Any]:
-        """Identify performance hotspots."""
+        """Identify performance hotspots.
+
+        Profiles from sample_function are ranked by sampled stack frames and
+        allocation sites; plain profile_function results fall back to
+        whole-function timings.
+        """
+        
+        sampled = [p for p in profiles if p.get("stacks")]
+        if sampled:
+            return self._identify_sampled_hotspots(sampled)
         
         sorted_by_time = sorted(profiles, key=lambda p: p.get("execution_time_ms", 0), reverse=True)
         sorted_by_memory = sorted(profiles, key=lambda p: p.get("memory_used_mb", 0), reverse=True)
@@ -233,6 +261,50 @@ class PerformanceProfiler:
             ]
         }
 
+    def _identify_sampled_hotspots(self, profiles: List[Dict]) -> Dict[str, Any]:
+        """Hotspots from merged stack samples and allocation diffs."""
+        
+        stacks = Counter()
+        allocations = Counter()
+        for profile in profiles:
+            stacks.update(profile["stacks"])
+            for site in profile.get("allocations", []):
+                allocations[site["location"]] += site["size_diff_kb"]
+        wall_seconds = sum(p.get("execution_time_ms", 0) for p in profiles) / 1000
+        
+        hotspots = []
+        for i, frame in enumerate(stack_hotspots(stacks, wall_seconds, top=5)):
+            if frame["self_percent"] >= 5:
+                hotspots.append({
+                    "rank": i + 1,
+                    "type": "CPU",
+                    "function": frame["frame"],
+                    "metric": f"{frame['self_percent']}% self, {frame['inclusive_percent']}% inclusive",
+                    "severity": "CRITICAL" if frame["self_percent"] >= 30 else "HIGH"
+                })
+        
+        for i, (location, size_kb) in enumerate(allocations.most_common(5)):
+            if size_kb > 1024:
+                hotspots.append({
+                    "rank": i + 1,
+                    "type": "MEMORY",
+                    "function": location,
+                    "metric": f"{round(size_kb / 1024, 1)}MB retained",
+                    "severity": "CRITICAL" if size_kb > 100 * 1024 else "HIGH"
+                })
+        
+        return {
+            "hotspot_count": len(hotspots),
+            "hotspots": hotspots,
+            "total_samples": sum(stacks.values()),
+            "recommendations": [
+                "Optimize frames with the highest self time first",
+                "Check frames with high inclusive but low self time for redundant calls",
+                "Reduce retained allocations at the reported sites",
+                "Render the collapsed stacks as a flame graph for the full picture"
+            ]
+        }
+
 
 if __name__ == "__main__":
     profiler = PerformanceProfiler()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler
+Low-overhead stack sampling with collapsed (flame graph) output and
+tracemalloc allocation diffs
+
+Attach to any skill script without editing it:
+
+    python sampling_profiler.py --out stacks.folded [--alloc] path/to/script.py [args...]
+
+The script's stdout/stdin are left untouched; the report goes to stderr and
+the collapsed stacks to --out (feed to flamegraph.pl or speedscope).
+"""
+
+import argparse
+import functools
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_INTERVAL = 0.005  # matches the interpreter's default GIL switch interval
+MAX_DEPTH = 128
+
+
+def frame_label(code) -> str:
+    """Flame-graph frame name: function (file:line). Semicolons are reserved."""
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+class StackSampler:
+    """Samples the Python stacks of one or more threads from a daemon thread.
+
+    Each tick reads sys._current_frames() and counts the collapsed stack
+    (root first, ";"-separated). Cost is one frame walk per sample, and the
+    profiled code runs untraced between samples.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_ids: Optional[List[int]] = None,
+                 max_depth: int = MAX_DEPTH):
+        """
+        Args:
+            interval: Seconds between samples
+            thread_ids: Threads to sample (default: the thread calling start())
+            max_depth: Stacks deeper than this keep only their innermost frames
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.wall_seconds = 0.0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> "StackSampler":
+        if self.thread_ids is None:
+            self.thread_ids = [threading.get_ident()]
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.wall_seconds += time.perf_counter() - self._started
+        return self
+
+    def __enter__(self) -> "StackSampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        wanted = set(self.thread_ids or [])
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in wanted:
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own:
+                    continue
+                stack = self._collapse(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+                    self.samples += 1
+
+    def _collapse(self, frame) -> Optional[str]:
+        """Collapsed stack for frame, or None if the thread is inside stop()."""
+        labels = []
+        cache = self._labels
+        stop_code = StackSampler.stop.__code__
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            if code is stop_code:
+                return None
+            label = cache.get(code)
+            if label is None:
+                label = cache[code] = frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    # ----- output -----
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format: one "frame;frame;frame count" per line."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(self.collapsed() + "\n")
+
+    def hotspots(self, top: int = 10) -> List[Dict[str, Any]]:
+        return stack_hotspots(self.stacks, self.wall_seconds, top)
+
+
+def stack_hotspots(stacks: Counter, wall_seconds: float, top: int = 10) -> List[Dict[str, Any]]:
+    """Rank frames by self samples (leaf) and inclusive samples (anywhere on stack).
+
+    Time estimates scale the sample share by wall time rather than trusting
+    the nominal interval, since the sampler thread competes for the GIL.
+    """
+    total = sum(stacks.values())
+    if not total:
+        return []
+    self_counts: Counter = Counter()
+    inclusive: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            inclusive[frame] += count
+    return [
+        {
+            "frame": frame,
+            "self_samples": count,
+            "self_percent": round(count / total * 100, 1),
+            "inclusive_percent": round(inclusive[frame] / total * 100, 1),
+            "estimated_self_ms": round(count / total * wall_seconds * 1000, 1),
+        }
+        for frame, count in self_counts.most_common(top)
+    ]
+
+
+class AllocationTracker:
+    """tracemalloc snapshots around a block, diffed by allocation site."""
+
+    def __init__(self, frames: int = 25):
+        self.frames = frames
+        self.before: Optional[tracemalloc.Snapshot] = None
+        self.after: Optional[tracemalloc.Snapshot] = None
+        self._started_here = False
+
+    def start(self) -> "AllocationTracker":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+        self.before = self._snapshot()
+        return self
+
+    def stop(self) -> "AllocationTracker":
+        self.after = self._snapshot()
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+        return self
+
+    def __enter__(self) -> "AllocationTracker":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, threading.__file__),
+        ))
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Allocation sites whose live memory grew the most."""
+        diffs = self.after.compare_to(self.before, "lineno")
+        return [
+            {
+                "location": f"{os.path.basename(d.traceback[0].filename)}:{d.traceback[0].lineno}",
+                "size_diff_kb": round(d.size_diff / 1024, 1),
+                "count_diff": d.count_diff,
+                "size_kb": round(d.size / 1024, 1),
+            }
+            for d in diffs[:limit] if d.size_diff > 0
+        ]
+
+    def collapsed(self) -> Counter:
+        """Net new bytes per allocation stack, in the same collapsed format."""
+        stacks: Counter = Counter()
+        for diff in self.after.compare_to(self.before, "traceback"):
+            if diff.size_diff <= 0:
+                continue
+            # Traceback frames run oldest -> newest since Python 3.7
+            path = ";".join(
+                f"{os.path.basename(f.filename)}:{f.lineno}".replace(";", ":") for f in diff.traceback
+            )
+            stacks[path] += diff.size_diff
+        return stacks
+
+
+def profile_call(func: Callable, *args, interval: float = DEFAULT_INTERVAL,
+                 track_allocations: bool = False, **kwargs) -> Dict[str, Any]:
+    """Run func under the stack sampler (and tracemalloc) and return the profile."""
+    tracker = AllocationTracker() if track_allocations else None
+    sampler = StackSampler(interval=interval)
+    exception = None
+    result = None
+    if tracker:
+        tracker.start()
+    sampler.start()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        exception = str(e)
+    finally:
+        sampler.stop()
+        if tracker:
+            tracker.stop()
+
+    profile = {
+        "function": getattr(func, "__name__", repr(func)),
+        "execution_time_ms": round(sampler.wall_seconds * 1000, 2),
+        "sample_interval_ms": interval * 1000,
+        "samples": sampler.samples,
+        "stacks": dict(sampler.stacks),
+        "hotspots": sampler.hotspots(),
+        "success": exception is None,
+        "exception": exception,
+        "result": result,
+    }
+    if tracker:
+        profile["allocations"] = tracker.top()
+        profile["allocation_stacks"] = dict(tracker.collapsed())
+    return profile
+
+
+def profile_entry_point(output: Optional[str] = None, interval: float = DEFAULT_INTERVAL,
+                        track_allocations: bool = False) -> Callable:
+    """Decorator for a script's main(); profiles only when enabled.
+
+    Enabled by passing `output` or setting SKILL_PROFILE to a path. Collapsed
+    stacks go to that path, allocations to <path>.alloc, and a hotspot summary
+    to stderr.
+    """
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = output or os.getenv("SKILL_PROFILE")
+            if not path:
+                return func(*args, **kwargs)
+            tracker = AllocationTracker().start() if track_allocations else None
+            sampler = StackSampler(interval=interval).start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sampler.stop()
+                if tracker:
+                    tracker.stop()
+                _write_report(sampler, tracker, path)
+        return wrapper
+    return decorate
+
+
+def _write_report(sampler: StackSampler, tracker: Optional[AllocationTracker], path: str) -> None:
+    sampler.write_collapsed(path)
+    report: Dict[str, Any] = {
+        "wall_ms": round(sampler.wall_seconds * 1000, 1),
+        "samples": sampler.samples,
+        "collapsed_stacks": path,
+        "hotspots": sampler.hotspots(),
+    }
+    if tracker:
+        alloc_path = path + ".alloc"
+        with open(alloc_path, "w", encoding="utf-8") as handle:
+            for stack, size in tracker.collapsed().most_common():
+                handle.write(f"{stack} {size}\n")
+        report["allocations"] = tracker.top()
+        report["allocation_stacks"] = alloc_path
+    print(json.dumps(report, indent=2), file=sys.stderr)
+
+
+def _strip_runner_frames(stacks: Counter) -> Counter:
+    """Drop this module's and runpy's frames from the root of each stack."""
+    stripped: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        for i, frame in enumerate(frames):
+            if frame.startswith("_run_code (") and "runpy" in frame:
+                frames = frames[i + 1:] or frames
+                break
+        stripped[";".join(frames)] += count
+    return stripped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sample a Python script and write collapsed stacks")
+    parser.add_argument("--out", default="profile.folded", help="Collapsed stack output path")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL * 1000, help="Sample interval in ms")
+    parser.add_argument("--alloc", action="store_true", help="Also diff tracemalloc snapshots")
+    parser.add_argument("script", help="Script to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the script")
+    options = parser.parse_args()
+
+    sys.argv = [options.script] + options.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(options.script)))
+    tracker = AllocationTracker().start() if options.alloc else None
+    sampler = StackSampler(interval=options.interval / 1000).start()
+    try:
+        runpy.run_path(options.script, run_name="__main__")
+    finally:
+        sampler.stop()
+        sampler.stacks = _strip_runner_frames(sampler.stacks)
+        if tracker:
+            tracker.stop()
+        _write_report(sampler, tracker, options.out)
+
+
+if __name__ == "__main__":
+    main()
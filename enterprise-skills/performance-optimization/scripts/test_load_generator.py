@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Unit tests for the latency histogram and open-model load generator."""
+
+import math
+import random
+import time
+
+import pytest
+
+from load_generator import LatencyHistogram, LoadGenerator, arrival_times
+
+
+def _exact_percentile(values, p):
+    """Nearest-rank percentile, the definition LatencyHistogram follows."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100.0 * len(ordered))) - 1]
+
+
+def _histogram(values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_small_values_are_exact():
+    histogram = _histogram(range(1, 101))
+    assert histogram.percentiles((50.0, 99.0, 100.0)) == {50.0: 50, 99.0: 99, 100.0: 100}
+    assert (histogram.min, histogram.max, histogram.total, histogram.sum) == (1, 100, 100, 5050)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_percentiles_within_relative_error(seed):
+    rng = random.Random(seed)
+    values = [int(rng.lognormvariate(9, 1.5)) for _ in range(20_000)]
+    histogram = _histogram(values)
+
+    for p, value in histogram.percentiles((1.0, 50.0, 90.0, 99.0, 99.9, 100.0)).items():
+        exact = _exact_percentile(values, p)
+        assert exact <= value <= max(exact, exact * (1 + 1 / LatencyHistogram._HALF)), p
+
+
+def test_bucket_boundaries_round_trip():
+    previous = -1
+    for value in sorted(set(range(0, 5000)) | {2**k + d for k in range(12, 40) for d in (-1, 0, 1)}):
+        index = LatencyHistogram._index(value)
+        assert index >= previous
+        previous = index
+        top = LatencyHistogram._highest_equivalent(index)
+        assert value <= top
+        assert LatencyHistogram._index(top) == index
+        assert LatencyHistogram._index(top + 1) == index + 1
+
+
+def test_merge_matches_single_histogram():
+    rng = random.Random(7)
+    values = [rng.randint(0, 10**7) for _ in range(5000)]
+    left, right = _histogram(values[:1234]), _histogram(values[1234:])
+    left.merge(right)
+    left.merge(LatencyHistogram())
+
+    combined = _histogram(values)
+    assert left.counts == combined.counts
+    assert (left.total, left.sum, left.min, left.max) == (combined.total, combined.sum, combined.min, combined.max)
+    assert left.percentiles() == combined.percentiles()
+
+
+def test_empty_histogram_summary():
+    summary = LatencyHistogram().summary_ms("latency_")
+    assert summary == {
+        "latency_avg_ms": 0.0, "latency_min_ms": 0.0, "latency_max_ms": 0.0,
+        "latency_p50_ms": 0.0, "latency_p95_ms": 0.0, "latency_p99_ms": 0.0, "latency_p999_ms": 0.0,
+    }
+
+
+def test_arrival_schedules():
+    constant = list(arrival_times("constant", 2.0, 50, {}))
+    assert len(constant) == 99
+    assert all(b > a for a, b in zip(constant, constant[1:]))
+
+    first = list(arrival_times("poisson", 5.0, 100, {"seed": 3}))
+    assert first == list(arrival_times("poisson", 5.0, 100, {"seed": 3}))
+    assert 400 < len(first) < 600
+
+    ramp = list(arrival_times("ramp", 2.0, 10, {"max_load_rps": 100}))
+    assert sum(t >= 1.0 for t in ramp) > 2 * sum(t < 1.0 for t in ramp)
+
+
+def test_stall_is_charged_to_queued_requests():
+    calls = []
+
+    def endpoint():
+        calls.append(time.perf_counter())
+        if len(calls) == 5:
+            time.sleep(0.2)
+        if len(calls) == 7:
+            raise ValueError("bad gateway")
+
+    report = LoadGenerator(endpoint, {
+        "duration_seconds": 0.5, "initial_load_rps": 40, "concurrency": 1, "interval_seconds": 0.25,
+    }).run()
+
+    assert report["total_requests"] == 19
+    assert report["failed_requests"] == 1
+    assert report["errors"] == {"ValueError: bad gateway": 1}
+    # With one worker, requests queued behind the stall wait far longer than they run
+    assert report["latency_max_ms"] > 150
+    assert report["service_p50_ms"] < 50
+    assert sum(i["requests"] + i["errors"] for i in report["intervals"]) == 19
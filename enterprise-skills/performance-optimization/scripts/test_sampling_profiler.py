@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Unit tests for the stack sampler, hotspot ranking and allocation tracking."""
+
+import os
+import time
+from collections import Counter
+
+from profiler import PerformanceProfiler
+from sampling_profiler import (
+    AllocationTracker,
+    StackSampler,
+    _strip_runner_frames,
+    frame_label,
+    stack_hotspots,
+)
+
+
+def _busy_loop(seconds=0.3):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def _allocate():
+    return [bytearray(1024) for _ in range(2000)]
+
+
+def test_self_and_inclusive_counts():
+    stacks = Counter({"main;a;b": 6, "main;a": 2, "main;c": 2})
+    hotspots = {h["frame"]: h for h in stack_hotspots(stacks, wall_seconds=2.0)}
+
+    assert [h["frame"] for h in stack_hotspots(stacks, 2.0)] == ["b", "a", "c"]
+    assert (hotspots["b"]["self_samples"], hotspots["b"]["self_percent"], hotspots["b"]["inclusive_percent"]) == (6, 60.0, 60.0)
+    assert (hotspots["a"]["self_percent"], hotspots["a"]["inclusive_percent"]) == (20.0, 80.0)
+    assert hotspots["b"]["estimated_self_ms"] == 1200.0
+    assert "main" not in hotspots  # Never a leaf
+    assert stack_hotspots(Counter(), 1.0) == []
+
+
+def test_recursive_frames_count_once_per_sample():
+    stacks = Counter({"main;fib;fib;fib": 4, "main;fib;fib": 3, "main;fib": 1, "main;other": 2})
+    fib = next(h for h in stack_hotspots(stacks, 1.0) if h["frame"] == "fib")
+
+    assert fib["self_samples"] == 8
+    assert fib["inclusive_percent"] == 80.0  # Not 4*3 + 3*2 + 1 samples
+
+
+def test_runner_frames_are_stripped():
+    runner = "main (sampling_profiler.py:350);run_path (runpy.py:291);_run_module_code (runpy.py:98)"
+    stacks = Counter({
+        f"{runner};_run_code (runpy.py:86);<module> (job.py:1);work (job.py:4)": 5,
+        "<module> (job.py:1);work (job.py:4)": 2,
+        f"{runner};_run_code (runpy.py:86)": 1,
+        "worker (pool.py:10);task (pool.py:20)": 3,
+    })
+
+    assert _strip_runner_frames(stacks) == Counter({
+        "<module> (job.py:1);work (job.py:4)": 7,
+        f"{runner};_run_code (runpy.py:86)": 1,  # Nothing below the runner: kept whole
+        "worker (pool.py:10);task (pool.py:20)": 3,
+    })
+
+
+def test_frame_label_escapes_semicolons():
+    code = compile("def f():\n    pass\n", os.path.join("tmp", "odd;name.py"), "exec").co_consts[0]
+    assert frame_label(code) == "f (odd:name.py:1)"
+    assert frame_label(code.replace(co_name="a;b")) == "a:b (odd:name.py:1)"
+    assert frame_label(_busy_loop.__code__) == f"_busy_loop (test_sampling_profiler.py:{_busy_loop.__code__.co_firstlineno})"
+
+
+def test_sampler_collects_the_running_stack():
+    with StackSampler(interval=0.002) as sampler:
+        _busy_loop(0.2)
+
+    label = frame_label(_busy_loop.__code__)
+    assert sampler.samples > 10
+    assert sum(c for s, c in sampler.stacks.items() if label in s.split(";")) >= 0.8 * sampler.samples
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in sampler.collapsed().splitlines()) == sampler.samples
+
+
+def test_allocation_tracker_reports_the_allocation_site():
+    with AllocationTracker() as tracker:
+        kept = _allocate()
+
+    site = f"test_sampling_profiler.py:{_allocate.__code__.co_firstlineno + 1}"
+    top = tracker.top()
+    assert top[0]["location"] == site
+    assert top[0]["size_diff_kb"] > 1500 and top[0]["count_diff"] >= 2000
+    assert max(tracker.collapsed().items(), key=lambda item: item[1])[0].endswith(site)
+    assert len(kept) == 2000
+
+
+def test_identify_hotspots_uses_samples_when_present():
+    profiler = PerformanceProfiler()
+    profile = profiler.sample_function(_busy_loop, 0.3, interval=0.002)
+
+    report = profiler.identify_hotspots([profile, {"function": "timed", "execution_time_ms": 5000}])
+
+    assert report["total_samples"] == profile["samples"] > 0
+    cpu = [h for h in report["hotspots"] if h["type"] == "CPU"]
+    assert cpu and any("_busy_loop" in h["function"] for h in cpu)
+
+    timed = profiler.identify_hotspots([{"function": "timed", "execution_time_ms": 5000}])
+    assert "total_samples" not in timed
+    assert timed["hotspots"][0] == {
+        "rank": 1, "type": "TIME", "function": "timed", "metric": "5000ms", "severity": "CRITICAL",
+    }
@@ -4,10 +4,13 @@ CVE Checker
 Checks for known vulnerabilities in dependencies
 """
 
+import os
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from cve_index import CVEIndex
+
 @dataclass
 class CVE:
     """Common Vulnerabilities and Exposures entry."""
@@ -25,24 +28,36 @@ class CVE:
 class CVEChecker:
     """Checks dependencies for known CVEs."""
 
-    def __init__(self):
-        # Simulated CVE database (in production, would fetch from NVD)
-        self.cve_database = self._load_cve_database()
+    def __init__(self, osv_paths: Optional[List[str]] = None):
+        """
+        Args:
+            osv_paths: OSV dumps to load (.json files, directories or the
+                per-ecosystem all.zip). Defaults to CVE_OSV_PATH
+                (os.pathsep-separated).
+        """
+        # Built-in sample entries plus any local OSV dumps, indexed by
+        # package name with version ranges parsed once at load time
+        self.index = CVEIndex()
+        for record in self._load_cve_database():
+            self.index.add_record(record)
+        if osv_paths is None:
+            osv_paths = [p for p in os.getenv("CVE_OSV_PATH", "").split(os.pathsep) if p]
+        for path in osv_paths:
+            self.load_osv(path)
+        self.cve_database = self.index.records
+
+    def load_osv(self, path: str) -> int:
+        """Load an OSV dump; returns the number of package entries added."""
+        return self.index.load_osv(path)
 
-    def check_package(self, package_name: str, version: str) -> List[CVE]:
+    def check_package(self, package_name: str, version: str,
+                      ecosystem: Optional[str] = None) -> List[CVE]:
         """Check a package for known CVEs."""
         
-        vulns = []
-        
-        for cve in self.cve_database:
-            if cve['package'].lower() == package_name.lower():
-                if self._is_vulnerable(version, cve['affected_versions']):
-                    vulns.append(cve)
-        
-        return vulns
+        return self.index.lookup(package_name, version, ecosystem)
 
     def check_requirements_file(self, requirements: Dict[str, str]) -> Dict[str, Any]:
-        """Check all packages in requirements."""
+        """Check all packages in requirements (PyPI name -> version)."""
         
         all_vulns = []
         vulnerable_packages = []
@@ -57,7 +72,7 @@ class CVEChecker:
         }
         
         for package, version in requirements.items():
-            vulns = self.check_package(package, version)
+            vulns = self.check_package(package, version, ecosystem="PyPI")
             if vulns:
                 vulnerable_packages.append({
                     "package": package,
@@ -83,7 +98,7 @@ class CVEChecker:
     def check_package_vulnerability_history(self, package: str) -> Dict[str, Any]:
         """Get vulnerability history for a package."""
         
-        vulns = [cve for cve in self.cve_database if cve['package'].lower() == package.lower()]
+        vulns = self.index.package_records(package)
         
         # Sort by publication date
         vulns.sort(key=lambda x: x['publication_date'], reverse=True)
@@ -102,7 +117,7 @@ class CVEChecker:
         components = []
         
         for package, version in requirements.items():
-            vulns = self.check_package(package, version)
+            vulns = self.check_package(package, version, ecosystem="PyPI")
             
             component = {
                 "type": "library",
@@ -282,54 +297,6 @@ class CVEChecker:
             "proprietary": {"license": "Proprietary", "restricted": True, "restriction_reason": "Commercial use prohibited"}
         }
 
-    def _is_vulnerable(self, installed_version: str, affected_versions: List[str]) -> bool:
-        """Check if installed version is in affected range."""
-        
-        for affected in affected_versions:
-            # Simplified version comparison (in production, use packaging.version)
-            if affected == "*":
-                return True
-            elif affected.startswith("<="):
-                affected_v = affected[2:]
-                if self._compare_versions(installed_version, affected_v) <= 0:
-                    return True
-            elif affected.startswith("<"):
-                affected_v = affected[1:]
-                if self._compare_versions(installed_version, affected_v) < 0:
-                    return True
-            elif affected.startswith(">="):
-                affected_v = affected[2:]
-                if self._compare_versions(installed_version, affected_v) >= 0:
-                    return True
-            elif affected.startswith(">"):
-                affected_v = affected[1:]
-                if self._compare_versions(installed_version, affected_v) > 0:
-                    return True
-            elif affected == installed_version:
-                return True
-        
-        return False
-
-    def _compare_versions(self, v1: str, v2: str) -> int:
-        """Simple version comparison."""
-        
-        parts1 = [int(x) if x.isdigit() else x for x in v1.split('.')]
-        parts2 = [int(x) if x.isdigit() else x for x in v2.split('.')]
-        
-        for p1, p2 in zip(parts1, parts2):
-            if isinstance(p1, int) and isinstance(p2, int):
-                if p1 < p2:
-                    return -1
-                elif p1 > p2:
-                    return 1
-        
-        if len(parts1) < len(parts2):
-            return -1
-        elif len(parts1) > len(parts2):
-            return 1
-        
-        return 0
-
     def _generate_upgrade_recommendations(self, vulnerable_packages: List[Dict]) -> List[str]:
         """Generate upgrade recommendations."""
         
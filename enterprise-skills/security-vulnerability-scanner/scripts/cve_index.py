@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+CVE Index
+Offline vulnerability store keyed by ecosystem and package name with pre-parsed version ranges
+"""
+
+import bisect
+import json
+import math
+import os
+import re
+import zipfile
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# ---------------------------------------------------------------------------
+# Versions
+# ---------------------------------------------------------------------------
+
+# PEP 440 with the usual semver spellings folded in ("1.2.3-beta.1", "v2.0.0")
+VERSION_PATTERN = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>\d+)!)?
+    (?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>\d+)?)?
+    (?:-(?P<post_n1>\d+)(?![.\w])|[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>\d+)?)?
+    (?:[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>\d+)?)?
+    (?:-(?P<tag>[0-9A-Za-z.-]+))?
+    (?:\+(?P<local>[0-9A-Za-z.-]+))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+PRE_RANK = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+# Sort sentinels for the optional segments of a version key
+_LOW = (0,)
+_HIGH = (2,)
+
+# Lower than every version (OSV "introduced": "0")
+MIN_KEY: Tuple = ()
+
+VersionKey = Tuple
+
+
+@lru_cache(maxsize=65536)
+def parse_version(version: str) -> Optional[VersionKey]:
+    """Parse a PEP 440 / semver string into a sortable key.
+
+    Returns None for versions that follow neither scheme; callers then fall
+    back to exact string matches.
+    """
+    match = VERSION_PATTERN.match(version or "")
+    if not match:
+        return None
+    release = tuple(int(part) for part in match.group("release").split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+
+    if match.group("pre_l"):
+        pre = (1, PRE_RANK[match.group("pre_l").lower()], int(match.group("pre_n") or 0), "")
+    elif match.group("tag"):
+        # Free-form semver pre-release ("-SNAPSHOT", "-next.3") sorts before
+        # alpha but still before the release itself
+        pre = (1, -1, 0, match.group("tag").lower())
+    else:
+        pre = None
+
+    if match.group("post_n1") is not None:
+        post = (1, int(match.group("post_n1")))
+    elif match.group("post_l"):
+        post = (1, int(match.group("post_n2") or 0))
+    else:
+        post = _LOW
+
+    dev = (1, int(match.group("dev_n") or 0)) if match.group("dev_l") else _HIGH
+
+    if pre is None:
+        # Same ordering as packaging.version: 1.0.dev0 < 1.0a0 < 1.0
+        pre = _LOW if post == _LOW and dev != _HIGH else _HIGH
+    return (int(match.group("epoch") or 0), release, pre, post, dev)
+
+
+def _floor_key(version: str) -> Optional[VersionKey]:
+    """Key below every version with this epoch/release prefix (for "1.2.*")."""
+    key = parse_version(version)
+    return None if key is None else key[:2]
+
+
+def normalize_name(name: str) -> str:
+    """PEP 503 normalisation, applied to every ecosystem."""
+    return re.sub(r"[-_.]+", "-", name.strip()).lower()
+
+
+# ---------------------------------------------------------------------------
+# Ranges
+# ---------------------------------------------------------------------------
+
+# Interval bounds are (key, side): side 0 sits just below key, side 2 just
+# above it. A version is placed at (key, 1), so it never ties with a bound.
+Bound = Tuple[VersionKey, int]
+Interval = Tuple[Bound, Optional[Bound]]
+
+_SPEC = re.compile(r"^\s*(===|==|!=|<=|>=|~=|<|>|=)?\s*(.+?)\s*$")
+
+
+def _clause_interval(clause: str) -> Optional[Interval]:
+    """One comparison ("<2.0", "==1.4.*") as a half-open interval."""
+    match = _SPEC.match(clause)
+    if not match:
+        return None
+    op, version = match.group(1) or "==", match.group(2)
+    if version == "*":
+        return ((MIN_KEY, 0), None)
+    if version.endswith(".*") and op in ("==", "="):
+        prefix = version[:-2]
+        release = [int(p) for p in prefix.split(".") if p.isdigit()]
+        if not release or len(release) != len(prefix.split(".")):
+            return None
+        release[-1] += 1
+        low = _floor_key(prefix)
+        high = _floor_key(".".join(str(p) for p in release))
+        return ((low, 0), (high, 0))
+
+    key = parse_version(version)
+    if key is None:
+        return None
+    if op in ("==", "=", "==="):
+        return ((key, 0), (key, 2))
+    if op == "<":
+        return ((MIN_KEY, 0), (key, 0))
+    if op == "<=":
+        return ((MIN_KEY, 0), (key, 2))
+    if op == ">":
+        return ((key, 2), None)
+    if op == ">=":
+        return ((key, 0), None)
+    if op == "~=":
+        # ~=1.4.5 means >=1.4.5, ==1.4.*
+        release = [int(p) for p in VERSION_PATTERN.match(version).group("release").split(".")]
+        if len(release) < 2:
+            return None
+        upper = release[:-1]
+        upper[-1] += 1
+        return ((key, 0), (_floor_key(".".join(str(p) for p in upper)), 0))
+    return None  # "!=" cannot be expressed as a single interval
+
+
+def _intersect(a: Interval, b: Interval) -> Optional[Interval]:
+    low = max(a[0], b[0])
+    if a[1] is None:
+        high = b[1]
+    elif b[1] is None:
+        high = a[1]
+    else:
+        high = min(a[1], b[1])
+    if high is not None and high <= low:
+        return None
+    return (low, high)
+
+
+def spec_intervals(spec: str) -> List[Interval]:
+    """Parse one affected-range spec (">=1.0,<1.4", "2.0.*", "<=8.2.0")."""
+    interval: Optional[Interval] = ((MIN_KEY, 0), None)
+    for clause in spec.split(","):
+        if not clause.strip():
+            continue
+        part = _clause_interval(clause)
+        if part is None:
+            return []
+        interval = _intersect(interval, part)
+        if interval is None:
+            return []
+    return [interval]
+
+
+def osv_range_intervals(events: List[Dict[str, str]]) -> List[Interval]:
+    """Turn an OSV ECOSYSTEM/SEMVER event list into intervals."""
+    keyed = []
+    for event in events:
+        for kind, version in event.items():
+            key = MIN_KEY if kind == "introduced" and version == "0" else parse_version(version)
+            if key is None:
+                return []
+            keyed.append((key, kind))
+    keyed.sort(key=lambda item: item[0])
+
+    intervals: List[Interval] = []
+    start: Optional[Bound] = None
+    for key, kind in keyed:
+        if kind == "introduced":
+            if start is None:
+                start = (key, 0)
+        elif start is not None and kind in ("fixed", "limit"):
+            intervals.append((start, (key, 0)))
+            start = None
+        elif start is not None and kind == "last_affected":
+            intervals.append((start, (key, 2)))
+            start = None
+    if start is not None:
+        intervals.append((start, None))
+    return intervals
+
+
+# ---------------------------------------------------------------------------
+# CVSS
+# ---------------------------------------------------------------------------
+
+_CVSS3_WEIGHTS = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "UI": {"N": 0.85, "R": 0.62},
+    "C": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "I": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "A": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+
+
+def _roundup(value: float) -> float:
+    return math.ceil(round(value * 100000) / 10000) / 10
+
+
+@lru_cache(maxsize=4096)
+def cvss3_base_score(vector: str) -> Optional[float]:
+    """Base score for a CVSS:3.x vector string."""
+    try:
+        metrics = dict(part.split(":", 1) for part in vector.split("/")[1:])
+        changed = metrics["S"] == "C"
+        pr = {"N": 0.85, "L": 0.68 if changed else 0.62, "H": 0.5 if changed else 0.27}[metrics["PR"]]
+        w = _CVSS3_WEIGHTS
+        iss = 1 - (1 - w["C"][metrics["C"]]) * (1 - w["I"][metrics["I"]]) * (1 - w["A"][metrics["A"]])
+        exploitability = 8.22 * w["AV"][metrics["AV"]] * w["AC"][metrics["AC"]] * pr * w["UI"][metrics["UI"]]
+    except (KeyError, ValueError):
+        return None
+    if changed:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    else:
+        impact = 6.42 * iss
+    if impact <= 0:
+        return 0.0
+    if changed:
+        return _roundup(min(1.08 * (impact + exploitability), 10))
+    return _roundup(min(impact + exploitability, 10))
+
+
+def severity_for_score(score: float) -> str:
+    if score >= 9.0:
+        return "CRITICAL"
+    if score >= 7.0:
+        return "HIGH"
+    if score >= 4.0:
+        return "MEDIUM"
+    if score > 0:
+        return "LOW"
+    return "UNKNOWN"
+
+
+# ---------------------------------------------------------------------------
+# OSV records
+# ---------------------------------------------------------------------------
+
+def _osv_record(vuln: Dict[str, Any], affected: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one OSV entry (for one affected package) to a CVE record."""
+    aliases = vuln.get("aliases") or []
+    cve_id = next((a for a in aliases if a.startswith("CVE-")), vuln.get("id", ""))
+
+    score = None
+    for entry in vuln.get("severity") or affected.get("severity") or []:
+        if entry.get("type") == "CVSS_V3":
+            score = cvss3_base_score(entry.get("score", ""))
+            if score is not None:
+                break
+    specific = {**(vuln.get("database_specific") or {}), **(affected.get("database_specific") or {})}
+    severity = str(specific.get("severity", "")).upper().replace("MODERATE", "MEDIUM")
+    if severity not in ("CRITICAL", "HIGH", "MEDIUM", "LOW"):
+        severity = severity_for_score(score or 0.0)
+
+    affected_versions, fixed = [], []
+    for rng in affected.get("ranges") or []:
+        if rng.get("type") not in ("ECOSYSTEM", "SEMVER"):
+            continue
+        lower = None
+        for event in rng.get("events") or []:
+            if "introduced" in event:
+                lower = event["introduced"]
+            elif "fixed" in event or "last_affected" in event:
+                upper = f"<{event['fixed']}" if "fixed" in event else f"<={event['last_affected']}"
+                affected_versions.append(upper if lower in (None, "0") else f">={lower},{upper}")
+                if "fixed" in event:
+                    fixed.append(event["fixed"])
+                lower = None
+        if lower is not None:
+            affected_versions.append("*" if lower == "0" else f">={lower}")
+
+    package = affected.get("package") or {}
+    return {
+        "cve_id": cve_id,
+        "osv_id": vuln.get("id", ""),
+        "package": package.get("name", ""),
+        "ecosystem": package.get("ecosystem", ""),
+        "severity": severity,
+        "description": vuln.get("summary") or (vuln.get("details") or "")[:200],
+        "affected_versions": affected_versions,
+        "fixed_version": max(fixed, key=lambda v: parse_version(v) or MIN_KEY) if fixed else "",
+        "cvss_score": score if score is not None else 0.0,
+        "publication_date": (vuln.get("published") or "")[:10],
+        "cwe_ids": list(specific.get("cwe_ids") or []),
+    }
+
+
+def iter_osv_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield OSV entries from a .json file, a directory of them or a .zip dump."""
+    if os.path.isdir(path):
+        for dirpath, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.endswith((".json", ".zip")):
+                    yield from iter_osv_documents(os.path.join(dirpath, filename))
+        return
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield from _as_entries(json.loads(archive.read(name)))
+        return
+    with open(path, "r", encoding="utf-8") as handle:
+        yield from _as_entries(json.load(handle))
+
+
+def _as_entries(document: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(document, list):
+        yield from (entry for entry in document if isinstance(entry, dict))
+    elif isinstance(document, dict):
+        # OSV query responses wrap entries in "vulns"
+        yield from document.get("vulns", [document])
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class _PackageIndex:
+    """Sorted interval partition for one package.
+
+    `bounds` are the distinct interval edges; `active[i]` holds the records
+    affected between bounds[i] and bounds[i + 1], so a lookup is one bisect.
+    """
+
+    __slots__ = ("intervals", "exact", "bounds", "active")
+
+    def __init__(self) -> None:
+        self.intervals: List[Tuple[Interval, int]] = []
+        self.exact: Dict[str, Set[int]] = {}
+        self.bounds: Optional[List[Bound]] = None
+        self.active: List[Tuple[int, ...]] = []
+
+    def build(self) -> None:
+        edges: Dict[Bound, List[Tuple[int, int]]] = {}
+        for (low, high), record in self.intervals:
+            edges.setdefault(low, []).append((record, 1))
+            if high is not None:
+                edges.setdefault(high, []).append((record, -1))
+        self.bounds = sorted(edges)
+        self.active = []
+        counts: Counter = Counter()
+        for bound in self.bounds:
+            for record, delta in edges[bound]:
+                counts[record] += delta
+            self.active.append(tuple(sorted(r for r, n in counts.items() if n > 0)))
+
+    def lookup(self, version: str) -> Set[int]:
+        found = set(self.exact.get(version.strip(), ()))
+        key = parse_version(version)
+        if key is not None and self.intervals:
+            if self.bounds is None:
+                self.build()
+            position = bisect.bisect_right(self.bounds, (key, 1)) - 1
+            if position >= 0:
+                found.update(self.active[position])
+        return found
+
+
+class CVEIndex:
+    """Vulnerability records indexed by ecosystem and normalized package name.
+
+    Records without an ecosystem (the built-in samples) match every ecosystem.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self._packages: Dict[Tuple[str, str], _PackageIndex] = {}
+        self._ecosystems: Dict[str, Set[str]] = {}
+        self._seen: Set[Tuple[str, str, str]] = set()
+        self.skipped_ranges = 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _package(self, ecosystem: str, name: str) -> _PackageIndex:
+        key = (ecosystem.lower(), normalize_name(name))
+        index = self._packages.get(key)
+        if index is None:
+            index = self._packages[key] = _PackageIndex()
+            self._ecosystems.setdefault(key[1], set()).add(key[0])
+        index.bounds = None  # rebuilt lazily on next lookup
+        return index
+
+    def _indexes(self, package: str, ecosystem: Optional[str]) -> List[_PackageIndex]:
+        """Indexes a lookup has to consult: one ecosystem plus untagged records, or all."""
+        name = normalize_name(package)
+        ecosystems = self._ecosystems.get(name, set())
+        if ecosystem:
+            ecosystems = ecosystems & {ecosystem.lower(), ""}
+        return [self._packages[(eco, name)] for eco in sorted(ecosystems)]
+
+    def add(self, record: Dict[str, Any], intervals: Iterable[Interval] = (),
+            versions: Iterable[str] = ()) -> None:
+        identity = (record.get("osv_id") or record["cve_id"], normalize_name(record["package"]),
+                    record.get("ecosystem", ""))
+        if identity in self._seen:
+            return
+        self._seen.add(identity)
+        record_id = len(self.records)
+        self.records.append(record)
+        index = self._package(record.get("ecosystem", ""), record["package"])
+        for interval in intervals:
+            index.intervals.append((interval, record_id))
+        for version in versions:
+            index.exact.setdefault(version, set()).add(record_id)
+
+    def add_record(self, record: Dict[str, Any]) -> None:
+        """Add a record whose affected_versions are specifier strings."""
+        intervals, versions = [], []
+        for spec in record.get("affected_versions", []):
+            parsed = spec_intervals(spec)
+            if parsed:
+                intervals.extend(parsed)
+            elif not any(op in spec for op in "<>=!~*,"):
+                versions.append(spec.strip())
+            else:
+                self.skipped_ranges += 1
+        self.add(record, intervals, versions)
+
+    def add_osv(self, vuln: Dict[str, Any]) -> int:
+        """Add one OSV entry; returns the number of packages it affects."""
+        if vuln.get("withdrawn"):
+            return 0
+        added = 0
+        for affected in vuln.get("affected") or []:
+            if not (affected.get("package") or {}).get("name"):
+                continue
+            intervals: List[Interval] = []
+            for rng in affected.get("ranges") or []:
+                if rng.get("type") not in ("ECOSYSTEM", "SEMVER"):
+                    continue
+                parsed = osv_range_intervals(rng.get("events") or [])
+                if not parsed:
+                    self.skipped_ranges += 1
+                intervals.extend(parsed)
+            self.add(_osv_record(vuln, affected), intervals, affected.get("versions") or [])
+            added += 1
+        return added
+
+    def load_osv(self, path: str) -> int:
+        """Load OSV entries from a file, directory or .zip dump."""
+        return sum(self.add_osv(vuln) for vuln in iter_osv_documents(path))
+
+    def lookup(self, package: str, version: str,
+               ecosystem: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records affecting package==version, in load order.
+
+        Without an ecosystem, same-named packages from every ecosystem match.
+        """
+        ids: Set[int] = set()
+        for index in self._indexes(package, ecosystem):
+            ids.update(index.lookup(version))
+        return [self.records[i] for i in sorted(ids)]
+
+    def package_records(self, package: str,
+                        ecosystem: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every record for a package, whatever the version."""
+        ids: Set[int] = set()
+        for index in self._indexes(package, ecosystem):
+            ids.update(record for _, record in index.intervals)
+            for record_ids in index.exact.values():
+                ids.update(record_ids)
+        return [self.records[i] for i in sorted(ids)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "records": len(self.records),
+            "packages": len(self._packages),
+            "skipped_ranges": self.skipped_ranges,
+        }
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Scan Engine
+Single-pass multi-pattern scanning shared by the code security scanners
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Comment syntax per file extension; anything else is scanned as-is
+PYTHON_EXTENSIONS = {".py", ".pyw"}
+C_STYLE_EXTENSIONS = {
+    ".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".java", ".kt", ".go",
+    ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".swift", ".rs", ".sol", ".scala",
+}
+DEFAULT_EXTENSIONS = PYTHON_EXTENSIONS | C_STYLE_EXTENSIONS
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox", "build", "dist"}
+
+MIN_LITERAL_LENGTH = 3
+MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# The leading lookahead lets the regex engine skip to the next quote or
+# comment marker instead of trying every alternative at every offset
+PYTHON_TOKENS = re.compile(
+    r"(?=['\"#])(?:(?P<string>'''.*?'''|\"\"\".*?\"\"\"|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\")"
+    r"|(?P<comment>#[^\n]*))",
+    re.DOTALL,
+)
+C_STYLE_TOKENS = re.compile(
+    r"(?=[\"'`/])(?:(?P<string>\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)"
+    r"|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z)))",
+    re.DOTALL,
+)
+COMMENT_MARKERS = {"python": "#", "c": "/"}
+_NOT_NEWLINE = re.compile(r"[^\n]")
+
+
+def syntax_for(filename: Optional[str], default: str = "python") -> Optional[str]:
+    """Comment syntax for a file name: "python", "c" or None (no stripping)."""
+    if not filename:
+        return default
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in PYTHON_EXTENSIONS:
+        return "python"
+    if ext in C_STYLE_EXTENSIONS:
+        return "c"
+    return None
+
+
+def mask_comments(source: str, syntax: Optional[str]) -> str:
+    """Blank out comments, keeping every offset and newline in place.
+
+    String literals are tokenized first so "http://x" or "#fff" inside a
+    string is not mistaken for a comment.
+    """
+    tokens = {"python": PYTHON_TOKENS, "c": C_STYLE_TOKENS}.get(syntax or "")
+    if tokens is None or COMMENT_MARKERS[syntax] not in source:
+        return source
+
+    pieces = []
+    position = 0
+    for match in tokens.finditer(source):
+        if match.lastgroup == "comment":
+            start, end = match.span()
+            pieces.append(source[position:start])
+            pieces.append(_NOT_NEWLINE.sub(" ", match.group()))
+            position = end
+    if not pieces:
+        return source
+    pieces.append(source[position:])
+    return "".join(pieces)
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Longest literal every match of a regex must contain (lower-cased).
+
+    Only top-level, unquantified characters count; alternation, classes and
+    groups end a run. Returns None if no run is long enough to prefilter on.
+    """
+    depth = 0
+    runs: List[str] = []
+    current = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        literal = None
+        if char == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            literal = nxt if not nxt.isalnum() else None
+            i += 2
+        elif char == "[":
+            # Skip the class, including a leading ] or escaped ]
+            i += 2 if pattern[i + 1:i + 2] == "]" else 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char in "()":
+            depth += 1 if char == "(" else -1
+            i += 1
+        elif char == "|":
+            if depth == 0:
+                return None
+            i += 1
+        elif char in ".^$":
+            i += 1
+        elif char in "?*+{":
+            # Quantified: the preceding character is optional or repeated
+            if char in "?*" or (char == "{" and re.match(r"\{0", pattern[i:])):
+                current = current[:-1]
+            runs.append(current)
+            current = ""
+            i = pattern.find("}", i) + 1 if char == "{" else i + 1
+            if i == 0:
+                return None
+            continue
+        else:
+            literal = char
+            i += 1
+
+        if literal is not None and depth == 0:
+            current += literal
+        else:
+            runs.append(current)
+            current = ""
+    runs.append(current)
+    best = max(runs, key=len)
+    return best.lower() if len(best) >= MIN_LITERAL_LENGTH else None
+
+
+@dataclass
+class Rule:
+    """One scan rule: a regex plus optional file-level conditions."""
+    id: str
+    pattern: str
+    ignore_case: bool = False
+    requires: Tuple[str, ...] = ()      # all must match somewhere in the file
+    requires_any: Tuple[str, ...] = ()  # at least one must match
+    unless: Tuple[str, ...] = ()        # none may match
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Match:
+    """A rule hit at a 1-based line."""
+    rule_id: str
+    line: int
+    snippet: str
+
+    def to_list(self) -> List[Any]:
+        return [self.rule_id, self.line, self.snippet]
+
+
+class ScanEngine:
+    """Compile a rule set once; per file, strip comments once and run only the
+    rules whose literals are present."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        self.rules_by_id = {rule.id: rule for rule in self.rules}
+        self.fingerprint = hashlib.sha256(
+            json.dumps([[r.id, r.pattern, r.ignore_case, r.requires, r.requires_any, r.unless]
+                        for r in self.rules]).encode()
+        ).hexdigest()[:16]
+
+        # Atoms: every distinct (regex, ignore_case), shared between rules
+        self.atoms: List[Tuple[str, bool]] = []
+        self._atom_ids: Dict[Tuple[str, bool], int] = {}
+        self._rule_atoms: List[Tuple[int, List[int], List[int], List[int]]] = []
+        for rule in self.rules:
+            main = self._atom(rule.pattern, rule.ignore_case)
+            self._rule_atoms.append((
+                main,
+                [self._atom(p, rule.ignore_case) for p in rule.requires],
+                [self._atom(p, rule.ignore_case) for p in rule.requires_any],
+                [self._atom(p, rule.ignore_case) for p in rule.unless],
+            ))
+        self.compiled = [
+            re.compile(p, re.IGNORECASE if ci else 0) for p, ci in self.atoms
+        ]
+
+        # Literal prefilter: an atom only runs if its required literal occurs
+        # in the lower-cased text. Substring search beats a combined regex
+        # alternation here (common words like "open" or "format" make the
+        # alternation produce thousands of matches per file).
+        self._always: List[int] = []
+        self._literal_atoms: Dict[str, List[int]] = {}
+        for index, (pattern, _) in enumerate(self.atoms):
+            literal = _required_literal(pattern)
+            if literal is None:
+                self._always.append(index)
+            else:
+                self._literal_atoms.setdefault(literal, []).append(index)
+
+    def _atom(self, pattern: str, ignore_case: bool) -> int:
+        key = (pattern, ignore_case)
+        if key not in self._atom_ids:
+            self._atom_ids[key] = len(self.atoms)
+            self.atoms.append(key)
+        return self._atom_ids[key]
+
+    def candidate_atoms(self, text: str) -> Set[int]:
+        """Atoms whose required literal occurs in *text*."""
+        candidates = set(self._always)
+        lowered = text.lower()
+        for literal, atoms in self._literal_atoms.items():
+            if literal in lowered:
+                candidates.update(atoms)
+        return candidates
+
+    def scan(
+        self,
+        source: str,
+        filename: Optional[str] = None,
+        syntax: Optional[str] = "auto",
+        first_only: bool = False,
+    ) -> List[Match]:
+        """Scan one file, skipping comments.
+
+        Args:
+            source: File contents
+            filename: Used to pick the comment syntax when syntax is "auto"
+            syntax: "python", "c", None (no stripping) or "auto"
+            first_only: Report only the first hit per rule (file-level checks)
+
+        Returns:
+            Matches ordered by line
+        """
+        if syntax == "auto":
+            syntax = syntax_for(filename)
+        text = mask_comments(source, syntax)
+        candidates = self.candidate_atoms(text)
+
+        first_hit: Dict[int, Optional["re.Match"]] = {}
+
+        def _first(atom: int) -> Optional["re.Match"]:
+            if atom not in first_hit:
+                first_hit[atom] = self.compiled[atom].search(text) if atom in candidates else None
+            return first_hit[atom]
+
+        line_starts: Optional[List[int]] = None
+        lines: List[str] = []
+        matches: List[Match] = []
+        for rule, (main, requires, requires_any, unless) in zip(self.rules, self._rule_atoms):
+            if main not in candidates or _first(main) is None:
+                continue
+            if any(_first(a) is None for a in requires):
+                continue
+            if requires_any and all(_first(a) is None for a in requires_any):
+                continue
+            if any(_first(a) is not None for a in unless):
+                continue
+
+            if line_starts is None:
+                lines = source.split("\n")
+                line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+            hits = [first_hit[main]] if first_only else self.compiled[main].finditer(text)
+            last_line = 0
+            for hit in hits:
+                line = bisect.bisect_right(line_starts, hit.start())
+                if line != last_line:
+                    matches.append(Match(rule.id, line, lines[line - 1].strip()[:120]))
+                    last_line = line
+        matches.sort(key=lambda m: m.line)
+        return matches
+
+
+# ---------------------------------------------------------------------------
+# Whole-repository scans
+# ---------------------------------------------------------------------------
+
+_worker_engine: Optional[ScanEngine] = None
+_worker_cache_dir: Optional[str] = None
+
+
+def default_cache_dir() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-scan-engine")
+    return os.getenv("SCAN_ENGINE_CACHE", default)
+
+
+def _init_worker(rules: List[Rule], cache_dir: Optional[str]) -> None:
+    global _worker_engine, _worker_cache_dir
+    _worker_engine = ScanEngine(rules)
+    _worker_cache_dir = cache_dir
+
+
+def _scan_file(path: str, first_only: bool) -> Tuple[str, List[List[Any]], bool]:
+    """Scan one file in a worker, reusing a cached result for identical content."""
+    engine = _worker_engine
+    try:
+        with open(path, "rb") as handle:
+            raw = handle.read(MAX_FILE_BYTES + 1)
+    except OSError:
+        return path, [], False
+    if len(raw) > MAX_FILE_BYTES or b"\0" in raw[:8192]:
+        return path, [], False  # Too large or binary
+
+    cache_file = None
+    if _worker_cache_dir:
+        digest = hashlib.sha256(raw + path.rsplit(".", 1)[-1].encode() + bytes([first_only])).hexdigest()
+        cache_file = os.path.join(_worker_cache_dir, engine.fingerprint, digest[:2], digest + ".json")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as handle:
+                return path, json.load(handle), True
+        except (OSError, ValueError):
+            pass
+
+    source = raw.decode("utf-8", errors="replace")
+    result = [m.to_list() for m in engine.scan(source, filename=path, first_only=first_only)]
+
+    if cache_file:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(result, handle)
+            os.replace(tmp, cache_file)  # Atomic: concurrent workers never see partial files
+        except OSError:
+            pass
+    return path, result, False
+
+
+def iter_source_files(root: str, extensions: Iterable[str] = DEFAULT_EXTENSIONS) -> List[str]:
+    """Source files under *root*, skipping VCS, dependency and build directories."""
+    if os.path.isfile(root):
+        return [root]
+    extensions = {e.lower() for e in extensions}
+    found = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in files:
+            if os.path.splitext(name)[1].lower() in extensions:
+                found.append(os.path.join(directory, name))
+    return sorted(found)
+
+
+def scan_paths(
+    rules: List[Rule],
+    paths: List[str],
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    first_only: bool = False,
+) -> Dict[str, Any]:
+    """Scan many files across a process pool with per-file result caching.
+
+    Args:
+        rules: Rule set (compiled once per worker)
+        paths: Files to scan
+        workers: Process count (default: CPU count; 1 scans in-process)
+        use_cache: Reuse results for files whose content hash is unchanged
+        cache_dir: Cache location (default SCAN_ENGINE_CACHE or ~/.cache/spoon-scan-engine)
+        first_only: Report only the first hit per rule per file
+
+    Returns:
+        {"files": {path: [Match, ...]}, "scanned": n, "cached": n}
+    """
+    cache = (cache_dir or default_cache_dir()) if use_cache else None
+    workers = workers or os.cpu_count() or 1
+    results: Dict[str, List[Match]] = {}
+    cached = 0
+
+    if workers == 1 or len(paths) < 2:
+        _init_worker(rules, cache)
+        outputs = (_scan_file(p, first_only) for p in paths)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules, cache))
+        chunk = max(1, len(paths) // (workers * 8))
+        outputs = executor.map(_scan_file, paths, [first_only] * len(paths), chunksize=chunk)
+    try:
+        for path, found, from_cache in outputs:
+            cached += from_cache
+            if found:
+                results[path] = [Match(*item) for item in found]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {"files": results, "scanned": len(paths), "cached": cached}
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Unit tests for the CVE index and CVEChecker lookups."""
+
+import itertools
+
+import pytest
+
+from cve_checker import CVEChecker
+from cve_index import CVEIndex
+
+
+def _legacy_compare_versions(v1, v2):
+    """CVEChecker._compare_versions before the index was introduced."""
+    parts1 = [int(x) if x.isdigit() else x for x in v1.split('.')]
+    parts2 = [int(x) if x.isdigit() else x for x in v2.split('.')]
+    for p1, p2 in zip(parts1, parts2):
+        if isinstance(p1, int) and isinstance(p2, int):
+            if p1 < p2:
+                return -1
+            elif p1 > p2:
+                return 1
+    if len(parts1) < len(parts2):
+        return -1
+    elif len(parts1) > len(parts2):
+        return 1
+    return 0
+
+
+def _legacy_is_vulnerable(installed_version, affected_versions):
+    """CVEChecker._is_vulnerable before the index was introduced."""
+    for affected in affected_versions:
+        if affected == "*":
+            return True
+        elif affected.startswith("<="):
+            if _legacy_compare_versions(installed_version, affected[2:]) <= 0:
+                return True
+        elif affected.startswith("<"):
+            if _legacy_compare_versions(installed_version, affected[1:]) < 0:
+                return True
+        elif affected.startswith(">="):
+            if _legacy_compare_versions(installed_version, affected[2:]) >= 0:
+                return True
+        elif affected.startswith(">"):
+            if _legacy_compare_versions(installed_version, affected[1:]) > 0:
+                return True
+        elif affected == installed_version:
+            return True
+    return False
+
+
+def _osv(osv_id, ecosystem, name, introduced, fixed):
+    return {
+        "id": osv_id,
+        "summary": f"{name} advisory",
+        "affected": [{
+            "package": {"ecosystem": ecosystem, "name": name},
+            "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": introduced}, {"fixed": fixed}]}],
+        }],
+    }
+
+
+VERSIONS = [".".join(map(str, v)) for v in itertools.product(range(3), range(3), range(3))]
+# The single-comparison and exact specs the old linear scan understood
+SPECS = ["*"] + [op + v for op in ("<", "<=", ">", ">=", "") for v in ("0.1.2", "1.0.0", "1.2.1", "2.2.2")]
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_index_matches_legacy_scan_on_simple_specs(spec):
+    index = CVEIndex()
+    index.add_record({"cve_id": "CVE-0000-0001", "package": "pkg", "affected_versions": [spec]})
+
+    for version in VERSIONS:
+        assert bool(index.lookup("pkg", version)) == _legacy_is_vulnerable(version, [spec]), (spec, version)
+
+
+def test_checker_matches_legacy_scan_on_sample_database():
+    checker = CVEChecker(osv_paths=[])
+    for record in checker.cve_database:
+        # "2.0.*" wildcards were never matched by the old scan; compare the rest
+        specs = [s for s in record["affected_versions"] if not s.endswith(".*")]
+        for version in VERSIONS + ["8.2.0", "8.3.0", "2.21.9", "2.22.0", "5.3.1", "5.4.0"]:
+            found = record in checker.check_package(record["package"], version)
+            assert found == _legacy_is_vulnerable(version, specs), (record["cve_id"], version)
+
+
+def test_wildcards_and_prereleases():
+    index = CVEIndex()
+    index.add_record({"cve_id": "CVE-1", "package": "django", "affected_versions": ["2.0.*", ">=3.0,<3.0.11"]})
+
+    assert index.lookup("django", "2.0.13")
+    assert not index.lookup("django", "2.1.0")
+    assert index.lookup("django", "3.0.11rc1")
+    assert not index.lookup("django", "3.0.11")
+
+
+def test_same_name_in_other_ecosystem_does_not_match():
+    index = CVEIndex()
+    index.add_osv(_osv("GHSA-py", "PyPI", "requests", "0", "2.31.0"))
+    index.add_osv(_osv("GHSA-js", "npm", "requests", "0", "9.0.0"))
+
+    assert [r["osv_id"] for r in index.lookup("requests", "3.0.0", ecosystem="PyPI")] == []
+    assert [r["osv_id"] for r in index.lookup("requests", "3.0.0", ecosystem="npm")] == ["GHSA-js"]
+    assert [r["osv_id"] for r in index.lookup("Requests", "2.0.0")] == ["GHSA-py", "GHSA-js"]
+    assert [r["osv_id"] for r in index.package_records("requests", ecosystem="pypi")] == ["GHSA-py"]
+
+
+def test_requirements_are_checked_as_pypi():
+    checker = CVEChecker(osv_paths=[])
+    checker.index.add_osv(_osv("GHSA-npm-flask", "npm", "flask", "0", "99.0.0"))
+
+    result = checker.check_requirements_file({"flask": "2.0.0", "PyYAML": "5.3"})
+
+    (vulnerable,) = result["vulnerable_packages"]
+    assert vulnerable["package"] == "PyYAML"
+    assert [v["cve_id"] for v in vulnerable["vulnerabilities"]] == ["CVE-2021-21240"]
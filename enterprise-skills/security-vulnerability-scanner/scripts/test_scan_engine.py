@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Unit tests for the single-pass scan engine and the detector built on it."""
+
+import re
+
+import pytest
+
+from scan_engine import (
+    Rule,
+    ScanEngine,
+    _required_literal,
+    mask_comments,
+    scan_paths,
+)
+from vuln_detector import VULN_RULES, VulnDetector
+
+SAMPLE = '''
+import os
+def get_user_data(user_id):
+    query = "SELECT * FROM users WHERE id = " + user_id
+    db.execute(query)
+
+    file_path = "/data/" + request.args['file']
+    with open(file_path) as f:
+        return f.read()
+'''
+
+WEB = '''
+from flask import Flask, request
+import pickle, yaml, hashlib, random, subprocess
+app = Flask(__name__)
+
+@app.route("/run")
+def run():
+    cmd = request.args["cmd"]
+    os.system("ls " + cmd)
+    subprocess.run("echo " + cmd, shell=True)
+    data = pickle.loads(request.data)
+    cfg = yaml.load(request.data)
+    digest = hashlib.md5(cmd.encode()).hexdigest()
+    token = random.randint(0, 10**6)
+    element.innerHTML = user_input
+    api_key = "sk_live_1234567890abcdef"
+    password = "hunter2hunter2"
+    return render_template_string(request.args["tpl"])
+'''
+
+CRYPTO = '''
+from Crypto.Cipher import AES
+cipher = AES.new(key, AES.MODE_ECB)
+h = hashlib.sha1(data)
+secret = random.choice(alphabet)
+value = eval(expr)
+'''
+
+CLEAN = '''
+import secrets
+import hashlib
+
+def handler(request):
+    token = secrets.token_hex(32)
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    return {"token": token, "digest": digest}
+'''
+
+# (type, description) pairs reported by the per-detector re.search loop that
+# the engine replaced, recorded on the same inputs
+LEGACY_FINDINGS = {
+    "sample": (SAMPLE, {
+        ("missing_input_validation", "User input from request without validation"),
+        ("sql_injection", "String concatenation in SQL"),
+    }),
+    "web": (WEB, {
+        ("command_injection", "os.system with string concatenation"),
+        ("command_injection", "shell=True in subprocess.run"),
+        ("command_injection", "subprocess with concatenated command"),
+        ("hardcoded_secrets", "Hardcoded password"),
+        ("insecure_deserialization", "yaml.load without Loader"),
+        ("insecure_random", "random.randint used for security token generation"),
+        ("missing_authentication", "API endpoint without authentication"),
+        ("missing_authentication", "Route defined without authentication check"),
+        ("missing_input_validation", "User input from request without validation"),
+        ("weak_cryptography", "Using weak hash function: md5"),
+        ("xss", "innerHTML assignment with user input"),
+    }),
+    "crypto": (CRYPTO, {
+        ("insecure_deserialization", "eval() or exec() with potentially untrusted input"),
+        ("insecure_random", "Using random module for security-sensitive values"),
+        ("weak_cryptography", "Using ECB mode (deterministic and weak)"),
+        ("weak_cryptography", "Using weak hash function: sha1"),
+    }),
+    "clean": (CLEAN, set()),
+}
+
+
+def _naive_scan(rules, text):
+    """Every rule checked with a plain re.search, no prefilter."""
+    def found(pattern, rule):
+        return re.search(pattern, text, re.IGNORECASE if rule.ignore_case else 0) is not None
+
+    hits = set()
+    for rule in rules:
+        if not found(rule.pattern, rule):
+            continue
+        if not all(found(p, rule) for p in rule.requires):
+            continue
+        if rule.requires_any and not any(found(p, rule) for p in rule.requires_any):
+            continue
+        if any(found(p, rule) for p in rule.unless):
+            continue
+        hits.add(rule.id)
+    return hits
+
+
+@pytest.mark.parametrize("name", sorted(LEGACY_FINDINGS))
+def test_detector_matches_legacy_findings(name):
+    code, expected = LEGACY_FINDINGS[name]
+    vulns = VulnDetector().detect_all_vulnerabilities(code)
+    assert {(v["type"], v["description"]) for v in vulns} == expected
+
+
+@pytest.mark.parametrize("name", sorted(LEGACY_FINDINGS))
+def test_literal_prefilter_never_drops_a_match(name):
+    code, _ = LEGACY_FINDINGS[name]
+    engine = ScanEngine(VULN_RULES)
+    found = {m.rule_id for m in engine.scan(code, syntax=None, first_only=True)}
+    assert found == _naive_scan(VULN_RULES, code)
+
+
+@pytest.mark.parametrize("pattern, literal", [
+    (r"hashlib\.md5\s*\(", "hashlib.md5"),
+    (r"os\.system\s*\(\s*[\"']", "os.system"),
+    (r"AES\.MODE_ECB", "aes.mode_ecb"),
+    (r"pickle\.loads?\(", "pickle.load"),
+    (r"colou?r_value", "r_value"),
+    (r"eval|exec", None),
+    (r"a.b", None),
+])
+def test_required_literal(pattern, literal):
+    assert _required_literal(pattern) == literal
+    if literal is not None:
+        # Any text the regex matches must contain the literal
+        for sample in ("x = hashlib.md5(data)", "os.system('ls')", "AES.MODE_ECB",
+                       "pickle.load(f)", "colour_value", "color_value"):
+            if re.search(pattern, sample):
+                assert literal in sample.lower()
+
+
+def test_comments_are_masked_but_strings_are_kept():
+    source = 'url = "http://example.com/#frag"  # os.system("rm " + x)\nos.system("ls " + y)\n'
+    masked = mask_comments(source, "python")
+    assert len(masked) == len(source) and masked.count("\n") == source.count("\n")
+    assert '"http://example.com/#frag"' in masked
+    assert masked.count("os.system") == 1
+
+    engine = ScanEngine([Rule("shell", r'os\.system\s*\(\s*["\'].*?\+\s*\w+')])
+    assert [(m.rule_id, m.line) for m in engine.scan(source, filename="app.py")] == [("shell", 2)]
+
+    c_source = "/* eval(x) */\nconst a = `// not a comment`; eval(y);\n"
+    assert [m.line for m in ScanEngine([Rule("eval", r"eval\(")]).scan(c_source, filename="a.js")] == [2]
+
+
+def test_file_level_conditions():
+    rules = [Rule("route", r"@app\.route", requires_any=(r"flask",), unless=(r"@login_required",))]
+    engine = ScanEngine(rules)
+    assert engine.scan("import flask\n@app.route('/')\n")
+    assert not engine.scan("@app.route('/')\n")
+    assert not engine.scan("import flask\n@login_required\n@app.route('/')\n")
+
+
+def test_scan_paths_reuses_cached_results(tmp_path):
+    (tmp_path / "a.py").write_text(SAMPLE)
+    (tmp_path / "b.py").write_text(CLEAN)
+    paths = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    cache_dir = str(tmp_path / "cache")
+
+    first = scan_paths(VULN_RULES, paths, workers=1, cache_dir=cache_dir, first_only=True)
+    second = scan_paths(VULN_RULES, paths, workers=1, cache_dir=cache_dir, first_only=True)
+
+    assert first["cached"] == 0 and second["cached"] == 2
+    assert list(first["files"]) == [paths[0]]
+    assert first["files"] == second["files"]
@@ -4,11 +4,149 @@ Vulnerability Detector
 Identifies security vulnerabilities in code
 """
 
-import re
+import os
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from scan_engine import Rule, ScanEngine, iter_source_files, scan_paths
+
+SQL_REMEDIATION = "Use parameterized queries or prepared statements"
+SHELL_REMEDIATION = "Use subprocess with shell=False and list arguments"
+PATH_REMEDIATION = "Validate and normalize file paths, use whitelist"
+XSS_REMEDIATION = "Use template auto-escaping or sanitize user input"
+DESERIALIZATION_REMEDIATION = "Use safer alternatives like json or specify safe Loader"
+SECRETS_REMEDIATION = "Use environment variables or secrets management"
+WEAK_HASH_REMEDIATION = "Use SHA-256 or SHA-512 instead"
+
+
+def _rule(rule_id: str, vuln_type: str, severity: str, cwe_id: str, pattern: str,
+          description: str, remediation: str, ignore_case: bool = False, **conditions) -> Rule:
+    return Rule(rule_id, pattern, ignore_case, meta={
+        "type": vuln_type,
+        "severity": severity,
+        "cwe_id": cwe_id,
+        "description": description,
+        "remediation": remediation,
+    }, **conditions)
+
+
+# Every detector's patterns, compiled once into a single ScanEngine.
+# File-level conditions (requires/requires_any/unless) replace the ad-hoc
+# `'x' in code` checks; they are evaluated on comment-stripped source.
+VULN_RULES: List[Rule] = [
+    # SQL injection
+    _rule("sql_injection.concat", "sql_injection", "CRITICAL", "CWE-89",
+          r'query\s*=\s*["\']SELECT.*?\+\s*\w+', "String concatenation in SQL", SQL_REMEDIATION, True),
+    _rule("sql_injection.execute_concat", "sql_injection", "CRITICAL", "CWE-89",
+          r'execute\s*\(\s*["\']SELECT.*?\+', "SQL injection via concatenation", SQL_REMEDIATION, True),
+    _rule("sql_injection.format", "sql_injection", "CRITICAL", "CWE-89",
+          r'format\s*\(\s*["\']SELECT', "SQL format string injection", SQL_REMEDIATION, True),
+    _rule("sql_injection.args_in", "sql_injection", "CRITICAL", "CWE-89",
+          r'request\.args\[.*?\]\s*in\s+', "Unescaped user input in SQL query",
+          "Use ORM or parameterized queries", True),
+    _rule("sql_injection.form_in", "sql_injection", "CRITICAL", "CWE-89",
+          r'request\.form\[.*?\]\s*in\s+', "Unescaped user input in SQL query",
+          "Use ORM or parameterized queries", True),
+    _rule("sql_injection.user_input", "sql_injection", "CRITICAL", "CWE-89",
+          r'user_input\s*in\s+query', "Unescaped user input in SQL query",
+          "Use ORM or parameterized queries", True),
+
+    # Command injection
+    _rule("command_injection.os_system", "command_injection", "CRITICAL", "CWE-78",
+          r'os\.system\s*\(\s*["\'].*?\+\s*\w+', "os.system with string concatenation", SHELL_REMEDIATION, True),
+    _rule("command_injection.subprocess", "command_injection", "CRITICAL", "CWE-78",
+          r'subprocess\.run\s*\(\s*["\'].*?\+', "subprocess with concatenated command", SHELL_REMEDIATION, True),
+    _rule("command_injection.popen", "command_injection", "CRITICAL", "CWE-78",
+          r'os\.popen\s*\(\s*user_input', "os.popen with user input", SHELL_REMEDIATION, True),
+    _rule("command_injection.shell_true", "command_injection", "CRITICAL", "CWE-78",
+          r'shell\s*=\s*True', "shell=True in subprocess.run", SHELL_REMEDIATION, True),
+
+    # Path traversal
+    _rule("path_traversal.open_user_input", "path_traversal", "HIGH", "CWE-22",
+          r'open\s*\(\s*user_input', "Direct open() with user input", PATH_REMEDIATION, True),
+    _rule("path_traversal.open_request", "path_traversal", "HIGH", "CWE-22",
+          r'open\s*\(\s*request\.args', "File open with request argument", PATH_REMEDIATION, True),
+    _rule("path_traversal.join", "path_traversal", "HIGH", "CWE-22",
+          r'os\.path\.join\s*\(\s*base_dir\s*,\s*user_input', "Path join without normalization",
+          PATH_REMEDIATION, True),
+    _rule("path_traversal.dotdot", "path_traversal", "HIGH", "CWE-22",
+          r'\.\.', "Potential path traversal with .. detected",
+          "Validate file paths against whitelist", requires_any=("open", "join")),
+
+    # Cross-site scripting
+    _rule("xss.jinja_variable", "xss", "HIGH", "CWE-79",
+          r'{{\s*\w+\s*}}', "Unescaped template variable in Jinja2", XSS_REMEDIATION),
+    _rule("xss.fstring", "xss", "HIGH", "CWE-79",
+          r'f["\'].*?{.*?}', "f-string with unsanitized user input", XSS_REMEDIATION),
+    _rule("xss.render_concat", "xss", "HIGH", "CWE-79",
+          r'render_template\s*\(\s*["\'].*?\+', "Template rendering with concatenation", XSS_REMEDIATION),
+    _rule("xss.inner_html", "xss", "HIGH", "CWE-79",
+          r'\.innerHTML\s*=\s*.*?user_input', "innerHTML assignment with user input",
+          "Use textContent or sanitize HTML input"),
+
+    # Insecure deserialization
+    _rule("insecure_deserialization.pickle_loads", "insecure_deserialization", "CRITICAL", "CWE-502",
+          r'pickle\.loads\s*\(\s*user_input', "pickle.loads with user input", DESERIALIZATION_REMEDIATION),
+    _rule("insecure_deserialization.pickle_load", "insecure_deserialization", "CRITICAL", "CWE-502",
+          r'pickle\.load\s*\(\s*request', "pickle.load from request", DESERIALIZATION_REMEDIATION),
+    _rule("insecure_deserialization.yaml_load", "insecure_deserialization", "CRITICAL", "CWE-502",
+          r'yaml\.load\s*\(\s*[^,]*?\)', "yaml.load without Loader", DESERIALIZATION_REMEDIATION),
+    _rule("insecure_deserialization.eval", "insecure_deserialization", "CRITICAL", "CWE-502",
+          r'eval\s*\(\s*\w+\s*\)', "eval() or exec() with potentially untrusted input",
+          "Never use eval/exec; use safer alternatives"),
+    _rule("insecure_deserialization.exec", "insecure_deserialization", "CRITICAL", "CWE-502",
+          r'exec\s*\(\s*\w+\s*\)', "eval() or exec() with potentially untrusted input",
+          "Never use eval/exec; use safer alternatives"),
+
+    # Hardcoded secrets
+    _rule("hardcoded_secrets.api_key", "hardcoded_secrets", "CRITICAL", "CWE-798",
+          r'api_key\s*=\s*["\'][A-Za-z0-9]{20,}', "Hardcoded API key", SECRETS_REMEDIATION, True),
+    _rule("hardcoded_secrets.password", "hardcoded_secrets", "CRITICAL", "CWE-798",
+          r'password\s*=\s*["\'][^"\']+["\']', "Hardcoded password", SECRETS_REMEDIATION, True),
+    _rule("hardcoded_secrets.secret", "hardcoded_secrets", "CRITICAL", "CWE-798",
+          r'secret\s*=\s*["\'][^"\']+["\']', "Hardcoded secret", SECRETS_REMEDIATION, True),
+    _rule("hardcoded_secrets.token", "hardcoded_secrets", "CRITICAL", "CWE-798",
+          r'token\s*=\s*["\']sk_[^"\']*', "Hardcoded authentication token", SECRETS_REMEDIATION, True),
+    _rule("hardcoded_secrets.aws", "hardcoded_secrets", "CRITICAL", "CWE-798",
+          r'aws_secret_access_key\s*=', "Hardcoded AWS secret", SECRETS_REMEDIATION, True),
+
+    # Insecure randomness
+    _rule("insecure_random.choice", "insecure_random", "HIGH", "CWE-338",
+          r'random\.choice\s*\(\s*\w+\s*\)', "Using random module for security-sensitive values",
+          "Use secrets module instead of random", requires=("(?i)secret",)),
+    _rule("insecure_random.randint", "insecure_random", "HIGH", "CWE-338",
+          r'random\.randint\s*\(\s*', "random.randint used for security token generation",
+          "Use secrets.randbelow() instead", requires=("(?i)token",)),
+
+    # Weak cryptography
+    _rule("weak_cryptography.md5", "weak_cryptography", "HIGH", "CWE-327",
+          r'hashlib\.md5\s*\(', "Using weak hash function: md5", WEAK_HASH_REMEDIATION),
+    _rule("weak_cryptography.sha1", "weak_cryptography", "HIGH", "CWE-327",
+          r'hashlib\.sha1\s*\(', "Using weak hash function: sha1", WEAK_HASH_REMEDIATION),
+    _rule("weak_cryptography.ecb", "weak_cryptography", "HIGH", "CWE-327",
+          r'AES\.MODE_ECB', "Using ECB mode (deterministic and weak)", "Use CBC or GCM mode instead"),
+    _rule("weak_cryptography.no_iv", "weak_cryptography", "HIGH", "CWE-327",
+          r'Cipher\.new\s*\(\s*AES', "Cipher created without IV/nonce", "Always use a random IV/nonce",
+          unless=("(?i)iv",)),
+
+    # Missing authentication
+    _rule("missing_authentication.route", "missing_authentication", "HIGH", "CWE-306",
+          r'@app\.route\s*\(', "Route defined without authentication check",
+          "Add @login_required or equivalent authentication check",
+          unless=("(?i)auth", r'@login_required')),
+    _rule("missing_authentication.api", "missing_authentication", "HIGH", "CWE-306",
+          r'(?i)api', "API endpoint without authentication", "Add authentication middleware or decorator",
+          requires=("@",), unless=(r'authenticate|verify_token|@login_required',)),
+
+    # Missing input validation
+    _rule("missing_input_validation.request", "missing_input_validation", "MEDIUM", "CWE-20",
+          r'request\.(args|form)\[', "User input from request without validation",
+          "Validate and sanitize all user inputs", unless=(r'(?i)validate|check|sanitize',)),
+]
+
+SEVERITY_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
 class Severity(Enum):
     """Severity levels."""
     CRITICAL = "critical"
@@ -42,349 +180,108 @@ class VulnDetector:
             "using_components_with_known_vulns",
             "insufficient_logging"
         ]
+        self.rules = VULN_RULES
+        self.engine = ScanEngine(self.rules)
 
-    def detect_sql_injection(self, code: str) -> List[Dict[str, Any]]:
-        """Detect SQL injection vulnerabilities."""
-        
+    def _detect(self, code: str, vuln_type: Optional[str] = None,
+                filename: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run the shared engine once; one finding per rule at its first line."""
         vulns = []
-        
-        # Pattern 1: String concatenation in SQL
-        patterns = [
-            (r'query\s*=\s*["\']SELECT.*?\+\s*\w+', "String concatenation in SQL"),
-            (r'execute\s*\(\s*["\']SELECT.*?\+', "SQL injection via concatenation"),
-            (r'format\s*\(\s*["\']SELECT', "SQL format string injection"),
-        ]
-        
-        for pattern, desc in patterns:
-            if re.search(pattern, code, re.IGNORECASE):
-                vulns.append({
-                    "type": "sql_injection",
-                    "severity": "CRITICAL",
-                    "cwe_id": "CWE-89",
-                    "description": desc,
-                    "remediation": "Use parameterized queries or prepared statements"
-                })
-        
-        # Pattern 2: User input in SQL without escaping
-        user_input_patterns = [
-            r'request\.args\[.*?\]\s*in\s+',
-            r'request\.form\[.*?\]\s*in\s+',
-            r'user_input\s*in\s+query'
-        ]
-        
-        for pattern in user_input_patterns:
-            if re.search(pattern, code, re.IGNORECASE):
-                vulns.append({
-                    "type": "sql_injection",
-                    "severity": "CRITICAL",
-                    "cwe_id": "CWE-89",
-                    "description": "Unescaped user input in SQL query",
-                    "remediation": "Use ORM or parameterized queries"
-                })
-        
+        for match in self.engine.scan(code, filename=filename, first_only=True):
+            meta = self.engine.rules_by_id[match.rule_id].meta
+            if vuln_type is None or meta["type"] == vuln_type:
+                vulns.append({**meta, "line": match.line})
         return vulns
 
+    def detect_sql_injection(self, code: str) -> List[Dict[str, Any]]:
+        """Detect SQL injection vulnerabilities."""
+        return self._detect(code, "sql_injection")
+
     def detect_command_injection(self, code: str) -> List[Dict[str, Any]]:
         """Detect command injection vulnerabilities."""
-        
-        vulns = []
-        
-        # Pattern 1: os.system or subprocess with user input
-        patterns = [
-            (r'os\.system\s*\(\s*["\'].*?\+\s*\w+', "os.system with string concatenation"),
-            (r'subprocess\.run\s*\(\s*["\'].*?\+', "subprocess with concatenated command"),
-            (r'os\.popen\s*\(\s*user_input', "os.popen with user input"),
-            (r'shell\s*=\s*True', "shell=True in subprocess.run"),
-        ]
-        
-        for pattern, desc in patterns:
-            if re.search(pattern, code, re.IGNORECASE):
-                vulns.append({
-                    "type": "command_injection",
-                    "severity": "CRITICAL",
-                    "cwe_id": "CWE-78",
-                    "description": desc,
-                    "remediation": "Use subprocess with shell=False and list arguments"
-                })
-        
-        return vulns
+        return self._detect(code, "command_injection")
 
     def detect_path_traversal(self, code: str) -> List[Dict[str, Any]]:
         """Detect path traversal vulnerabilities."""
-        
-        vulns = []
-        
-        # Pattern 1: Direct file access with user input
-        patterns = [
-            (r'open\s*\(\s*user_input', "Direct open() with user input"),
-            (r'open\s*\(\s*request\.args', "File open with request argument"),
-            (r'os\.path\.join\s*\(\s*base_dir\s*,\s*user_input', "Path join without normalization"),
-        ]
-        
-        for pattern, desc in patterns:
-            if re.search(pattern, code, re.IGNORECASE):
-                vulns.append({
-                    "type": "path_traversal",
-                    "severity": "HIGH",
-                    "cwe_id": "CWE-22",
-                    "description": desc,
-                    "remediation": "Validate and normalize file paths, use whitelist"
-                })
-        
-        # Pattern 2: .. in path
-        if '..' in code and ('open' in code or 'join' in code):
-            vulns.append({
-                "type": "path_traversal",
-                "severity": "HIGH",
-                "cwe_id": "CWE-22",
-                "description": "Potential path traversal with .. detected",
-                "remediation": "Validate file paths against whitelist"
-            })
-        
-        return vulns
+        return self._detect(code, "path_traversal")
 
     def detect_xss_vulnerabilities(self, code: str) -> List[Dict[str, Any]]:
         """Detect Cross-Site Scripting (XSS) vulnerabilities."""
-        
-        vulns = []
-        
-        # Pattern 1: Unescaped output in templates
-        patterns = [
-            (r'{{\s*\w+\s*}}', "Unescaped template variable in Jinja2"),
-            (r'f["\'].*?{.*?}', "f-string with unsanitized user input"),
-            (r'render_template\s*\(\s*["\'].*?\+', "Template rendering with concatenation"),
-        ]
-        
-        for pattern, desc in patterns:
-            if re.search(pattern, code):
-                vulns.append({
-                    "type": "xss",
-                    "severity": "HIGH",
-                    "cwe_id": "CWE-79",
-                    "description": desc,
-                    "remediation": "Use template auto-escaping or sanitize user input"
-                })
-        
-        # Pattern 2: innerHTML with user data
-        if re.search(r'\.innerHTML\s*=\s*.*?user_input', code):
-            vulns.append({
-                "type": "xss",
-                "severity": "HIGH",
-                "cwe_id": "CWE-79",
-                "description": "innerHTML assignment with user input",
-                "remediation": "Use textContent or sanitize HTML input"
-            })
-        
-        return vulns
+        return self._detect(code, "xss")
 
     def detect_insecure_deserialization(self, code: str) -> List[Dict[str, Any]]:
         """Detect insecure deserialization vulnerabilities."""
-        
-        vulns = []
-        
-        # Pattern 1: pickle with untrusted data
-        patterns = [
-            (r'pickle\.loads\s*\(\s*user_input', "pickle.loads with user input"),
-            (r'pickle\.load\s*\(\s*request', "pickle.load from request"),
-            (r'yaml\.load\s*\(\s*[^,]*?\)', "yaml.load without Loader"),
-        ]
-        
-        for pattern, desc in patterns:
-            if re.search(pattern, code):
-                vulns.append({
-                    "type": "insecure_deserialization",
-                    "severity": "CRITICAL",
-                    "cwe_id": "CWE-502",
-                    "description": desc,
-                    "remediation": "Use safer alternatives like json or specify safe Loader"
-                })
-        
-        # Pattern 2: eval/exec with user input
-        if re.search(r'eval\s*\(\s*\w+\s*\)', code) or re.search(r'exec\s*\(\s*\w+\s*\)', code):
-            vulns.append({
-                "type": "insecure_deserialization",
-                "severity": "CRITICAL",
-                "cwe_id": "CWE-502",
-                "description": "eval() or exec() with potentially untrusted input",
-                "remediation": "Never use eval/exec; use safer alternatives"
-            })
-        
-        return vulns
+        return self._detect(code, "insecure_deserialization")
 
     def detect_hardcoded_secrets(self, code: str) -> List[Dict[str, Any]]:
         """Detect hardcoded secrets in code."""
-        
-        vulns = []
-        
-        # Pattern 1: Hardcoded API keys
-        patterns = [
-            (r'api_key\s*=\s*["\'][A-Za-z0-9]{20,}', "Hardcoded API key"),
-            (r'password\s*=\s*["\'][^"\']+["\']', "Hardcoded password"),
-            (r'secret\s*=\s*["\'][^"\']+["\']', "Hardcoded secret"),
-            (r'token\s*=\s*["\']sk_[^"\']*', "Hardcoded authentication token"),
-            (r'aws_secret_access_key\s*=', "Hardcoded AWS secret"),
-        ]
-        
-        for pattern, desc in patterns:
-            if re.search(pattern, code, re.IGNORECASE):
-                vulns.append({
-                    "type": "hardcoded_secrets",
-                    "severity": "CRITICAL",
-                    "cwe_id": "CWE-798",
-                    "description": desc,
-                    "remediation": "Use environment variables or secrets management"
-                })
-        
-        return vulns
+        return self._detect(code, "hardcoded_secrets")
 
     def detect_insecure_random(self, code: str) -> List[Dict[str, Any]]:
         """Detect use of insecure random number generation."""
-        
-        vulns = []
-        
-        # Pattern: Using random instead of secrets
-        if re.search(r'random\.choice\s*\(\s*\w+\s*\)', code) and 'secret' in code.lower():
-            vulns.append({
-                "type": "insecure_random",
-                "severity": "HIGH",
-                "cwe_id": "CWE-338",
-                "description": "Using random module for security-sensitive values",
-                "remediation": "Use secrets module instead of random"
-            })
-        
-        if re.search(r'random\.randint\s*\(\s*', code) and 'token' in code.lower():
-            vulns.append({
-                "type": "insecure_random",
-                "severity": "HIGH",
-                "cwe_id": "CWE-338",
-                "description": "random.randint used for security token generation",
-                "remediation": "Use secrets.randbelow() instead"
-            })
-        
-        return vulns
+        return self._detect(code, "insecure_random")
 
     def detect_weak_cryptography(self, code: str) -> List[Dict[str, Any]]:
         """Detect weak cryptography usage."""
-        
-        vulns = []
-        
-        # Pattern 1: Weak hash functions
-        weak_hashes = ['md5', 'sha1']
-        for weak_hash in weak_hashes:
-            if re.search(f'hashlib\\.{weak_hash}\\s*\\(', code):
-                vulns.append({
-                    "type": "weak_cryptography",
-                    "severity": "HIGH",
-                    "cwe_id": "CWE-327",
-                    "description": f"Using weak hash function: {weak_hash}",
-                    "remediation": "Use SHA-256 or SHA-512 instead"
-                })
-        
-        # Pattern 2: ECB mode (weak cipher mode)
-        if re.search(r'AES\.MODE_ECB', code):
-            vulns.append({
-                "type": "weak_cryptography",
-                "severity": "HIGH",
-                "cwe_id": "CWE-327",
-                "description": "Using ECB mode (deterministic and weak)",
-                "remediation": "Use CBC or GCM mode instead"
-            })
-        
-        # Pattern 3: No IV/nonce
-        if re.search(r'Cipher\\.new\s*\(\s*AES', code) and 'iv' not in code.lower():
-            vulns.append({
-                "type": "weak_cryptography",
-                "severity": "HIGH",
-                "cwe_id": "CWE-327",
-                "description": "Cipher created without IV/nonce",
-                "remediation": "Always use a random IV/nonce"
-            })
-        
-        return vulns
+        return self._detect(code, "weak_cryptography")
 
     def detect_missing_authentication(self, code: str) -> List[Dict[str, Any]]:
         """Detect missing authentication checks."""
-        
-        vulns = []
-        
-        # Pattern 1: Routes without authentication
-        if re.search(r'@app\.route\s*\(', code) and 'auth' not in code.lower():
-            if not re.search(r'@login_required', code):
-                vulns.append({
-                    "type": "missing_authentication",
-                    "severity": "HIGH",
-                    "cwe_id": "CWE-306",
-                    "description": "Route defined without authentication check",
-                    "remediation": "Add @login_required or equivalent authentication check"
-                })
-        
-        # Pattern 2: API endpoints without authentication
-        if 'api' in code.lower() and '@' in code:
-            if not re.search(r'authenticate|verify_token|@login_required', code):
-                vulns.append({
-                    "type": "missing_authentication",
-                    "severity": "HIGH",
-                    "cwe_id": "CWE-306",
-                    "description": "API endpoint without authentication",
-                    "remediation": "Add authentication middleware or decorator"
-                })
-        
-        return vulns
+        return self._detect(code, "missing_authentication")
 
     def detect_missing_input_validation(self, code: str) -> List[Dict[str, Any]]:
         """Detect missing input validation."""
-        
-        vulns = []
-        
-        # Pattern 1: request.args/form without validation
-        if re.search(r'request\.(args|form)\[', code):
-            if not re.search(r'validate|check|sanitize', code.lower()):
-                vulns.append({
-                    "type": "missing_input_validation",
-                    "severity": "MEDIUM",
-                    "cwe_id": "CWE-20",
-                    "description": "User input from request without validation",
-                    "remediation": "Validate and sanitize all user inputs"
-                })
-        
-        return vulns
+        return self._detect(code, "missing_input_validation")
 
-    def detect_all_vulnerabilities(self, code: str) -> List[Dict[str, Any]]:
-        """Detect all known vulnerabilities in code."""
-        
-        all_vulns = []
-        
-        detectors = [
-            self.detect_sql_injection,
-            self.detect_command_injection,
-            self.detect_path_traversal,
-            self.detect_xss_vulnerabilities,
-            self.detect_insecure_deserialization,
-            self.detect_hardcoded_secrets,
-            self.detect_insecure_random,
-            self.detect_weak_cryptography,
-            self.detect_missing_authentication,
-            self.detect_missing_input_validation,
-        ]
-        
-        for detector in detectors:
-            all_vulns.extend(detector(code))
-        
-        # Remove duplicates and sort by severity
+    def _dedupe_and_sort(self, vulns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove duplicates (same type + description) and sort by severity."""
         seen = set()
         unique_vulns = []
-        for vuln in all_vulns:
+        for vuln in vulns:
             key = (vuln['type'], vuln['description'])
             if key not in seen:
                 seen.add(key)
                 unique_vulns.append(vuln)
-        
-        # Sort by severity
-        severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-        unique_vulns.sort(key=lambda x: severity_order.get(x['severity'], 4))
-        
+        unique_vulns.sort(key=lambda x: SEVERITY_ORDER.get(x['severity'], 4))
         return unique_vulns
 
+    def detect_all_vulnerabilities(self, code: str, filename: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Detect all known vulnerabilities in code in a single scan.
+
+        Args:
+            code: Source code
+            filename: Optional file name, used to pick comment syntax (default Python)
+        """
+        return self._dedupe_and_sort(self._detect(code, filename=filename))
+
+    def scan_repository(self, root: str, workers: Optional[int] = None,
+                        use_cache: bool = True) -> Dict[str, Any]:
+        """Scan every source file under root across a process pool.
+
+        Results are cached per file by content hash, so re-scans only pay
+        for files that changed.
+
+        Args:
+            root: Directory (or single file) to scan
+            workers: Process count (default: CPU count)
+            use_cache: Reuse cached per-file results
+
+        Returns:
+            Findings per file plus scan counts
+        """
+        paths = iter_source_files(root)
+        scan = scan_paths(self.rules, paths, workers=workers, use_cache=use_cache, first_only=True)
+        files = {}
+        for path, matches in scan["files"].items():
+            vulns = [{**self.engine.rules_by_id[m.rule_id].meta, "line": m.line} for m in matches]
+            files[os.path.relpath(path, root) if os.path.isdir(root) else path] = self._dedupe_and_sort(vulns)
+        return {
+            "files": files,
+            "files_scanned": scan["scanned"],
+            "files_cached": scan["cached"],
+            "total_vulnerabilities": sum(len(v) for v in files.values()),
+        }
+
     def get_owasp_mapping(self, vuln_type: str) -> str:
         """Map vulnerability to OWASP Top 10."""
         
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Pytest fixtures for the smart contract fuzzer: an in-memory vault contract."""
+
+import pytest
+from eth_abi import decode, encode
+from web3 import Web3
+
+from evm_backend import ExecutionBackend, ExecutionResult, FunctionCodec
+from fuzz_engine import FuzzConfig, FuzzEngine
+from invariant_checker import InvariantType
+
+VAULT = Web3.to_checksum_address("0x00000000000000000000000000000000000fa017")
+CAP = 100
+
+VAULT_ABI = [
+    {"type": "function", "name": "deposit", "stateMutability": "nonpayable",
+     "inputs": [{"name": "amount", "type": "uint256"}], "outputs": []},
+    {"type": "function", "name": "withdraw", "stateMutability": "nonpayable",
+     "inputs": [{"name": "amount", "type": "uint256"}], "outputs": []},
+    {"type": "function", "name": "poke", "stateMutability": "nonpayable",
+     "inputs": [{"name": "value", "type": "uint256"}], "outputs": []},
+    {"type": "function", "name": "totalAssets", "stateMutability": "view",
+     "inputs": [], "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "depositsOf", "stateMutability": "view",
+     "inputs": [{"name": "index", "type": "uint256"}], "outputs": [{"name": "", "type": "uint256"}]},
+]
+
+# PUSH2 0x1337 PUSH1 0x04 EQ PUSH2 0x000a JUMPI JUMPDEST STOP
+VAULT_CODE = bytes.fromhex("61133760041461000a575b00")
+
+
+class VaultBackend(ExecutionBackend):
+    """
+    Stateful stand-in for a vault contract
+
+    deposit(x) adds x (checked, like Solidity 0.8), withdraw(x) reverts past
+    the balance, poke(x) changes nothing. Each call reports one branch edge per function and side of 1000.
+    """
+
+    name = "fake"
+    stateful = True
+
+    def __init__(self, coverage: bool = False):
+        self.deposits = []
+        self.coverage = coverage
+        self.executed = 0
+        self.batches = []  # Size of every call_many batch
+        self.codecs = {codec.selector: codec for codec in map(FunctionCodec, VAULT_ABI)}
+
+    def _decode(self, data):
+        codec = self.codecs[data[:4]]
+        return codec.name, decode(codec.input_types, data[4:])
+
+    def execute(self, sender, to, data, value=0, gas=None):
+        self.executed += 1
+        name, args = self._decode(data)
+        edges = frozenset({(name.encode(), 0, bool(args and args[0] > 1000))}) if self.coverage else None
+        if name == "deposit":
+            if sum(self.deposits) + args[0] >= 2**256:
+                return ExecutionResult(False, 25_000, revert_reason="Panic(0x11): arithmetic overflow or underflow",
+                                       coverage=edges)
+            self.deposits.append(args[0])
+        elif name == "withdraw":
+            if args[0] > sum(self.deposits):
+                return ExecutionResult(False, 25_000, revert_reason="insufficient balance", coverage=edges)
+            self.deposits.append(-args[0])
+        return ExecutionResult(True, 30_000, coverage=edges)
+
+    def call(self, to, data, sender=None, gas=None):
+        name, args = self._decode(data)
+        if name == "totalAssets":
+            return ExecutionResult(True, 0, encode(["uint256"], [sum(self.deposits)]))
+        if args[0] >= len(self.deposits):
+            return ExecutionResult(False, 0, revert_reason="index out of range")
+        return ExecutionResult(True, 0, encode(["uint256"], [max(self.deposits[args[0]], 0)]))
+
+    def call_many(self, calls, sender=None, gas=None):
+        self.batches.append(len(calls))
+        return super().call_many(calls, sender, gas)
+
+    def snapshot(self):
+        return list(self.deposits)
+
+    def revert(self, snapshot_id):
+        self.deposits = list(snapshot_id)
+
+    def get_code(self, address):
+        return VAULT_CODE
+
+    def enable_coverage(self):
+        return self.coverage
+
+    @property
+    def block_number(self):
+        return 1
+
+
+def make_engine(coverage: bool = False, cap_invariant: bool = True, **config) -> FuzzEngine:
+    """FuzzEngine over a fresh VaultBackend, optionally checking totalAssets() < CAP"""
+    config = FuzzConfig(**{"seed": 1, "verbose": False, "coverage_guided": coverage, **config})
+    engine = FuzzEngine(Web3(), VAULT, VAULT_ABI, config, backend=VaultBackend(coverage))
+    if cap_invariant:
+        checker = engine.invariant_checker
+        engine.add_invariant(
+            "below_cap", InvariantType.SUPPLY,
+            lambda: checker.call("totalAssets") < CAP, f"totalAssets() < {CAP}",
+        )
+    engine.initial_state = engine.backend.snapshot()
+    return engine
+
+
+@pytest.fixture
+def engine():
+    return make_engine()
@@ -0,0 +1,844 @@
+#!/usr/bin/env python3
+"""
+Smart Contract EVM Backend - Execution Layer
+Execute fuzz transactions against a node or an in-process EVM
+
+REAL IMPLEMENTATION - No Mocks/Simulations
+- RPC backend: eth_estimateGas + eth_call against a live node (read-only)
+- Local backend: py-evm execution forked from a state snapshot
+- Real state-changing transactions with snapshot/revert between sequences
+- State snapshots captured from a node or loaded from a dump file
+- Branch coverage (JUMPI edges) recorded per transaction on the local backend
+- Batched view reads: Multicall3 aggregate3 over RPC, bare EVM messages locally
+"""
+
+import os
+import json
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+from eth_abi import encode, decode
+from eth_utils import to_canonical_address, to_checksum_address
+from eth_utils.abi import collapse_if_tuple, function_abi_to_4byte_selector
+from web3 import Web3
+
+try:
+    from eth.db.atomic import AtomicDB
+    from eth.constants import BLANK_ROOT_HASH, CREATE_CONTRACT_ADDRESS
+    from eth.exceptions import Revert
+    from eth.vm.execution_context import ExecutionContext
+    from eth.vm.forks import ShanghaiVM, CancunVM, PragueVM
+    from eth._utils.address import generate_contract_address
+    from eth.vm.spoof import SpoofTransaction
+    from eth.vm.message import Message
+    PY_EVM_AVAILABLE = True
+    EVM_FORKS = {"shanghai": ShanghaiVM, "cancun": CancunVM, "prague": PragueVM}
+except ImportError:
+    PY_EVM_AVAILABLE = False
+    EVM_FORKS = {}
+
+# Funded externally-owned account used as msg.sender on the local backend
+DEFAULT_SENDER = "0x0000000000000000000000000000000000010000"
+DEFAULT_SENDER_BALANCE = 10 ** 24  # 1M ETH in wei
+DEFAULT_FORK = "cancun"
+DEFAULT_BLOCK_GAS_LIMIT = 30_000_000
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+PANIC_SELECTOR = bytes.fromhex("4e487b71")  # Panic(uint256)
+PANIC_CODES = {
+    0x01: "assertion failed",
+    0x11: "arithmetic overflow or underflow",
+    0x12: "division or modulo by zero",
+    0x21: "invalid enum value",
+    0x22: "invalid storage byte array",
+    0x31: "pop on empty array",
+    0x32: "array index out of bounds",
+    0x41: "out of memory",
+    0x51: "call to zero-initialized function",
+}
+
+JUMPDEST, JUMPI = 0x5b, 0x57
+PUSH1, PUSH32 = 0x60, 0x7f
+MAX_CODE_CONSTANTS = 1024
+
+@dataclass
+class ExecutionResult:
+    """Result of executing one transaction or call"""
+    success: bool
+    gas_used: int
+    output: bytes = b""
+    revert_reason: Optional[str] = None
+    logs: List[Tuple[str, List[int], bytes]] = field(default_factory=list)
+    tx_hash: Optional[str] = None
+    contract_address: Optional[str] = None
+    coverage: Optional[FrozenSet[Tuple[bytes, int, bool]]] = None  # (code address, JUMPI pc, taken)
+
+def decode_revert_reason(output: bytes) -> str:
+    """
+    Decode revert data into a readable reason
+
+    Args:
+        output: Raw revert data
+
+    Returns:
+        Error(string) message, Panic code description, or raw custom error hex
+    """
+    if not output:
+        return "execution reverted"
+    try:
+        if output[:4] == ERROR_SELECTOR:
+            return decode(["string"], output[4:])[0]
+        if output[:4] == PANIC_SELECTOR:
+            code = decode(["uint256"], output[4:])[0]
+            return f"Panic(0x{code:02x}): {PANIC_CODES.get(code, 'unknown panic')}"
+    except Exception:
+        pass
+    return f"custom error 0x{output.hex()}"
+
+def extract_code_constants(code: bytes, min_size: int = 2) -> List[int]:
+    """
+    Collect PUSH immediates from runtime bytecode
+
+    Comparisons against magic numbers compile to PUSHn + EQ/LT/GT, so these
+    values make a good mutation dictionary for reaching guarded branches.
+
+    Args:
+        code: Runtime bytecode
+        min_size: Smallest PUSH width to keep (PUSH1 is mostly stack offsets)
+
+    Returns:
+        Distinct values in bytecode order, jump targets excluded (at most MAX_CODE_CONSTANTS)
+    """
+    constants: Dict[int, bool] = {}
+    jumpdests = set()
+    pc = 0
+    while pc < len(code):
+        opcode = code[pc]
+        if opcode == JUMPDEST:
+            jumpdests.add(pc)
+        pc += 1
+        if PUSH1 <= opcode <= PUSH32:
+            size = opcode - PUSH1 + 1
+            if size >= min_size:
+                constants[int.from_bytes(code[pc:pc + size], "big")] = True
+            pc += size
+    return [value for value in constants if value not in jumpdests][:MAX_CODE_CONSTANTS]
+
+class FunctionCodec:
+    """Precomputed selector and types for one ABI function"""
+
+    def __init__(self, function_abi: Dict):
+        """
+        Args:
+            function_abi: Function ABI entry
+        """
+        self.name = function_abi["name"]
+        self.selector = function_abi_to_4byte_selector(function_abi)
+        self.input_types = [collapse_if_tuple(p) for p in function_abi.get("inputs", [])]
+        self.output_types = [collapse_if_tuple(p) for p in function_abi.get("outputs", [])]
+
+    def encode_call(self, args: Iterable[Any]) -> bytes:
+        """Encode calldata for the given arguments"""
+        return self.selector + encode(self.input_types, list(args))
+
+    def decode_output(self, output: bytes) -> Any:
+        """Decode return data (single value unwrapped, like web3's call())"""
+        if not self.output_types:
+            return None
+        values = decode(self.output_types, output)
+        return values[0] if len(values) == 1 else values
+
+class ExecutionBackend:
+    """
+    Interface shared by execution backends
+
+    execute() runs a transaction (state-changing where the backend supports
+    it), call() runs a read-only call, and snapshot()/revert() bracket a
+    sequence of transactions.
+    """
+
+    name = "base"
+    stateful = False  # True when execute() changes the state later calls see
+
+    def execute(
+        self,
+        sender: Optional[str],
+        to: str,
+        data: bytes,
+        value: int = 0,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        raise NotImplementedError
+
+    def call(
+        self,
+        to: str,
+        data: bytes,
+        sender: Optional[str] = None,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        raise NotImplementedError
+
+    def call_many(
+        self,
+        calls: List[Tuple[str, bytes]],
+        sender: Optional[str] = None,
+        gas: Optional[int] = None
+    ) -> List[ExecutionResult]:
+        """
+        Run several read-only calls against the same state
+
+        Args:
+            calls: (to, calldata) pairs
+
+        Returns:
+            One ExecutionResult per call, in order
+        """
+        return [self.call(to, data, sender, gas) for to, data in calls]
+
+    def snapshot(self) -> Any:
+        raise NotImplementedError
+
+    def revert(self, snapshot_id: Any):
+        raise NotImplementedError
+
+    def get_storage_at(self, address: str, slot: int) -> int:
+        raise NotImplementedError
+
+    def get_code(self, address: str) -> bytes:
+        raise NotImplementedError
+
+    def enable_coverage(self) -> bool:
+        """
+        Record branch coverage on every execute()
+
+        Returns:
+            True if supported (ExecutionResult.coverage is then populated)
+        """
+        return False
+
+    @property
+    def block_number(self) -> int:
+        raise NotImplementedError
+
+class RPCBackend(ExecutionBackend):
+    """
+    Execute against a JSON-RPC node
+
+    Every execution is an eth_estimateGas plus an eth_call, so state never
+    advances and snapshot()/revert() are no-ops.
+    """
+
+    name = "rpc"
+
+    def __init__(self, w3: Web3):
+        """
+        Args:
+            w3: Web3 instance connected to the target chain
+        """
+        self.w3 = w3
+        self.multicall = True  # Cleared if Multicall3 is missing on this chain
+
+    def execute(
+        self,
+        sender: Optional[str],
+        to: str,
+        data: bytes,
+        value: int = 0,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        tx = {"to": to, "data": data, "value": value}
+        if sender:
+            tx["from"] = sender
+
+        result = ExecutionResult(success=False, gas_used=0)
+
+        # Estimate gas (failure usually means the call reverts)
+        try:
+            result.gas_used = self.w3.eth.estimate_gas(tx)
+        except Exception as e:
+            result.revert_reason = str(e)
+
+        # Read-only simulation
+        try:
+            if gas:
+                tx["gas"] = gas
+            result.output = bytes(self.w3.eth.call(tx))
+            result.success = True
+        except Exception as e:
+            result.revert_reason = str(e)
+
+        return result
+
+    def call(
+        self,
+        to: str,
+        data: bytes,
+        sender: Optional[str] = None,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        tx = {"to": to, "data": data}
+        if sender:
+            tx["from"] = sender
+        if gas:
+            tx["gas"] = gas
+        try:
+            return ExecutionResult(success=True, gas_used=0, output=bytes(self.w3.eth.call(tx)))
+        except Exception as e:
+            return ExecutionResult(success=False, gas_used=0, revert_reason=str(e))
+
+    def call_many(
+        self,
+        calls: List[Tuple[str, bytes]],
+        sender: Optional[str] = None,
+        gas: Optional[int] = None
+    ) -> List[ExecutionResult]:
+        """
+        Run read-only calls in one eth_call through Multicall3 aggregate3
+
+        Falls back to one eth_call per read when a sender is given (inside
+        aggregate3, msg.sender is Multicall3) or Multicall3 is not deployed.
+        """
+        if len(calls) > 1 and self.multicall and sender is None:
+            tx = {"to": MULTICALL3_ADDRESS, "data": AGGREGATE3_SELECTOR + encode(
+                ["(address,bool,bytes)[]"], [[(to, True, data) for to, data in calls]]
+            )}
+            if gas:
+                tx["gas"] = gas
+            try:
+                (returns,) = decode(["(bool,bytes)[]"], bytes(self.w3.eth.call(tx)))
+            except Exception as e:
+                print(f"⚠️  Multicall3 unavailable, reading one call at a time: {e}")
+                self.multicall = False
+            else:
+                return [
+                    ExecutionResult(
+                        success=ok,
+                        gas_used=0,
+                        output=output,
+                        revert_reason=None if ok else decode_revert_reason(output)
+                    )
+                    for ok, output in returns
+                ]
+        return super().call_many(calls, sender, gas)
+
+    def snapshot(self) -> Any:
+        return None
+
+    def revert(self, snapshot_id: Any):
+        pass
+
+    def get_storage_at(self, address: str, slot: int) -> int:
+        return int.from_bytes(self.w3.eth.get_storage_at(address, slot), "big")
+
+    def get_code(self, address: str) -> bytes:
+        return bytes(self.w3.eth.get_code(address))
+
+    @property
+    def block_number(self) -> int:
+        return self.w3.eth.block_number
+
+def _to_int(value: Any) -> int:
+    """Parse an int from an int, hex string or decimal string"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.startswith(("0x", "0X")):
+        return int(value, 16) if len(value) > 2 else 0
+    return int(value or 0)
+
+def _to_bytes(value: Any) -> bytes:
+    """Parse bytes from a hex string or bytes"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if not value:
+        return b""
+    return bytes.fromhex(value[2:] if value.startswith(("0x", "0X")) else value)
+
+class LocalEVMBackend(ExecutionBackend):
+    """
+    Execute against an in-process py-evm state
+
+    Features:
+    - Forks from a state snapshot (node capture or dump file), no node needed afterwards
+    - Real state-changing transactions (nonces, balances, storage, logs)
+    - Cheap snapshot/revert by state root between fuzz sequences
+    - Contract deployment from bytecode
+    - Optional branch coverage: every JUMPI records (code address, pc, taken)
+    """
+
+    name = "local"
+    stateful = True
+
+    def __init__(
+        self,
+        alloc: Optional[Dict[str, Dict]] = None,
+        chain_id: int = 1,
+        block_number: int = 1,
+        timestamp: int = 1,
+        gas_limit: int = DEFAULT_BLOCK_GAS_LIMIT,
+        coinbase: str = "0x0000000000000000000000000000000000000000",
+        fork: str = DEFAULT_FORK,
+        fund: Optional[Iterable[str]] = (DEFAULT_SENDER,)
+    ):
+        """
+        Initialize Local EVM Backend
+
+        Args:
+            alloc: Accounts by address: {balance, nonce, code, storage{slot: value}}
+            chain_id: CHAINID seen by contracts
+            block_number: NUMBER seen by contracts
+            timestamp: TIMESTAMP seen by contracts
+            gas_limit: Block gas limit (also the default transaction gas)
+            coinbase: COINBASE seen by contracts
+            fork: EVM rules ('shanghai', 'cancun', 'prague')
+            fund: Addresses given DEFAULT_SENDER_BALANCE when absent from alloc
+        """
+        if not PY_EVM_AVAILABLE:
+            raise ImportError("py-evm required for the local backend. Install with: pip install py-evm")
+        if fork not in EVM_FORKS:
+            raise ValueError(f"Unsupported fork: {fork} (choose from {', '.join(EVM_FORKS)})")
+
+        self.alloc = {to_checksum_address(addr): acct for addr, acct in (alloc or {}).items()}
+        for addr in fund or ():
+            self.alloc.setdefault(to_checksum_address(addr), {"balance": DEFAULT_SENDER_BALANCE})
+
+        self.chain_id = chain_id
+        self.timestamp = timestamp
+        self.gas_limit = gas_limit
+        self.coinbase = to_checksum_address(coinbase)
+        self.fork = fork
+        self._block_number = block_number
+        self._vm_class = EVM_FORKS[fork]
+        self._state_class = self._vm_class.get_state_class()
+        self._context = ExecutionContext(
+            coinbase=to_canonical_address(coinbase),
+            timestamp=timestamp,
+            block_number=block_number,
+            difficulty=0,
+            mix_hash=b"\x00" * 32,
+            gas_limit=gas_limit,
+            prev_hashes=(),
+            chain_id=chain_id,
+            base_fee_per_gas=0,
+            excess_blob_gas=0,
+        )
+        self._db = AtomicDB()
+        self._state = self._state_class(self._db, self._context, BLANK_ROOT_HASH)
+        self.executions = 0
+        self._edges: Optional[set] = None  # Branch edges of the running transaction
+
+        for addr, acct in self.alloc.items():
+            canonical = to_canonical_address(addr)
+            self._state.set_balance(canonical, _to_int(acct.get("balance", 0)))
+            self._state.set_nonce(canonical, _to_int(acct.get("nonce", 0)))
+            code = _to_bytes(acct.get("code"))
+            if code:
+                self._state.set_code(canonical, code)
+            for slot, value in (acct.get("storage") or {}).items():
+                self._state.set_storage(canonical, _to_int(slot), _to_int(value))
+        self._state.persist()
+
+        print("=" * 70)
+        print("LOCAL EVM BACKEND")
+        print("=" * 70)
+        print(f"✅ Fork: {fork} (chain {chain_id}, block {block_number})")
+        print(f"   Accounts loaded: {len(self.alloc)}")
+        print()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "LocalEVMBackend":
+        """
+        Load a state snapshot file
+
+        Accepts the format written by save_snapshot(), genesis files
+        ({"alloc": ...}), and account dumps ({"accounts": ...}) such as
+        `geth dump` or `anvil --dump-state`.
+
+        Args:
+            path: Snapshot JSON path
+            **kwargs: Overrides for block context and fork
+
+        Returns:
+            LocalEVMBackend initialized from the snapshot
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        alloc = data.get("alloc") or data.get("accounts") or data
+        block = data.get("block") or {}
+        params = {
+            "chain_id": _to_int(data.get("chain_id", data.get("config", {}).get("chainId", 1))),
+            "block_number": _to_int(block.get("number", 1)),
+            "timestamp": _to_int(block.get("timestamp", 1)),
+            "gas_limit": _to_int(block.get("gas_limit", DEFAULT_BLOCK_GAS_LIMIT)),
+        }
+        if block.get("coinbase"):
+            params["coinbase"] = block["coinbase"]
+        params.update(kwargs)
+        return cls(alloc=alloc, **params)
+
+    @classmethod
+    def from_rpc(
+        cls,
+        w3: Web3,
+        addresses: Iterable[str],
+        storage_slots: Optional[Dict[str, Iterable[int]]] = None,
+        block_identifier: Any = "latest",
+        **kwargs
+    ) -> "LocalEVMBackend":
+        """
+        Fork account state from a node
+
+        Code, balance and nonce are captured for each address, plus the
+        listed storage slots. Slots not captured read as zero locally, so
+        pass the slots your target depends on or load a full dump with
+        from_file() instead.
+
+        Args:
+            w3: Web3 instance
+            addresses: Accounts to capture
+            storage_slots: Storage slots to capture per address
+            block_identifier: Block to fork from
+            **kwargs: Overrides for block context and fork
+
+        Returns:
+            LocalEVMBackend initialized from the node's state
+        """
+        block = w3.eth.get_block(block_identifier)
+        number = block["number"]
+        storage_slots = {to_checksum_address(a): s for a, s in (storage_slots or {}).items()}
+
+        alloc = {}
+        for addr in addresses:
+            addr = to_checksum_address(addr)
+            alloc[addr] = {
+                "balance": w3.eth.get_balance(addr, number),
+                "nonce": w3.eth.get_transaction_count(addr, number),
+                "code": bytes(w3.eth.get_code(addr, number)),
+                "storage": {
+                    slot: int.from_bytes(w3.eth.get_storage_at(addr, slot, number), "big")
+                    for slot in storage_slots.get(addr, ())
+                },
+            }
+
+        params = {
+            "chain_id": w3.eth.chain_id,
+            "block_number": number,
+            "timestamp": block["timestamp"],
+            "gas_limit": block["gasLimit"],
+            "coinbase": block.get("miner", "0x0000000000000000000000000000000000000000"),
+        }
+        params.update(kwargs)
+        return cls(alloc=alloc, **params)
+
+    def save_snapshot(
+        self,
+        path: str,
+        storage_slots: Optional[Dict[str, Iterable[int]]] = None
+    ):
+        """
+        Write the current state of known accounts to a snapshot file
+
+        py-evm keeps storage keyed by slot hash, so only slots listed in the
+        original alloc or in storage_slots are written. Save right after
+        from_rpc() to reuse a capture offline.
+
+        Args:
+            path: Output JSON path
+            storage_slots: Extra storage slots to write per address
+        """
+        extra = {to_checksum_address(a): s for a, s in (storage_slots or {}).items()}
+        accounts = {}
+        for addr in set(self.alloc) | set(extra):
+            slots = {_to_int(s) for s in (self.alloc.get(addr) or {}).get("storage") or {}}
+            slots.update(_to_int(s) for s in extra.get(addr, ()))
+            accounts[addr] = {
+                "balance": hex(self.get_balance(addr)),
+                "nonce": hex(self._state.get_nonce(to_canonical_address(addr))),
+                "code": "0x" + self.get_code(addr).hex(),
+                "storage": {hex(s): hex(self.get_storage_at(addr, s)) for s in sorted(slots)},
+            }
+
+        data = {
+            "chain_id": self.chain_id,
+            "block": {
+                "number": self._block_number,
+                "timestamp": self.timestamp,
+                "gas_limit": self.gas_limit,
+                "coinbase": self.coinbase,
+            },
+            "alloc": accounts,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"💾 Saved state snapshot: {path} ({len(accounts)} accounts)")
+
+    def _apply(
+        self,
+        sender: str,
+        to: Optional[str],
+        data: bytes,
+        value: int,
+        gas: Optional[int]
+    ) -> Tuple[Any, int, Any]:
+        """Run one spoofed transaction on the current state"""
+        sender_address = to_canonical_address(sender)
+        tx = self._vm_class.create_unsigned_transaction(
+            nonce=self._state.get_nonce(sender_address),
+            gas_price=0,
+            gas=gas or self.gas_limit,
+            to=to_canonical_address(to) if to else CREATE_CONTRACT_ADDRESS,
+            value=value,
+            data=data,
+        )
+        spoofed = SpoofTransaction(tx, from_=sender_address)
+        computation = self._state.apply_transaction(spoofed)
+        self.executions += 1
+        return computation, self._vm_class.finalize_gas_used(spoofed, computation), sender_address
+
+    def _result(self, computation, gas_used: int) -> ExecutionResult:
+        """Convert a py-evm computation into an ExecutionResult"""
+        result = ExecutionResult(success=computation.is_success, gas_used=gas_used)
+        if computation.is_success:
+            result.output = computation.output
+            result.logs = [
+                (to_checksum_address(address), list(topics), data)
+                for address, topics, data in computation.get_log_entries()
+            ]
+        elif isinstance(computation.error, Revert):
+            result.output = computation.output
+            result.revert_reason = decode_revert_reason(computation.output)
+        else:
+            result.revert_reason = f"{type(computation.error).__name__}: {computation.error}"
+        return result
+
+    def execute(
+        self,
+        sender: Optional[str],
+        to: str,
+        data: bytes,
+        value: int = 0,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        """
+        Apply a state-changing transaction
+
+        Args:
+            sender: Transaction sender (defaults to DEFAULT_SENDER)
+            to: Target contract
+            data: Calldata
+            value: Wei to send
+            gas: Gas limit (defaults to the block gas limit)
+
+        Returns:
+            ExecutionResult; state changes persist until revert()
+        """
+        if self._edges is not None:
+            self._edges.clear()
+        try:
+            computation, gas_used, _ = self._apply(sender or DEFAULT_SENDER, to, data, value, gas)
+        except Exception as e:
+            # Transaction invalid before execution (e.g. insufficient funds for value)
+            return ExecutionResult(success=False, gas_used=0, revert_reason=str(e))
+        self._state.lock_changes()
+        result = self._result(computation, gas_used)
+        if self._edges is not None:
+            result.coverage = frozenset(self._edges)
+        return result
+
+    def call(
+        self,
+        to: str,
+        data: bytes,
+        sender: Optional[str] = None,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        """
+        Run a read-only call; state is restored afterwards
+
+        Args:
+            to: Target contract
+            data: Calldata
+            sender: msg.sender (defaults to DEFAULT_SENDER)
+            gas: Gas limit (defaults to the block gas limit)
+        """
+        checkpoint = self._state.snapshot()
+        try:
+            computation, gas_used, _ = self._apply(sender or DEFAULT_SENDER, to, data, 0, gas)
+            return self._result(computation, gas_used)
+        except Exception as e:
+            return ExecutionResult(success=False, gas_used=0, revert_reason=str(e))
+        finally:
+            self._state.revert(checkpoint)
+
+    def call_many(
+        self,
+        calls: List[Tuple[str, bytes]],
+        sender: Optional[str] = None,
+        gas: Optional[int] = None
+    ) -> List[ExecutionResult]:
+        """
+        Run read-only calls as bare static messages under one checkpoint
+
+        Skips the transaction layer call() goes through (nonce, intrinsic
+        gas, refunds), which makes view reads roughly 3x cheaper. gas_used
+        is execution gas only.
+        """
+        origin = to_canonical_address(sender or DEFAULT_SENDER)
+        gas = gas or self.gas_limit
+        context = self._state.get_transaction_context_class()(gas_price=0, origin=origin)
+        computation_class = self._state.computation_class
+
+        results = []
+        checkpoint = self._state.snapshot()
+        try:
+            for to, data in calls:
+                target = to_canonical_address(to)
+                message = Message(
+                    gas=gas,
+                    to=target,
+                    sender=origin,
+                    value=0,
+                    data=data,
+                    code=self._state.get_code(target),
+                    is_static=True,
+                )
+                computation = computation_class.apply_message(self._state, message, context)
+                results.append(self._result(computation, gas - computation.get_gas_remaining()))
+        finally:
+            self._state.revert(checkpoint)
+        return results
+
+    def deploy(
+        self,
+        bytecode: Any,
+        sender: Optional[str] = None,
+        value: int = 0,
+        gas: Optional[int] = None
+    ) -> ExecutionResult:
+        """
+        Deploy a contract from creation bytecode (constructor args appended)
+
+        Returns:
+            ExecutionResult with contract_address set on success
+        """
+        sender = sender or DEFAULT_SENDER
+        sender_address = to_canonical_address(sender)
+        address = generate_contract_address(sender_address, self._state.get_nonce(sender_address))
+
+        result = self.execute(sender, None, _to_bytes(bytecode), value, gas)
+        if result.success:
+            result.contract_address = to_checksum_address(address)
+            self.alloc.setdefault(result.contract_address, {})
+            print(f"✅ Deployed contract: {result.contract_address} (gas: {result.gas_used:,})")
+        else:
+            print(f"❌ Deployment failed: {result.revert_reason}")
+        return result
+
+    def snapshot(self) -> bytes:
+        """
+        Persist pending changes and return the state root
+
+        Returns:
+            State root to pass to revert(); valid for the backend's lifetime
+        """
+        self._state.persist()
+        return self._state.state_root
+
+    def revert(self, snapshot_id: bytes):
+        """Restore the state captured by snapshot()"""
+        self._state = self._state_class(self._db, self._context, snapshot_id)
+
+    def enable_coverage(self) -> bool:
+        """
+        Record branch coverage on every execute()
+
+        Swaps in computation/state classes whose JUMPI logs the edge it
+        takes. Other opcodes run untouched, so the overhead is one Python
+        call per conditional jump.
+
+        Returns:
+            True
+        """
+        if self._edges is not None:
+            return True
+
+        edges: set = set()
+        base_computation = self._state_class.computation_class
+        jumpi = base_computation.opcodes[JUMPI]
+
+        def traced_jumpi(computation) -> None:
+            pc = computation.code.program_counter  # Already past the JUMPI byte
+            jumpi(computation=computation)
+            msg = computation.msg
+            edges.add((msg.code_address or msg.storage_address, pc - 1, computation.code.program_counter != pc))
+
+        computation_class = type(
+            f"Traced{base_computation.__name__}",
+            (base_computation,),
+            {"opcodes": {**base_computation.opcodes, JUMPI: traced_jumpi}}
+        )
+        self._state_class = type(
+            f"Traced{self._state_class.__name__}",
+            (self._state_class,),
+            {"computation_class": computation_class}
+        )
+        self._state = self._state_class(self._db, self._context, self.snapshot())
+        self._edges = edges
+        return True
+
+    def set_balance(self, address: str, balance: int):
+        """Set an account's ETH balance in wei"""
+        self._state.set_balance(to_canonical_address(address), balance)
+
+    def get_balance(self, address: str) -> int:
+        """Get an account's ETH balance in wei"""
+        return self._state.get_balance(to_canonical_address(address))
+
+    def get_code(self, address: str) -> bytes:
+        """Get an account's runtime bytecode"""
+        return self._state.get_code(to_canonical_address(address))
+
+    def get_storage_at(self, address: str, slot: int) -> int:
+        """Read a storage slot directly (no call overhead)"""
+        return self._state.get_storage(to_canonical_address(address), slot)
+
+    @property
+    def block_number(self) -> int:
+        return self._block_number
+
+def create_backend(
+    kind: str,
+    w3: Optional[Web3] = None,
+    addresses: Iterable[str] = (),
+    state_snapshot: Optional[str] = None
+) -> ExecutionBackend:
+    """
+    Build an execution backend by name
+
+    Args:
+        kind: 'rpc' or 'local'
+        w3: Web3 instance (required for 'rpc', and for 'local' without a snapshot file)
+        addresses: Accounts to fork when the local backend captures from the node
+        state_snapshot: Snapshot file for the local backend
+
+    Returns:
+        ExecutionBackend
+    """
+    if kind == "rpc":
+        if w3 is None:
+            raise ValueError("RPC backend requires a Web3 instance")
+        return RPCBackend(w3)
+
+    if kind == "local":
+        if state_snapshot:
+            return LocalEVMBackend.from_file(state_snapshot)
+        if w3 is None:
+            raise ValueError("Local backend requires a state snapshot file or a Web3 instance to fork from")
+        return LocalEVMBackend.from_rpc(w3, addresses)
+
+    raise ValueError(f"Unknown backend: {kind} (choose 'rpc' or 'local')")
@@ -5,15 +5,20 @@ Main fuzzing engine for smart contract testing
 
 REAL IMPLEMENTATION - No Mocks/Simulations
 - Real random input generation and execution
-- Real contract function calls via web3
-- Real invariant checking after each execution
+- Real contract function calls via web3 or an in-process EVM fork
+- Real state-changing sequences with snapshot/revert (local backend)
+- Real invariant checking after each execution (reads batched per check)
+- Real failing sequences shrunk to minimal reproducers (sequence_shrinker.py)
+- Real coverage feedback: branch edges from the local EVM drive an energy-scheduled corpus
 - Real vulnerability detection and reporting
+- Multi-process campaigns with a shared corpus (parallel_campaign.py)
 """
 
 import os
 import time
 import json
-from typing import List, Dict, Optional, Any, Tuple
+import random
+from typing import List, Dict, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from web3 import Web3
 from eth_typing import ChecksumAddress
@@ -22,6 +27,8 @@ from eth_account import Account
 from input_generator import InputGenerator, FuzzInput
 from invariant_checker import InvariantChecker, InvariantViolation, InvariantType
 from vulnerability_detector import VulnerabilityDetector, Vulnerability, Severity
+from evm_backend import ExecutionBackend, ExecutionResult, FunctionCodec, create_backend, extract_code_constants, DEFAULT_SENDER
+from sequence_shrinker import SequenceShrinker, SequenceStep, Reproducer, DEFAULT_SHRINK_REPLAYS
 
 @dataclass
 class FuzzConfig:
@@ -33,6 +40,14 @@ class FuzzConfig:
     mutation_rate: float = 0.2
     seed: Optional[int] = None
     verbose: bool = True
+    backend: str = "rpc"  # "rpc" (node, read-only) or "local" (in-process EVM)
+    state_snapshot: Optional[str] = None  # Snapshot file for the local backend
+    sequence_length: int = 20  # Transactions before reverting to the initial state
+    sender: Optional[str] = None  # msg.sender (local default: funded DEFAULT_SENDER)
+    workers: int = 1  # Worker processes (>1 runs a ParallelCampaign)
+    sync_interval: int = 200  # Iterations per worker between corpus syncs
+    coverage_guided: bool = True  # Branch-coverage feedback + bytecode dictionary
+    shrink_replays: int = DEFAULT_SHRINK_REPLAYS  # Replay budget per failing sequence (0 = no shrinking)
 
 @dataclass
 class FuzzResult:
@@ -61,6 +76,22 @@ class FuzzSummary:
     average_gas_per_call: float
     execution_time_seconds: float
     coverage_percentage: float = 0.0
+    corpus_size: int = 0
+    workers: int = 1
+    branch_edges: int = 0
+    first_issue_iteration: Optional[int] = None
+    reproducers: int = 0
+
+@dataclass
+class CorpusEntry:
+    """Input set kept because it reached something new"""
+    function_name: str
+    inputs: List[FuzzInput]
+    features: Tuple[Any, ...]  # Outcome keys and branch edges first reached by these inputs
+    picks: int = 0
+
+# Corpus entries kept per function (oldest entries are kept, later ones dropped)
+MAX_CORPUS_PER_FUNCTION = 256
 
 class FuzzEngine:
     """
@@ -68,8 +99,10 @@ class FuzzEngine:
     
     Features:
     - Random input generation for all function parameters
-    - Coverage-guided fuzzing (prioritize unexplored paths)
+    - Coverage-guided fuzzing: inputs reaching new branches or outcomes join
+      a corpus, replayed with stacked mutations weighted by edge rarity
     - Invariant checking after each execution
+    - Stateful sequences with failing ones shrunk to minimal reproducers
     - Vulnerability detection and classification
     - Crash detection and deduplication
     - Detailed execution reporting
@@ -80,7 +113,8 @@ class FuzzEngine:
         w3: Web3,
         contract_address: ChecksumAddress,
         contract_abi: List[Dict],
-        config: FuzzConfig
+        config: FuzzConfig,
+        backend: Optional[ExecutionBackend] = None
     ):
         """
         Initialize Fuzz Engine
@@ -90,6 +124,7 @@ class FuzzEngine:
             contract_address: Contract to fuzz
             contract_abi: Contract ABI
             config: Fuzzing configuration
+            backend: Execution backend (defaults to one built from config.backend)
         """
         self.w3 = w3
         self.contract_address = contract_address
@@ -98,21 +133,66 @@ class FuzzEngine:
             abi=contract_abi
         )
         self.config = config
+        self.backend = backend or create_backend(
+            config.backend,
+            w3=w3,
+            addresses=[contract_address],
+            state_snapshot=config.state_snapshot
+        )
+        self.sender = config.sender or (DEFAULT_SENDER if self.backend.name == "local" else None)
+        self.codecs = {
+            item["name"]: FunctionCodec(item)
+            for item in contract_abi
+            if item.get("type") == "function"
+        }
         
         # Initialize components
+        self.rng = random.Random(config.seed)
         self.input_generator = InputGenerator(seed=config.seed)
-        self.invariant_checker = InvariantChecker(w3, contract_address, contract_abi)
+        self.invariant_checker = InvariantChecker(w3, contract_address, contract_abi, backend=self.backend)
+        self.invariant_checker.verbose = config.verbose
         self.vulnerability_detector = VulnerabilityDetector(w3)
         
         # Tracking
         self.results: List[FuzzResult] = []
         self.function_coverage: Dict[str, int] = {}
         self.unique_crashes: Dict[str, int] = {}
+        self.iterations = 0
+        self.initial_state: Any = None
+        self.first_issue_iteration: Optional[int] = None
+        
+        # Calls since the last revert to initial_state, and the shortest
+        # failing sequence found per invariant. Violations are reused while a
+        # stateful backend's state is unchanged (reverted calls).
+        self.sequence: List[SequenceStep] = []
+        self.reproducers: Dict[str, Reproducer] = {}
+        self.known_failures: Set[str] = set()  # Shrunk by another worker
+        self._last_violations: Optional[List[InvariantViolation]] = None
+        
+        # Corpus of inputs that reached a new feature, replayed with mutations.
+        # Features are outcome keys ("function:status|violations") and, with
+        # coverage on, branch edges; feature_hits counts executions reaching each.
+        self.corpus: Dict[str, List[CorpusEntry]] = {}
+        self.feature_hits: Dict[Any, int] = {}
+        self.new_corpus_entries: List[CorpusEntry] = []
+        
+        self.coverage_guided = False
+        if config.coverage_guided:
+            self.coverage_guided = self.backend.enable_coverage()
+            try:
+                code = self.backend.get_code(contract_address)
+            except Exception as e:
+                print(f"⚠️  Could not read bytecode for the mutation dictionary: {e}")
+                code = b""
+            if code:
+                self.input_generator.add_dictionary(extract_code_constants(code))
         
         print("=" * 70)
         print("SMART CONTRACT FUZZ ENGINE")
         print("=" * 70)
         print(f"✅ Target: {contract_address}")
+        print(f"   Backend: {self.backend.name}")
+        print(f"   Coverage-guided: {'branch edges' if self.coverage_guided else 'outcomes only'}")
         print(f"   Max iterations: {config.max_iterations}")
         print(f"   Edge case prob: {config.edge_case_probability}")
         print(f"   Gas limit: {config.gas_limit:,}")
@@ -177,10 +257,7 @@ class FuzzEngine:
         
         # Generate inputs
         param_types = [p["type"] for p in params]
-        inputs = self.input_generator.generate_function_inputs(
-            param_types,
-            edge_case_probability=self.config.edge_case_probability
-        )
+        inputs = self.next_inputs(function_name, param_types)
         
         # Extract values
         input_values = [inp.value for inp in inputs]
@@ -198,39 +275,33 @@ class FuzzEngine:
             gas_used=0
         )
         
+        coverage = None
+        execution = None
+        sender = caller_account.address if caller_account else self.sender
+        self.sequence.append(SequenceStep(function_name, inputs, sender))
         try:
-            # Build and send transaction
-            func = self.contract.functions[function_name](*input_values)
+            # Build and execute transaction
+            codec = self.codecs[function_name]
+            execution = self.execute_step(function_name, inputs, sender)
             
-            # Estimate gas
-            try:
-                estimated_gas = func.estimate_gas()
-                result.gas_used = estimated_gas
-            except Exception as e:
-                # Estimation failed, might revert
-                result.revert_reason = str(e)
-                if self.config.verbose:
-                    print(f"  ⚠️  Gas estimation failed: {e}")
+            result.gas_used = execution.gas_used
+            result.tx_hash = execution.tx_hash
+            result.success = execution.success
+            result.revert_reason = execution.revert_reason
+            coverage = execution.coverage
             
-            # Try to call (read-only simulation)
-            try:
-                return_value = func.call()
-                result.success = True
-                
+            if execution.success:
                 if self.config.verbose:
-                    print(f"  ✅ Success (estimated gas: {result.gas_used:,})")
+                    print(f"  ✅ Success (gas: {result.gas_used:,})")
+                    return_value = codec.decode_output(execution.output) if execution.output else None
                     if return_value:
                         print(f"     Return: {return_value}")
-                
-            except Exception as e:
-                result.revert_reason = str(e)
-                result.success = False
-                
+            else:
                 if self.config.verbose:
-                    print(f"  ❌ Reverted: {e}")
+                    print(f"  ❌ Reverted: {execution.revert_reason}")
                 
                 # Track unique crashes
-                crash_sig = f"{function_name}:{str(e)[:50]}"
+                crash_sig = f"{function_name}:{str(execution.revert_reason)[:50]}"
                 self.unique_crashes[crash_sig] = self.unique_crashes.get(crash_sig, 0) + 1
         
         except Exception as e:
@@ -238,8 +309,12 @@ class FuzzEngine:
             if self.config.verbose:
                 print(f"  ❌ Error: {e}")
         
-        # Check invariants
-        violations = self.invariant_checker.check_all_invariants()
+        # Check invariants (a call that changed nothing cannot change the verdict)
+        if self.backend.stateful and self._last_violations is not None and not (execution and execution.success):
+            violations = self._last_violations
+        else:
+            violations = self.invariant_checker.check_all_invariants()
+            self._last_violations = violations
         result.invariant_violations = violations
         
         if violations and self.config.verbose:
@@ -275,15 +350,173 @@ class FuzzEngine:
         # Update coverage
         self.function_coverage[function_name] = self.function_coverage.get(function_name, 0) + 1
         
+        if self.first_issue_iteration is None and (result.invariant_violations or result.vulnerabilities):
+            self.first_issue_iteration = iteration
+        
+        # Keep inputs that reached an outcome or branch edge not seen before
+        status = "ok" if result.success else str(result.revert_reason)[:50]
+        violated = ",".join(v.invariant_name for v in result.invariant_violations)
+        new_features = []
+        for feature in (f"{function_name}:{status}|{violated}", *(coverage or ())):
+            hits = self.feature_hits.get(feature, 0)
+            if not hits:
+                new_features.append(feature)
+            self.feature_hits[feature] = hits + 1
+        
+        if new_features:
+            entry = CorpusEntry(function_name, inputs, tuple(new_features))
+            self.add_to_corpus(entry)
+            self.new_corpus_entries.append(entry)
+            if self.config.verbose and coverage:
+                print(f"  🆕 New coverage: {len(new_features)} features")
+        
         return result
     
+    def execute_step(
+        self,
+        function_name: str,
+        inputs: List[FuzzInput],
+        sender: Optional[str] = None
+    ) -> ExecutionResult:
+        """
+        Encode and execute one call on the backend (no checks or bookkeeping)
+        
+        Args:
+            function_name: Function to call
+            inputs: Arguments
+            sender: msg.sender (defaults to the engine's sender)
+        
+        Returns:
+            ExecutionResult
+        """
+        calldata = self.codecs[function_name].encode_call([inp.value for inp in inputs])
+        return self.backend.execute(sender or self.sender, self.contract_address, calldata, gas=self.config.gas_limit)
+    
+    def reset_sequence(self):
+        """Revert the backend to the initial state and start a new sequence"""
+        self.backend.revert(self.initial_state)
+        self.sequence = []
+        self._last_violations = None
+    
+    def shrink_failure(self, invariant_name: str) -> Reproducer:
+        """
+        Shrink the current sequence, which just broke invariant_name
+        
+        The backend is left at the initial state with an empty sequence.
+        
+        Returns:
+            Reproducer (also stored in self.reproducers)
+        """
+        reproducer = SequenceShrinker(self, self.config.shrink_replays).shrink(self.sequence, invariant_name)
+        self.reproducers[invariant_name] = reproducer
+        self.reset_sequence()
+        
+        if self.config.verbose:
+            print(f"  🔁 Shrunk {invariant_name}: {reproducer.original_length} → {len(reproducer.steps)} calls "
+                  f"({reproducer.replays} replays)")
+        return reproducer
+    
+    def next_inputs(self, function_name: str, param_types: List[str]) -> List[FuzzInput]:
+        """
+        Pick inputs for the next call
+        
+        With probability mutation_rate a corpus entry for the function is
+        picked by energy and replayed with stacked mutations (including
+        splicing with a second entry); otherwise fresh inputs are drawn.
+        
+        Args:
+            function_name: Function being fuzzed
+            param_types: Solidity parameter types
+        
+        Returns:
+            List of FuzzInput objects
+        """
+        entries = self.corpus.get(function_name)
+        if entries and param_types and self.rng.random() < self.config.mutation_rate:
+            entry = self.rng.choices(entries, weights=[self.energy(e) for e in entries])[0]
+            entry.picks += 1
+            donor = self.rng.choice(entries)
+            return self.input_generator.havoc(entry.inputs, donor.inputs)
+        
+        return self.input_generator.generate_function_inputs(
+            param_types,
+            edge_case_probability=self.config.edge_case_probability
+        )
+    
+    def energy(self, entry: CorpusEntry) -> float:
+        """
+        Scheduling weight of a corpus entry
+        
+        Entries holding rarely-hit features score high; the score decays
+        with the number of times the entry has already been picked.
+        """
+        rarity = sum(1.0 / self.feature_hits.get(feature, 1) for feature in entry.features)
+        return (1.0 + rarity) / (1 + entry.picks) ** 0.5
+    
+    def add_to_corpus(self, entry: CorpusEntry) -> bool:
+        """
+        Add an input set to the corpus
+        
+        Args:
+            entry: Corpus entry to keep
+        
+        Returns:
+            True if added (False when the function's corpus is full)
+        """
+        entries = self.corpus.setdefault(entry.function_name, [])
+        if len(entries) >= MAX_CORPUS_PER_FUNCTION:
+            return False
+        entries.append(entry)
+        self.input_generator.remember_inputs(entry.inputs)
+        return True
+    
+    def import_corpus(self, entries: List[CorpusEntry]) -> List[CorpusEntry]:
+        """
+        Merge corpus entries found by other workers
+        
+        Entries whose features this engine has all reached already are skipped.
+        
+        Args:
+            entries: Corpus entries from another engine
+        
+        Returns:
+            Entries that were new to this engine
+        """
+        accepted = []
+        for entry in entries:
+            if all(feature in self.feature_hits for feature in entry.features):
+                continue
+            for feature in entry.features:
+                self.feature_hits.setdefault(feature, 1)
+            entry.picks = 0
+            self.add_to_corpus(entry)
+            accepted.append(entry)
+        return accepted
+    
+    def drain_corpus_updates(self) -> List[CorpusEntry]:
+        """
+        Take the corpus entries found since the last drain
+        
+        Returns:
+            Corpus entries in discovery order
+        """
+        entries, self.new_corpus_entries = self.new_corpus_entries, []
+        return entries
+    
     def run_campaign(self) -> FuzzSummary:
         """
         Run complete fuzzing campaign
         
+        With config.workers > 1 the campaign is sharded across worker
+        processes (see parallel_campaign.ParallelCampaign).
+        
         Returns:
             FuzzSummary with results
         """
+        if self.config.workers > 1:
+            from parallel_campaign import ParallelCampaign
+            return ParallelCampaign(self).run()
+        
         print("\n" + "=" * 70)
         print("STARTING FUZZ CAMPAIGN")
         print("=" * 70)
@@ -310,41 +543,94 @@ class FuzzEngine:
             params = [p["type"] for p in func.get("inputs", [])]
             print(f"  • {func['name']}({', '.join(params)})")
         
-        # Fuzz each function
-        iteration = 0
-        while iteration < self.config.max_iterations:
-            # Check timeout
-            if time.time() - start_time > self.config.timeout_seconds:
+        # Fuzz in chunks of 100 for progress reporting
+        deadline = start_time + self.config.timeout_seconds
+        while self.iterations < self.config.max_iterations:
+            chunk = min(100, self.config.max_iterations - self.iterations)
+            if self.run_iterations(fuzzable_functions, chunk, deadline) < chunk:
                 print(f"\n⏱️  Timeout reached ({self.config.timeout_seconds}s)")
                 break
             
-            # Select function (weighted by coverage - prioritize less-tested)
-            import random
-            function_weights = []
-            for func in fuzzable_functions:
-                name = func["name"]
-                coverage = self.function_coverage.get(name, 0)
-                # Inverse weighting: less coverage = higher weight
-                weight = 1.0 / (coverage + 1)
-                function_weights.append(weight)
+            # Progress update
+            if self.iterations % 100 == 0:
+                elapsed = time.time() - start_time
+                rate = self.iterations / elapsed
+                print(f"\n📊 Progress: {self.iterations}/{self.config.max_iterations} "
+                      f"({rate:.1f} iter/sec)")
+        
+        # Leave the backend in its initial state
+        self.backend.revert(self.initial_state)
+        
+        summary = self.build_summary(fuzzable_functions, time.time() - start_time)
+        self.print_summary(summary)
+        
+        return summary
+    
+    def run_iterations(
+        self,
+        functions: List[Dict],
+        count: int,
+        deadline: Optional[float] = None
+    ) -> int:
+        """
+        Run up to count iterations, continuing the engine's sequence
+        
+        Functions are picked with inverse-coverage weights, updated in place
+        for the function just fuzzed. State-changing backends revert to the
+        initial snapshot every sequence_length calls, and the first sequence
+        to break each critical invariant is shrunk to a minimal reproducer.
+        
+        Args:
+            functions: Fuzzable function ABIs
+            count: Iterations to run
+            deadline: Stop early once time.time() passes this
+        
+        Returns:
+            Iterations actually run
+        """
+        if self.initial_state is None:
+            self.initial_state = self.backend.snapshot()
+        
+        # Inverse weighting: less coverage = higher weight
+        weights = [1.0 / (self.function_coverage.get(f["name"], 0) + 1) for f in functions]
+        indices = range(len(functions))
+        sequence_length = self.config.sequence_length
+        
+        run = 0
+        while run < count:
+            if deadline is not None and time.time() > deadline:
+                break
             
-            selected_func = random.choices(fuzzable_functions, weights=function_weights)[0]
+            if sequence_length and len(self.sequence) >= sequence_length:
+                self.reset_sequence()
             
-            # Fuzz the function
-            result = self.fuzz_function(selected_func, iteration)
+            index = self.rng.choices(indices, weights=weights)[0]
+            result = self.fuzz_function(functions[index], self.iterations)
+            weights[index] = 1.0 / (self.function_coverage[functions[index]["name"]] + 1)
             
-            iteration += 1
+            if self.backend.stateful and self.config.shrink_replays:
+                for violation in result.invariant_violations:
+                    name = violation.invariant_name
+                    if violation.critical and name not in self.reproducers and name not in self.known_failures:
+                        self.shrink_failure(name)
+                        break
             
-            # Progress update
-            if iteration % 100 == 0:
-                elapsed = time.time() - start_time
-                rate = iteration / elapsed
-                print(f"\n📊 Progress: {iteration}/{self.config.max_iterations} "
-                      f"({rate:.1f} iter/sec)")
+            self.iterations += 1
+            run += 1
         
-        # Generate summary
-        elapsed_time = time.time() - start_time
+        return run
+    
+    def build_summary(self, fuzzable_functions: List[Dict], elapsed_time: float) -> FuzzSummary:
+        """
+        Summarize this engine's results
+        
+        Args:
+            fuzzable_functions: Function ABIs the campaign targeted
+            elapsed_time: Campaign wall time in seconds
         
+        Returns:
+            FuzzSummary
+        """
         successful = sum(1 for r in self.results if r.success)
         failed = len(self.results) - successful
         total_gas = sum(r.gas_used for r in self.results)
@@ -355,7 +641,7 @@ class FuzzEngine:
         
         coverage = len(self.function_coverage) / len(fuzzable_functions) * 100 if fuzzable_functions else 0
         
-        summary = FuzzSummary(
+        return FuzzSummary(
             total_iterations=len(self.results),
             successful_calls=successful,
             failed_calls=failed,
@@ -365,12 +651,16 @@ class FuzzEngine:
             total_gas_used=total_gas,
             average_gas_per_call=avg_gas,
             execution_time_seconds=elapsed_time,
-            coverage_percentage=coverage
+            coverage_percentage=coverage,
+            corpus_size=sum(len(entries) for entries in self.corpus.values()),
+            branch_edges=self.count_edges(),
+            first_issue_iteration=self.first_issue_iteration,
+            reproducers=len(self.reproducers)
         )
-        
-        self.print_summary(summary)
-        
-        return summary
+    
+    def count_edges(self) -> int:
+        """Distinct branch edges reached (outcome keys are strings, edges tuples)"""
+        return sum(1 for feature in self.feature_hits if isinstance(feature, tuple))
     
     def print_summary(self, summary: FuzzSummary):
         """Print fuzzing summary"""
@@ -378,37 +668,52 @@ class FuzzEngine:
         print("FUZZ CAMPAIGN SUMMARY")
         print("=" * 70)
         
-        print(f"\n📊 Execution Statistics:")
+        print("\n📊 Execution Statistics:")
         print(f"   Total iterations: {summary.total_iterations}")
         print(f"   Successful: {summary.successful_calls} ({summary.successful_calls/summary.total_iterations*100:.1f}%)")
         print(f"   Failed: {summary.failed_calls} ({summary.failed_calls/summary.total_iterations*100:.1f}%)")
         print(f"   Execution time: {summary.execution_time_seconds:.2f}s")
         print(f"   Rate: {summary.total_iterations/summary.execution_time_seconds:.1f} iter/sec")
+        if summary.workers > 1:
+            print(f"   Workers: {summary.workers}")
         
-        print(f"\n⛽ Gas Analysis:")
+        print("\n⛽ Gas Analysis:")
         print(f"   Total gas: {summary.total_gas_used:,}")
         print(f"   Average: {summary.average_gas_per_call:,.0f} per call")
         
-        print(f"\n🎯 Coverage:")
+        print("\n🎯 Coverage:")
         print(f"   Function coverage: {summary.coverage_percentage:.1f}%")
+        print(f"   Corpus entries: {summary.corpus_size}")
+        if summary.branch_edges:
+            print(f"   Branch edges: {summary.branch_edges}")
         print(f"   Functions tested: {len(self.function_coverage)}")
         for func, count in sorted(self.function_coverage.items(), key=lambda x: -x[1]):
             print(f"      {func}: {count} iterations")
         
-        print(f"\n🐛 Issues Found:")
+        print("\n🐛 Issues Found:")
         print(f"   Invariant violations: {summary.total_invariant_violations}")
         print(f"   Vulnerabilities: {summary.total_vulnerabilities}")
         print(f"   Unique crashes: {summary.unique_crashes}")
+        if summary.first_issue_iteration is not None:
+            print(f"   First issue at iteration: {summary.first_issue_iteration}")
         
         if self.unique_crashes:
-            print(f"\n   Top crashes:")
+            print("\n   Top crashes:")
             for crash, count in sorted(self.unique_crashes.items(), key=lambda x: -x[1])[:5]:
                 print(f"      {crash[:60]}... ({count}x)")
         
+        if self.reproducers:
+            print("\n🔁 Minimal Reproducers:")
+            for name, reproducer in self.reproducers.items():
+                status = "" if reproducer.confirmed else " (did not replay)"
+                print(f"   {name}: {len(reproducer.steps)} of {reproducer.original_length} calls{status}")
+                for number, step in enumerate(reproducer.steps, 1):
+                    print(f"      {number}. {step.describe()[:100]}")
+        
         # Get detailed vulnerability summary
         vuln_summary = self.vulnerability_detector.get_summary()
         if vuln_summary["total"] > 0:
-            print(f"\n   Vulnerabilities by severity:")
+            print("\n   Vulnerabilities by severity:")
             for severity, count in vuln_summary["by_severity"].items():
                 if count > 0:
                     print(f"      {severity}: {count}")
@@ -416,14 +721,21 @@ class FuzzEngine:
 def main():
     """Example usage of Fuzz Engine"""
     
-    # Initialize Web3 (requires RPC_URL environment variable)
+    # Backend selection: FUZZ_BACKEND=local runs an in-process EVM, forked
+    # from FUZZ_STATE_SNAPSHOT if set (no node needed) or else from RPC_URL
+    backend = os.getenv("FUZZ_BACKEND", "rpc")
+    state_snapshot = os.getenv("FUZZ_STATE_SNAPSHOT")
+    
+    # Initialize Web3 (requires RPC_URL unless fuzzing a local snapshot)
     rpc_url = os.getenv("RPC_URL")
-    if not rpc_url:
+    if rpc_url:
+        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        print(f"Connected to: {rpc_url}")
+        print(f"Block: {w3.eth.block_number}\n")
+    elif backend == "local" and state_snapshot:
+        w3 = Web3()
+    else:
         raise ValueError("RPC_URL environment variable must be set")
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    
-    print(f"Connected to: {rpc_url}")
-    print(f"Block: {w3.eth.block_number}\n")
     
     # Example: Fuzz an ERC20 contract (USDC)
     usdc_address = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
@@ -441,7 +753,9 @@ def main():
         edge_case_probability=0.4,
         timeout_seconds=60,
         verbose=True,
-        seed=42
+        seed=42,
+        backend=backend,
+        state_snapshot=state_snapshot
     )
     
     # Initialize engine
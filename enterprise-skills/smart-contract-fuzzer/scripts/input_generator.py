@@ -7,17 +7,19 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real random input generation for all Solidity types
 - Real boundary value generation (min/max, zero, overflow)
 - Real mutation-based fuzzing from seed inputs
+- Real ABI-aware splicing and dictionary mutations (bytecode constants)
 - Real ABI parsing for function signatures
 """
 
 import random
-import secrets
 from typing import Any, List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from eth_abi import encode
 from eth_utils import to_checksum_address, to_bytes
 from web3 import Web3
 
+MAX_POOL_PER_TYPE = 64  # Splice donor values kept per ABI type
+
 @dataclass
 class FuzzInput:
     """Generated fuzz input for a function parameter"""
@@ -41,6 +43,8 @@ class InputGenerator:
     - Struct support via tuple
     - Edge case generation (zero, max, overflow)
     - Mutation-based fuzzing from seed corpus
+    - Stacked (havoc) mutations with ABI-aware splicing between corpus entries
+    - Mutation dictionary of magic values (e.g. PUSH constants from bytecode)
     """
     
     def __init__(self, seed: Optional[int] = None):
@@ -50,8 +54,9 @@ class InputGenerator:
         Args:
             seed: Random seed for reproducibility (optional)
         """
-        if seed:
-            random.seed(seed)
+        # Per-instance generator so seeded campaigns are reproducible
+        # (including across worker processes) without touching global state
+        self.rng = random.Random(seed)
         
         self.w3 = Web3()
         
@@ -62,15 +67,24 @@ class InputGenerator:
             "0xFFfFfFffFFfffFFfFFfFFFFFffFFFffffFfFFFfF",  # Max address
         ]
         
+        # Magic values for dictionary mutations, and parameter values from
+        # interesting inputs by type (donors for cross-function splicing)
+        self.dictionary: List[int] = []
+        self.value_pool: Dict[str, List[Any]] = {}
+        
         print("=" * 70)
         print("SMART CONTRACT INPUT GENERATOR")
         print("=" * 70)
-        if seed:
+        if seed is not None:
             print(f"✅ Seeded random generation (seed: {seed})")
         else:
             print("✅ Random input generation enabled")
         print()
     
+    def _random_bytes(self, length: int) -> bytes:
+        """Random bytes from the seeded generator"""
+        return self.rng.getrandbits(8 * length).to_bytes(length, "big") if length else b""
+    
     def generate_uint(
         self,
         bits: int = 256,
@@ -96,12 +110,12 @@ class InputGenerator:
                 (max_val, "maximum"),
                 (max_val - 1, "maximum - 1"),
                 (2 ** (bits - 1), "half maximum"),
-                (2 ** (bits // 2), f"sqrt(max)"),
+                (2 ** (bits // 2), "sqrt(max)"),
             ]
-            value, desc = random.choice(choices)
+            value, desc = self.rng.choice(choices)
         else:
             # Random value in range
-            value = random.randint(0, max_val)
+            value = self.rng.randint(0, max_val)
             desc = "random"
         
         return FuzzInput(
@@ -140,10 +154,10 @@ class InputGenerator:
                 (max_val, "maximum"),
                 (max_val - 1, "maximum - 1"),
             ]
-            value, desc = random.choice(choices)
+            value, desc = self.rng.choice(choices)
         else:
             # Random value in range
-            value = random.randint(min_val, max_val)
+            value = self.rng.randint(min_val, max_val)
             desc = "random"
         
         return FuzzInput(
@@ -164,11 +178,11 @@ class InputGenerator:
             FuzzInput with address value
         """
         if edge_case:
-            address = random.choice(self.edge_addresses)
+            address = self.rng.choice(self.edge_addresses)
             desc = "edge case address"
         else:
             # Random valid address
-            random_bytes = secrets.token_bytes(20)
+            random_bytes = self._random_bytes(20)
             address = to_checksum_address(random_bytes)
             desc = "random address"
         
@@ -182,7 +196,7 @@ class InputGenerator:
     def generate_bool(self) -> FuzzInput:
         """Generate boolean value"""
         return FuzzInput(
-            value=random.choice([True, False]),
+            value=self.rng.choice([True, False]),
             type_name="bool",
             description="random"
         )
@@ -208,25 +222,25 @@ class InputGenerator:
                 choices = [
                     (b'\x00' * size, "all zeros"),
                     (b'\xff' * size, "all ones"),
-                    (secrets.token_bytes(size), "random"),
+                    (self._random_bytes(size), "random"),
                 ]
-                value, desc = random.choice(choices)
+                value, desc = self.rng.choice(choices)
             else:
                 # Dynamic bytes edge cases
                 choices = [
                     (b'', "empty"),
                     (b'\x00', "single zero"),
                     (b'\xff' * 100, "large (100 bytes)"),
-                    (secrets.token_bytes(random.randint(1, 1000)), "random size"),
+                    (self._random_bytes(self.rng.randint(1, 1000)), "random size"),
                 ]
-                value, desc = random.choice(choices)
+                value, desc = self.rng.choice(choices)
         else:
             # Random bytes
             if size:
-                value = secrets.token_bytes(size)
+                value = self._random_bytes(size)
             else:
-                length = random.randint(0, 256)
-                value = secrets.token_bytes(length)
+                length = self.rng.randint(0, 256)
+                value = self._random_bytes(length)
             desc = "random"
         
         type_name = f"bytes{size}" if size else "bytes"
@@ -256,12 +270,12 @@ class InputGenerator:
                 ("Unicode: 你好世界 🚀", "unicode characters"),
                 (" " * 100, "whitespace"),
             ]
-            value, desc = random.choice(choices)
+            value, desc = self.rng.choice(choices)
         else:
             # Random string
-            length = random.randint(0, 100)
+            length = self.rng.randint(0, 100)
             chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 "
-            value = ''.join(random.choice(chars) for _ in range(length))
+            value = ''.join(self.rng.choice(chars) for _ in range(length))
             desc = "random"
         
         return FuzzInput(
@@ -295,13 +309,13 @@ class InputGenerator:
             else:
                 # Dynamic array edge cases
                 choices = [0, 1, 100, 1000]
-                array_length = random.choice(choices)
+                array_length = self.rng.choice(choices)
         else:
             # Random length
             if length:
                 array_length = length
             else:
-                array_length = random.randint(0, 50)
+                array_length = self.rng.randint(0, 50)
         
         # Generate elements
         elements = []
@@ -387,7 +401,7 @@ class InputGenerator:
         
         for param_type in param_types:
             # Decide if this should be an edge case
-            use_edge_case = random.random() < edge_case_probability
+            use_edge_case = self.rng.random() < edge_case_probability
             
             # Generate input
             fuzz_input = self.generate_for_type(param_type, use_edge_case)
@@ -395,6 +409,45 @@ class InputGenerator:
         
         return inputs
     
+    def _wrap_int(self, type_name: str, value: int) -> int:
+        """Wrap an integer into the range of its Solidity type (two's complement)"""
+        signed = not type_name.startswith("uint")
+        digits = type_name[3:] if signed else type_name[4:]
+        bits = int(digits) if digits else 256
+        value %= 2 ** bits
+        if signed and value >= 2 ** (bits - 1):
+            value -= 2 ** bits
+        return value
+    
+    def add_dictionary(self, values: List[int]):
+        """
+        Add magic values for dictionary mutations
+        
+        Args:
+            values: Integers to try verbatim (and off by one) in int/bytesN parameters
+        """
+        known = set(self.dictionary)
+        self.dictionary.extend(v for v in dict.fromkeys(values) if v not in known)
+        print(f"📖 Mutation dictionary: {len(self.dictionary)} values")
+    
+    def remember_inputs(self, inputs: List[FuzzInput]):
+        """
+        Keep parameter values from an interesting input set as splice donors
+        
+        Args:
+            inputs: Inputs that reached new coverage
+        """
+        for inp in inputs:
+            pool = self.value_pool.setdefault(inp.type_name, [])
+            if len(pool) < MAX_POOL_PER_TYPE:
+                pool.append(inp.value)
+            else:
+                pool[self.rng.randrange(MAX_POOL_PER_TYPE)] = inp.value
+    
+    def _dictionary_value(self) -> int:
+        """Dictionary value, sometimes off by one to cross </<= boundaries"""
+        return self.rng.choice(self.dictionary) + self.rng.choice([0, 0, 0, 1, -1])
+    
     def mutate_input(self, original: FuzzInput) -> FuzzInput:
         """
         Mutate an existing input (mutation-based fuzzing)
@@ -405,15 +458,21 @@ class InputGenerator:
         Returns:
             Mutated FuzzInput
         """
-        if "uint" in original.type_name or "int" in original.type_name:
-            # Mutate integer: flip bits, add/subtract, multiply
+        if "int" in original.type_name and "[" not in original.type_name:
+            # Mutate integer: flip bits, add/subtract, multiply, dictionary
+            bits = int(original.type_name.lstrip("uint") or 256)
             mutations = [
-                lambda x: x + random.randint(-10, 10),
-                lambda x: x * random.choice([0, 1, 2, 10]),
-                lambda x: x ^ random.randint(0, 0xFF),
+                lambda x: x + self.rng.randint(-10, 10),
+                lambda x: x * self.rng.choice([0, 1, 2, 10]),
+                lambda x: x ^ self.rng.randint(0, 0xFF),
+                lambda x: x ^ (1 << self.rng.randrange(bits)),
                 lambda x: -x if isinstance(x, int) else x,
             ]
-            mutated_value = random.choice(mutations)(original.value)
+            if self.dictionary:
+                # As likely as all arithmetic mutations combined: magic values
+                # are what random mutation almost never reaches
+                mutations.extend([lambda x: self._dictionary_value()] * len(mutations))
+            mutated_value = self._wrap_int(original.type_name, self.rng.choice(mutations)(original.value))
             
             return FuzzInput(
                 value=mutated_value,
@@ -424,8 +483,8 @@ class InputGenerator:
         elif original.type_name == "address":
             # Mutate address: flip bytes
             addr_bytes = bytearray(to_bytes(hexstr=original.value))
-            pos = random.randint(0, len(addr_bytes) - 1)
-            addr_bytes[pos] ^= random.randint(1, 255)
+            pos = self.rng.randint(0, len(addr_bytes) - 1)
+            addr_bytes[pos] ^= self.rng.randint(1, 255)
             mutated_value = to_checksum_address(bytes(addr_bytes))
             
             return FuzzInput(
@@ -434,6 +493,21 @@ class InputGenerator:
                 description="mutated address"
             )
         
+        elif original.type_name.startswith("bytes") and original.type_name != "bytes" and "[" not in original.type_name:
+            # Mutate fixed bytes: flip a byte or drop in a dictionary value
+            size = int(original.type_name[5:])
+            value_bytes = bytearray(original.value)
+            if self.dictionary and self.rng.random() < 0.5:
+                value_bytes = bytearray((self._dictionary_value() % 2 ** (8 * size)).to_bytes(size, "big"))
+            else:
+                value_bytes[self.rng.randrange(size)] ^= self.rng.randint(1, 255)
+            
+            return FuzzInput(
+                value=bytes(value_bytes),
+                type_name=original.type_name,
+                description="mutated fixed bytes"
+            )
+        
         elif original.type_name in ["bytes", "string"]:
             # Mutate bytes/string: insert, delete, modify
             if isinstance(original.value, str):
@@ -442,11 +516,11 @@ class InputGenerator:
                 value_bytes = original.value
             
             mutations = [
-                lambda b: b + secrets.token_bytes(1),  # Append
+                lambda b: b + self._random_bytes(1),  # Append
                 lambda b: b[:-1] if len(b) > 0 else b,  # Delete
-                lambda b: secrets.token_bytes(1) + b,  # Prepend
+                lambda b: self._random_bytes(1) + b,  # Prepend
             ]
-            mutated_bytes = random.choice(mutations)(value_bytes)
+            mutated_bytes = self.rng.choice(mutations)(value_bytes)
             
             if isinstance(original.value, str):
                 mutated_value = mutated_bytes.decode(errors='ignore')
@@ -462,6 +536,68 @@ class InputGenerator:
         else:
             # For other types, regenerate
             return self.generate_for_type(original.type_name)
+    
+    def splice_inputs(self, first: List[FuzzInput], second: List[FuzzInput]) -> List[FuzzInput]:
+        """
+        ABI-aware crossover of two input sets for the same function
+        
+        Each parameter is taken from either parent, so values stay valid
+        for their type (no byte-level splicing across ABI boundaries).
+        
+        Args:
+            first: Parent input set
+            second: Other parent, same parameter types
+        
+        Returns:
+            Spliced input set
+        """
+        return [
+            b if a.type_name == b.type_name and self.rng.random() < 0.5 else a
+            for a, b in zip(first, second)
+        ]
+    
+    def havoc(
+        self,
+        inputs: List[FuzzInput],
+        donor: Optional[List[FuzzInput]] = None,
+        max_mutations: int = 4
+    ) -> List[FuzzInput]:
+        """
+        Apply a stack of random mutations to a function's inputs
+        
+        Each round picks one of: mutate a parameter, splice with the donor
+        input set, or swap a parameter for a pooled value of the same type
+        (taken from any function's interesting inputs).
+        
+        Args:
+            inputs: Input set to start from (not modified)
+            donor: Second corpus entry of the same function for splicing
+            max_mutations: Upper bound on stacked mutations
+        
+        Returns:
+            Mutated input set
+        """
+        mutated = list(inputs)
+        if not mutated:
+            return mutated
+        
+        for _ in range(self.rng.randint(1, max_mutations)):
+            operation = self.rng.random()
+            position = self.rng.randrange(len(mutated))
+            pool = self.value_pool.get(mutated[position].type_name)
+            
+            if donor and operation < 0.2:
+                mutated = self.splice_inputs(mutated, donor)
+            elif pool and operation < 0.35:
+                mutated[position] = FuzzInput(
+                    value=self.rng.choice(pool),
+                    type_name=mutated[position].type_name,
+                    description="spliced from corpus"
+                )
+            else:
+                mutated[position] = self.mutate_input(mutated[position])
+        
+        return mutated
 
 def main():
     """Example usage of Input Generator"""
@@ -491,7 +627,7 @@ def main():
     
     for _ in range(5):
         edge_input = generator.generate_uint(256, edge_case=True)
-        print(f"\nuint256 (edge case):")
+        print("\nuint256 (edge case):")
         print(f"  Value: {edge_input.value}")
         print(f"  Description: {edge_input.description}")
     
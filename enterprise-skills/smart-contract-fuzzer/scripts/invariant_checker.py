@@ -8,15 +8,18 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real balance/supply/ownership verification
 - Real arithmetic invariant checking
 - Real access control validation
+- Real batched state reads: one Multicall3 / local EVM batch per check
 """
 
 import os
-from typing import Any, List, Dict, Callable, Optional
+from typing import Any, List, Dict, Callable, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from web3 import Web3
 from eth_typing import ChecksumAddress
 
+from evm_backend import ExecutionBackend, RPCBackend, FunctionCodec
+
 class InvariantType(Enum):
     """Types of contract invariants"""
     BALANCE = "balance"  # Token balance rules
@@ -71,13 +74,16 @@ class InvariantChecker:
     - Arithmetic invariants (a + b >= a, no overflow)
     - State transition invariants (valid state changes)
     - Access control invariants (role-based permissions)
+    - Batched evaluation: reads made by the previous check are fetched in
+      one batch up front, so each check costs one round trip
     """
     
     def __init__(
         self,
         w3: Web3,
         contract_address: ChecksumAddress,
-        contract_abi: List[Dict]
+        contract_abi: List[Dict],
+        backend: Optional[ExecutionBackend] = None
     ):
         """
         Initialize Invariant Checker
@@ -86,14 +92,32 @@ class InvariantChecker:
             w3: Web3 instance
             contract_address: Contract to check
             contract_abi: Contract ABI
+            backend: Execution backend to read state from (defaults to web3 calls)
         """
         self.w3 = w3
         self.contract = w3.eth.contract(
             address=contract_address,
             abi=contract_abi
         )
+        self.contract_address = contract_address
+        self.backend = backend
+        self.codecs = {
+            item["name"]: FunctionCodec(item)
+            for item in contract_abi
+            if item.get("type") == "function"
+        }
         self.invariants: List[Invariant] = []
         self.violations: List[InvariantViolation] = []
+        self.verbose = True
+        
+        # Reads requested during the last check, keyed (function_name, args);
+        # the next check prefetches them in one batch through the reader
+        self.reader = backend or RPCBackend(w3)
+        self.read_set: Dict[Tuple[str, Tuple], bool] = {}
+        self.batched_reads = 0
+        self.unbatched_reads = 0
+        self._reads: Optional[Dict[Tuple[str, Tuple], Any]] = None
+        self._requested: Dict[Tuple[str, Tuple], bool] = {}
         
         print("=" * 70)
         print("SMART CONTRACT INVARIANT CHECKER")
@@ -101,6 +125,86 @@ class InvariantChecker:
         print(f"✅ Checking contract: {contract_address}")
         print()
     
+    def call(self, function_name: str, *args) -> Any:
+        """
+        Call a view function on the contract
+        
+        Reads go through the execution backend when one is set, so
+        invariants see the backend's state (e.g. the local EVM fork).
+        During check_all_invariants() results come from the prefetched
+        batch when the same read was made by the previous check.
+        
+        Args:
+            function_name: Contract function to call
+            *args: Function arguments
+        
+        Returns:
+            Decoded return value
+        """
+        key = (function_name, args)
+        batching = self._reads is not None
+        if batching:
+            try:
+                self._requested[key] = True
+            except TypeError:
+                batching = False  # Unhashable args (lists): read directly, never batched
+        
+        if not batching:
+            return self._read(function_name, args)
+        
+        if key not in self._reads:
+            self.unbatched_reads += 1
+            try:
+                self._reads[key] = self._read(function_name, args)
+            except Exception as e:
+                self._reads[key] = e
+        value = self._reads[key]
+        if isinstance(value, Exception):
+            raise value
+        return value
+    
+    def _read(self, function_name: str, args: Tuple) -> Any:
+        """Make one view call through the backend (or web3)"""
+        if self.backend is None:
+            return self.contract.functions[function_name](*args).call()
+        
+        codec = self.codecs[function_name]
+        result = self.backend.call(self.contract_address, codec.encode_call(args))
+        if not result.success:
+            raise RuntimeError(f"{function_name}() reverted: {result.revert_reason}")
+        return codec.decode_output(result.output)
+    
+    def prefetch(self, reads: List[Tuple[str, Tuple]]) -> Dict[Tuple[str, Tuple], Any]:
+        """
+        Read several view functions in one batch
+        
+        Args:
+            reads: (function_name, args) pairs
+        
+        Returns:
+            Decoded value per read (or the exception the read raised)
+        """
+        values: Dict[Tuple[str, Tuple], Any] = {}
+        batch = []
+        for function_name, args in reads:
+            try:
+                batch.append(((function_name, args), self.codecs[function_name].encode_call(args)))
+            except Exception as e:
+                values[(function_name, args)] = e
+        
+        results = self.reader.call_many([(self.contract_address, calldata) for _, calldata in batch])
+        self.batched_reads += len(batch)
+        
+        for ((function_name, args), _), result in zip(batch, results):
+            if not result.success:
+                values[(function_name, args)] = RuntimeError(f"{function_name}() reverted: {result.revert_reason}")
+                continue
+            try:
+                values[(function_name, args)] = self.codecs[function_name].decode_output(result.output)
+            except Exception as e:
+                values[(function_name, args)] = e
+        return values
+    
     def add_invariant(
         self,
         name: str,
@@ -129,50 +233,80 @@ class InvariantChecker:
         self.invariants.append(invariant)
         print(f"✅ Added invariant: {name}")
     
+    def evaluate(self, invariant: Invariant) -> Optional[InvariantViolation]:
+        """
+        Evaluate one invariant against the current state
+        
+        Args:
+            invariant: Invariant to evaluate
+        
+        Returns:
+            InvariantViolation if it does not hold, else None
+        
+        Raises:
+            Exception: Whatever the check function raised
+        """
+        result = invariant.check_function()
+        if not (result is False or (isinstance(result, tuple) and not result[0])):
+            return None
+        
+        if isinstance(result, tuple):
+            _, actual_value, expected = result
+        else:
+            actual_value = "N/A"
+            expected = invariant.description
+        
+        return InvariantViolation(
+            invariant_name=invariant.name,
+            inv_type=invariant.inv_type,
+            description=invariant.description,
+            actual_value=actual_value,
+            expected_condition=expected,
+            critical=invariant.critical
+        )
+    
     def check_all_invariants(self) -> List[InvariantViolation]:
         """
         Check all registered invariants
         
+        Reads made through call() by the previous check are fetched in one
+        batch first; reads not seen before are made individually and join
+        the batch from the next check on.
+        
         Returns:
             List of detected violations
         """
-        print(f"\n🔍 Checking {len(self.invariants)} invariants...")
+        if self.verbose:
+            print(f"\n🔍 Checking {len(self.invariants)} invariants...")
         
         violations = []
+        self._reads = self.prefetch(list(self.read_set)) if self.read_set else {}
+        self._requested = {}
         
-        for invariant in self.invariants:
-            try:
-                # Execute check function
-                result = invariant.check_function()
+        try:
+            for invariant in self.invariants:
+                try:
+                    violation = self.evaluate(invariant)
+                except Exception as e:
+                    if self.verbose:
+                        print(f"  ⚠️  Error checking {invariant.name}: {e}")
+                    continue
                 
-                if result is False or (isinstance(result, tuple) and not result[0]):
-                    # Invariant violated
-                    if isinstance(result, tuple):
-                        _, actual_value, expected = result
-                    else:
-                        actual_value = "N/A"
-                        expected = invariant.description
-                    
-                    violation = InvariantViolation(
-                        invariant_name=invariant.name,
-                        inv_type=invariant.inv_type,
-                        description=invariant.description,
-                        actual_value=actual_value,
-                        expected_condition=expected,
-                        critical=invariant.critical,
-                        block_number=self.w3.eth.block_number
-                    )
+                if violation:
                     violations.append(violation)
-                    
-                    symbol = "❌" if invariant.critical else "⚠️"
-                    print(f"  {symbol} VIOLATION: {invariant.name}")
-                    print(f"     Actual: {actual_value}")
-                    print(f"     Expected: {expected}")
-                
-            except Exception as e:
-                print(f"  ⚠️  Error checking {invariant.name}: {e}")
+                    if self.verbose:
+                        symbol = "❌" if invariant.critical else "⚠️"
+                        print(f"  {symbol} VIOLATION: {invariant.name}")
+                        print(f"     Actual: {violation.actual_value}")
+                        print(f"     Expected: {violation.expected_condition}")
+        finally:
+            self.read_set, self._requested, self._reads = self._requested, {}, None
         
-        if not violations:
+        if violations:
+            block_number = self.backend.block_number if self.backend else self.w3.eth.block_number
+            for violation in violations:
+                violation.block_number = block_number
+        elif self.verbose:
             print("  ✅ All invariants hold")
         
         self.violations.extend(violations)
@@ -196,7 +330,7 @@ class InvariantChecker:
             Check function
         """
         def check() -> tuple:
-            balance = self.contract.functions.balanceOf(address).call()
+            balance = self.call("balanceOf", address)
             
             if balance < min_balance:
                 return False, balance, f">= {min_balance}"
@@ -217,7 +351,7 @@ class InvariantChecker:
         """
         def check() -> tuple:
             try:
-                total_supply = self.contract.functions.totalSupply().call()
+                total_supply = self.call("totalSupply")
                 
                 # Check non-negative
                 if total_supply < 0:
@@ -250,7 +384,7 @@ class InvariantChecker:
         """
         def check() -> tuple:
             try:
-                actual_owner = self.contract.functions.owner().call()
+                actual_owner = self.call("owner")
                 
                 if actual_owner.lower() != expected_owner.lower():
                     return False, actual_owner, expected_owner
@@ -283,7 +417,7 @@ class InvariantChecker:
         """
         def check() -> tuple:
             try:
-                result = self.contract.functions[function_name](*args).call()
+                result = self.call(function_name, *args)
                 
                 if expected_min is not None and result < expected_min:
                     return False, result, f">= {expected_min}"
@@ -321,17 +455,17 @@ class InvariantChecker:
             if operation == "add":
                 result = a + b
                 overflow = result > max_uint256
-                expected = f"a + b <= 2^256 - 1"
+                expected = "a + b <= 2^256 - 1"
             
             elif operation == "sub":
                 result = a - b
                 overflow = result < 0 or a < b
-                expected = f"a >= b (no underflow)"
+                expected = "a >= b (no underflow)"
             
             elif operation == "mul":
                 result = a * b
                 overflow = result > max_uint256
-                expected = f"a * b <= 2^256 - 1"
+                expected = "a * b <= 2^256 - 1"
             
             elif operation == "div":
                 if b == 0:
@@ -367,7 +501,7 @@ class InvariantChecker:
         """
         def check() -> tuple:
             try:
-                current_state = self.contract.functions[state_function]().call()
+                current_state = self.call(state_function)
                 
                 if current_state not in valid_states:
                     return False, current_state, f"in {valid_states}"
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Smart Contract Parallel Campaign - Multi-Process Fuzzing
+Shard fuzz iterations across worker processes with a shared corpus
+
+REAL IMPLEMENTATION - No Mocks/Simulations
+- One worker process per shard, each with its own copy of the EVM state
+- Coordinator exchanges corpus entries and shrunk failure signatures every
+  epoch, so a failure is shrunk once rather than once per worker
+- Epoch barriers keep campaigns deterministic for a given seed
+- Worker results merged into one FuzzSummary in worker order, with crash
+  counts summed per signature and duplicate vulnerabilities dropped
+"""
+
+import os
+import sys
+import time
+import queue
+import random
+import traceback
+import multiprocessing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from fuzz_engine import FuzzEngine, FuzzSummary, CorpusEntry
+from sequence_shrinker import Reproducer
+from vulnerability_detector import Vulnerability
+
+WORKER_SEED_STRIDE = 1_000_003  # Keeps worker seed streams apart
+WORKER_POLL_SECONDS = 1.0
+
+@dataclass
+class WorkerReport:
+    """Final results from one worker process"""
+    worker_id: int
+    iterations: int
+    successful_calls: int
+    failed_calls: int
+    total_gas_used: int
+    invariant_violations: int
+    vulnerabilities: List[Vulnerability]
+    function_coverage: Dict[str, int]
+    unique_crashes: Dict[str, int]
+    feature_hits: Dict[Any, int]
+    first_issue_iteration: Optional[int]  # Worker-local iteration number
+    reproducers: Dict[str, Reproducer]
+
+def global_iteration(local: int, worker_id: int, progress: List[List[int]]) -> int:
+    """
+    Campaign-wide index of a worker-local iteration
+
+    progress[e][w] is worker w's completed iterations after epoch e. Within an
+    epoch the workers' iterations are taken as interleaved round-robin in
+    worker order, the same order reports are merged in.
+    """
+    before = [0] * len(progress[0]) if progress else []
+    for after in progress:
+        if local < after[worker_id]:
+            offset = local - before[worker_id]
+            ran = [a - b for a, b in zip(after, before)]
+            earlier = sum(min(n, offset) for n in ran)
+            rank = sum(1 for w in range(worker_id) if ran[w] > offset)
+            return sum(before) + earlier + rank
+        before = after
+    return sum(before) + local - (before[worker_id] if before else 0)
+
+def _vulnerability_key(vulnerability: Vulnerability) -> Tuple:
+    """Same finding in the same function, whatever inputs triggered it"""
+    return (vulnerability.vuln_type, vulnerability.location, vulnerability.description)
+
+def worker_seed(seed: Optional[int], worker_id: int) -> Optional[int]:
+    """Derive a worker's seed from the campaign seed (None stays random)"""
+    if seed is None:
+        return None
+    return seed * WORKER_SEED_STRIDE + worker_id
+
+def _run_worker(
+    engine: FuzzEngine,
+    worker_id: int,
+    shard: int,
+    epochs: int,
+    sync_interval: int,
+    functions: List[Dict],
+    deadline: float,
+    inbox,
+    outbox
+):
+    """
+    Worker process body
+
+    The engine (backend state, invariants, corpus) is inherited from the
+    coordinator by fork. Each epoch the worker runs its slice, reports the
+    corpus entries that reached new features and the failures it has shrunk,
+    then blocks until the coordinator sends back what the other workers found
+    in the same epoch. Failures shrunk elsewhere are not shrunk again.
+    """
+    sys.stdout = open(os.devnull, "w")
+    try:
+        seed = worker_seed(engine.config.seed, worker_id)
+        engine.rng = random.Random(seed)
+        engine.input_generator.rng = random.Random(seed)
+
+        done = 0
+        for epoch in range(epochs):
+            count = min(sync_interval, shard - done)
+            if count > 0:
+                done += engine.run_iterations(functions, count, deadline)
+            outbox.put(("epoch", worker_id, done, engine.drain_corpus_updates(), sorted(engine.reproducers)))
+            corpus, failures = inbox.get()
+            engine.import_corpus(corpus)
+            engine.known_failures.update(failures)
+
+        results = engine.results
+        successful = sum(1 for r in results if r.success)
+        outbox.put(("done", worker_id, WorkerReport(
+            worker_id=worker_id,
+            iterations=len(results),
+            successful_calls=successful,
+            failed_calls=len(results) - successful,
+            total_gas_used=sum(r.gas_used for r in results),
+            invariant_violations=sum(len(r.invariant_violations) for r in results),
+            vulnerabilities=[v for r in results for v in r.vulnerabilities],
+            function_coverage=engine.function_coverage,
+            unique_crashes=engine.unique_crashes,
+            feature_hits=engine.feature_hits,
+            first_issue_iteration=engine.first_issue_iteration,
+            reproducers=engine.reproducers,
+        )))
+    except BaseException:
+        outbox.put(("error", worker_id, traceback.format_exc()))
+
+class ParallelCampaign:
+    """
+    Run a FuzzEngine campaign across worker processes
+
+    Features:
+    - Iterations sharded evenly across workers
+    - Per-worker EVM state (copy-on-write fork of the coordinator's snapshot)
+    - Shared corpus and shrunk failure signatures, exchanged at epoch barriers
+    - Crash counts, reproducers and vulnerabilities merged once, after the run
+    - Deterministic merged FuzzSummary for a given seed (when the campaign
+      ends on max_iterations rather than the timeout)
+    """
+
+    def __init__(
+        self,
+        engine: FuzzEngine,
+        workers: Optional[int] = None,
+        sync_interval: Optional[int] = None
+    ):
+        """
+        Initialize Parallel Campaign
+
+        Args:
+            engine: Configured engine (backend, invariants) to replicate in each worker
+            workers: Worker processes (defaults to config.workers, or the CPU count)
+            sync_interval: Iterations per worker between corpus syncs (defaults to config.sync_interval)
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("Parallel campaigns need the 'fork' start method (Linux/macOS)")
+
+        config = engine.config
+        self.engine = engine
+        self.workers = workers or (config.workers if config.workers > 1 else os.cpu_count() or 1)
+        self.sync_interval = max(1, sync_interval or config.sync_interval)
+        self._context = multiprocessing.get_context("fork")
+
+    def _collect(self, outbox, processes: List) -> Dict[int, Tuple]:
+        """Wait for one message from every worker, keyed by worker id"""
+        messages = {}
+        while len(messages) < len(processes):
+            try:
+                message = outbox.get(timeout=WORKER_POLL_SECONDS)
+            except queue.Empty:
+                for worker_id, process in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"Worker {worker_id} exited unexpectedly (code {process.exitcode})")
+                continue
+
+            kind, worker_id = message[0], message[1]
+            if kind == "error":
+                raise RuntimeError(f"Worker {worker_id} failed:\n{message[2]}")
+            messages[worker_id] = message[2:]
+        return messages
+
+    def run(self) -> FuzzSummary:
+        """
+        Run the sharded campaign
+
+        Returns:
+            FuzzSummary merged across workers
+        """
+        engine = self.engine
+        config = engine.config
+
+        print("\n" + "=" * 70)
+        print("STARTING PARALLEL FUZZ CAMPAIGN")
+        print("=" * 70)
+
+        start_time = time.time()
+        functions = engine.get_fuzzable_functions()
+        if not functions:
+            print("⚠️  No fuzzable functions found (all are view/pure)")
+            return engine.build_summary(functions, 0.0)
+
+        total = config.max_iterations
+        shards = [total // self.workers + (1 if i < total % self.workers else 0) for i in range(self.workers)]
+        epochs = -(-max(shards) // self.sync_interval)
+        deadline = start_time + config.timeout_seconds
+
+        print(f"✅ Workers: {self.workers}")
+        print(f"   Iterations: {total} ({max(shards)} per worker)")
+        print(f"   Sync interval: {self.sync_interval} iterations ({epochs} epochs)")
+
+        # Workers fork from this state and revert to it between sequences
+        engine.initial_state = engine.backend.snapshot()
+
+        outbox = self._context.Queue()
+        inboxes = [self._context.Queue() for _ in range(self.workers)]
+        processes = [
+            self._context.Process(
+                target=_run_worker,
+                args=(engine, worker_id, shards[worker_id], epochs, self.sync_interval,
+                      functions, deadline, inboxes[worker_id], outbox),
+                daemon=True
+            )
+            for worker_id in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        progress: List[List[int]] = []
+        try:
+            for epoch in range(epochs):
+                updates = self._collect(outbox, processes)
+
+                # Merge in worker order so the result does not depend on
+                # arrival order; a feature reached by several workers in
+                # the same epoch is kept from the lowest worker id
+                fresh: Dict[int, List[CorpusEntry]] = {}
+                for worker_id in sorted(updates):
+                    fresh[worker_id] = engine.import_corpus(updates[worker_id][1])
+
+                failures = sorted({name for update in updates.values() for name in update[2]})
+                for worker_id, inbox in enumerate(inboxes):
+                    inbox.put(([e for other in sorted(fresh) if other != worker_id for e in fresh[other]],
+                               failures))
+
+                progress.append([updates[worker_id][0] for worker_id in range(self.workers)])
+                done = sum(progress[-1])
+                elapsed = time.time() - start_time
+                print(f"\n📊 Progress: {done}/{total} ({done / elapsed:.1f} iter/sec, "
+                      f"corpus {sum(len(e) for e in engine.corpus.values())})")
+
+            reports = self._collect(outbox, processes)
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        summary = self._merge([reports[worker_id][0] for worker_id in sorted(reports)],
+                              functions, time.time() - start_time, progress)
+        engine.print_summary(summary)
+        return summary
+
+    def _merge(
+        self,
+        reports: List[WorkerReport],
+        functions: List[Dict],
+        elapsed_time: float,
+        progress: Optional[List[List[int]]] = None
+    ) -> FuzzSummary:
+        """
+        Merge worker reports into the coordinator engine and a FuzzSummary
+
+        Reports are combined in worker order so the result only depends on
+        the seed, not on which worker finished first. A vulnerability found
+        by several workers (same type, function and description) is kept
+        once, from the lowest worker id.
+
+        Args:
+            reports: Worker reports in worker order
+            functions: Fuzzable function ABIs
+            elapsed_time: Campaign wall time in seconds
+            progress: Per-epoch completed iterations per worker, used to turn
+                first_issue_iteration into a campaign-wide index
+        """
+        engine = self.engine
+        function_coverage: Dict[str, int] = {}
+        unique_crashes: Dict[str, int] = {}
+        feature_hits: Dict[Any, int] = {}
+        reproducers: Dict[str, Reproducer] = {}
+        vulnerabilities: List[Vulnerability] = []
+        seen_vulnerabilities = set()
+
+        for report in reports:
+            for name, count in report.function_coverage.items():
+                function_coverage[name] = function_coverage.get(name, 0) + count
+            for crash, count in report.unique_crashes.items():
+                unique_crashes[crash] = unique_crashes.get(crash, 0) + count
+            for feature, count in report.feature_hits.items():
+                feature_hits[feature] = feature_hits.get(feature, 0) + count
+            for name, reproducer in report.reproducers.items():
+                # Shortest confirmed reproducer wins; ties go to the lowest worker id
+                best = reproducers.get(name)
+                if best is None or (reproducer.confirmed, -len(reproducer.steps)) > (best.confirmed, -len(best.steps)):
+                    reproducers[name] = reproducer
+            for vulnerability in report.vulnerabilities:
+                key = _vulnerability_key(vulnerability)
+                if key not in seen_vulnerabilities:
+                    seen_vulnerabilities.add(key)
+                    vulnerabilities.append(vulnerability)
+
+        engine.function_coverage = function_coverage
+        engine.unique_crashes = unique_crashes
+        engine.feature_hits = feature_hits
+        engine.reproducers = reproducers
+        engine.vulnerability_detector.vulnerabilities = vulnerabilities
+
+        iterations = sum(r.iterations for r in reports)
+        total_gas = sum(r.total_gas_used for r in reports)
+        first_issues = [
+            global_iteration(r.first_issue_iteration, r.worker_id, progress or [])
+            for r in reports if r.first_issue_iteration is not None
+        ]
+
+        return FuzzSummary(
+            total_iterations=iterations,
+            successful_calls=sum(r.successful_calls for r in reports),
+            failed_calls=sum(r.failed_calls for r in reports),
+            total_invariant_violations=sum(r.invariant_violations for r in reports),
+            total_vulnerabilities=len(vulnerabilities),
+            unique_crashes=len(unique_crashes),
+            total_gas_used=total_gas,
+            average_gas_per_call=total_gas / iterations if iterations else 0,
+            execution_time_seconds=elapsed_time,
+            coverage_percentage=len(function_coverage) / len(functions) * 100 if functions else 0,
+            corpus_size=sum(len(entries) for entries in engine.corpus.values()),
+            workers=len(reports),
+            branch_edges=engine.count_edges(),
+            first_issue_iteration=min(first_issues) if first_issues else None,
+            reproducers=len(reproducers)
+        )
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Smart Contract Sequence Shrinker - Minimal Reproducers
+Reduce a failing transaction sequence to the shortest one that still fails
+
+REAL IMPLEMENTATION - No Mocks/Simulations
+- Real replays from the engine's initial state snapshot
+- Delta debugging over calls (drop chunks, halve chunk size, repeat)
+- Integer arguments shrunk toward zero (bisection) while the failure persists
+- Bounded by a replay budget so shrinking never stalls a campaign
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from input_generator import FuzzInput
+
+DEFAULT_SHRINK_REPLAYS = 200
+MAX_BISECT_STEPS = 40  # Per integer argument
+
+@dataclass
+class SequenceStep:
+    """One call in a fuzz sequence"""
+    function_name: str
+    inputs: List[FuzzInput]
+    sender: Optional[str] = None
+
+    def describe(self) -> str:
+        """Call as it would appear in a test, e.g. transfer(0xabc..., 5)"""
+        return f"{self.function_name}({', '.join(str(inp.value) for inp in self.inputs)})"
+
+@dataclass
+class Reproducer:
+    """Shortest known call sequence that breaks an invariant"""
+    invariant_name: str
+    steps: List[SequenceStep]
+    original_length: int
+    replays: int = 0
+    confirmed: bool = True  # False if the failure did not replay (e.g. order-dependent state)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "invariant": self.invariant_name,
+            "calls": [
+                {
+                    "function": step.function_name,
+                    "args": [str(inp.value) for inp in step.inputs],
+                    "types": [inp.type_name for inp in step.inputs],
+                    "sender": step.sender,
+                }
+                for step in self.steps
+            ],
+            "original_length": self.original_length,
+            "replays": self.replays,
+            "confirmed": self.confirmed,
+        }
+
+def _split(low: int, high: int) -> int:
+    """
+    Bisection point between a passing and a failing magnitude
+
+    Far-apart bounds are split by bit length so a 256-bit value reaches
+    the right order of magnitude in ~8 steps; close bounds split evenly.
+    """
+    if high > 4 * max(low, 1):
+        middle = 1 << ((max(low, 1).bit_length() + high.bit_length()) // 2)
+        if low < middle < high:
+            return middle
+    return (low + high) // 2
+
+class SequenceShrinker:
+    """
+    Shrink a failing sequence by replaying candidates on a stateful backend
+
+    Features:
+    - Truncates the sequence at the first call after which the invariant fails
+    - Removes chunks of calls (n/2, n/4, ... 1) while the failure persists
+    - Shrinks integer arguments: zero first, then bisection toward zero
+    - Leaves the backend at the engine's initial state when done
+    """
+
+    def __init__(self, engine, max_replays: int = DEFAULT_SHRINK_REPLAYS):
+        """
+        Initialize Sequence Shrinker
+
+        Args:
+            engine: FuzzEngine whose backend, invariants and initial_state to use
+            max_replays: Replay budget per shrink
+        """
+        self.engine = engine
+        self.max_replays = max_replays
+        self.replays = 0
+
+    def replay(self, steps: List[SequenceStep], invariant_name: str) -> Optional[int]:
+        """
+        Replay steps from the initial state, checking the invariant after each call
+
+        Args:
+            steps: Calls to replay
+            invariant_name: Invariant expected to fail
+
+        Returns:
+            Index of the first call after which the invariant fails, or None
+        """
+        engine = self.engine
+        checker = engine.invariant_checker
+        invariant = next(inv for inv in checker.invariants if inv.name == invariant_name)
+
+        self.replays += 1
+        engine.backend.revert(engine.initial_state)
+        for index, step in enumerate(steps):
+            execution = engine.execute_step(step.function_name, step.inputs, step.sender)
+            # A reverted call leaves the contract state as it was
+            if index and not execution.success:
+                continue
+            try:
+                if checker.evaluate(invariant):
+                    return index
+            except Exception:
+                continue
+        return None
+
+    def _budget_left(self) -> bool:
+        return self.replays < self.max_replays
+
+    def shrink(self, steps: List[SequenceStep], invariant_name: str) -> Reproducer:
+        """
+        Shrink a sequence that broke an invariant
+
+        Args:
+            steps: Calls since the last revert to the initial state, failing call last
+            invariant_name: Invariant that failed
+
+        Returns:
+            Reproducer with the shortest failing sequence found
+        """
+        self.replays = 0
+        original_length = len(steps)
+        try:
+            failing = self.replay(steps, invariant_name)
+            if failing is None:
+                return Reproducer(invariant_name, list(steps), original_length, self.replays, confirmed=False)
+            steps = steps[:failing + 1]
+
+            steps = self._shrink_calls(steps, invariant_name)
+            steps = self._shrink_arguments(steps, invariant_name)
+            return Reproducer(invariant_name, steps, original_length, self.replays)
+        finally:
+            self.engine.backend.revert(self.engine.initial_state)
+
+    def _shrink_calls(self, steps: List[SequenceStep], invariant_name: str) -> List[SequenceStep]:
+        """Delta debugging: drop chunks of calls, halving the chunk size"""
+        chunk = max(1, len(steps) // 2)
+        while chunk >= 1 and self._budget_left():
+            start = 0
+            while start < len(steps) and len(steps) > 1 and self._budget_left():
+                candidate = steps[:start] + steps[start + chunk:]
+                failing = self.replay(candidate, invariant_name) if candidate else None
+                if failing is None:
+                    start += chunk
+                else:
+                    steps = candidate[:failing + 1]
+            chunk //= 2
+        return steps
+
+    def _shrink_arguments(self, steps: List[SequenceStep], invariant_name: str) -> List[SequenceStep]:
+        """Move integer arguments toward zero while the sequence still fails"""
+        for index in range(len(steps)):
+            for position, inp in enumerate(steps[index].inputs):
+                if "int" not in inp.type_name or "[" in inp.type_name or not inp.value:
+                    continue
+                if not self._budget_left():
+                    return steps
+
+                # Zero first, then bisect between zero (passes) and the
+                # current value (fails) for the smallest failing magnitude
+                candidate = self._with_argument(steps, index, position, 0)
+                if self.replay(candidate, invariant_name) is not None:
+                    steps = candidate
+                    continue
+
+                sign = -1 if inp.value < 0 else 1
+                low, high = 0, abs(inp.value)
+                for _ in range(MAX_BISECT_STEPS):
+                    if high - low <= 1 or not self._budget_left():
+                        break
+                    middle = _split(low, high)
+                    candidate = self._with_argument(steps, index, position, sign * middle)
+                    if self.replay(candidate, invariant_name) is None:
+                        low = middle
+                    else:
+                        high, steps = middle, candidate
+        return steps
+
+    def _with_argument(
+        self,
+        steps: List[SequenceStep],
+        index: int,
+        position: int,
+        value: int
+    ) -> List[SequenceStep]:
+        """Copy of steps with one argument replaced"""
+        step = steps[index]
+        inputs = list(step.inputs)
+        inputs[position] = FuzzInput(value=value, type_name=inputs[position].type_name, description="shrunk")
+        return steps[:index] + [SequenceStep(step.function_name, inputs, step.sender)] + steps[index + 1:]
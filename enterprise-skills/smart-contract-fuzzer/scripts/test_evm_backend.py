@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Unit tests for the backend helpers that need no EVM: bytecode constants and revert data."""
+
+from eth_abi import encode
+
+from evm_backend import (
+    ERROR_SELECTOR,
+    MAX_CODE_CONSTANTS,
+    PANIC_SELECTOR,
+    decode_revert_reason,
+    extract_code_constants,
+)
+
+
+def _push(value: int, size: int) -> bytes:
+    return bytes([0x60 + size - 1]) + value.to_bytes(size, "big")
+
+
+def test_code_constants_skip_push1_and_jump_targets():
+    # PUSH2 0x1337 PUSH1 0x04 EQ PUSH2 0x000a JUMPI JUMPDEST STOP
+    code = bytes.fromhex("61133760041461000a575b00")
+    assert extract_code_constants(code) == [0x1337]
+    assert extract_code_constants(code, min_size=1) == [0x1337, 0x04]
+
+
+def test_code_constants_dedupe_in_bytecode_order():
+    code = _push(0xdead, 2) + _push(2**255, 32) + _push(0xdead, 2) + _push(0xbeef, 4)
+    assert extract_code_constants(code) == [0xdead, 2**255, 0xbeef]
+
+
+def test_push_data_is_not_decoded_as_opcodes():
+    # 0x5b inside PUSH data is not a JUMPDEST, and 0x61 inside it is not a PUSH2
+    code = _push(0x5b61, 2) + bytes([0x5b]) + _push(0x0003, 2)
+    assert extract_code_constants(code) == [0x5b61]
+
+
+def test_truncated_push_and_cap():
+    assert extract_code_constants(bytes.fromhex("62ab")) == [0xab]
+    code = b"".join(_push(value, 2) for value in range(0x100, 0x100 + MAX_CODE_CONSTANTS + 10))
+    assert len(extract_code_constants(code)) == MAX_CODE_CONSTANTS
+
+
+def test_decode_revert_reason():
+    assert decode_revert_reason(b"") == "execution reverted"
+    assert decode_revert_reason(ERROR_SELECTOR + encode(["string"], ["insufficient balance"])) == "insufficient balance"
+    assert decode_revert_reason(PANIC_SELECTOR + encode(["uint256"], [0x11])) == \
+        "Panic(0x11): arithmetic overflow or underflow"
+    assert decode_revert_reason(bytes.fromhex("deadbeef")) == "custom error 0xdeadbeef"
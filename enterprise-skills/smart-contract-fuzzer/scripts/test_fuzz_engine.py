@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Unit tests for corpus admission, energy scheduling and shrink deduplication in FuzzEngine."""
+
+from conftest import make_engine
+from fuzz_engine import CorpusEntry
+from input_generator import FuzzInput
+
+DEPOSIT = {"name": "deposit", "inputs": [{"name": "amount", "type": "uint256"}]}
+WITHDRAW = {"name": "withdraw", "inputs": [{"name": "amount", "type": "uint256"}]}
+
+
+def _fuzz(engine, function_abi, value):
+    engine.next_inputs = lambda name, types: [FuzzInput(value=value, type_name="uint256")]
+    return engine.fuzz_function(function_abi, engine.iterations)
+
+
+def test_bytecode_constants_seed_the_dictionary():
+    assert make_engine(coverage=True).input_generator.dictionary == [0x1337]
+    assert make_engine(coverage=False).input_generator.dictionary == []
+
+
+def test_only_inputs_reaching_new_features_join_the_corpus():
+    engine = make_engine(coverage=True, cap_invariant=False)
+
+    _fuzz(engine, DEPOSIT, 5)
+    _fuzz(engine, DEPOSIT, 7)  # Same outcome, same edge
+    _fuzz(engine, DEPOSIT, 5000)  # New edge only
+    _fuzz(engine, WITHDRAW, 10**9)  # New revert reason and edge
+
+    assert [(e.function_name, e.inputs[0].value, e.features) for e in engine.drain_corpus_updates()] == [
+        ("deposit", 5, ("deposit:ok|", (b"deposit", 0, False))),
+        ("deposit", 5000, ((b"deposit", 0, True),)),
+        ("withdraw", 10**9, ("withdraw:insufficient balance|", (b"withdraw", 0, True))),
+    ]
+    assert engine.drain_corpus_updates() == []
+    assert [e.inputs[0].value for e in engine.corpus["deposit"]] == [5, 5000]
+    assert engine.feature_hits["deposit:ok|"] == 3
+    assert engine.input_generator.value_pool["uint256"] == [5, 5000, 10**9]
+
+
+def test_invariant_outcome_is_a_feature():
+    engine = make_engine()
+    _fuzz(engine, DEPOSIT, 10)
+    _fuzz(engine, DEPOSIT, 200)
+    assert [e.features for e in engine.corpus["deposit"]] == [("deposit:ok|",), ("deposit:ok|below_cap",)]
+
+
+def test_energy_favours_rare_features_and_decays_with_picks():
+    engine = make_engine(cap_invariant=False)
+    engine.feature_hits = {"rare": 1, "common": 50}
+    rare = CorpusEntry("deposit", [FuzzInput(1, "uint256")], ("rare",))
+    common = CorpusEntry("deposit", [FuzzInput(2, "uint256")], ("common",))
+
+    assert engine.energy(rare) == 2.0
+    assert engine.energy(common) == 1.02
+    rare.picks = 3
+    assert engine.energy(rare) == 1.0
+
+
+def test_corpus_picks_follow_energy():
+    engine = make_engine(cap_invariant=False, mutation_rate=1.0)
+    engine.feature_hits = {"rare": 1, "common": 50}
+    rare = CorpusEntry("deposit", [FuzzInput(1, "uint256")], ("rare",))
+    common = CorpusEntry("deposit", [FuzzInput(2, "uint256")], ("common",))
+    engine.corpus["deposit"] = [common, rare]
+
+    for _ in range(400):
+        engine.next_inputs("deposit", ["uint256"])
+
+    assert rare.picks + common.picks == 400
+    # Picks drawn in proportion to energy settle near (1 + picks)^1.5 ~ rarity,
+    # so rare is picked about (2 / 1.02)^(2/3) = 1.57 times as often
+    assert 1.3 < (rare.picks + 1) / (common.picks + 1) < 2.0
+
+
+def test_import_corpus_keeps_entries_with_unseen_features():
+    engine = make_engine(cap_invariant=False)
+    engine.feature_hits = {"seen": 4}
+    known = CorpusEntry("deposit", [FuzzInput(1, "uint256")], ("seen",))
+    fresh = CorpusEntry("deposit", [FuzzInput(2, "uint256")], ("seen", "unseen"), picks=9)
+
+    assert engine.import_corpus([known, fresh]) == [fresh]
+    assert engine.corpus["deposit"] == [fresh] and fresh.picks == 0
+    assert engine.feature_hits == {"seen": 4, "unseen": 1}
+    assert engine.drain_corpus_updates() == []  # Imported entries are not sent back
+
+
+def test_failures_shrunk_by_another_worker_are_not_shrunk_again():
+    shrunk = make_engine(sequence_length=5)
+    shrunk.run_iterations(shrunk.get_fuzzable_functions(), 20)
+    assert list(shrunk.reproducers) == ["below_cap"]
+
+    skipped = make_engine(sequence_length=5)
+    skipped.known_failures.add("below_cap")
+    skipped.run_iterations(skipped.get_fuzzable_functions(), 20)
+    assert skipped.reproducers == {}
+    assert any(r.invariant_violations for r in skipped.results)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Unit tests for integer wrapping, the mutation dictionary and havoc mutations."""
+
+import pytest
+
+from input_generator import MAX_POOL_PER_TYPE, FuzzInput, InputGenerator
+
+
+@pytest.mark.parametrize("type_name, value, wrapped", [
+    ("uint8", 256, 0),
+    ("uint8", -1, 255),
+    ("uint8", 0x1337, 0x37),
+    ("int8", 127, 127),
+    ("int8", 128, -128),
+    ("int8", -129, 127),
+    ("uint", -1, 2**256 - 1),
+    ("int", 2**255, -(2**255)),
+    ("int256", -(2**255) - 1, 2**255 - 1),
+])
+def test_wrap_int(type_name, value, wrapped):
+    assert InputGenerator(seed=0)._wrap_int(type_name, value) == wrapped
+
+
+@pytest.mark.parametrize("type_name, low, high", [("uint8", 0, 255), ("int8", -128, 127), ("uint16", 0, 65535)])
+def test_integer_mutations_stay_in_range(type_name, low, high):
+    generator = InputGenerator(seed=5)
+    generator.add_dictionary([0x1337, 2**200, -5])
+    value = FuzzInput(value=high, type_name=type_name)
+    for _ in range(500):
+        value = generator.mutate_input(value)
+        assert low <= value.value <= high
+        assert value.type_name == type_name
+
+
+def test_dictionary_values_are_added_once():
+    generator = InputGenerator(seed=0)
+    generator.add_dictionary([3, 1, 3])
+    generator.add_dictionary([1, 2])
+    assert generator.dictionary == [3, 1, 2]
+
+
+def test_value_pool_is_capped_per_type():
+    generator = InputGenerator(seed=0)
+    generator.remember_inputs([FuzzInput(value=v, type_name="uint256") for v in range(MAX_POOL_PER_TYPE + 20)])
+    generator.remember_inputs([FuzzInput(value=True, type_name="bool")])
+    assert len(generator.value_pool["uint256"]) == MAX_POOL_PER_TYPE
+    assert generator.value_pool["bool"] == [True]
+
+
+def _havoc_run(seed):
+    generator = InputGenerator(seed=seed)
+    generator.add_dictionary([0x1337])
+    generator.remember_inputs([FuzzInput(value=42, type_name="uint256"), FuzzInput(value=b"\x01" * 4, type_name="bytes4")])
+    inputs = [
+        FuzzInput(value=7, type_name="uint256"),
+        FuzzInput(value=-3, type_name="int64"),
+        FuzzInput(value=b"\x00" * 4, type_name="bytes4"),
+        FuzzInput(value="0x000000000000000000000000000000000000dEaD", type_name="address"),
+    ]
+    donor = [
+        FuzzInput(value=9, type_name="uint256"),
+        FuzzInput(value=11, type_name="int64"),
+        FuzzInput(value=b"\xff" * 4, type_name="bytes4"),
+        FuzzInput(value="0xFFfFfFffFFfffFFfFFfFFFFFffFFFffffFfFFFfF", type_name="address"),
+    ]
+    snapshot = list(inputs)
+    runs = [generator.havoc(inputs, donor) for _ in range(50)]
+    assert inputs == snapshot  # Not modified in place
+    return runs
+
+
+def test_havoc_is_deterministic_for_a_seed():
+    first = _havoc_run(seed=11)
+    assert [[i.value for i in run] for run in first] == [[i.value for i in run] for run in _havoc_run(seed=11)]
+    assert [[i.value for i in run] for run in first] != [[i.value for i in run] for run in _havoc_run(seed=12)]
+    assert all([i.type_name for i in run] == ["uint256", "int64", "bytes4", "address"] for run in first)
+
+
+def test_havoc_on_no_parameters():
+    assert InputGenerator(seed=0).havoc([], []) == []
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Unit tests for batched invariant reads."""
+
+import pytest
+from web3 import Web3
+
+from conftest import VAULT, VAULT_ABI, VaultBackend
+from invariant_checker import InvariantChecker, InvariantType
+
+
+@pytest.fixture
+def checker():
+    checker = InvariantChecker(Web3(), VAULT, VAULT_ABI, backend=VaultBackend())
+    checker.verbose = False
+    checker.add_invariant("cap", InvariantType.SUPPLY, lambda: checker.call("totalAssets") < 100, "total < 100")
+    checker.add_invariant(
+        "first_below_total", InvariantType.BALANCE,
+        lambda: (checker.call("depositsOf", 0) <= checker.call("totalAssets"),
+                 checker.call("depositsOf", 0), "<= totalAssets()"),
+        "first deposit within total",
+    )
+    checker.add_invariant("second_small", InvariantType.BALANCE, lambda: checker.call("depositsOf", 1) < 50, "small")
+    return checker
+
+
+def _names(violations):
+    return [v.invariant_name for v in violations]
+
+
+def test_prefetch_matches_per_invariant_reads(checker):
+    backend = checker.backend
+    backend.deposits = [70, 60, -20]
+    reads = [("totalAssets", ()), ("depositsOf", (0,)), ("depositsOf", (1,)), ("depositsOf", (9,))]
+
+    values = checker.prefetch(reads)
+
+    assert backend.batches == [4]
+    for function_name, args in reads[:3]:
+        assert values[(function_name, args)] == checker._read(function_name, args)
+    assert isinstance(values[("depositsOf", (9,))], RuntimeError)
+    with pytest.raises(RuntimeError, match="index out of range"):
+        checker._read("depositsOf", (9,))
+
+
+def test_reads_from_the_last_check_are_one_batch(checker):
+    backend = checker.backend
+    backend.deposits = [70, 60]
+
+    first = checker.check_all_invariants()
+    assert backend.batches == []
+    assert checker.unbatched_reads == 3
+
+    second = checker.check_all_invariants()
+    assert backend.batches == [3]
+    assert (checker.batched_reads, checker.unbatched_reads) == (3, 3)
+    assert _names(first) == _names(second) == ["cap", "second_small"]
+
+
+def test_batched_checks_see_state_changes(checker):
+    backend = checker.backend
+    backend.deposits = [10]
+
+    # depositsOf(1) reverts, so second_small errors and is skipped
+    assert _names(checker.check_all_invariants()) == []
+    backend.deposits = [10, 95]
+    assert _names(checker.check_all_invariants()) == ["cap", "second_small"]
+    assert backend.batches == [3]
+
+    # A read first made in this check is fetched alone and batched next time
+    checker.add_invariant("third", InvariantType.STATE, lambda: checker.call("depositsOf", 2) > 0, "third")
+    backend.deposits = [10, 95, 0]
+    assert _names(checker.check_all_invariants()) == ["cap", "second_small", "third"]
+    assert checker.check_all_invariants() and backend.batches == [3, 3, 4]
+
+
+def test_unhashable_arguments_bypass_the_batch(checker):
+    calls = []
+    checker._read = lambda function_name, args: calls.append((function_name, args)) or 0
+    checker.invariants = []
+    checker.add_invariant("listy", InvariantType.STATE, lambda: checker.call("depositsOf", [0]) == 0, "listy")
+
+    checker.check_all_invariants()
+    checker.check_all_invariants()
+
+    assert calls == [("depositsOf", ([0],))] * 2
+    assert checker.read_set == {}
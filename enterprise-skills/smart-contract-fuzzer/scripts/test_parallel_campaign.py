@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Unit tests for merging parallel fuzzing worker reports."""
+
+from types import SimpleNamespace
+
+from parallel_campaign import ParallelCampaign, WorkerReport, global_iteration
+from vulnerability_detector import Severity, Vulnerability, VulnerabilityType
+
+
+def _vuln(location, evidence):
+    return Vulnerability(
+        vuln_type=VulnerabilityType.INTEGER_OVERFLOW,
+        severity=Severity.HIGH,
+        description="Addition overflow",
+        location=location,
+        evidence=evidence,
+        recommendation="Use checked arithmetic",
+    )
+
+
+def _report(worker_id, vulnerabilities=(), first_issue=None, crashes=None):
+    return WorkerReport(
+        worker_id=worker_id, iterations=10, successful_calls=8, failed_calls=2,
+        total_gas_used=1000, invariant_violations=0, vulnerabilities=list(vulnerabilities),
+        function_coverage={"add": 10}, unique_crashes=crashes or {}, feature_hits={},
+        first_issue_iteration=first_issue, reproducers={},
+    )
+
+
+def _campaign():
+    campaign = ParallelCampaign.__new__(ParallelCampaign)
+    campaign.engine = SimpleNamespace(
+        corpus={}, count_edges=lambda: 0, vulnerability_detector=SimpleNamespace(vulnerabilities=[]),
+    )
+    return campaign
+
+
+def test_global_iteration_interleaves_workers_round_robin():
+    progress = [[3, 3], [6, 5]]
+    order = sorted(
+        ((w, i) for w in range(2) for i in range(progress[-1][w])),
+        key=lambda wi: global_iteration(wi[1], wi[0], progress),
+    )
+    assert [global_iteration(i, w, progress) for w, i in order] == list(range(11))
+    assert order[:6] == [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2), (1, 2)]
+    # Worker 1 ran out in epoch 2, so worker 0's last iteration goes last
+    assert order[-1] == (0, 5)
+
+
+def test_merge_dedupes_vulnerabilities_across_workers():
+    reports = [
+        _report(0, [_vuln("add", {"a": 1})], crashes={"add:overflow": 2}),
+        _report(1, [_vuln("add", {"a": 7}), _vuln("mul", {"a": 7})], crashes={"add:overflow": 1}),
+    ]
+    campaign = _campaign()
+    summary = campaign._merge(reports, [{"name": "add"}, {"name": "mul"}], 1.0)
+
+    assert summary.total_vulnerabilities == 2
+    assert [v.evidence for v in campaign.engine.vulnerability_detector.vulnerabilities] == [{"a": 1}, {"a": 7}]
+    assert summary.unique_crashes == 1
+    assert campaign.engine.unique_crashes == {"add:overflow": 3}
+
+
+def test_merge_reports_campaign_wide_first_issue():
+    reports = [_report(0, first_issue=4), _report(1, first_issue=2)]
+    summary = _campaign()._merge(reports, [{"name": "add"}], 1.0, progress=[[5, 5], [10, 10]])
+
+    # Worker 1's third iteration ran before worker 0's fifth
+    assert summary.first_issue_iteration == 5
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Unit tests for delta-debugging shrinking of failing call sequences."""
+
+from conftest import CAP
+from input_generator import FuzzInput
+from sequence_shrinker import SequenceShrinker, SequenceStep, _split
+
+
+def _step(name, value):
+    return SequenceStep(name, [FuzzInput(value=value, type_name="uint256")])
+
+
+def _calls(steps):
+    return [(s.function_name, s.inputs[0].value) for s in steps]
+
+
+NOISY = [
+    _step("poke", 1), _step("deposit", 30), _step("withdraw", 5000), _step("poke", 2),
+    _step("deposit", 40), _step("deposit", 10), _step("poke", 3), _step("deposit", 35),
+    _step("poke", 4), _step("deposit", 1),
+]
+
+
+def test_shrinks_to_a_minimal_failing_subsequence(engine):
+    shrinker = SequenceShrinker(engine)
+    reproducer = shrinker.shrink(NOISY, "below_cap")
+
+    assert reproducer.confirmed and reproducer.original_length == len(NOISY)
+    assert engine.backend.deposits == []  # Left at the initial state
+    steps = reproducer.steps
+    assert {s.function_name for s in steps} == {"deposit"}
+    assert sum(s.inputs[0].value for s in steps) == CAP  # Arguments bisected to the boundary
+    assert shrinker.replay(steps, "below_cap") == len(steps) - 1
+    # Every step left is needed: dropping any one makes the failure disappear
+    for index in range(len(steps)):
+        assert shrinker.replay(steps[:index] + steps[index + 1:], "below_cap") is None
+
+
+def test_calls_after_the_failure_are_dropped(engine):
+    steps = [_step("deposit", 150), _step("deposit", 5), _step("poke", 9)]
+    reproducer = SequenceShrinker(engine).shrink(steps, "below_cap")
+    assert _calls(reproducer.steps) == [("deposit", CAP)]
+
+
+def test_needed_calls_are_never_dropped(engine):
+    # Each deposit alone stays below the cap; only together do they break it
+    steps = [_step("deposit", 60), _step("poke", 0), _step("deposit", 60)]
+    reproducer = SequenceShrinker(engine, max_replays=10).shrink(steps, "below_cap")
+    assert [s.function_name for s in reproducer.steps] == ["deposit", "deposit"]
+
+
+def test_replay_budget_is_respected(engine):
+    shrinker = SequenceShrinker(engine, max_replays=3)
+    reproducer = shrinker.shrink(NOISY, "below_cap")
+
+    assert reproducer.replays == 3
+    assert reproducer.confirmed
+    assert shrinker.replay(reproducer.steps, "below_cap") is not None
+
+
+def test_failure_that_does_not_replay_is_unconfirmed(engine):
+    steps = [_step("deposit", 10), _step("poke", 1)]
+    reproducer = SequenceShrinker(engine).shrink(steps, "below_cap")
+    assert not reproducer.confirmed
+    assert _calls(reproducer.steps) == _calls(steps)
+
+
+def test_split_reaches_the_order_of_magnitude_first():
+    # Bit lengths 1 and 257 meet at 2^129; close bounds split evenly
+    assert _split(0, 2**256) == 2**129
+    assert _split(2**128, 2**256) == 2**193
+    assert _split(10, 20) == 15
+    assert _split(0, 1) == 0
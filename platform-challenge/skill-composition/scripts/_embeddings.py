@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Skill Embeddings — local vectors for the semantic routing tier.
+
+Strategy Pattern (selected by SKILL_EMBEDDING_BACKEND):
+    1. hashing (default): stdlib feature hashing of words, word bigrams and
+       character trigrams. No model download, no API call.
+    2. sentence-transformers: any local model (SKILL_EMBEDDING_MODEL,
+       default all-MiniLM-L6-v2) when the package is installed.
+    3. openai: text-embedding-3-small over HTTP (OPENAI_API_KEY). Query
+       vectors are LRU-cached so repeated queries stay local.
+
+Every backend returns L2-normalized vectors, so cosine similarity is a dot
+product. A backend that fails (no network, bad API key, unknown model) is
+replaced by hashing for the rest of the process. numpy is used for the similarity matrix when installed. Raw cosine
+ranges differ by backend, so calibrate() maps each backend's typical
+unrelated..strong-match band onto 0.0-1.0 before scores are blended.
+
+Usage:
+    from _embeddings import get_embedder, cosine_scores
+
+    embedder = get_embedder()
+    matrix = embedder.embed(["skill text", ...])
+    scores = cosine_scores(as_matrix(matrix), embedder.embed_query("user query"))
+    relevance = [calibrate(s, embedder) for s in scores]
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+import os
+import re
+import sys
+import urllib.request
+import zlib
+from array import array
+from functools import lru_cache
+from typing import Any, Sequence
+
+try:
+    import numpy as np  # type: ignore[import-untyped]
+except ImportError:  # pure-Python fallback below
+    np = None
+
+Vector = list[float]
+
+_WORD = re.compile(r"[a-z0-9一-鿿]+")
+
+_STOPWORDS = frozenset("""
+a an and are as at be by can for from has have i in into is it its me my of on
+or our please that the their this to use using want we what when which with you
+your need help how do does
+""".split())
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class HashingEmbedder:
+    """Feature-hashed bag of words, bigrams and character trigrams.
+
+    Trigrams give partial credit across inflections ("swap" / "swapping"),
+    bigrams reward phrase overlap. Term weights are sublinear (1 + log tf).
+    """
+
+    WEIGHTS = {"w": 1.0, "b": 0.6, "c": 0.25}
+    SIMILARITY_RANGE = (0.05, 0.5)
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.model_id = f"hashing-v1-{dim}"
+
+    def _features(self, text: str) -> dict[str, float]:
+        words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+        counts: dict[str, float] = {}
+        for i, word in enumerate(words):
+            counts["w:" + word] = counts.get("w:" + word, 0.0) + 1
+            if i:
+                key = f"b:{words[i - 1]} {word}"
+                counts[key] = counts.get(key, 0.0) + 1
+            padded = f"<{word}>"
+            for j in range(len(padded) - 2):
+                key = "c:" + padded[j:j + 3]
+                counts[key] = counts.get(key, 0.0) + 1
+        return counts
+
+    def _embed_one(self, text: str) -> Vector:
+        vector = [0.0] * self.dim
+        for feature, count in self._features(text).items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            vector[h % self.dim] += sign * self.WEIGHTS[feature[0]] * (1 + math.log(count))
+        return _normalize(vector)
+
+    def embed(self, texts: Sequence[str]) -> list[Vector]:
+        return [self._embed_one(text) for text in texts]
+
+    def embed_query(self, text: str) -> Vector:
+        return self._embed_one(text)
+
+
+class SentenceTransformerEmbedder:
+    """Local transformer model via the sentence-transformers package."""
+
+    SIMILARITY_RANGE = (0.15, 0.75)
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer  # type: ignore[import-untyped]
+        self._model = SentenceTransformer(model_name)
+        self.model_id = f"st-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> list[Vector]:
+        vectors = self._model.encode(list(texts), normalize_embeddings=True)
+        return [list(map(float, v)) for v in vectors]
+
+    def embed_query(self, text: str) -> Vector:
+        return self.embed([text])[0]
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings API over stdlib HTTP."""
+
+    URL = "https://api.openai.com/v1/embeddings"
+    SIMILARITY_RANGE = (0.15, 0.65)
+
+    def __init__(self, model: str = "text-embedding-3-small"):
+        self.model = model
+        self.model_id = f"openai-{model}"
+        self._api_key = os.environ.get("OPENAI_API_KEY", "")
+        self.embed_query = lru_cache(maxsize=2048)(self._embed_query)
+
+    def embed(self, texts: Sequence[str]) -> list[Vector]:
+        vectors: list[Vector] = []
+        for start in range(0, len(texts), 256):
+            payload = json.dumps({"model": self.model, "input": list(texts[start:start + 256])}).encode()
+            req = urllib.request.Request(self.URL, data=payload, headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self._api_key}",
+            })
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                data = json.loads(resp.read().decode())
+            rows = sorted(data.get("data", []), key=lambda row: row["index"])
+            vectors.extend(_normalize(row["embedding"]) for row in rows)
+        return vectors
+
+    def _embed_query(self, text: str) -> Vector:
+        return self.embed([text])[0]
+
+
+_EMBEDDER: Any = None
+
+# What a backend raises once running: urllib's URLError / HTTPError and
+# timeouts are OSError, a malformed API response is ValueError or KeyError
+EMBEDDING_ERRORS = (OSError, ValueError, KeyError)
+
+
+def get_embedder() -> Any:
+    """Process-wide embedder for the configured backend (hashing on failure)."""
+    global _EMBEDDER
+    if _EMBEDDER is not None:
+        return _EMBEDDER
+    backend = os.environ.get("SKILL_EMBEDDING_BACKEND", "hashing").lower()
+    try:
+        if backend == "sentence-transformers":
+            _EMBEDDER = SentenceTransformerEmbedder(
+                os.environ.get("SKILL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+            )
+        elif backend == "openai" and os.environ.get("OPENAI_API_KEY"):
+            _EMBEDDER = OpenAIEmbedder(os.environ.get("SKILL_EMBEDDING_MODEL", "text-embedding-3-small"))
+    except (ImportError, OSError) as e:  # OSError: model not found / download failed
+        print(f"Embedding backend {backend} unavailable, using hashing: {e}", file=sys.stderr)
+    if _EMBEDDER is None:
+        _EMBEDDER = HashingEmbedder()
+    return _EMBEDDER
+
+
+def fallback_embedder(error: Exception) -> HashingEmbedder:
+    """Replace the process-wide embedder with hashing after a backend error."""
+    global _EMBEDDER
+    failed = getattr(_EMBEDDER, "model_id", "embedder")
+    print(f"Embedding backend {failed} failed, using hashing: {error}", file=sys.stderr)
+    _EMBEDDER = HashingEmbedder()
+    return _EMBEDDER
+
+
+# ---------------------------------------------------------------------------
+# Similarity
+# ---------------------------------------------------------------------------
+
+def _normalize(vector: Sequence[float]) -> Vector:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+def as_matrix(vectors: Sequence[Sequence[float]]) -> Any:
+    """Stack vectors into the fastest available matrix form."""
+    if np is not None:
+        return np.asarray(vectors, dtype=np.float32)
+    return [list(v) for v in vectors]
+
+
+def cosine_scores(matrix: Any, query: Vector) -> list[float]:
+    """Cosine similarity of each (normalized) row with the normalized query."""
+    if np is not None and isinstance(matrix, np.ndarray):
+        return (matrix @ np.asarray(query, dtype=np.float32)).tolist()
+    # Hashed query vectors are sparse: only their nonzero dimensions matter
+    nonzero = [(i, x) for i, x in enumerate(query) if x]
+    return [sum(row[i] * x for i, x in nonzero) for row in matrix]
+
+
+def calibrate(similarity: float, embedder: Any) -> float:
+    """Map a raw cosine onto 0.0-1.0 relevance using the backend's range."""
+    low, high = getattr(embedder, "SIMILARITY_RANGE", (0.0, 1.0))
+    return max(0.0, min(1.0, (similarity - low) / (high - low)))
+
+
+def embedding_text(name: str, description: str, tags: Sequence[str],
+                   keywords: Sequence[str]) -> str:
+    """The text a skill is embedded from."""
+    parts = [name, description]
+    if tags:
+        parts.append("Tags: " + ", ".join(tags))
+    if keywords:
+        parts.append("Keywords: " + ", ".join(keywords))
+    return ". ".join(p for p in parts if p)
+
+
+def pack_vector(vector: Sequence[float]) -> str:
+    """float32 + base64: about a quarter the size of a JSON float list."""
+    return base64.b64encode(array("f", vector).tobytes()).decode("ascii")
+
+
+def unpack_vector(packed: str) -> array:
+    vector = array("f")
+    vector.frombytes(base64.b64decode(packed))
+    return vector
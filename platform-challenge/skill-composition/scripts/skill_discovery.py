@@ -6,7 +6,8 @@ Parses SKILL.md metadata files across the repository, builds a searchable
 skill catalog, and semantically matches user intent to relevant skills.
 
 Architecture:
-    Three-layer matching: Keyword Filter → Tag Scoring → LLM Semantic Match
+    Layered matching: Keyword Filter → Tag Scoring → Embedding Similarity
+    → LLM Judge (only when the embedding ranking is ambiguous).
     Inspired by search engine ranking — fast filters first, expensive LLM last.
 
 SpoonOS Integration:
@@ -16,17 +17,24 @@ SpoonOS Integration:
 """
 
 import asyncio
+import dataclasses
+import hashlib
 import json
 import math
 import os
 import re
 import sys
+import tempfile
 import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Sequence
 
+from _embeddings import (
+    EMBEDDING_ERRORS, as_matrix, calibrate, cosine_scores, embedding_text,
+    fallback_embedder, get_embedder, pack_vector, unpack_vector,
+)
 from _llm_client import extract_json, llm_chat, load_env
 
 load_env()
@@ -267,7 +275,11 @@ def parse_skill_file(file_path: Path) -> Optional[SkillMetadata]:
         content = file_path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
         return None
+    return parse_skill_content(content, file_path)
 
+
+def parse_skill_content(content: str, file_path: Path) -> Optional[SkillMetadata]:
+    """Parse SKILL.md content (already read) into SkillMetadata."""
     meta = parse_yaml_frontmatter(content)
     if not meta.get("name"):
         return None
@@ -311,14 +323,318 @@ def parse_skill_file(file_path: Path) -> Optional[SkillMetadata]:
 
 
 def scan_skill_registry(root_path: str) -> list[SkillMetadata]:
-    """Recursively scan directory for SKILL.md files and build catalog."""
-    root = Path(root_path).resolve()
-    skills: list[SkillMetadata] = []
-    for skill_file in root.rglob("SKILL.md"):
-        skill = parse_skill_file(skill_file)
-        if skill is not None:
-            skills.append(skill)
-    return skills
+    """Recursively scan directory for SKILL.md files and build catalog.
+
+    Served from the persistent registry index, so only new or changed
+    SKILL.md files are parsed.
+    """
+    return get_registry_index(root_path).skills()
+
+
+# ---------------------------------------------------------------------------
+# Registry Index (persistent, incrementally refreshed)
+# ---------------------------------------------------------------------------
+
+INDEX_VERSION = 2
+INDEX_MAX_AGE_SECONDS = 2.0
+INDEX_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".tox",
+})
+
+
+def default_index_dir() -> Path:
+    """Directory for on-disk registry indexes (SKILL_INDEX_CACHE overrides)."""
+    default = Path.home() / ".cache" / "spoon-skill-index"
+    return Path(os.environ.get("SKILL_INDEX_CACHE", str(default)))
+
+
+def _metadata_from_dict(data: dict) -> SkillMetadata:
+    return SkillMetadata(
+        **{
+            **data,
+            "tags": tuple(data["tags"]),
+            "keywords": tuple(data["keywords"]),
+            "scripts": tuple(data["scripts"]),
+            "parameters": tuple(SkillParameter(**p) for p in data["parameters"]),
+        }
+    )
+
+
+def skill_token_set(skill: SkillMetadata) -> frozenset[str]:
+    """Tokens of every text field keyword matching looks at."""
+    return frozenset(_tokenize(" ".join([
+        skill.name,
+        skill.description,
+        " ".join(skill.tags),
+        " ".join(skill.keywords),
+    ])))
+
+
+def skill_embedding_text(skill: SkillMetadata) -> str:
+    """Text the semantic tier embeds for a skill."""
+    return embedding_text(skill.name, skill.description, skill.tags, skill.keywords)
+
+
+@dataclass
+class IndexEntry:
+    """One SKILL.md in the index, with its tokens pre-computed."""
+    skill: Optional[SkillMetadata]  # None: file has no usable frontmatter
+    mtime_ns: int
+    size: int
+    sha256: str
+    tokens: frozenset[str] = frozenset()
+    tag_tokens: tuple[frozenset[str], ...] = ()
+    embedding: Optional[Sequence[float]] = None  # filled lazily by embedding_matrix()
+    embedding_model: str = ""
+
+    @classmethod
+    def build(cls, skill: Optional[SkillMetadata], mtime_ns: int, size: int, digest: str) -> "IndexEntry":
+        if skill is None:
+            return cls(None, mtime_ns, size, digest)
+        return cls(
+            skill=skill,
+            mtime_ns=mtime_ns,
+            size=size,
+            sha256=digest,
+            tokens=skill_token_set(skill),
+            tag_tokens=tuple(frozenset(_tokenize(tag)) for tag in skill.tags),
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            "skill": dataclasses.asdict(self.skill) if self.skill else None,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "sha256": self.sha256,
+        }
+        if self.embedding is not None:
+            data["embedding"] = pack_vector(self.embedding)
+            data["embedding_model"] = self.embedding_model
+        return data
+
+
+class SkillRegistryIndex:
+    """Catalog of every SKILL.md under a root, kept on disk between runs.
+
+    A refresh re-lists only directories whose mtime changed and re-parses
+    only SKILL.md files whose (mtime, size) changed and whose content hash
+    differs. An inverted token -> skill index lets discovery score just the
+    skills that share a token with the query. Skill embeddings are stored with
+    their entry, so a skill is re-embedded only when its SKILL.md changes (or
+    the embedding model does).
+    """
+
+    def __init__(self, root_path: str, cache_dir: Optional[Path] = None):
+        self.root = Path(root_path).resolve()
+        root_key = hashlib.sha1(str(self.root).encode()).hexdigest()[:16]
+        self.cache_path = (cache_dir or default_index_dir()) / f"{root_key}.json"
+        self.entries: dict[str, IndexEntry] = {}
+        self.postings: dict[str, set[str]] = {}
+        self.refreshed_at = 0.0
+        self.stats = {"parsed": 0, "dirs_listed": 0, "embedded": 0}
+        self._dirs: dict[str, dict] = {}
+        self._dirty = False
+        self._matrix: Optional[tuple[str, list[IndexEntry], Any]] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self.entries.values() if entry.skill is not None)
+
+    # ----- persistence -----
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return
+        self._dirs = data.get("dirs", {})
+        for rel, raw in data.get("files", {}).items():
+            skill = _metadata_from_dict(raw["skill"]) if raw.get("skill") else None
+            entry = IndexEntry.build(skill, raw["mtime_ns"], raw["size"], raw["sha256"])
+            if skill is not None and raw.get("embedding"):
+                entry.embedding = unpack_vector(raw["embedding"])
+                entry.embedding_model = raw.get("embedding_model", "")
+            self._put(rel, entry)
+
+    def save(self) -> None:
+        """Write the index atomically if anything changed since the last save."""
+        if not self._dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "dirs": self._dirs,
+            "files": {rel: entry.to_dict() for rel, entry in self.entries.items()},
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(data, handle)
+            os.replace(tmp, self.cache_path)
+            self._dirty = False
+        except OSError:
+            pass  # a read-only cache dir only costs the next cold start
+
+    # ----- maintenance -----
+
+    def _put(self, rel: str, entry: IndexEntry) -> None:
+        self._drop(rel)
+        self.entries[rel] = entry
+        self._matrix = None
+        for token in entry.tokens:
+            self.postings.setdefault(token, set()).add(rel)
+
+    def _drop(self, rel: str) -> None:
+        old = self.entries.pop(rel, None)
+        if old is None:
+            return
+        self._matrix = None
+        for token in old.tokens:
+            holders = self.postings.get(token)
+            if holders is not None:
+                holders.discard(rel)
+                if not holders:
+                    del self.postings[token]
+
+    def _list_dir(self, rel: str) -> Optional[dict]:
+        path = self.root / rel if rel else self.root
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        cached = self._dirs.get(rel)
+        if cached is not None and cached["mtime_ns"] == mtime_ns:
+            return cached
+        subdirs: list[str] = []
+        has_skill = False
+        try:
+            with os.scandir(path) as entries:
+                for item in entries:
+                    if item.is_dir(follow_symlinks=False):
+                        if item.name not in INDEX_SKIP_DIRS:
+                            subdirs.append(f"{rel}/{item.name}" if rel else item.name)
+                    elif item.name == "SKILL.md":
+                        has_skill = True
+        except OSError:
+            return None
+        self.stats["dirs_listed"] += 1
+        self._dirty = True
+        return {"mtime_ns": mtime_ns, "subdirs": sorted(subdirs), "skill": has_skill}
+
+    def _refresh_file(self, rel: str) -> None:
+        path = self.root / rel
+        try:
+            stat = path.stat()
+        except OSError:
+            self._drop(rel)
+            return
+        entry = self.entries.get(rel)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            self._drop(rel)
+            return
+        digest = hashlib.sha256(raw).hexdigest()
+        self._dirty = True
+        if entry is not None and entry.sha256 == digest:
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size  # touched, not edited
+            return
+        try:
+            skill = parse_skill_content(raw.decode("utf-8"), path)
+        except UnicodeDecodeError:
+            skill = None
+        self.stats["parsed"] += 1
+        self._put(rel, IndexEntry.build(skill, stat.st_mtime_ns, stat.st_size, digest))
+
+    def refresh(self) -> "SkillRegistryIndex":
+        """Bring the index in line with the tree and persist any changes."""
+        dirs: dict[str, dict] = {}
+        seen: set[str] = set()
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            info = self._list_dir(rel)
+            if info is None:
+                continue
+            dirs[rel] = info
+            stack.extend(info["subdirs"])
+            if info["skill"]:
+                file_rel = f"{rel}/SKILL.md" if rel else "SKILL.md"
+                seen.add(file_rel)
+                self._refresh_file(file_rel)
+        for rel in set(self.entries) - seen:
+            self._drop(rel)
+            self._dirty = True
+        if dirs.keys() != self._dirs.keys():
+            self._dirty = True
+        self._dirs = dirs
+        self.refreshed_at = time.monotonic()
+        self.save()
+        return self
+
+    # ----- queries -----
+
+    def skills(self) -> list[SkillMetadata]:
+        """Every parsed skill, in path order."""
+        return [
+            self.entries[rel].skill for rel in sorted(self.entries)
+            if self.entries[rel].skill is not None
+        ]
+
+    def candidates(self, query_tokens: set[str]) -> list[IndexEntry]:
+        """Entries sharing at least one token with the query, in path order."""
+        rels: set[str] = set()
+        for token in query_tokens:
+            rels.update(self.postings.get(token, ()))
+        return [self.entries[rel] for rel in sorted(rels) if self.entries[rel].skill is not None]
+
+    def embedding_matrix(self, embedder: Any) -> tuple[list[IndexEntry], Any]:
+        """Skill entries in path order and their stacked, normalized embeddings.
+
+        Only entries without a vector from this embedder are embedded (in one
+        batch); the stacked matrix is cached until the index changes.
+        """
+        model_id = embedder.model_id
+        if self._matrix is not None and self._matrix[0] == model_id:
+            return self._matrix[1], self._matrix[2]
+        rows = [
+            self.entries[rel] for rel in sorted(self.entries)
+            if self.entries[rel].skill is not None
+        ]
+        stale = [entry for entry in rows if entry.embedding_model != model_id or entry.embedding is None]
+        if stale:
+            vectors = embedder.embed([skill_embedding_text(entry.skill) for entry in stale])
+            for entry, vector in zip(stale, vectors):
+                entry.embedding = vector
+                entry.embedding_model = model_id
+            self.stats["embedded"] += len(stale)
+            self._dirty = True
+            self.save()
+        self._matrix = (model_id, rows, as_matrix([entry.embedding for entry in rows]))
+        return rows, self._matrix[2]
+
+
+_REGISTRY_INDEXES: dict[str, SkillRegistryIndex] = {}
+
+
+def get_registry_index(
+    root_path: str,
+    max_age: float = INDEX_MAX_AGE_SECONDS,
+) -> SkillRegistryIndex:
+    """Process-wide index for root_path, refreshed at most every max_age seconds."""
+    key = str(Path(root_path).resolve())
+    index = _REGISTRY_INDEXES.get(key)
+    if index is None:
+        index = _REGISTRY_INDEXES[key] = SkillRegistryIndex(key)
+    if time.monotonic() - index.refreshed_at > max_age or not index.refreshed_at:
+        index.refresh()
+    return index
 
 
 # ---------------------------------------------------------------------------
@@ -335,19 +651,17 @@ def keyword_match_score(query: str, skill: SkillMetadata) -> tuple[float, list[s
 
     Returns (score, matched_keywords) where score is 0.0-1.0.
     """
-    query_tokens = _tokenize(query)
+    return keyword_token_score(_tokenize(query), skill_token_set(skill))
+
+
+def keyword_token_score(
+    query_tokens: set[str],
+    skill_tokens: frozenset[str],
+) -> tuple[float, list[str]]:
+    """keyword_match_score on pre-tokenized query and skill text."""
     if not query_tokens:
         return 0.0, []
 
-    # Build skill token pool from all text fields
-    skill_text = " ".join([
-        skill.name,
-        skill.description,
-        " ".join(skill.tags),
-        " ".join(skill.keywords),
-    ])
-    skill_tokens = _tokenize(skill_text)
-
     matched = query_tokens & skill_tokens
     if not matched:
         return 0.0, []
@@ -369,25 +683,73 @@ def tag_match_score(query: str, skill: SkillMetadata) -> tuple[float, list[str]]
 
     Tags are curated metadata — higher signal than raw text matching.
     """
-    query_tokens = _tokenize(query)
-    if not query_tokens or not skill.tags:
+    return tag_token_score(
+        _tokenize(query), skill.tags, tuple(_tokenize(tag) for tag in skill.tags)
+    )
+
+
+def tag_token_score(
+    query_tokens: set[str],
+    tags: tuple[str, ...],
+    tag_tokens: tuple[frozenset[str], ...],
+) -> tuple[float, list[str]]:
+    """tag_match_score on pre-tokenized query and tags."""
+    if not query_tokens or not tags:
         return 0.0, []
 
-    matched_tags: list[str] = []
-    for tag in skill.tags:
-        tag_tokens = _tokenize(tag)
-        if tag_tokens & query_tokens:
-            matched_tags.append(tag)
+    matched_tags = [tag for tag, tokens in zip(tags, tag_tokens) if tokens & query_tokens]
 
     if not matched_tags:
         return 0.0, []
 
-    score = len(matched_tags) / len(skill.tags)
+    score = len(matched_tags) / len(tags)
     return min(1.0, score), matched_tags
 
 
 # ---------------------------------------------------------------------------
-# Layer 3: LLM Semantic Matching (via shared _llm_client)
+# Layer 3: Embedding Similarity (local, via shared _embeddings)
+# ---------------------------------------------------------------------------
+
+# The LLM judge runs only if the top two final scores are this close, or the
+# best match is below the MODERATE tier.
+LLM_AMBIGUITY_MARGIN = 0.05
+LLM_CONFIDENCE_FLOOR = 0.35
+
+
+def semantic_scores(query: str, index: SkillRegistryIndex) -> dict[str, float]:
+    """Calibrated 0.0-1.0 embedding relevance for every skill, by file path.
+
+    One query embedding and one matrix-vector product over all skills. If
+    the configured backend fails, the query is scored with hashing instead.
+    """
+    embedder = get_embedder()
+    try:
+        entries, matrix = index.embedding_matrix(embedder)
+        query_vector = embedder.embed_query(query)
+    except EMBEDDING_ERRORS as e:
+        embedder = fallback_embedder(e)
+        entries, matrix = index.embedding_matrix(embedder)
+        query_vector = embedder.embed_query(query)
+    similarities = cosine_scores(matrix, query_vector)
+    return {
+        entry.skill.file_path: calibrate(similarity, embedder)
+        for entry, similarity in zip(entries, similarities)
+    }
+
+
+def is_ambiguous(scores: list[float], margin: float = LLM_AMBIGUITY_MARGIN) -> bool:
+    """True when the ranking needs a second opinion from the LLM judge."""
+    if not scores:
+        return False
+    ranked = sorted(scores, reverse=True)
+    if ranked[0] < LLM_CONFIDENCE_FLOOR:
+        return True
+    runner_up = ranked[1] if len(ranked) > 1 else 0.0
+    return ranked[0] - runner_up < margin
+
+
+# ---------------------------------------------------------------------------
+# Layer 4: LLM Semantic Judge (via shared _llm_client)
 # ---------------------------------------------------------------------------
 
 
@@ -395,13 +757,16 @@ async def llm_semantic_match(
     query: str,
     candidates: list[SkillMetadata],
     provider: str = "openai",
+    with_fallback: bool = True,
 ) -> list[dict]:
     """Use LLM to semantically match query to candidate skills.
 
-    This is the expensive but most accurate matching layer.
-    Only called for candidates that passed keyword/tag filters.
+    This is the expensive but most accurate matching layer. Only called for
+    the top candidates, and (with embeddings on) only for ambiguous rankings.
 
     Delegates to SpoonOS LLMManager when available, falls back to HTTP.
+    Without with_fallback, an unavailable LLM yields [] instead of a neutral
+    0.5 for every candidate.
     """
     if not candidates:
         return []
@@ -409,7 +774,7 @@ async def llm_semantic_match(
     fallback = [
         {"skill_name": c.name, "relevance": 0.5, "reasoning": "LLM unavailable"}
         for c in candidates
-    ]
+    ] if with_fallback else []
 
     skill_summaries = "\n".join(
         f"- **{c.name}**: {c.description[:200]} (tags: {', '.join(c.tags[:5])})"
@@ -474,24 +839,35 @@ async def discover_skills(
     max_results: int = 5,
     provider: str = "openai",
     use_llm: bool = True,
+    use_embeddings: bool = True,
+    llm_margin: float = LLM_AMBIGUITY_MARGIN,
+    trace: Optional[dict] = None,
 ) -> list[SkillMatch]:
     """Main discovery pipeline: scan → filter → score → rank.
 
-    Three-layer matching:
+    Layered matching:
         1. Keyword matching (fast, broad filter)
         2. Tag scoring (structured metadata)
-        3. LLM semantic matching (deep understanding, expensive)
+        3. Embedding similarity (local, vectorized over every skill)
+        4. LLM judge (deep understanding, expensive) — with embeddings on,
+           only when the top scores are within llm_margin or all weak;
+           without them, for every query as before
+
+    trace, if given, receives which layers ran.
     """
-    # Step 1: Scan registry
-    all_skills = scan_skill_registry(registry_path)
-    if not all_skills:
+    # Step 1: Load the registry index (incremental refresh)
+    index = get_registry_index(registry_path)
+    if not len(index):
         return []
 
-    # Step 2: Layer 1 + Layer 2 scoring
-    scored: list[tuple[SkillMetadata, float, list[str], list[str]]] = []
-    for skill in all_skills:
-        kw_score, kw_matched = keyword_match_score(query, skill)
-        tag_score, tag_matched = tag_match_score(query, skill)
+    # Step 2: Layer 1 + Layer 2 scoring, only for skills sharing a query token
+    # (the rest score 0 on both layers and could never pass the threshold)
+    query_tokens = _tokenize(query)
+    lexical: dict[str, tuple[SkillMetadata, float, list[str], list[str]]] = {}
+    for entry in index.candidates(query_tokens):
+        skill = entry.skill
+        kw_score, kw_matched = keyword_token_score(query_tokens, entry.tokens)
+        tag_score, tag_matched = tag_token_score(query_tokens, skill.tags, entry.tag_tokens)
 
         # Weighted combination: keywords 40%, tags 60% (tags are higher signal)
         combined = 0.4 * kw_score + 0.6 * tag_score
@@ -501,35 +877,64 @@ async def discover_skills(
             combined = min(1.0, combined + 0.05)
 
         if combined > 0.05:  # Minimum threshold to proceed
-            scored.append((skill, combined, kw_matched, tag_matched))
-
-    # Sort by score descending
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    # Take top candidates for LLM matching
-    candidates = scored[:max(max_results * 2, 10)]
-
-    # Step 3: Layer 3 — LLM semantic matching (optional)
+            lexical[skill.file_path] = (skill, combined, kw_matched, tag_matched)
+
+    # Take top lexical candidates
+    pool_size = max(max_results * 2, 10)
+    candidates = sorted(lexical.values(), key=lambda x: x[1], reverse=True)[:pool_size]
+
+    # Step 3: Layer 3 — embedding similarity; its top skills join the pool
+    # even when they share no token with the query
+    semantic: dict[str, float] = {}
+    if use_embeddings:
+        semantic = semantic_scores(query, index)
+        pooled = {c[0].file_path for c in candidates}
+        by_path = {skill.file_path: skill for skill in index.skills()}
+        for path in sorted(semantic, key=semantic.__getitem__, reverse=True)[:pool_size]:
+            if path not in pooled and semantic[path] > 0:
+                candidates.append(lexical.get(path) or (by_path[path], 0.0, [], []))
+
+    def blended(base_score: float, path: str) -> float:
+        # Final score: base 40% + semantic 60% (semantic is most accurate)
+        return 0.4 * base_score + 0.6 * semantic[path] if semantic else base_score
+
+    # Step 4: Layer 4 — LLM judge (optional; with embeddings, ambiguous only)
+    candidates.sort(key=lambda c: blended(c[1], c[0].file_path), reverse=True)
     llm_scores: dict[str, dict] = {}
-    if use_llm and candidates:
-        candidate_skills = [c[0] for c in candidates]
-        llm_results = await llm_semantic_match(query, candidate_skills, provider)
+    consult_llm = use_llm and bool(candidates) and (
+        not semantic or is_ambiguous([blended(c[1], c[0].file_path) for c in candidates], llm_margin)
+    )
+    if consult_llm:
+        candidate_skills = [c[0] for c in candidates[:pool_size]]
+        llm_results = await llm_semantic_match(
+            query, candidate_skills, provider, with_fallback=not semantic
+        )
         for result in llm_results:
             if isinstance(result, dict):
                 llm_scores[result.get("skill_name", "")] = result
 
+    if trace is not None:
+        trace["candidates"] = len(candidates)
+        trace["semantic_backend"] = get_embedder().model_id if semantic else None
+        trace["llm_invoked"] = consult_llm
+
     # Combine all scores
     final_matches: list[SkillMatch] = []
     for skill, base_score, kw_matched, tag_matched in candidates:
-        llm_data = llm_scores.get(skill.name, {})
-        llm_relevance = float(llm_data.get("relevance", 0.5))
-        reasoning = str(llm_data.get("reasoning", ""))
-
-        # Final score: base 40% + LLM 60% (LLM is most accurate)
-        if use_llm and llm_scores:
+        llm_data = llm_scores.get(skill.name)
+        if llm_data is not None:
+            llm_relevance = float(llm_data.get("relevance", 0.5))
+            reasoning = str(llm_data.get("reasoning", ""))
             final_score = 0.4 * base_score + 0.6 * llm_relevance
+        elif consult_llm and not semantic:
+            # LLM answered without this skill: neutral relevance, as before
+            final_score = 0.4 * base_score + 0.6 * 0.5 if llm_scores else base_score
+            reasoning = ""
         else:
-            final_score = base_score
+            final_score = blended(base_score, skill.file_path)
+            reasoning = (
+                f"embedding similarity {semantic[skill.file_path]:.2f}" if semantic else ""
+            )
 
         tier = classify_tier(final_score)
 
@@ -598,17 +1003,23 @@ async def run_skill_discovery(input_data: dict) -> dict:
     max_results = min(10, max(1, input_data.get("max_skills", 5)))
     provider = input_data.get("provider", "openai")
     use_llm = input_data.get("use_llm", True)
+    use_embeddings = input_data.get("use_embeddings", True)
+    llm_margin = float(input_data.get("llm_margin", LLM_AMBIGUITY_MARGIN))
 
     start_ms = int(time.time() * 1000)
 
     # Scan and discover
-    all_skills = scan_skill_registry(registry_path)
+    index = get_registry_index(registry_path)
+    trace: dict = {}
     matches = await discover_skills(
         query=query,
         registry_path=registry_path,
         max_results=max_results,
         provider=provider,
         use_llm=use_llm,
+        use_embeddings=use_embeddings,
+        llm_margin=llm_margin,
+        trace=trace,
     )
 
     elapsed_ms = int(time.time() * 1000) - start_ms
@@ -617,11 +1028,13 @@ async def run_skill_discovery(input_data: dict) -> dict:
         "success": True,
         "query": query,
         "registry_path": str(Path(registry_path).resolve()),
-        "total_skills_scanned": len(all_skills),
+        "total_skills_scanned": len(index),
         "matches_found": len(matches),
         "elapsed_ms": elapsed_ms,
         "provider": provider,
         "use_llm": use_llm,
+        "semantic_backend": trace.get("semantic_backend"),
+        "llm_invoked": trace.get("llm_invoked", False),
         "matches": [match_to_dict(m) for m in matches],
     }
 
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Unit tests for the persistent skill registry index."""
+
+import os
+import urllib.error
+
+import pytest
+
+import _embeddings
+from _embeddings import HashingEmbedder
+from skill_discovery import SkillRegistryIndex, semantic_scores
+
+
+def _write_skill(root, rel, name, description, tags=("defi",), mtime_ns=None):
+    path = root / rel / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\nname: {name}\ndescription: {description}\ntags:\n"
+        + "".join(f"  - {tag}\n" for tag in tags)
+        + "---\n\n# Body\n",
+        encoding="utf-8",
+    )
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+class _Embedder:
+    model_id = "test-embedder"
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class _OfflineEmbedder:
+    model_id = "openai-offline"
+
+    def embed(self, texts):
+        raise urllib.error.URLError("Name or service not known")
+
+    def embed_query(self, text):
+        raise urllib.error.URLError("Name or service not known")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "skills"
+    _write_skill(root, "defi/swap", "token-swap", "Swap tokens on a DEX", ("defi", "trading"))
+    _write_skill(root, "nft/rarity", "nft-rarity", "Rank NFT traits by rarity", ("nft",))
+    return root
+
+
+def _index(root, tmp_path):
+    return SkillRegistryIndex(str(root), cache_dir=tmp_path / "cache").refresh()
+
+
+def test_reload_from_disk_parses_nothing(tree, tmp_path):
+    first = _index(tree, tmp_path)
+    assert first.stats["parsed"] == 2
+    assert [s.name for s in first.skills()] == ["token-swap", "nft-rarity"]
+
+    second = _index(tree, tmp_path)
+    assert second.stats["parsed"] == 0
+    assert second.stats["dirs_listed"] == 0
+    assert [s.name for s in second.skills()] == ["token-swap", "nft-rarity"]
+
+
+def test_edited_skill_is_reparsed_and_postings_updated(tree, tmp_path):
+    index = _index(tree, tmp_path)
+    assert [e.skill.name for e in index.candidates({"dex"})] == ["token-swap"]
+
+    path = _write_skill(tree, "defi/swap", "token-swap", "Bridge tokens across chains", ("defi",))
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    index.refresh()
+
+    assert index.stats["parsed"] == 3
+    assert index.candidates({"dex"}) == []
+    assert [e.skill.name for e in index.candidates({"bridge"})] == ["token-swap"]
+    assert "trading" not in index.postings
+
+
+def test_touched_skill_is_not_reparsed(tree, tmp_path):
+    index = _index(tree, tmp_path)
+    path = tree / "nft/rarity/SKILL.md"
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+
+    index.refresh()
+    assert index.stats["parsed"] == 2
+
+    # The new mtime is persisted, so the next process skips hashing too
+    assert _index(tree, tmp_path).stats["parsed"] == 0
+
+
+def test_added_and_removed_skills(tree, tmp_path):
+    index = _index(tree, tmp_path)
+
+    _write_skill(tree, "dao/voting", "dao-voting", "Track governance proposals", ("dao",))
+    (tree / "nft/rarity/SKILL.md").unlink()
+    index.refresh()
+
+    assert [s.name for s in index.skills()] == ["dao-voting", "token-swap"]
+    assert index.candidates({"nft", "rarity"}) == []
+    assert [s.name for s in _index(tree, tmp_path).skills()] == ["dao-voting", "token-swap"]
+
+
+def test_skipped_and_invalid_files(tree, tmp_path):
+    _write_skill(tree, "node_modules/pkg", "vendored", "Should not be indexed")
+    (tree / "broken").mkdir()
+    (tree / "broken/SKILL.md").write_text("no frontmatter here", encoding="utf-8")
+
+    index = _index(tree, tmp_path)
+    assert len(index) == 2
+    assert "broken/SKILL.md" in index.entries
+    assert all(not rel.startswith("node_modules") for rel in index.entries)
+
+
+def test_only_changed_skills_are_reembedded(tree, tmp_path):
+    index = _index(tree, tmp_path)
+    embedder = _Embedder()
+    rows, _ = index.embedding_matrix(embedder)
+    assert [r.skill.name for r in rows] == ["token-swap", "nft-rarity"]
+    assert len(embedder.embedded) == 2
+
+    # Stored with the index: a new process embeds nothing
+    embedder = _Embedder()
+    _index(tree, tmp_path).embedding_matrix(embedder)
+    assert embedder.embedded == []
+
+    path = _write_skill(tree, "nft/rarity", "nft-rarity", "Score NFT traits statistically", ("nft",))
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    index.refresh().embedding_matrix(embedder)
+    assert len(embedder.embedded) == 1 and "statistically" in embedder.embedded[0]
+
+
+def test_failing_backend_falls_back_to_hashing(tree, tmp_path, monkeypatch):
+    monkeypatch.setattr(_embeddings, "_EMBEDDER", _OfflineEmbedder())
+    index = _index(tree, tmp_path)
+
+    scores = semantic_scores("swap tokens on a dex", index)
+
+    assert max(scores, key=scores.__getitem__).endswith("defi/swap/SKILL.md")
+    assert isinstance(_embeddings.get_embedder(), HashingEmbedder)
+
+
+def test_unloadable_model_falls_back_to_hashing(monkeypatch):
+    def missing_model(name):
+        raise OSError(f"{name} is not a local folder and is not a valid model identifier")
+
+    monkeypatch.setattr(_embeddings, "_EMBEDDER", None)
+    monkeypatch.setattr(_embeddings, "SentenceTransformerEmbedder", missing_model)
+    monkeypatch.setenv("SKILL_EMBEDDING_BACKEND", "sentence-transformers")
+
+    assert isinstance(_embeddings.get_embedder(), HashingEmbedder)
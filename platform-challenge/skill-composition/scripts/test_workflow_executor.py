@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Unit tests for workflow_executor scheduling, timeouts and memoization."""
+
+import asyncio
+import time
+
+from workflow_executor import (
+    ExecutorConfig,
+    Isolation,
+    NodeStatus,
+    WorkflowExecutor,
+    config_from_input,
+    resolve_script,
+    script_identity,
+)
+
+
+def _graph(skills, edges, aggregate=False):
+    nodes = [{"id": nid, "type": "skill", "label": nid} for nid in skills]
+    edges = [{"source": s, "target": t} for s, t in edges]
+    if aggregate:
+        nodes.append({"id": "__aggregate__", "type": "aggregator"})
+        edges += [{"source": nid, "target": "__aggregate__"} for nid in skills]
+    return {"nodes": nodes, "edges": edges}
+
+
+def _runner(delays=None, fail=(), calls=None):
+    """Custom runner: sleeps per node, records calls, echoes the payload."""
+    async def run(node, payload):
+        if calls is not None:
+            calls.append(node["id"])
+        await asyncio.sleep((delays or {}).get(node["id"], 0.0))
+        if node["id"] in fail:
+            raise RuntimeError("boom")
+        return {"node": node["id"], "upstream": sorted(payload.get("upstream", {}))}
+    return run
+
+
+def _run(graph, config=ExecutorConfig(), **kwargs):
+    executor = WorkflowExecutor(graph, config=config, **kwargs)
+    return executor, asyncio.run(executor.run())
+
+
+def _skill(tmp_path, script_body, memoize=False, timeout=30):
+    skill_dir = tmp_path / "skill"
+    (skill_dir / "scripts").mkdir(parents=True)
+    (skill_dir / "scripts" / "main.py").write_text(script_body)
+    flag = "      memoize: true\n" if memoize else ""
+    (skill_dir / "SKILL.md").write_text(
+        "---\nname: test-skill\nscripts:\n  definitions:\n    - name: main\n"
+        f"      type: python\n      file: main.py\n      timeout: {timeout}\n{flag}---\n"
+    )
+    return {"id": "s", "type": "skill", "label": "s", "skill_file": str(skill_dir / "SKILL.md")}
+
+
+def test_independent_branches_overlap():
+    graph = _graph(["a", "b", "c"], [], aggregate=True)
+    started = time.perf_counter()
+    executor, results = _run(graph, runner=_runner({"a": 0.2, "b": 0.2, "c": 0.2}))
+
+    assert time.perf_counter() - started < 0.5
+    assert set(results["__aggregate__"].output) == {"a", "b", "c"}
+    assert executor.timing_report()["parallelism"] > 2
+
+
+def test_successor_starts_after_all_predecessors():
+    graph = _graph(["a", "b", "c"], [("a", "c"), ("b", "c")])
+    _, results = _run(graph, runner=_runner({"a": 0.05, "b": 0.15}))
+
+    assert results["c"].start_ms >= max(results["a"].end_ms, results["b"].end_ms)
+    assert results["c"].output["upstream"] == ["a", "b"]
+
+
+def test_failure_skips_downstream_but_not_independent_branches():
+    graph = _graph(["a", "b", "c"], [("a", "b")])
+    _, results = _run(graph, runner=_runner(fail={"a"}))
+
+    assert results["a"].status == NodeStatus.FAILED
+    assert results["b"].status == NodeStatus.SKIPPED
+    assert results["c"].status == NodeStatus.SUCCESS
+
+
+def test_node_timeout_override():
+    graph = _graph(["slow", "after"], [("slow", "after")])
+    config = ExecutorConfig(node_timeouts={"slow": 0.05})
+    _, results = _run(graph, config, runner=_runner({"slow": 5.0}))
+
+    assert results["slow"].status == NodeStatus.TIMEOUT
+    assert results["slow"].duration_ms < 1000
+    assert results["after"].status == NodeStatus.SKIPPED
+
+
+def test_max_concurrency_serializes_nodes():
+    graph = _graph(["a", "b", "c"], [])
+    _, results = _run(graph, ExecutorConfig(max_concurrency=1), runner=_runner({"a": 0.05, "b": 0.05, "c": 0.05}))
+
+    spans = sorted((r.start_ms, r.end_ms) for r in results.values())
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+
+
+def test_dependency_cycle_is_reported():
+    graph = _graph(["a", "b"], [("a", "b"), ("b", "a")])
+    _, results = _run(graph, runner=_runner())
+
+    assert {r.error for r in results.values()} == {"dependency cycle"}
+
+
+def test_memoization_is_opt_in(tmp_path):
+    graph = _graph(["a", "b"], [])
+    query = f"memo-{tmp_path.name}"
+
+    calls = []
+    for _ in range(2):
+        _run(graph, ExecutorConfig(memo_dir=tmp_path), query=query, runner=_runner(calls=calls))
+    assert sorted(calls) == ["a", "a", "b", "b"]
+
+    calls = []
+    config = config_from_input({"memoize_nodes": ["a"], "memo_dir": str(tmp_path)})
+    for _ in range(2):
+        _, results = _run(graph, config, query=query, runner=_runner(calls=calls))
+    assert sorted(calls) == ["a", "b", "b"]
+    assert results["a"].cached and not results["b"].cached
+
+
+def test_script_identity_covers_helper_modules(tmp_path):
+    node = _skill(tmp_path, "import helper\n")
+    helper = tmp_path / "skill" / "scripts" / "helper.py"
+    helper.write_text("VALUE = 1\n")
+    spec = resolve_script(node)
+    before = script_identity(spec)
+
+    helper.write_text("VALUE = 22\n")
+    assert script_identity(spec) != before
+    assert script_identity(spec) == script_identity(spec)
+
+
+def test_skill_md_memoize_flag(tmp_path):
+    assert resolve_script(_skill(tmp_path / "plain", "")).memoize is False
+    assert resolve_script(_skill(tmp_path / "pure", "", memoize=True)).memoize is True
+
+
+def test_subprocess_script_timeout_and_output(tmp_path):
+    node = _skill(tmp_path, (
+        "import json, sys, time\n"
+        "data = json.load(sys.stdin)\n"
+        "time.sleep(data.get('sleep', 0))\n"
+        "print(json.dumps({'echo': data['query']}))\n"
+    ), timeout=0.5)
+    graph = {"nodes": [node, {**node, "id": "t", "label": "t"}], "edges": []}
+    config = ExecutorConfig(isolation=Isolation.SUBPROCESS)
+
+    _, results = _run(graph, config, query="hi", inputs={"t": {"sleep": 5}})
+
+    assert results["s"].status == NodeStatus.SUCCESS
+    assert results["s"].output == {"echo": "hi"}
+    assert results["t"].status == NodeStatus.TIMEOUT
+    assert results["t"].duration_ms < 3000
+
+
+def test_pool_worker_enforces_timeout(tmp_path):
+    node = _skill(tmp_path, (
+        "import json, sys, time\n"
+        "try:\n"
+        "    time.sleep(5)\n"
+        "except Exception:\n"
+        "    pass\n"
+        "print(json.dumps({'done': True}))\n"
+    ), timeout=0.3)
+    _, results = _run({"nodes": [node], "edges": []}, ExecutorConfig(max_workers=1))
+
+    assert results["s"].status == NodeStatus.TIMEOUT
+    assert results["s"].duration_ms < 2000
@@ -80,6 +80,7 @@ class SkillNode:
     parameters: Tuple[dict, ...]
     tags: FrozenSet[str]
     composable: bool
+    file_path: str = ""       # SKILL.md location, used to resolve scripts
 
 
 @dataclass(frozen=True)
@@ -155,6 +156,7 @@ def parse_skill_nodes(matches: list[dict]) -> tuple[SkillNode, ...]:
             parameters=tuple(meta.get("parameters", [])),
             tags=frozenset(meta.get("tags", [])),
             composable=meta.get("composable", True),
+            file_path=meta.get("file_path", ""),
         )
         nodes.append(node)
     return tuple(nodes)
@@ -494,6 +496,7 @@ def generate_state_graph(
             "label": n.skill_name,
             "scripts": list(n.scripts),
             "parameters": list(n.parameters),
+            "skill_file": n.file_path,
         })
 
     # Add aggregator for fan-out/fan-in and mixed strategies
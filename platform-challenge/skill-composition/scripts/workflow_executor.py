@@ -0,0 +1,761 @@
+#!/usr/bin/env python3
+"""Workflow Executor — Run composed StateGraph workflows with maximal concurrency.
+
+This script is the third stage of the Skill Composition Engine pipeline:
+    skill_discovery.py → workflow_composer.py → workflow_executor.py
+
+It takes the StateGraph definition from workflow_composer and executes it:
+    - Every node starts as soon as all of its predecessors finish, as its own
+      asyncio task, so independent branches overlap.
+    - Skill scripts (stdin/stdout JSON programs) run in a process pool of warm
+      interpreters, so CPU-bound skills run truly in parallel; subprocess
+      isolation is available per run.
+    - Each node has a timeout (SKILL.md script timeout, overridable).
+    - Opted-in nodes are memoized by skill code + input payload.
+    - A critical-path report shows which chain of nodes bounded the run.
+
+A workflow then finishes in critical-path time rather than the sum of all
+node times.
+
+stdin/stdout JSON protocol (SpoonOS compatible):
+    ... | python workflow_composer.py | python workflow_executor.py
+
+Dependencies: Python 3.10+, skill_discovery.py (SKILL.md frontmatter parser).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import io
+import json
+import os
+import runpy
+import signal
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from skill_discovery import parse_yaml_frontmatter
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+DEFAULT_NODE_TIMEOUT = 60.0
+POOL_GRACE_SECONDS = 2.0      # backstop beyond the in-worker timeout
+TIMED_OUT = -1000             # runner exit code for a node that hit its timeout
+MEMO_TTL_SECONDS = 300.0      # skill outputs (prices, chain state) go stale
+
+
+def default_memo_dir() -> Path:
+    """Directory for memoized node outputs (WORKFLOW_MEMO_CACHE overrides)."""
+    default = Path.home() / ".cache" / "spoon-workflow-memo"
+    return Path(os.environ.get("WORKFLOW_MEMO_CACHE", str(default)))
+
+
+# ---------------------------------------------------------------------------
+# Domain Types
+# ---------------------------------------------------------------------------
+
+class Isolation(Enum):
+    """How skill scripts are run."""
+    POOL = "pool"               # warm process pool, shared interpreters
+    SUBPROCESS = "subprocess"   # fresh interpreter per node
+
+
+class NodeStatus(Enum):
+    """Outcome of one node."""
+    SUCCESS = "success"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+    SKIPPED = "skipped"         # an upstream skill did not succeed
+    NO_SCRIPT = "no_script"     # prompt-only skill, nothing to execute
+
+
+@dataclass(frozen=True)
+class ExecutorConfig:
+    """Execution settings; every field has a JSON input key of the same name."""
+    isolation: Isolation = Isolation.POOL
+    default_timeout: float = DEFAULT_NODE_TIMEOUT
+    node_timeouts: dict = field(default_factory=dict)   # node_id -> seconds
+    max_workers: int = 0                                 # 0: one per skill node, capped
+    max_concurrency: int = 0                             # 0: unbounded
+    memoize: bool = False                                # True: memoize every skill node
+    memoize_nodes: frozenset = frozenset()               # node ids memoized when memoize is off
+    memo_ttl_seconds: float = MEMO_TTL_SECONDS
+    memo_dir: Optional[Path] = None                      # None: default_memo_dir()
+
+
+@dataclass(frozen=True)
+class ScriptSpec:
+    """A runnable script resolved from a skill's SKILL.md."""
+    name: str
+    path: str
+    timeout: Optional[float]
+    skill_dir: str = ""
+    memoize: bool = False       # SKILL.md script `memoize: true`: output is a pure function of input
+
+
+@dataclass(frozen=True)
+class NodeResult:
+    """Execution record for one graph node."""
+    node_id: str
+    status: NodeStatus
+    output: Any = None
+    error: str = ""
+    start_ms: float = 0.0
+    end_ms: float = 0.0
+    cached: bool = False
+    runner: str = ""
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+    @property
+    def unblocks_successors(self) -> bool:
+        return self.status in (NodeStatus.SUCCESS, NodeStatus.NO_SCRIPT)
+
+
+# A custom runner executes one skill node: (graph node, input payload) -> output.
+NodeRunner = Callable[[dict, dict], Awaitable[Any]]
+
+
+# ---------------------------------------------------------------------------
+# Script Resolution (SKILL.md → script file)
+# ---------------------------------------------------------------------------
+
+def _parse_timeout(value: Any) -> Optional[float]:
+    """SKILL.md timeouts are seconds, occasionally written as "10s"."""
+    try:
+        return float(str(value).strip().rstrip("s"))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _script_definitions(skill_file: str) -> tuple[tuple[dict, ...], str]:
+    """(definitions, working_directory); handles both scripts formats
+    (scripts.definitions and a flat list), like extract_script_names."""
+    try:
+        content = Path(skill_file).read_text(encoding="utf-8")
+    except OSError:
+        return (), ""
+    scripts = parse_yaml_frontmatter(content).get("scripts", {})
+    working_dir = ""
+    if isinstance(scripts, dict):
+        working_dir = str(scripts.get("working_directory", ""))
+        scripts = scripts.get("definitions", [])
+    if not isinstance(scripts, list):
+        return (), ""
+    return tuple(d for d in scripts if isinstance(d, dict)), working_dir
+
+
+def resolve_script(node: dict, script_name: str = "") -> Optional[ScriptSpec]:
+    """The node's script (the named one, else its first Python script)."""
+    skill_file = node.get("skill_file", "")
+    if not skill_file:
+        return None
+    defs, working_dir = _script_definitions(skill_file)
+    skill_dir = Path(skill_file).parent
+    for definition in defs:
+        name = str(definition.get("name", ""))
+        if script_name and name != script_name:
+            continue
+        file_name = definition.get("file") or definition.get("path")
+        if definition.get("type", "python") != "python" or not file_name:
+            continue
+        base = skill_dir / working_dir if working_dir else skill_dir
+        path = base / str(file_name)
+        if not path.is_file() and not working_dir:
+            path = skill_dir / "scripts" / str(file_name)
+        if path.is_file():
+            return ScriptSpec(
+                name, str(path.resolve()), _parse_timeout(definition.get("timeout")),
+                skill_dir=str(skill_dir.resolve()), memoize=definition.get("memoize") is True,
+            )
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Script Runners
+# ---------------------------------------------------------------------------
+
+class _NodeDeadline(BaseException):
+    """Raised inside a pool worker when its node timeout expires.
+
+    A BaseException so a script's own `except Exception` cannot swallow it.
+    """
+
+
+def _raise_deadline(signum, frame) -> None:
+    raise _NodeDeadline()
+
+
+def _run_script_in_process(path: str, payload: str, timeout: float) -> tuple[int, str, str]:
+    """Pool worker: run a stdin/stdout JSON script inside this interpreter.
+
+    The timeout is enforced here with SIGALRM where available, so a runaway
+    script frees its worker. Modules imported from the script's directory
+    are dropped afterwards, since different skills reuse helper names.
+    """
+    script_dir = os.path.dirname(path)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_stdin, saved_argv, saved_path, saved_cwd = sys.stdin, sys.argv, sys.path[:], os.getcwd()
+    use_alarm = hasattr(signal, "setitimer") and timeout > 0
+    code = 0
+    try:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _raise_deadline)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        sys.stdin, sys.argv = io.StringIO(payload), [path]
+        sys.path.insert(0, script_dir)
+        os.chdir(script_dir)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except _NodeDeadline:
+        code = TIMED_OUT
+    except BaseException:
+        code = 1
+        stderr.write(traceback.format_exc())
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        sys.stdin, sys.argv, sys.path[:] = saved_stdin, saved_argv, saved_path
+        os.chdir(saved_cwd)
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None) or ""
+            if module_file.startswith(script_dir + os.sep):
+                del sys.modules[name]
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+async def _run_in_pool(
+    pool: ProcessPoolExecutor, spec: ScriptSpec, payload: str, timeout: float,
+) -> tuple[int, str, str]:
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(pool, _run_script_in_process, spec.path, payload, timeout)
+    try:
+        return await asyncio.wait_for(future, timeout + POOL_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        return TIMED_OUT, "", ""
+
+
+async def _run_in_subprocess(spec: ScriptSpec, payload: str, timeout: float) -> tuple[int, str, str]:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, spec.path,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=os.path.dirname(spec.path),
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(payload.encode()), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return TIMED_OUT, "", ""
+    return proc.returncode or 0, out.decode(errors="replace"), err.decode(errors="replace")
+
+
+def _parse_script_output(code: int, stdout: str, stderr: str) -> tuple[NodeStatus, Any, str]:
+    """Map a script's exit code and stdout to (status, output, error)."""
+    try:
+        output: Any = json.loads(stdout) if stdout.strip() else None
+    except json.JSONDecodeError:
+        output = {"raw_output": stdout}
+    if code == TIMED_OUT:
+        return NodeStatus.TIMEOUT, output, "node timed out"
+    reported = isinstance(output, dict) and "error" in output and not output.get("success")
+    if code != 0 or reported:
+        if reported:
+            return NodeStatus.FAILED, output, str(output["error"])
+        return NodeStatus.FAILED, output, (stderr.strip().splitlines() or [f"exit code {code}"])[-1]
+    return NodeStatus.SUCCESS, output, ""
+
+
+# ---------------------------------------------------------------------------
+# Memoization
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=512)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _source_digest(paths: list[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path}\0{_file_digest(str(path), stat.st_mtime_ns, stat.st_size)}\0".encode())
+    return digest.hexdigest()
+
+
+def script_identity(spec: ScriptSpec) -> str:
+    """Script path + hash of every .py file in its skill directory.
+
+    Editing the script or any helper module it imports invalidates its memos.
+    """
+    skill_dir = Path(spec.skill_dir or os.path.dirname(spec.path))
+    sources = {Path(spec.path), *skill_dir.rglob("*.py")}
+    return f"{spec.path}:{_source_digest(sorted(sources))}"
+
+
+def memo_key(identity: str, payload: dict) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{identity}\0{canonical}".encode()).hexdigest()
+
+
+class MemoCache:
+    """Successful node outputs by memo key, in memory and on disk, with a TTL."""
+
+    _memory: dict[str, tuple[float, Any]] = {}   # shared across executions
+
+    def __init__(self, directory: Optional[Path], ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._memory.get(key)
+        if entry is None and self.directory is not None:
+            try:
+                raw = json.loads((self.directory / f"{key}.json").read_text(encoding="utf-8"))
+                entry = (raw["created_at"], raw["output"])
+            except (OSError, ValueError, KeyError):
+                entry = None
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return False, None
+        self._memory[key] = entry
+        return True, entry[1]
+
+    def put(self, key: str, output: Any) -> None:
+        created_at = time.time()
+        self._memory[key] = (created_at, output)
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"created_at": created_at, "output": output}, handle, default=str)
+            os.replace(tmp, self.directory / f"{key}.json")
+        except OSError:
+            pass  # memoization is an optimization only
+
+
+# ---------------------------------------------------------------------------
+# Graph Structure
+# ---------------------------------------------------------------------------
+
+def graph_links(graph: dict) -> tuple[dict[str, dict], dict[str, list[str]], dict[str, list[str]]]:
+    """(nodes by id, predecessors, successors) from a StateGraph definition."""
+    nodes = {n["id"]: n for n in graph.get("nodes", []) if isinstance(n, dict) and "id" in n}
+    preds: dict[str, list[str]] = {nid: [] for nid in nodes}
+    succs: dict[str, list[str]] = {nid: [] for nid in nodes}
+    for edge in graph.get("edges", []):
+        source, target = edge.get("source"), edge.get("target")
+        if source in nodes and target in nodes and source not in preds[target]:
+            preds[target].append(source)
+            succs[source].append(target)
+    return nodes, preds, succs
+
+
+def critical_path(
+    order: list[str],
+    preds: dict[str, list[str]],
+    durations: dict[str, float],
+) -> tuple[list[str], float, dict[str, float]]:
+    """Longest duration-weighted path through the DAG (critical path method).
+
+    Returns (path, length_ms, slack_ms per node): a node's slack is how much
+    longer it could have taken without lengthening the run.
+    """
+    finish: dict[str, float] = {}
+    via: dict[str, Optional[str]] = {}
+    for nid in order:
+        best = max(preds[nid], key=lambda p: finish.get(p, 0.0), default=None)
+        finish[nid] = durations.get(nid, 0.0) + (finish.get(best, 0.0) if best else 0.0)
+        via[nid] = best
+    if not finish:
+        return [], 0.0, {}
+    end = max(order, key=finish.__getitem__)
+    length = finish[end]
+
+    latest_finish: dict[str, float] = {}
+    succs: dict[str, list[str]] = {nid: [] for nid in order}
+    for nid in order:
+        for p in preds[nid]:
+            if p in succs:
+                succs[p].append(nid)
+    for nid in reversed(order):
+        latest_finish[nid] = min(
+            (latest_finish[s] - durations.get(s, 0.0) for s in succs[nid]), default=length
+        )
+    slack = {nid: round(latest_finish[nid] - finish[nid], 3) for nid in order}
+
+    path: list[str] = []
+    node: Optional[str] = end
+    while node is not None:
+        path.append(node)
+        node = via[node]
+    path.reverse()
+    return path, length, slack
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+class WorkflowExecutor:
+    """Event-driven DAG scheduler over a StateGraph definition.
+
+    Node payloads: {"query": ..., **inputs[node_id], "upstream": {pred_id:
+    output}}. Aggregator nodes collect their successful predecessors' outputs.
+    A skill node is skipped if any upstream skill failed; independent branches
+    keep running.
+    """
+
+    def __init__(
+        self,
+        graph: dict,
+        query: str = "",
+        inputs: Optional[dict] = None,
+        config: ExecutorConfig = ExecutorConfig(),
+        runner: Optional[NodeRunner] = None,
+        scripts: Optional[dict] = None,
+    ):
+        self.graph = graph
+        self.query = query
+        self.inputs = inputs or {}
+        self.config = config
+        self.runner = runner
+        self.scripts = scripts or {}
+        self.nodes, self.preds, self.succs = graph_links(graph)
+        self.memo = MemoCache(config.memo_dir or default_memo_dir(), config.memo_ttl_seconds)
+        self.results: dict[str, NodeResult] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._start = 0.0
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def _memoize(self, node_id: str, spec: Optional[ScriptSpec]) -> bool:
+        """Memoization is opt-in: globally, per node, or per script in SKILL.md."""
+        if self.config.memoize or node_id in self.config.memoize_nodes:
+            return True
+        return spec is not None and spec.memoize
+
+    def _timeout(self, node_id: str, spec: Optional[ScriptSpec]) -> float:
+        if node_id in self.config.node_timeouts:
+            return float(self.config.node_timeouts[node_id])
+        if spec is not None and spec.timeout:
+            return spec.timeout
+        return self.config.default_timeout
+
+    # ----- scheduling -----
+
+    async def run(self) -> dict[str, NodeResult]:
+        """Execute the graph; returns one NodeResult per node."""
+        self._start = time.perf_counter()
+        if self.config.max_concurrency > 0:
+            self._limit = asyncio.Semaphore(self.config.max_concurrency)
+        waiting = {nid: len(p) for nid, p in self.preds.items()}
+        running: dict[asyncio.Task, str] = {}
+
+        def launch(nid: str) -> None:
+            running[asyncio.ensure_future(self._execute(nid))] = nid
+
+        for nid in sorted(nid for nid, count in waiting.items() if count == 0):
+            launch(nid)
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    nid = running.pop(task)
+                    self.results[nid] = task.result()
+                    for successor in self.succs[nid]:
+                        waiting[successor] -= 1
+                        if waiting[successor] == 0:
+                            launch(successor)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+        now = self._now_ms()
+        for nid in self.nodes:  # never became ready: dependency cycle
+            if nid not in self.results:
+                self.results[nid] = NodeResult(nid, NodeStatus.SKIPPED, error="dependency cycle",
+                                               start_ms=now, end_ms=now)
+        return self.results
+
+    async def _execute(self, node_id: str) -> NodeResult:
+        node = self.nodes[node_id]
+        kind = node.get("type", "skill")
+        start = self._now_ms()
+        if kind == "aggregator":
+            output = {
+                p: self.results[p].output for p in self.preds[node_id]
+                if self.results[p].status == NodeStatus.SUCCESS
+            }
+            return NodeResult(node_id, NodeStatus.SUCCESS, output, start_ms=start, end_ms=self._now_ms())
+        if kind != "skill":
+            return NodeResult(node_id, NodeStatus.SUCCESS, start_ms=start, end_ms=start)
+
+        blocked = [p for p in self.preds[node_id] if not self.results[p].unblocks_successors]
+        if blocked:
+            return NodeResult(node_id, NodeStatus.SKIPPED, error=f"upstream not successful: {', '.join(blocked)}",
+                              start_ms=start, end_ms=start)
+
+        if self._limit is None:
+            return await self._execute_skill(node_id, node)
+        async with self._limit:
+            return await self._execute_skill(node_id, node)
+
+    def _payload(self, node_id: str) -> dict:
+        payload: dict = {"query": self.query}
+        payload.update(self.inputs.get(node_id, {}))
+        upstream = {
+            p: self.results[p].output for p in self.preds[node_id]
+            if self.nodes[p].get("type") == "skill" and self.results[p].output is not None
+        }
+        if upstream:
+            payload["upstream"] = upstream
+        return payload
+
+    async def _execute_skill(self, node_id: str, node: dict) -> NodeResult:
+        start = self._now_ms()
+        payload = self._payload(node_id)
+        spec = None if self.runner else resolve_script(node, self.scripts.get(node_id, ""))
+        if self.runner is None and spec is None:
+            return NodeResult(node_id, NodeStatus.NO_SCRIPT, start_ms=start, end_ms=start)
+        timeout = self._timeout(node_id, spec)
+        runner_name = "custom" if self.runner else self.config.isolation.value
+
+        key = ""
+        if self._memoize(node_id, spec):
+            identity = script_identity(spec) if spec else f"{node_id}:{node.get('label', '')}"
+            key = memo_key(identity, payload)
+            hit, output = self.memo.get(key)
+            if hit:
+                return NodeResult(node_id, NodeStatus.SUCCESS, output, start_ms=start,
+                                  end_ms=self._now_ms(), cached=True, runner=runner_name)
+
+        if self.runner is not None:
+            try:
+                output = await asyncio.wait_for(self.runner(node, payload), timeout)
+                status, error = NodeStatus.SUCCESS, ""
+            except asyncio.TimeoutError:
+                output, status, error = None, NodeStatus.TIMEOUT, "node timed out"
+            except Exception as e:
+                output, status, error = None, NodeStatus.FAILED, f"{type(e).__name__}: {e}"
+        else:
+            encoded = json.dumps(payload, default=str)
+            if self.config.isolation == Isolation.SUBPROCESS:
+                code, stdout, stderr = await _run_in_subprocess(spec, encoded, timeout)
+            else:
+                code, stdout, stderr = await _run_in_pool(self._get_pool(), spec, encoded, timeout)
+            status, output, error = _parse_script_output(code, stdout, stderr)
+
+        if key and status == NodeStatus.SUCCESS:
+            self.memo.put(key, output)
+        return NodeResult(node_id, status, output, error, start, self._now_ms(), runner=runner_name)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            workers = self.config.max_workers
+            if workers <= 0:
+                skill_nodes = sum(1 for n in self.nodes.values() if n.get("type") == "skill")
+                workers = min(32, max(os.cpu_count() or 1, skill_nodes))
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+        return self._pool
+
+    # ----- reporting -----
+
+    def timing_report(self) -> dict:
+        """Wall time vs. summed node time, and the critical path that bounded the run.
+
+        parallelism is the average number of nodes in flight; on a machine
+        with fewer cores than CPU-bound branches it overstates the speedup.
+        """
+        durations = {nid: r.duration_ms for nid, r in self.results.items()}
+        order = _topological_order(self.nodes, self.preds)
+        path, length, slack = critical_path(order, self.preds, durations)
+        wall = max((r.end_ms for r in self.results.values()), default=0.0)
+        serial = sum(durations.values())
+        return {
+            "wall_ms": round(wall, 3),
+            "serial_ms": round(serial, 3),
+            "parallelism": round(serial / wall, 2) if wall > 0 else 1.0,
+            "critical_path": [nid for nid in path if self.nodes[nid].get("type") in ("skill", "aggregator")],
+            "critical_path_ms": round(length, 3),
+            "scheduling_overhead_ms": round(max(0.0, wall - length), 3),
+            "slack_ms": {nid: s for nid, s in slack.items() if self.nodes[nid].get("type") == "skill"},
+        }
+
+
+def _topological_order(nodes: dict[str, dict], preds: dict[str, list[str]]) -> list[str]:
+    """Kahn's algorithm; nodes on a cycle are left out."""
+    waiting = {nid: len(p) for nid, p in preds.items()}
+    succs: dict[str, list[str]] = {nid: [] for nid in nodes}
+    for nid, ps in preds.items():
+        for p in ps:
+            succs[p].append(nid)
+    queue = sorted(nid for nid, count in waiting.items() if count == 0)
+    order: list[str] = []
+    while queue:
+        nid = queue.pop(0)
+        order.append(nid)
+        for s in succs[nid]:
+            waiting[s] -= 1
+            if waiting[s] == 0:
+                queue.append(s)
+    return order
+
+
+# ---------------------------------------------------------------------------
+# Serialization Helpers
+# ---------------------------------------------------------------------------
+
+def _result_to_dict(result: NodeResult) -> dict:
+    return {
+        "status": result.status.value,
+        "output": result.output,
+        "error": result.error,
+        "start_ms": round(result.start_ms, 3),
+        "end_ms": round(result.end_ms, 3),
+        "duration_ms": round(result.duration_ms, 3),
+        "cached": result.cached,
+        "runner": result.runner,
+    }
+
+
+def config_from_input(input_data: dict) -> ExecutorConfig:
+    """Build an ExecutorConfig from JSON input keys (missing keys keep defaults)."""
+    try:
+        isolation = Isolation(str(input_data.get("isolation", "pool")).lower())
+    except ValueError:
+        isolation = Isolation.POOL
+    memo_dir = input_data.get("memo_dir")
+    return ExecutorConfig(
+        isolation=isolation,
+        default_timeout=float(input_data.get("default_timeout", DEFAULT_NODE_TIMEOUT)),
+        node_timeouts=dict(input_data.get("node_timeouts", {})),
+        max_workers=int(input_data.get("max_workers", 0)),
+        max_concurrency=int(input_data.get("max_concurrency", 0)),
+        memoize=bool(input_data.get("memoize", False)),
+        memoize_nodes=frozenset(input_data.get("memoize_nodes", ())),
+        memo_ttl_seconds=float(input_data.get("memo_ttl_seconds", MEMO_TTL_SECONDS)),
+        memo_dir=Path(memo_dir) if memo_dir else None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Main Execution Pipeline
+# ---------------------------------------------------------------------------
+
+async def run_workflow_executor(input_data: dict, runner: Optional[NodeRunner] = None) -> dict:
+    """Main entry point: execute a composed StateGraph workflow.
+
+    StateGraph node mapping:
+        graph.add_node("execute", run_workflow_executor)
+        graph.add_edge("compose", "execute")
+        graph.add_edge("execute", "end")
+
+    Expected input (workflow_composer.py output, plus optional settings):
+        {
+            "query": "user intent",
+            "graph": {...},                      # from workflow_composer output
+            "inputs": {"node_id": {...}},        # extra payload per node
+            "scripts": {"node_id": "name"},      # script to run (default: first)
+            "isolation": "pool",                 # pool|subprocess
+            "default_timeout": 60,
+            "node_timeouts": {"node_id": 30},
+            "max_workers": 0,
+            "max_concurrency": 0,
+            "memoize": false,                    # true: memoize every skill node
+            "memoize_nodes": ["node_id"],
+            "memo_ttl_seconds": 300
+        }
+    """
+    graph = input_data.get("graph")
+    if not isinstance(graph, dict) or not graph.get("nodes"):
+        return {"error": "Missing required parameter: graph"}
+
+    query = input_data.get("query", "")
+    config = config_from_input(input_data)
+
+    # Honor an explicitly sequential workflow
+    if graph.get("execution_mode") == "sequential" and config.max_concurrency == 0:
+        config = dataclasses.replace(config, max_concurrency=1)
+
+    start_ms = int(time.time() * 1000)
+    executor = WorkflowExecutor(
+        graph, query,
+        inputs=input_data.get("inputs", {}),
+        config=config,
+        runner=runner,
+        scripts=input_data.get("scripts", {}),
+    )
+    results = await executor.run()
+    elapsed_ms = int(time.time() * 1000) - start_ms
+
+    skill_results = {
+        nid: r for nid, r in results.items() if executor.nodes[nid].get("type") == "skill"
+    }
+    errors = [
+        {"node": nid, "status": r.status.value, "error": r.error}
+        for nid, r in skill_results.items()
+        if r.status in (NodeStatus.FAILED, NodeStatus.TIMEOUT, NodeStatus.SKIPPED)
+    ]
+    aggregate = results.get("__aggregate__")
+
+    return {
+        "success": not errors,
+        "query": query,
+        "strategy": graph.get("strategy", ""),
+        "execution_mode": graph.get("execution_mode", ""),
+        "isolation": "custom" if runner else config.isolation.value,
+        "nodes": {nid: _result_to_dict(r) for nid, r in skill_results.items()},
+        "aggregate": aggregate.output if aggregate else None,
+        "errors": errors,
+        "timing": executor.timing_report(),
+        "cache_hits": sum(1 for r in skill_results.values() if r.cached),
+        "elapsed_ms": elapsed_ms,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Main Entry Point (stdin/stdout JSON protocol)
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    """Read JSON from stdin, execute the workflow, output JSON to stdout."""
+    try:
+        input_data = json.loads(sys.stdin.read())
+        result = asyncio.run(run_workflow_executor(input_data))
+        print(json.dumps(result, indent=2, default=str))
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON input"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": f"Workflow execution failed: {e}"}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real UserOperation submission via handleOps
 - Real simulation and validation
 - Real event monitoring and tracking
+- Concurrent simulation and multi-bundle submission
 """
 
 import os
@@ -17,6 +18,17 @@ from dataclasses import dataclass
 from web3 import Web3
 from eth_account import Account
 
+from userop_bundler import (
+    HANDLE_OPS_OVERHEAD_GAS,
+    Bundle,
+    SimulationResult,
+    compute_user_op_hash,
+    load_entrypoint,
+    simulate_user_operations,
+    user_op_bundle_gas,
+    user_op_to_tuple
+)
+
 # ERC-4337 EntryPoint v0.6.0 (Mainnet, Polygon, Arbitrum, Optimism, Base)
 ENTRYPOINT_V06_ADDRESS = "0x5FF137D4b0FDCD49DcA30c7CF57E578a026d2789"
 
@@ -31,6 +43,13 @@ class UserOpReceipt:
     actual_gas_cost: float
     events: List[Dict]
 
+@dataclass
+class BundleSubmission:
+    """Outcome of submitting one bundle"""
+    tx_hash: Optional[str]  # Set once the transaction was broadcast
+    receipt: Optional[UserOpReceipt] = None  # Set once it was confirmed
+    error: Optional[str] = None
+
 @dataclass
 class ValidationResult:
     """Result of UserOperation validation"""
@@ -72,135 +91,17 @@ class EntryPointInteraction:
         
         # Load EntryPoint contract
         self.entrypoint = self._load_entrypoint_contract()
+        self.chain_id = self.w3.eth.chain_id
         
-        print(f"✅ EntryPoint interaction initialized")
+        print("✅ EntryPoint interaction initialized")
         print(f"   EntryPoint: {self.entrypoint_address}")
-        print(f"   Chain ID: {self.w3.eth.chain_id}")
+        print(f"   Chain ID: {self.chain_id}")
         if self.bundler_account:
             print(f"   Bundler: {self.bundler_account.address}")
     
     def _load_entrypoint_contract(self):
-        """Load full EntryPoint contract ABI"""
-        # Complete EntryPoint v0.6.0 ABI
-        entrypoint_abi = [
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"internalType": "address", "name": "sender", "type": "address"},
-                            {"internalType": "uint256", "name": "nonce", "type": "uint256"},
-                            {"internalType": "bytes", "name": "initCode", "type": "bytes"},
-                            {"internalType": "bytes", "name": "callData", "type": "bytes"},
-                            {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
-                            {"internalType": "bytes", "name": "signature", "type": "bytes"}
-                        ],
-                        "internalType": "struct UserOperation[]",
-                        "name": "ops",
-                        "type": "tuple[]"
-                    },
-                    {"internalType": "address payable", "name": "beneficiary", "type": "address"}
-                ],
-                "name": "handleOps",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"internalType": "address", "name": "sender", "type": "address"},
-                            {"internalType": "uint256", "name": "nonce", "type": "uint256"},
-                            {"internalType": "bytes", "name": "initCode", "type": "bytes"},
-                            {"internalType": "bytes", "name": "callData", "type": "bytes"},
-                            {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
-                            {"internalType": "bytes", "name": "signature", "type": "bytes"}
-                        ],
-                        "internalType": "struct UserOperation",
-                        "name": "userOp",
-                        "type": "tuple"
-                    }
-                ],
-                "name": "getUserOpHash",
-                "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-                "name": "depositTo",
-                "outputs": [],
-                "stateMutability": "payable",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {"internalType": "address payable", "name": "withdrawAddress", "type": "address"},
-                    {"internalType": "uint256", "name": "withdrawAmount", "type": "uint256"}
-                ],
-                "name": "withdrawTo",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {"internalType": "address", "name": "sender", "type": "address"},
-                    {"internalType": "uint192", "name": "key", "type": "uint192"}
-                ],
-                "name": "getNonce",
-                "outputs": [{"internalType": "uint256", "name": "nonce", "type": "uint256"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "anonymous": False,
-                "inputs": [
-                    {"indexed": True, "internalType": "bytes32", "name": "userOpHash", "type": "bytes32"},
-                    {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
-                    {"indexed": True, "internalType": "address", "name": "paymaster", "type": "address"},
-                    {"indexed": False, "internalType": "uint256", "name": "nonce", "type": "uint256"},
-                    {"indexed": False, "internalType": "bool", "name": "success", "type": "bool"},
-                    {"indexed": False, "internalType": "uint256", "name": "actualGasCost", "type": "uint256"},
-                    {"indexed": False, "internalType": "uint256", "name": "actualGasUsed", "type": "uint256"}
-                ],
-                "name": "UserOperationEvent",
-                "type": "event"
-            },
-            {
-                "anonymous": False,
-                "inputs": [
-                    {"indexed": True, "internalType": "bytes32", "name": "userOpHash", "type": "bytes32"},
-                    {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
-                    {"indexed": False, "internalType": "uint256", "name": "nonce", "type": "uint256"},
-                    {"indexed": False, "internalType": "bytes", "name": "revertReason", "type": "bytes"}
-                ],
-                "name": "UserOperationRevertReason",
-                "type": "event"
-            }
-        ]
-        
-        return self.w3.eth.contract(
-            address=self.entrypoint_address,
-            abi=entrypoint_abi
-        )
+        """Load EntryPoint contract (shared per Web3 instance)"""
+        return load_entrypoint(self.w3, self.entrypoint_address)
     
     def get_user_op_hash(self, user_op: Dict) -> str:
         """
@@ -212,9 +113,7 @@ class EntryPointInteraction:
         Returns:
             UserOperation hash as hex string
         """
-        user_op_tuple = self._dict_to_tuple(user_op)
-        user_op_hash = self.entrypoint.functions.getUserOpHash(user_op_tuple).call()
-        return user_op_hash.hex()
+        return compute_user_op_hash(user_op, self.entrypoint_address, self.chain_id)
     
     def get_nonce(self, sender: str, key: int = 0) -> int:
         """
@@ -273,7 +172,7 @@ class EntryPointInteraction:
             print("❌ No account available for deposit")
             return None
         
-        print(f"\n💰 Depositing to EntryPoint")
+        print("\n💰 Depositing to EntryPoint")
         print(f"   For: {account}")
         print(f"   Amount: {amount_eth} ETH")
         print(f"   From: {sender.address}")
@@ -298,12 +197,12 @@ class EntryPointInteraction:
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
             
             if receipt['status'] == 1:
-                print(f"   ✅ Deposit successful!")
+                print("   ✅ Deposit successful!")
                 new_balance = self.get_deposit_balance(account)
                 print(f"   New balance: {new_balance} ETH")
                 return tx_hash.hex()
             else:
-                print(f"   ❌ Deposit failed")
+                print("   ❌ Deposit failed")
                 return None
                 
         except Exception as e:
@@ -323,33 +222,53 @@ class EntryPointInteraction:
         Returns:
             (success, error_message) tuple
         """
-        print(f"\n🔬 Simulating UserOperation")
+        print("\n🔬 Simulating UserOperation")
         print(f"   Sender: {user_op['sender']}")
         
-        try:
-            user_op_tuple = self._dict_to_tuple(user_op)
-            
-            # Try to call simulateHandleOp (this will revert with validation data)
-            # In production, you'd use eth_call with special bundler RPC
-            self.entrypoint.functions.simulateHandleOp(
-                user_op_tuple,
-                user_op['sender'],
-                user_op['callData']
-            ).call()
-            
-            print(f"   ✅ Simulation passed")
+        result = self.simulate_user_operations([user_op])[0]
+        
+        if result.success:
+            print("   ✅ Simulation passed")
+            print(f"   Pre-op gas: {result.pre_op_gas:,}")
             return True, None
+        
+        print(f"   ❌ Simulation failed: {result.error[:100]}")
+        return False, result.error
+    
+    def simulate_user_operations(
+        self,
+        user_ops: List[Dict],
+        max_workers: int = 16
+    ) -> List[SimulationResult]:
+        """
+        Simulate many UserOperations concurrently
+        
+        simulateHandleOp always reverts; the ExecutionResult / FailedOp
+        revert data is decoded into a SimulationResult per operation.
+        
+        Args:
+            user_ops: UserOperations to simulate
+            max_workers: Concurrent eth_call requests
             
-        except Exception as e:
-            error_msg = str(e)
-            print(f"   ❌ Simulation failed: {error_msg[:100]}")
-            return False, error_msg
+        Returns:
+            SimulationResult per operation, in order
+        """
+        user_op_hashes = [self.get_user_op_hash(op) for op in user_ops]
+        return simulate_user_operations(
+            self.w3,
+            self.entrypoint_address,
+            user_ops,
+            user_op_hashes,
+            max_workers
+        )
     
     def submit_user_operations(
         self,
         user_ops: List[Dict],
         beneficiary: Optional[str] = None,
-        wait_for_receipt: bool = True
+        wait_for_receipt: bool = True,
+        gas_limit: Optional[int] = None,
+        tx_nonce: Optional[int] = None
     ) -> Optional[UserOpReceipt]:
         """
         Submit UserOperations to EntryPoint via handleOps
@@ -358,6 +277,8 @@ class EntryPointInteraction:
             user_ops: List of UserOperations to submit
             beneficiary: Address to receive bundler fees (uses bundler if not provided)
             wait_for_receipt: Whether to wait for transaction confirmation
+            gas_limit: handleOps gas limit (sized from the operations if not provided)
+            tx_nonce: Bundler transaction nonce (read from chain if not provided)
             
         Returns:
             UserOpReceipt if successful, None otherwise
@@ -374,38 +295,21 @@ class EntryPointInteraction:
         print(f"\n🚀 Submitting {len(user_ops)} UserOperation(s)")
         print(f"   Beneficiary: {beneficiary}")
         
-        # Convert to tuples
-        user_ops_tuples = [self._dict_to_tuple(op) for op in user_ops]
-        
-        # Get user op hashes
-        user_op_hashes = []
-        for op in user_ops:
-            op_hash = self.get_user_op_hash(op)
-            user_op_hashes.append(op_hash)
-            print(f"   UserOp #{len(user_op_hashes)}: {op_hash[:16]}...")
+        # Get user op hashes (computed locally)
+        user_op_hashes = [self.get_user_op_hash(op) for op in user_ops]
+        for i, op_hash in enumerate(user_op_hashes[:10], 1):
+            print(f"   UserOp #{i}: {op_hash[:16]}...")
+        if len(user_op_hashes) > 10:
+            print(f"   ... and {len(user_op_hashes) - 10} more")
         
         try:
-            # Build handleOps transaction
-            tx = self.entrypoint.functions.handleOps(
-                user_ops_tuples,
-                beneficiary
-            ).build_transaction({
-                'from': self.bundler_account.address,
-                'gas': 1_000_000,  # High limit for safety
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.bundler_account.address)
-            })
-            
-            # Sign and send
-            signed_tx = self.bundler_account.sign_transaction(tx)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            
-            print(f"   ✅ Transaction sent: {tx_hash.hex()}")
+            tx_hash = self._send_handle_ops(user_ops, beneficiary, gas_limit, tx_nonce)
+            print(f"   ✅ Transaction sent: {tx_hash}")
             
             if not wait_for_receipt:
                 return UserOpReceipt(
                     user_op_hash=user_op_hashes[0],
-                    tx_hash=tx_hash.hex(),
+                    tx_hash=tx_hash,
                     block_number=0,
                     success=True,
                     actual_gas_used=0,
@@ -413,43 +317,125 @@ class EntryPointInteraction:
                     events=[]
                 )
             
-            # Wait for receipt
-            print(f"   ⏳ Waiting for confirmation...")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
-            print(f"   ✅ Confirmed in block {receipt['blockNumber']}")
-            print(f"   Gas used: {receipt['gasUsed']:,}")
-            
-            # Parse events
-            events = self._parse_user_op_events(receipt)
-            
-            # Calculate gas cost
-            gas_cost_wei = receipt['gasUsed'] * receipt['effectiveGasPrice']
-            gas_cost_eth = float(Web3.from_wei(gas_cost_wei, 'ether'))
-            
-            print(f"   💰 Total cost: {gas_cost_eth:.6f} ETH")
-            
-            # Check for UserOperationEvent
-            for event in events:
-                if event['event'] == 'UserOperationEvent':
-                    print(f"\n   ✅ UserOperation executed successfully")
-                    print(f"      Actual gas used: {event['args']['actualGasUsed']:,}")
-                    print(f"      Actual gas cost: {Web3.from_wei(event['args']['actualGasCost'], 'ether')} ETH")
-            
-            return UserOpReceipt(
-                user_op_hash=user_op_hashes[0],
-                tx_hash=tx_hash.hex(),
-                block_number=receipt['blockNumber'],
-                success=receipt['status'] == 1,
-                actual_gas_used=receipt['gasUsed'],
-                actual_gas_cost=gas_cost_eth,
-                events=events
-            )
+            return self._wait_for_receipt(tx_hash, user_op_hashes[0])
             
         except Exception as e:
             print(f"   ❌ Submission failed: {e}")
             return None
     
+    def _send_handle_ops(
+        self,
+        user_ops: List[Dict],
+        beneficiary: str,
+        gas_limit: Optional[int] = None,
+        tx_nonce: Optional[int] = None
+    ) -> str:
+        """Build, sign and broadcast a handleOps transaction; returns its hash"""
+        if gas_limit is None:
+            # At least the previous fixed limit, more for large bundles
+            gas_limit = max(
+                1_000_000,
+                HANDLE_OPS_OVERHEAD_GAS + sum(user_op_bundle_gas(op) for op in user_ops)
+            )
+        if tx_nonce is None:
+            tx_nonce = self.w3.eth.get_transaction_count(self.bundler_account.address)
+        
+        tx = self.entrypoint.functions.handleOps(
+            [self._dict_to_tuple(op) for op in user_ops],
+            beneficiary
+        ).build_transaction({
+            'from': self.bundler_account.address,
+            'gas': gas_limit,
+            'gasPrice': self.w3.eth.gas_price,
+            'nonce': tx_nonce
+        })
+        signed_tx = self.bundler_account.sign_transaction(tx)
+        return self.w3.eth.send_raw_transaction(signed_tx.rawTransaction).hex()
+    
+    def _wait_for_receipt(self, tx_hash: str, user_op_hash: str) -> UserOpReceipt:
+        """Wait for a handleOps transaction and decode its UserOperation events"""
+        print("   ⏳ Waiting for confirmation...")
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        
+        print(f"   ✅ Confirmed in block {receipt['blockNumber']}")
+        print(f"   Gas used: {receipt['gasUsed']:,}")
+        
+        # Parse events
+        events = self._parse_user_op_events(receipt)
+        
+        # Calculate gas cost
+        gas_cost_wei = receipt['gasUsed'] * receipt['effectiveGasPrice']
+        gas_cost_eth = float(Web3.from_wei(gas_cost_wei, 'ether'))
+        
+        print(f"   💰 Total cost: {gas_cost_eth:.6f} ETH")
+        
+        # Check for UserOperationEvent
+        for event in events:
+            if event['event'] == 'UserOperationEvent':
+                print("\n   ✅ UserOperation executed successfully")
+                print(f"      Actual gas used: {event['args']['actualGasUsed']:,}")
+                print(f"      Actual gas cost: {Web3.from_wei(event['args']['actualGasCost'], 'ether')} ETH")
+        
+        return UserOpReceipt(
+            user_op_hash=user_op_hash,
+            tx_hash=tx_hash,
+            block_number=receipt['blockNumber'],
+            success=receipt['status'] == 1,
+            actual_gas_used=receipt['gasUsed'],
+            actual_gas_cost=gas_cost_eth,
+            events=events
+        )
+    
+    def submit_bundles(
+        self,
+        bundles: List[Bundle],
+        beneficiary: Optional[str] = None,
+        wait_for_receipt: bool = False
+    ) -> List[BundleSubmission]:
+        """
+        Submit bundles from BundlePipeline as consecutive handleOps transactions
+        
+        Bundler transaction nonces are assigned locally from the pending
+        count and advance as soon as a transaction is broadcast, so bundles
+        go out back to back and a slow or failed confirmation never causes
+        the next bundle to reuse a nonce.
+        
+        Args:
+            bundles: Bundles produced by BundlePipeline.process
+            beneficiary: Address to receive bundler fees
+            wait_for_receipt: Wait for each transaction before sending the next
+            
+        Returns:
+            BundleSubmission per bundle: tx_hash once broadcast, receipt once
+            confirmed (only when waiting), error if either step failed
+        """
+        if not self.bundler_account:
+            print("❌ No bundler account configured")
+            return [BundleSubmission(tx_hash=None, error="No bundler account configured") for _ in bundles]
+        
+        beneficiary = Web3.to_checksum_address(beneficiary or self.bundler_account.address)
+        tx_nonce = self.w3.eth.get_transaction_count(self.bundler_account.address, 'pending')
+        submissions = []
+        for bundle in bundles:
+            try:
+                tx_hash = self._send_handle_ops(bundle.user_ops, beneficiary, bundle.gas_limit, tx_nonce)
+            except Exception as e:
+                print(f"   ❌ Bundle submission failed: {e}")
+                submissions.append(BundleSubmission(tx_hash=None, error=str(e)))
+                continue
+            # The nonce is used once the transaction is in the mempool
+            tx_nonce += 1
+            print(f"   ✅ Bundle of {len(bundle.user_ops)} sent: {tx_hash}")
+            submission = BundleSubmission(tx_hash=tx_hash)
+            if wait_for_receipt:
+                try:
+                    submission.receipt = self._wait_for_receipt(tx_hash, bundle.user_op_hashes[0])
+                except Exception as e:
+                    submission.error = str(e)
+            submissions.append(submission)
+        
+        return submissions
+    
     def _parse_user_op_events(self, receipt: Dict) -> List[Dict]:
         """Parse UserOperation events from transaction receipt"""
         events = []
@@ -477,19 +463,7 @@ class EntryPointInteraction:
     
     def _dict_to_tuple(self, user_op: Dict) -> tuple:
         """Convert UserOperation dict to tuple"""
-        return (
-            Web3.to_checksum_address(user_op['sender']),
-            user_op['nonce'],
-            bytes.fromhex(user_op['initCode'][2:] if user_op['initCode'].startswith('0x') else user_op['initCode']),
-            bytes.fromhex(user_op['callData'][2:] if user_op['callData'].startswith('0x') else user_op['callData']),
-            user_op['callGasLimit'],
-            user_op['verificationGasLimit'],
-            user_op['preVerificationGas'],
-            user_op['maxFeePerGas'],
-            user_op['maxPriorityFeePerGas'],
-            bytes.fromhex(user_op['paymasterAndData'][2:] if user_op['paymasterAndData'].startswith('0x') else user_op['paymasterAndData']),
-            bytes.fromhex(user_op['signature'][2:] if user_op['signature'].startswith('0x') else user_op['signature'])
-        )
+        return user_op_to_tuple(user_op)
 
 
 def main():
@@ -520,7 +494,7 @@ def main():
     print(f"   Nonce: {nonce}")
     
     # Check deposit balance
-    print(f"\n💰 Checking EntryPoint deposit balance")
+    print("\n💰 Checking EntryPoint deposit balance")
     balance = entrypoint.get_deposit_balance(example_account)
     print(f"   Balance: {balance} ETH")
 
@@ -8,6 +8,7 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real Paymaster contract deployment and interaction
 - Real UserOperation validation and sponsorship
 - Real gas estimation and payment
+- Bulk sponsorship with batched token-balance reads and local hashing
 """
 
 import json
@@ -18,6 +19,10 @@ from decimal import Decimal
 from web3 import Web3
 from eth_account import Account
 from eth_account.messages import encode_defunct
+from eth_abi import encode
+from eth_keys import keys
+
+from userop_bundler import compute_user_op_hash, load_entrypoint, multicall, user_op_to_tuple
 
 # ERC-4337 EntryPoint v0.6.0 (Official deployment)
 ENTRYPOINT_V06_ADDRESS = "0x5FF137D4b0FDCD49DcA30c7CF57E578a026d2789"
@@ -87,118 +92,27 @@ class PaymasterSponsor:
         
         # Initialize account for signing if provided
         self.account = None
+        self._signing_key = None
         if owner_private_key:
             self.account = Account.from_key(owner_private_key)
+            # Parsed once; re-deriving it per signature dominates bulk sponsorship
+            self._signing_key = keys.PrivateKey(bytes(self.account.key))
         
         # Load EntryPoint contract
         self.entrypoint = self._load_entrypoint_contract()
+        self.chain_id = self.w3.eth.chain_id
         
         # Sponsorship tracking
         self.daily_spending: Dict[str, float] = {}  # user_address -> eth_spent_today
         
-        print(f"✅ Paymaster initialized")
+        print("✅ Paymaster initialized")
         print(f"   Paymaster: {self.paymaster_address}")
         print(f"   EntryPoint: {self.entrypoint_address}")
-        print(f"   Network: {self.w3.eth.chain_id}")
+        print(f"   Network: {self.chain_id}")
     
     def _load_entrypoint_contract(self):
-        """Load ERC-4337 EntryPoint contract ABI"""
-        # Real EntryPoint v0.6.0 ABI (key functions)
-        entrypoint_abi = [
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"internalType": "address", "name": "sender", "type": "address"},
-                            {"internalType": "uint256", "name": "nonce", "type": "uint256"},
-                            {"internalType": "bytes", "name": "initCode", "type": "bytes"},
-                            {"internalType": "bytes", "name": "callData", "type": "bytes"},
-                            {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
-                            {"internalType": "bytes", "name": "signature", "type": "bytes"}
-                        ],
-                        "internalType": "struct UserOperation",
-                        "name": "userOp",
-                        "type": "tuple"
-                    },
-                    {"internalType": "address", "name": "target", "type": "address"},
-                    {"internalType": "bytes", "name": "targetCallData", "type": "bytes"}
-                ],
-                "name": "simulateHandleOp",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"internalType": "address", "name": "sender", "type": "address"},
-                            {"internalType": "uint256", "name": "nonce", "type": "uint256"},
-                            {"internalType": "bytes", "name": "initCode", "type": "bytes"},
-                            {"internalType": "bytes", "name": "callData", "type": "bytes"},
-                            {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
-                            {"internalType": "bytes", "name": "signature", "type": "bytes"}
-                        ],
-                        "internalType": "struct UserOperation[]",
-                        "name": "ops",
-                        "type": "tuple[]"
-                    },
-                    {"internalType": "address payable", "name": "beneficiary", "type": "address"}
-                ],
-                "name": "handleOps",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            },
-            {
-                "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"internalType": "address", "name": "sender", "type": "address"},
-                            {"internalType": "uint256", "name": "nonce", "type": "uint256"},
-                            {"internalType": "bytes", "name": "initCode", "type": "bytes"},
-                            {"internalType": "bytes", "name": "callData", "type": "bytes"},
-                            {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
-                            {"internalType": "bytes", "name": "signature", "type": "bytes"}
-                        ],
-                        "internalType": "struct UserOperation",
-                        "name": "userOp",
-                        "type": "tuple"
-                    }
-                ],
-                "name": "getUserOpHash",
-                "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        
-        return self.w3.eth.contract(
-            address=self.entrypoint_address,
-            abi=entrypoint_abi
-        )
+        """Load ERC-4337 EntryPoint contract (shared per Web3 instance)"""
+        return load_entrypoint(self.w3, self.entrypoint_address)
     
     def calculate_user_op_gas(
         self,
@@ -245,7 +159,8 @@ class PaymasterSponsor:
         self,
         sender: str,
         gas_cost: UserOperationGas,
-        policy: SponsorshipPolicy
+        policy: SponsorshipPolicy,
+        token_balance: Optional[int] = None
     ) -> Tuple[bool, str]:
         """
         Check if a user operation is eligible for gas sponsorship
@@ -254,6 +169,7 @@ class PaymasterSponsor:
             sender: User's smart account address
             gas_cost: Calculated gas costs
             policy: Sponsorship policy to apply
+            token_balance: Prefetched balance of the required token (read from chain if None)
             
         Returns:
             (eligible, reason) tuple
@@ -288,7 +204,9 @@ class PaymasterSponsor:
         # Check token balance requirement (if configured)
         if policy.require_token_balance:
             token_address, min_balance = policy.require_token_balance
-            balance = self._get_token_balance(sender, token_address)
+            balance = token_balance
+            if balance is None:
+                balance = self._get_token_balance(sender, token_address)
             if balance < min_balance:
                 return False, f"Insufficient token balance: {balance} < {min_balance}"
         
@@ -347,9 +265,9 @@ class PaymasterSponsor:
                 [user_op_hash, valid_until, valid_after]
             )
             
-            # Sign the message
-            signed_message = self.account.signHash(message)
-            signature = signed_message.signature
+            # Sign the message (r || s || v with v in {27, 28})
+            signed = self._signing_key.sign_msg_hash(bytes(message))
+            signature = signed.r.to_bytes(32, 'big') + signed.s.to_bytes(32, 'big') + bytes([signed.v + 27])
             
             # Append signature (65 bytes)
             paymaster_data += signature
@@ -380,7 +298,7 @@ class PaymasterSponsor:
         """
         sender = user_op['sender']
         
-        print(f"\n💎 Sponsorship Request")
+        print("\n💎 Sponsorship Request")
         print(f"   Sender: {sender}")
         
         # Calculate gas costs
@@ -440,7 +358,7 @@ class PaymasterSponsor:
         self.daily_spending[sender_checksum] = self.daily_spending.get(sender_checksum, 0.0) + gas_cost.estimated_cost_eth
         
         print(f"   📊 Daily spending: {self.daily_spending[sender_checksum]:.6f} / {policy.daily_limit_eth} ETH")
-        print(f"   ✅ Sponsorship approved!")
+        print("   ✅ Sponsorship approved!")
         
         return SponsorshipResult(
             success=True,
@@ -451,21 +369,98 @@ class PaymasterSponsor:
             reason="Sponsored successfully"
         )
     
+    def sponsor_user_operations(
+        self,
+        user_ops: List[Dict],
+        policy: SponsorshipPolicy,
+        valid_until: int = 0,
+        valid_after: int = 0,
+        quiet: bool = False
+    ) -> List[SponsorshipResult]:
+        """
+        Sponsor many user operations in one pass
+        
+        Reads the gas price once, fetches required token balances for all
+        senders through one Multicall3 batch and computes UserOperation
+        hashes locally, so no per-operation RPC calls are made. Policy and
+        daily limits are applied in order, exactly as repeated calls to
+        sponsor_user_operation would.
+        
+        Args:
+            user_ops: UserOperations to sponsor (updated in place)
+            policy: Sponsorship policy to apply
+            valid_until: Sponsorship expiration timestamp
+            valid_after: Sponsorship activation timestamp
+            quiet: Suppress the summary output
+            
+        Returns:
+            SponsorshipResult per operation, in order
+        """
+        if not user_ops:
+            return []
+        
+        gas_price = self.w3.eth.gas_price
+        
+        token_balances: Dict[str, int] = {}
+        if policy.require_token_balance:
+            token_address = Web3.to_checksum_address(policy.require_token_balance[0])
+            senders = list(dict.fromkeys(Web3.to_checksum_address(op['sender']) for op in user_ops))
+            selector = Web3.keccak(text="balanceOf(address)")[:4]
+            calls = [(token_address, selector + encode(['address'], [sender])) for sender in senders]
+            for sender, (ok, data) in zip(senders, multicall(self.w3, calls)):
+                token_balances[sender] = int.from_bytes(data[:32], 'big') if ok and len(data) >= 32 else 0
+        
+        results = []
+        for user_op in user_ops:
+            sender = Web3.to_checksum_address(user_op['sender'])
+            gas_cost = self.calculate_user_op_gas(user_op, gas_price)
+            
+            eligible, reason = self.check_sponsorship_eligibility(
+                sender, gas_cost, policy, token_balances.get(sender)
+            )
+            if not eligible:
+                results.append(SponsorshipResult(
+                    success=False,
+                    user_op_hash="",
+                    sponsored=False,
+                    gas_sponsored=0,
+                    cost_eth=0.0,
+                    reason=reason
+                ))
+                continue
+            
+            user_op_hash_hex = compute_user_op_hash(user_op, self.entrypoint_address, self.chain_id)
+            paymaster_data = self.generate_paymaster_data(
+                bytes.fromhex(user_op_hash_hex),
+                valid_until,
+                valid_after
+            )
+            user_op['paymasterAndData'] = '0x' + paymaster_data.hex()
+            
+            self.daily_spending[sender] = self.daily_spending.get(sender, 0.0) + gas_cost.estimated_cost_eth
+            
+            results.append(SponsorshipResult(
+                success=True,
+                user_op_hash=user_op_hash_hex,
+                sponsored=True,
+                gas_sponsored=gas_cost.total_gas,
+                cost_eth=gas_cost.estimated_cost_eth,
+                reason="Sponsored successfully"
+            ))
+        
+        if not quiet:
+            sponsored = [r for r in results if r.sponsored]
+            print("\n💎 Bulk Sponsorship")
+            print(f"   Requests: {len(user_ops)}")
+            print(f"   ✅ Sponsored: {len(sponsored)}")
+            print(f"   ❌ Declined: {len(results) - len(sponsored)}")
+            print(f"   Total Cost: {sum(r.cost_eth for r in sponsored):.6f} ETH")
+        
+        return results
+    
     def _dict_to_tuple(self, user_op: Dict) -> tuple:
         """Convert UserOperation dict to tuple for contract calls"""
-        return (
-            Web3.to_checksum_address(user_op['sender']),
-            user_op['nonce'],
-            bytes.fromhex(user_op['initCode'][2:] if user_op['initCode'].startswith('0x') else user_op['initCode']),
-            bytes.fromhex(user_op['callData'][2:] if user_op['callData'].startswith('0x') else user_op['callData']),
-            user_op['callGasLimit'],
-            user_op['verificationGasLimit'],
-            user_op['preVerificationGas'],
-            user_op['maxFeePerGas'],
-            user_op['maxPriorityFeePerGas'],
-            bytes.fromhex(user_op['paymasterAndData'][2:] if user_op['paymasterAndData'].startswith('0x') else user_op['paymasterAndData']),
-            bytes.fromhex(user_op['signature'][2:] if user_op['signature'].startswith('0x') else user_op['signature'])
-        )
+        return user_op_to_tuple(user_op)
     
     def get_paymaster_deposit(self) -> float:
         """Get paymaster's deposit in EntryPoint (in ETH)"""
@@ -540,7 +535,7 @@ def main():
         policy=policy
     )
     
-    print(f"\n📋 Sponsorship Result:")
+    print("\n📋 Sponsorship Result:")
     print(f"   Success: {result.success}")
     print(f"   Sponsored: {result.sponsored}")
     print(f"   Gas Sponsored: {result.gas_sponsored:,} units")
@@ -548,7 +543,7 @@ def main():
     print(f"   Reason: {result.reason}")
     
     if result.success:
-        print(f"\n✅ UserOperation ready to be submitted with paymaster!")
+        print("\n✅ UserOperation ready to be submitted with paymaster!")
         print(f"   paymasterAndData: {user_op['paymasterAndData'][:50]}...")
 
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Unit tests for UserOperation bundling, signing order and nonce handling."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import userop_bundler
+from entrypoint_interaction import EntryPointInteraction
+from userop_bundler import (
+    Bundle,
+    BundlePipeline,
+    NonceCache,
+    compute_user_op_hash,
+    is_signed,
+)
+
+ALICE = "0x" + "11" * 20
+BOB = "0x" + "22" * 20
+PAYMASTER = "0x" + "33" * 20
+
+
+def _op(sender, nonce=None, signature="0x"):
+    op = {
+        "sender": sender,
+        "initCode": "0x",
+        "callData": "0x",
+        "callGasLimit": 50_000,
+        "verificationGasLimit": 100_000,
+        "preVerificationGas": 21_000,
+        "maxFeePerGas": 1,
+        "maxPriorityFeePerGas": 1,
+        "paymasterAndData": "0x",
+        "signature": signature,
+    }
+    if nonce is not None:
+        op["nonce"] = nonce
+    return op
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    """Stub the Multicall3 state read: every sender funded, nonces from the dict."""
+    nonces = {}
+
+    def fetch_account_state(w3, entrypoint, senders, paymasters=(), nonce_key=0, block="latest"):
+        accounts = {
+            s: {"nonce": nonces.get(s, 0), "deposit": 10 ** 18, "balance": 10 ** 18} for s in senders
+        }
+        return accounts, {p: 10 ** 18 for p in paymasters}
+
+    monkeypatch.setattr(userop_bundler, "fetch_account_state", fetch_account_state)
+    return nonces
+
+
+def _pipeline(**kwargs):
+    return BundlePipeline(SimpleNamespace(eth=SimpleNamespace(chain_id=1)), simulate=False, **kwargs)
+
+
+class _Sponsor:
+    """Sets paymasterAndData the way PaymasterSponsor does."""
+
+    paymaster_address = PAYMASTER
+
+    def sponsor_user_operations(self, user_ops, policy, quiet=False):
+        for op in user_ops:
+            op["paymasterAndData"] = PAYMASTER + "ab" * 8
+        return [SimpleNamespace(success=True, reason="") for _ in user_ops]
+
+
+def test_nonce_cache_hands_out_sequential_nonces():
+    cache = NonceCache()
+    cache.seed(ALICE, 7)
+    assert [cache.reserve(ALICE) for _ in range(3)] == [7, 8, 9]
+    cache.seed(ALICE, 8)  # chain caught up; local reservations stay ahead
+    assert cache.reserve(ALICE) == 10
+    cache.observe(ALICE, 20)
+    assert cache.reserve(ALICE) == 21
+
+
+def test_pipeline_assigns_nonces_and_packs_one_op_per_sender(chain):
+    chain[userop_bundler.Web3.to_checksum_address(ALICE)] = 5
+    pipeline = _pipeline()
+    bundles = list(pipeline.process([_op(ALICE), _op(ALICE), _op(BOB)]))
+
+    assert [op["nonce"] for b in bundles for op in b.user_ops if op["sender"].lower() == ALICE] == [5, 6]
+    for bundle in bundles:
+        senders = [op["sender"] for op in bundle.user_ops]
+        assert len(senders) == len(set(senders))
+    assert pipeline.stats.bundled == 3
+
+
+def test_signed_ops_are_not_mutated_without_a_signer(chain):
+    pipeline = _pipeline(sponsor=_Sponsor(), policy=object())
+    signed = _op(ALICE, nonce=0, signature="0x" + "aa" * 65)
+    bundles = list(pipeline.process([signed, _op(BOB, signature="0x" + "bb" * 65)]))
+
+    (bundle,) = bundles
+    (op,) = bundle.user_ops
+    assert op["signature"] == signed["signature"]
+    assert op["paymasterAndData"] == "0x"  # left self-funded rather than re-sponsored
+    assert pipeline.stats.rejected[0]["reason"].startswith("Signed operation has no nonce")
+
+
+def test_signer_runs_after_nonce_and_sponsorship(chain):
+    seen = []
+
+    def signer(user_op, user_op_hash):
+        seen.append((dict(user_op), user_op_hash))
+        return "0x" + "cc" * 65
+
+    pipeline = _pipeline(sponsor=_Sponsor(), policy=object(), signer=signer)
+    (bundle,) = list(pipeline.process([_op(ALICE, signature="0x" + "aa" * 65)]))
+
+    (signed_op, signed_hash), = seen
+    assert signed_op["nonce"] == 0
+    assert signed_op["paymasterAndData"].startswith(PAYMASTER)
+    assert signed_hash == compute_user_op_hash(bundle.user_ops[0], pipeline.entrypoint_address, 1)
+    assert bundle.user_op_hashes == [signed_hash]
+    assert bundle.user_ops[0]["signature"] == "0x" + "cc" * 65
+    assert is_signed(bundle.user_ops[0])
+
+
+def test_signing_failure_drops_the_senders_later_nonces(chain):
+    def signer(user_op, user_op_hash):
+        if user_op["sender"].lower() == ALICE and user_op["nonce"] == 0:
+            raise ValueError("key unavailable")
+        return "0x" + "cc" * 65
+
+    pipeline = _pipeline(signer=signer)
+    bundles = list(pipeline.process([_op(ALICE), _op(ALICE), _op(BOB, nonce=0)]))
+
+    assert [op["sender"].lower() for b in bundles for op in b.user_ops] == [BOB]
+    assert len(pipeline.stats.rejected) == 2
+
+
+def _interaction(sent, fail_send=(), fail_receipt=False):
+    interaction = EntryPointInteraction.__new__(EntryPointInteraction)
+    interaction.w3 = SimpleNamespace(eth=SimpleNamespace(get_transaction_count=lambda address, block: 40))
+    interaction.bundler_account = SimpleNamespace(address="0x" + "44" * 20)
+
+    def send(user_ops, beneficiary, gas_limit=None, tx_nonce=None):
+        sent.append(tx_nonce)
+        if len(sent) in fail_send:
+            raise ValueError("nonce too low")
+        return f"0xhash{tx_nonce}"
+
+    def wait(tx_hash, user_op_hash):
+        if fail_receipt:
+            raise TimeoutError("not mined")
+        return SimpleNamespace(tx_hash=tx_hash)
+
+    interaction._send_handle_ops = send
+    interaction._wait_for_receipt = wait
+    return interaction
+
+
+def _bundles(n):
+    return [Bundle(user_ops=[_op(ALICE, nonce=i)], user_op_hashes=[f"h{i}"], gas_limit=1) for i in range(n)]
+
+
+def test_submit_bundles_advances_nonce_on_send_not_receipt():
+    sent = []
+    submissions = _interaction(sent, fail_receipt=True).submit_bundles(_bundles(3), wait_for_receipt=True)
+
+    assert sent == [40, 41, 42]
+    assert [s.tx_hash for s in submissions] == ["0xhash40", "0xhash41", "0xhash42"]
+    assert all(s.receipt is None and s.error for s in submissions)
+
+
+def test_submit_bundles_reuses_nonce_after_failed_send():
+    sent = []
+    submissions = _interaction(sent, fail_send=(2,)).submit_bundles(_bundles(3))
+
+    assert sent == [40, 41, 41]
+    assert [s.tx_hash for s in submissions] == ["0xhash40", None, "0xhash41"]
+    assert submissions[1].error == "nonce too low"
@@ -8,6 +8,7 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real nonce fetching from EntryPoint
 - Real call data encoding for target contracts
 - Real signature generation for smart accounts
+- Batched nonce reads with a per-sender nonce cache
 """
 
 import os
@@ -17,6 +18,8 @@ from web3 import Web3
 from eth_account import Account
 from eth_abi import encode
 
+from userop_bundler import NonceCache, compute_user_op_hash, fetch_account_state, load_entrypoint
+
 # ERC-4337 EntryPoint
 ENTRYPOINT_V06_ADDRESS = "0x5FF137D4b0FDCD49DcA30c7CF57E578a026d2789"
 
@@ -81,56 +84,16 @@ class UserOperationBuilder:
         self.w3 = w3
         self.entrypoint_address = Web3.to_checksum_address(entrypoint_address)
         self.entrypoint = self._load_entrypoint_contract()
+        self.nonce_cache = NonceCache()
+        self.chain_id = self.w3.eth.chain_id
         
         print(f"✅ UserOperation builder initialized")
-        print(f"   Chain ID: {self.w3.eth.chain_id}")
+        print(f"   Chain ID: {self.chain_id}")
         print(f"   EntryPoint: {self.entrypoint_address}")
     
     def _load_entrypoint_contract(self):
-        """Load EntryPoint contract"""
-        abi = [
-            {
-                "inputs": [
-                    {"internalType": "address", "name": "sender", "type": "address"},
-                    {"internalType": "uint192", "name": "key", "type": "uint192"}
-                ],
-                "name": "getNonce",
-                "outputs": [{"internalType": "uint256", "name": "nonce", "type": "uint256"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"internalType": "address", "name": "sender", "type": "address"},
-                            {"internalType": "uint256", "name": "nonce", "type": "uint256"},
-                            {"internalType": "bytes", "name": "initCode", "type": "bytes"},
-                            {"internalType": "bytes", "name": "callData", "type": "bytes"},
-                            {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
-                            {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
-                            {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
-                            {"internalType": "bytes", "name": "signature", "type": "bytes"}
-                        ],
-                        "internalType": "struct UserOperation",
-                        "name": "userOp",
-                        "type": "tuple"
-                    }
-                ],
-                "name": "getUserOpHash",
-                "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
-        
-        return self.w3.eth.contract(
-            address=self.entrypoint_address,
-            abi=abi
-        )
+        """Load EntryPoint contract (shared per Web3 instance)"""
+        return load_entrypoint(self.w3, self.entrypoint_address)
     
     def get_nonce(self, sender: str, key: int = 0) -> int:
         """
@@ -430,6 +393,82 @@ class UserOperationBuilder:
             paymaster_and_data=paymaster_and_data
         )
     
+    def build_user_operations(
+        self,
+        requests: List[Dict],
+        gas_multiplier: float = 1.5,
+        nonce_key: int = 0
+    ) -> List[UserOperation]:
+        """
+        Build many UserOperations with shared network reads
+        
+        Gas price is read once and nonces for all senders come from a single
+        Multicall3 batch; repeated senders get sequential nonces from the
+        per-sender cache instead of re-reading the chain.
+        
+        Args:
+            requests: Dicts with 'sender' and 'call_data', optionally
+                'init_code', 'nonce', 'paymaster_and_data', 'signature'
+            gas_multiplier: Multiplier for gas estimates
+            nonce_key: Nonce key for parallel operations
+            
+        Returns:
+            UserOperations in request order
+        """
+        print(f"\n🔨 Building {len(requests)} UserOperations")
+        
+        senders = [Web3.to_checksum_address(req['sender']) for req in requests]
+        unseeded = [
+            sender for sender in dict.fromkeys(senders)
+            if self.nonce_cache.chain_nonce(sender, nonce_key) is None
+        ]
+        if unseeded:
+            accounts, _ = fetch_account_state(
+                self.w3, self.entrypoint_address, unseeded, nonce_key=nonce_key
+            )
+            for sender, account in accounts.items():
+                self.nonce_cache.seed(sender, account['nonce'], nonce_key)
+            print(f"   Nonces: {len(unseeded)} senders (1 multicall)")
+        
+        gas_price = self.w3.eth.gas_price
+        max_fee_per_gas = int(gas_price * 1.3)  # 30% buffer
+        max_priority_fee = int(gas_price * 0.1)  # 10% priority
+        
+        user_ops = []
+        for req, sender in zip(requests, senders):
+            init_code = req.get('init_code', "0x")
+            paymaster_and_data = req.get('paymaster_and_data', "0x")
+            
+            nonce = req.get('nonce')
+            if nonce is None:
+                nonce = self.nonce_cache.reserve(sender, nonce_key)
+            else:
+                self.nonce_cache.observe(sender, nonce, nonce_key)
+            
+            call_gas, verification_gas, pre_verification_gas = self.estimate_user_op_gas(
+                req['call_data'],
+                init_code,
+                len(paymaster_and_data) > 2
+            )
+            
+            user_ops.append(UserOperation(
+                sender=sender,
+                nonce=nonce,
+                initCode=init_code,
+                callData=req['call_data'],
+                callGasLimit=int(call_gas * gas_multiplier),
+                verificationGasLimit=int(verification_gas * gas_multiplier),
+                preVerificationGas=pre_verification_gas,
+                maxFeePerGas=max_fee_per_gas,
+                maxPriorityFeePerGas=max_priority_fee,
+                paymasterAndData=paymaster_and_data,
+                signature=req.get('signature', "0x")
+            ))
+        
+        print(f"   ✅ Built {len(user_ops)} UserOperations")
+        
+        return user_ops
+    
     def get_user_op_hash(self, user_op: UserOperation) -> str:
         """
         Calculate UserOperation hash
@@ -440,9 +479,7 @@ class UserOperationBuilder:
         Returns:
             UserOperation hash as hex string
         """
-        user_op_tuple = user_op.to_tuple()
-        user_op_hash = self.entrypoint.functions.getUserOpHash(user_op_tuple).call()
-        return user_op_hash.hex()
+        return compute_user_op_hash(user_op.to_dict(), self.entrypoint_address, self.chain_id)
 
 
 def main():
@@ -0,0 +1,868 @@
+#!/usr/bin/env python3
+"""
+UserOperation Bundling Pipeline for ERC-4337
+Turns a stream of UserOperations into gas-sized handleOps bundles
+
+REAL IMPLEMENTATION - No Mocks/Simulations
+- Real nonce, deposit and balance reads batched through Multicall3
+- Real per-sender nonce cache for sequential operations
+- Real concurrent simulateHandleOp calls against the EntryPoint
+- Real bundle packing bounded by gas limit and bundle size
+"""
+
+import os
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from web3 import Web3
+from eth_abi import encode, decode
+
+# ERC-4337 EntryPoint v0.6.0
+ENTRYPOINT_V06_ADDRESS = "0x5FF137D4b0FDCD49DcA30c7CF57E578a026d2789"
+
+# Multicall3 (same address on all major EVM chains)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Pipeline limits
+MAX_CALLS_PER_MULTICALL = 500
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_MAX_BUNDLE_GAS = 10_000_000
+DEFAULT_MAX_BUNDLE_SIZE = 50
+DEFAULT_SIMULATION_WORKERS = 16
+HANDLE_OPS_OVERHEAD_GAS = 100_000  # handleOps loop, beneficiary payment, calldata
+
+USER_OP_COMPONENTS = [
+    {"internalType": "address", "name": "sender", "type": "address"},
+    {"internalType": "uint256", "name": "nonce", "type": "uint256"},
+    {"internalType": "bytes", "name": "initCode", "type": "bytes"},
+    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+    {"internalType": "uint256", "name": "callGasLimit", "type": "uint256"},
+    {"internalType": "uint256", "name": "verificationGasLimit", "type": "uint256"},
+    {"internalType": "uint256", "name": "preVerificationGas", "type": "uint256"},
+    {"internalType": "uint256", "name": "maxFeePerGas", "type": "uint256"},
+    {"internalType": "uint256", "name": "maxPriorityFeePerGas", "type": "uint256"},
+    {"internalType": "bytes", "name": "paymasterAndData", "type": "bytes"},
+    {"internalType": "bytes", "name": "signature", "type": "bytes"}
+]
+
+USER_OP_TYPE = "(address,uint256,bytes,bytes,uint256,uint256,uint256,uint256,uint256,bytes,bytes)"
+
+# EntryPoint v0.6.0 ABI (functions and events used by this skill)
+ENTRYPOINT_ABI = [
+    {
+        "inputs": [
+            {"components": USER_OP_COMPONENTS, "internalType": "struct UserOperation[]", "name": "ops", "type": "tuple[]"},
+            {"internalType": "address payable", "name": "beneficiary", "type": "address"}
+        ],
+        "name": "handleOps",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"components": USER_OP_COMPONENTS, "internalType": "struct UserOperation", "name": "op", "type": "tuple"},
+            {"internalType": "address", "name": "target", "type": "address"},
+            {"internalType": "bytes", "name": "targetCallData", "type": "bytes"}
+        ],
+        "name": "simulateHandleOp",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"components": USER_OP_COMPONENTS, "internalType": "struct UserOperation", "name": "userOp", "type": "tuple"}
+        ],
+        "name": "getUserOpHash",
+        "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "sender", "type": "address"},
+            {"internalType": "uint192", "name": "key", "type": "uint192"}
+        ],
+        "name": "getNonce",
+        "outputs": [{"internalType": "uint256", "name": "nonce", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
+        "name": "depositTo",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "address payable", "name": "withdrawAddress", "type": "address"},
+            {"internalType": "uint256", "name": "withdrawAmount", "type": "uint256"}
+        ],
+        "name": "withdrawTo",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "bytes32", "name": "userOpHash", "type": "bytes32"},
+            {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
+            {"indexed": True, "internalType": "address", "name": "paymaster", "type": "address"},
+            {"indexed": False, "internalType": "uint256", "name": "nonce", "type": "uint256"},
+            {"indexed": False, "internalType": "bool", "name": "success", "type": "bool"},
+            {"indexed": False, "internalType": "uint256", "name": "actualGasCost", "type": "uint256"},
+            {"indexed": False, "internalType": "uint256", "name": "actualGasUsed", "type": "uint256"}
+        ],
+        "name": "UserOperationEvent",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "bytes32", "name": "userOpHash", "type": "bytes32"},
+            {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
+            {"indexed": False, "internalType": "uint256", "name": "nonce", "type": "uint256"},
+            {"indexed": False, "internalType": "bytes", "name": "revertReason", "type": "bytes"}
+        ],
+        "name": "UserOperationRevertReason",
+        "type": "event"
+    }
+]
+
+# Function selectors
+SELECTOR_GET_NONCE = Web3.keccak(text="getNonce(address,uint192)")[:4]
+SELECTOR_BALANCE_OF = Web3.keccak(text="balanceOf(address)")[:4]
+SELECTOR_GET_ETH_BALANCE = Web3.keccak(text="getEthBalance(address)")[:4]
+SELECTOR_AGGREGATE3 = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+SELECTOR_SIMULATE_HANDLE_OP = Web3.keccak(text=f"simulateHandleOp({USER_OP_TYPE},address,bytes)")[:4]
+
+# simulateHandleOp always reverts: ExecutionResult on success, FailedOp on validation failure
+ERROR_EXECUTION_RESULT = Web3.keccak(text="ExecutionResult(uint256,uint256,uint48,uint48,bool,bytes)")[:4]
+ERROR_FAILED_OP = Web3.keccak(text="FailedOp(uint256,string)")[:4]
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of simulateHandleOp for one UserOperation"""
+    user_op_hash: str
+    success: bool
+    pre_op_gas: int = 0
+    paid: int = 0
+    target_success: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class Bundle:
+    """A handleOps bundle ready for submission"""
+    user_ops: List[Dict]
+    user_op_hashes: List[str]
+    gas_limit: int
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "size": len(self.user_ops),
+            "gas_limit": self.gas_limit,
+            "user_op_hashes": self.user_op_hashes
+        }
+
+
+@dataclass
+class PipelineStats:
+    """Counters for a pipeline run"""
+    received: int = 0
+    bundled: int = 0
+    bundles: int = 0
+    rejected: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "received": self.received,
+            "bundled": self.bundled,
+            "bundles": self.bundles,
+            "rejected": len(self.rejected),
+            "rejections": self.rejected[:20]
+        }
+
+
+def _to_bytes(value: str) -> bytes:
+    """Hex string (with or without 0x) to bytes"""
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+@lru_cache(maxsize=32)
+def load_entrypoint(w3: Web3, entrypoint_address: str = ENTRYPOINT_V06_ADDRESS):
+    """
+    Load the EntryPoint contract once per (Web3, address)
+
+    Args:
+        w3: Web3 instance
+        entrypoint_address: EntryPoint contract address
+
+    Returns:
+        Cached web3 contract object
+    """
+    return w3.eth.contract(
+        address=Web3.to_checksum_address(entrypoint_address),
+        abi=ENTRYPOINT_ABI
+    )
+
+
+def user_op_to_tuple(user_op: Dict) -> tuple:
+    """Convert UserOperation dict to tuple for contract calls"""
+    return (
+        Web3.to_checksum_address(user_op['sender']),
+        user_op['nonce'],
+        _to_bytes(user_op['initCode']),
+        _to_bytes(user_op['callData']),
+        user_op['callGasLimit'],
+        user_op['verificationGasLimit'],
+        user_op['preVerificationGas'],
+        user_op['maxFeePerGas'],
+        user_op['maxPriorityFeePerGas'],
+        _to_bytes(user_op['paymasterAndData']),
+        _to_bytes(user_op['signature'])
+    )
+
+
+def compute_user_op_hash(user_op: Dict, entrypoint_address: str, chain_id: int) -> str:
+    """
+    Compute the EntryPoint v0.6 UserOperation hash locally
+
+    Same value as EntryPoint.getUserOpHash without an RPC round trip:
+    keccak256(abi.encode(keccak256(pack(userOp)), entryPoint, chainId))
+
+    Returns:
+        UserOperation hash as hex string (no 0x prefix, like HexBytes.hex())
+    """
+    packed = encode(
+        ['address', 'uint256', 'bytes32', 'bytes32', 'uint256', 'uint256',
+         'uint256', 'uint256', 'uint256', 'bytes32'],
+        [
+            Web3.to_checksum_address(user_op['sender']),
+            user_op['nonce'],
+            Web3.keccak(_to_bytes(user_op['initCode'])),
+            Web3.keccak(_to_bytes(user_op['callData'])),
+            user_op['callGasLimit'],
+            user_op['verificationGasLimit'],
+            user_op['preVerificationGas'],
+            user_op['maxFeePerGas'],
+            user_op['maxPriorityFeePerGas'],
+            Web3.keccak(_to_bytes(user_op['paymasterAndData']))
+        ]
+    )
+    user_op_hash = Web3.keccak(encode(
+        ['bytes32', 'address', 'uint256'],
+        [Web3.keccak(packed), Web3.to_checksum_address(entrypoint_address), chain_id]
+    ))
+    return bytes(user_op_hash).hex()
+
+
+def is_signed(user_op: Dict) -> bool:
+    """True if the operation already carries a signature"""
+    return len(_to_bytes(user_op.get('signature') or '0x')) > 0
+
+
+def paymaster_of(user_op: Dict) -> Optional[str]:
+    """Paymaster address from paymasterAndData (None if unsponsored)"""
+    data = _to_bytes(user_op.get('paymasterAndData', '0x'))
+    if len(data) < 20:
+        return None
+    return Web3.to_checksum_address(data[:20])
+
+
+def user_op_bundle_gas(user_op: Dict) -> int:
+    """
+    Gas a UserOperation can consume inside handleOps
+
+    With a paymaster, verificationGasLimit also bounds validatePaymasterUserOp
+    and postOp (up to 3 uses in v0.6).
+    """
+    multiplier = 3 if paymaster_of(user_op) else 1
+    return (
+        user_op['preVerificationGas']
+        + user_op['verificationGasLimit'] * multiplier
+        + user_op['callGasLimit']
+    )
+
+
+def required_prefund(user_op: Dict) -> int:
+    """Maximum wei the EntryPoint will charge for a UserOperation"""
+    return user_op_bundle_gas(user_op) * user_op['maxFeePerGas']
+
+
+def multicall(
+    w3: Web3,
+    calls: List[Tuple[str, bytes]],
+    block: str = "latest"
+) -> List[Tuple[bool, bytes]]:
+    """
+    Execute read calls through Multicall3 aggregate3
+
+    Args:
+        w3: Web3 instance
+        calls: (target address, calldata) pairs
+        block: Block identifier for a consistent snapshot
+
+    Returns:
+        (success, return data) per call, in order
+    """
+    results: List[Tuple[bool, bytes]] = []
+    for start in range(0, len(calls), MAX_CALLS_PER_MULTICALL):
+        chunk = calls[start:start + MAX_CALLS_PER_MULTICALL]
+        data = SELECTOR_AGGREGATE3 + encode(
+            ['(address,bool,bytes)[]'],
+            [[(Web3.to_checksum_address(target), True, calldata) for target, calldata in chunk]]
+        )
+        raw = w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': '0x' + bytes(data).hex()}, block)
+        (decoded,) = decode(['(bool,bytes)[]'], bytes(raw))
+        results.extend((bool(ok), bytes(ret)) for ok, ret in decoded)
+    return results
+
+
+def fetch_account_state(
+    w3: Web3,
+    entrypoint_address: str,
+    senders: Iterable[str],
+    paymasters: Iterable[str] = (),
+    nonce_key: int = 0,
+    block: str = "latest"
+) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+    """
+    Read nonce, EntryPoint deposit and native balance for many accounts
+
+    One Multicall3 request per 500 calls instead of three RPCs per sender.
+
+    Args:
+        w3: Web3 instance
+        entrypoint_address: EntryPoint contract address
+        senders: Smart account addresses
+        paymasters: Paymaster addresses whose deposits are needed
+        nonce_key: Nonce key passed to getNonce
+        block: Block identifier for a consistent snapshot
+
+    Returns:
+        (sender -> {nonce, deposit, balance}, paymaster -> deposit) in wei
+    """
+    entrypoint = Web3.to_checksum_address(entrypoint_address)
+    senders = list(dict.fromkeys(Web3.to_checksum_address(s) for s in senders))
+    paymasters = list(dict.fromkeys(Web3.to_checksum_address(p) for p in paymasters))
+
+    calls = []
+    for sender in senders:
+        calls.append((entrypoint, SELECTOR_GET_NONCE + encode(['address', 'uint192'], [sender, nonce_key])))
+        calls.append((entrypoint, SELECTOR_BALANCE_OF + encode(['address'], [sender])))
+        calls.append((MULTICALL3_ADDRESS, SELECTOR_GET_ETH_BALANCE + encode(['address'], [sender])))
+    for paymaster in paymasters:
+        calls.append((entrypoint, SELECTOR_BALANCE_OF + encode(['address'], [paymaster])))
+
+    results = multicall(w3, calls, block)
+
+    def as_uint(result: Tuple[bool, bytes]) -> int:
+        ok, data = result
+        return int.from_bytes(data[:32], 'big') if ok and len(data) >= 32 else 0
+
+    accounts = {}
+    for i, sender in enumerate(senders):
+        nonce, deposit, balance = results[3 * i:3 * i + 3]
+        accounts[sender] = {
+            'nonce': as_uint(nonce),
+            'deposit': as_uint(deposit),
+            'balance': as_uint(balance)
+        }
+    offset = 3 * len(senders)
+    deposits = {paymaster: as_uint(results[offset + i]) for i, paymaster in enumerate(paymasters)}
+    return accounts, deposits
+
+
+class NonceCache:
+    """
+    Per-sender nonce cache
+
+    Seeded from chain once, then hands out sequential nonces locally so a
+    burst of operations from one account needs a single getNonce read.
+    """
+
+    def __init__(self):
+        self._next: Dict[Tuple[str, int], int] = {}
+        self._chain: Dict[Tuple[str, int], int] = {}
+
+    def seed(self, sender: str, nonce: int, key: int = 0):
+        """Record the on-chain nonce for a sender (keeps local reservations ahead of it)"""
+        sender_key = (Web3.to_checksum_address(sender), key)
+        self._chain[sender_key] = nonce
+        self._next[sender_key] = max(nonce, self._next.get(sender_key, 0))
+
+    def chain_nonce(self, sender: str, key: int = 0) -> Optional[int]:
+        """Last seeded on-chain nonce"""
+        return self._chain.get((Web3.to_checksum_address(sender), key))
+
+    def reserve(self, sender: str, key: int = 0) -> int:
+        """Take the next nonce for a sender (must be seeded first)"""
+        sender_key = (Web3.to_checksum_address(sender), key)
+        nonce = self._next[sender_key]
+        self._next[sender_key] = nonce + 1
+        return nonce
+
+    def observe(self, sender: str, nonce: int, key: int = 0):
+        """Advance past a nonce supplied by the caller"""
+        sender_key = (Web3.to_checksum_address(sender), key)
+        self._next[sender_key] = max(self._next.get(sender_key, 0), nonce + 1)
+
+    def invalidate(self, sender: str, key: int = 0):
+        """Drop cached state so the next use re-reads the chain"""
+        sender_key = (Web3.to_checksum_address(sender), key)
+        self._next.pop(sender_key, None)
+        self._chain.pop(sender_key, None)
+
+
+def _revert_data(error) -> Optional[bytes]:
+    """Extract revert bytes from a JSON-RPC error object"""
+    data = error.get('data') if isinstance(error, dict) else None
+    if isinstance(data, dict):
+        data = data.get('data') or data.get('result')
+    if isinstance(data, str) and data.startswith('0x'):
+        return bytes.fromhex(data[2:])
+    return None
+
+
+def _simulate_one(w3: Web3, entrypoint_address: str, user_op: Dict, user_op_hash: str) -> SimulationResult:
+    """Run simulateHandleOp for one operation and decode its revert"""
+    calldata = SELECTOR_SIMULATE_HANDLE_OP + encode(
+        [USER_OP_TYPE, 'address', 'bytes'],
+        [user_op_to_tuple(user_op), '0x' + '00' * 20, b'']
+    )
+    response = w3.provider.make_request('eth_call', [
+        {'to': entrypoint_address, 'data': '0x' + bytes(calldata).hex()},
+        'latest'
+    ])
+    revert = _revert_data(response.get('error'))
+
+    if revert is None:
+        message = (response.get('error') or {}).get('message', 'simulateHandleOp did not revert')
+        return SimulationResult(user_op_hash=user_op_hash, success=False, error=message)
+
+    if revert[:4] == ERROR_EXECUTION_RESULT:
+        pre_op_gas, paid, _, _, target_success, _ = decode(
+            ['uint256', 'uint256', 'uint48', 'uint48', 'bool', 'bytes'], revert[4:]
+        )
+        return SimulationResult(
+            user_op_hash=user_op_hash,
+            success=True,
+            pre_op_gas=pre_op_gas,
+            paid=paid,
+            target_success=target_success
+        )
+
+    if revert[:4] == ERROR_FAILED_OP:
+        _, reason = decode(['uint256', 'string'], revert[4:])
+        return SimulationResult(user_op_hash=user_op_hash, success=False, error=reason)
+
+    return SimulationResult(user_op_hash=user_op_hash, success=False, error='0x' + revert.hex())
+
+
+def simulate_user_operations(
+    w3: Web3,
+    entrypoint_address: str,
+    user_ops: List[Dict],
+    user_op_hashes: Optional[List[str]] = None,
+    max_workers: int = DEFAULT_SIMULATION_WORKERS
+) -> List[SimulationResult]:
+    """
+    Simulate many UserOperations concurrently via simulateHandleOp
+
+    Args:
+        w3: Web3 instance
+        entrypoint_address: EntryPoint contract address
+        user_ops: UserOperations to simulate
+        user_op_hashes: Precomputed hashes (computed locally if omitted)
+        max_workers: Concurrent eth_call requests
+
+    Returns:
+        SimulationResult per operation, in order
+    """
+    entrypoint_address = Web3.to_checksum_address(entrypoint_address)
+    if user_op_hashes is None:
+        chain_id = w3.eth.chain_id
+        user_op_hashes = [compute_user_op_hash(op, entrypoint_address, chain_id) for op in user_ops]
+
+    def run(args: Tuple[Dict, str]) -> SimulationResult:
+        user_op, user_op_hash = args
+        try:
+            return _simulate_one(w3, entrypoint_address, user_op, user_op_hash)
+        except Exception as e:
+            return SimulationResult(user_op_hash=user_op_hash, success=False, error=str(e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, zip(user_ops, user_op_hashes)))
+
+
+def pack_bundles(
+    user_ops: List[Dict],
+    user_op_hashes: List[str],
+    max_bundle_gas: int = DEFAULT_MAX_BUNDLE_GAS,
+    max_bundle_size: int = DEFAULT_MAX_BUNDLE_SIZE
+) -> Tuple[List[Bundle], List[Tuple[Dict, str]]]:
+    """
+    Pack operations into handleOps bundles
+
+    A bundle holds at most one operation per sender (ERC-4337 bundling rule
+    for unstaked accounts) and stays under the gas and size limits. Later
+    nonces of the same sender are returned as leftovers for the next round,
+    keeping per-sender nonce order.
+
+    Returns:
+        (bundles, leftover (user_op, hash) pairs)
+    """
+    bundles: List[Bundle] = []
+    leftovers: List[Tuple[Dict, str]] = []
+    current_ops: List[Dict] = []
+    current_hashes: List[str] = []
+    current_senders = set()
+    current_gas = HANDLE_OPS_OVERHEAD_GAS
+    blocked_senders = set()
+
+    def flush():
+        nonlocal current_ops, current_hashes, current_senders, current_gas
+        if current_ops:
+            bundles.append(Bundle(user_ops=current_ops, user_op_hashes=current_hashes, gas_limit=current_gas))
+        current_ops, current_hashes, current_senders = [], [], set()
+        current_gas = HANDLE_OPS_OVERHEAD_GAS
+
+    # Lowest nonce first so each sender's head operation is bundled first
+    order = sorted(range(len(user_ops)), key=lambda i: user_ops[i]['nonce'])
+    for i in order:
+        user_op, user_op_hash = user_ops[i], user_op_hashes[i]
+        sender = Web3.to_checksum_address(user_op['sender'])
+        gas = user_op_bundle_gas(user_op)
+
+        if sender in blocked_senders:
+            leftovers.append((user_op, user_op_hash))
+            continue
+        if sender in current_senders:
+            # Next nonce of a sender already in this bundle must wait for it to land
+            leftovers.append((user_op, user_op_hash))
+            blocked_senders.add(sender)
+            continue
+        if current_gas + gas > max_bundle_gas or len(current_ops) >= max_bundle_size:
+            flush()
+
+        current_ops.append(user_op)
+        current_hashes.append(user_op_hash)
+        current_senders.add(sender)
+        current_gas += gas
+
+    flush()
+    return bundles, leftovers
+
+
+class BundlePipeline:
+    """
+    Stream UserOperations into simulated, gas-sized handleOps bundles
+
+    Stages per chunk of operations:
+    1. Batched state read (nonces, deposits, balances) via Multicall3
+    2. Nonce assignment from the per-sender cache
+    3. Optional bulk sponsorship through a PaymasterSponsor
+    4. Prefund checks against sender and paymaster deposits
+    5. Signing through the signer callback, once nonce and paymasterAndData are final
+    6. Concurrent simulateHandleOp for each sender's next operation
+    7. Packing into bundles (one op per sender, bounded gas)
+
+    The account signature covers the nonce and paymasterAndData. Without a
+    signer, signed operations are never modified: they must carry an explicit
+    nonce and are not sponsored.
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        entrypoint_address: str = ENTRYPOINT_V06_ADDRESS,
+        sponsor=None,
+        policy=None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bundle_gas: int = DEFAULT_MAX_BUNDLE_GAS,
+        max_bundle_size: int = DEFAULT_MAX_BUNDLE_SIZE,
+        simulate: bool = True,
+        max_workers: int = DEFAULT_SIMULATION_WORKERS,
+        nonce_key: int = 0,
+        signer: Optional[Callable[[Dict, str], str]] = None
+    ):
+        """
+        Initialize bundling pipeline
+
+        Args:
+            w3: Web3 instance
+            entrypoint_address: EntryPoint contract address
+            sponsor: Optional PaymasterSponsor used to sponsor unsponsored operations
+            policy: SponsorshipPolicy applied by the sponsor
+            chunk_size: Operations read from the stream per round
+            max_bundle_gas: Gas ceiling per handleOps transaction
+            max_bundle_size: Maximum operations per bundle
+            simulate: Run simulateHandleOp before bundling
+            max_workers: Concurrent simulation requests
+            nonce_key: Nonce key used for nonce reads and assignment
+            signer: Callback (user_op, user_op_hash) -> signature hex, called for
+                unsigned operations and for any operation whose nonce or
+                paymasterAndData the pipeline filled in
+        """
+        if sponsor is not None and policy is None:
+            raise ValueError("A sponsorship policy is required when a sponsor is set")
+        self.w3 = w3
+        self.entrypoint_address = Web3.to_checksum_address(entrypoint_address)
+        self.chain_id = w3.eth.chain_id
+        self.sponsor = sponsor
+        self.policy = policy
+        self.chunk_size = chunk_size
+        self.max_bundle_gas = max_bundle_gas
+        self.max_bundle_size = max_bundle_size
+        self.simulate = simulate
+        self.max_workers = max_workers
+        self.nonce_key = nonce_key
+        self.signer = signer
+        self.nonces = NonceCache()
+        self.stats = PipelineStats()
+
+    def _reject(self, user_op: Dict, reason: str, user_op_hash: str = ""):
+        """Record a rejected operation"""
+        self.stats.rejected.append({
+            'sender': user_op.get('sender'),
+            'nonce': user_op.get('nonce'),
+            'user_op_hash': user_op_hash,
+            'reason': reason
+        })
+
+    def _prepare(self, chunk: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """Run the read, nonce, sponsor, prefund, signing and simulation stages on one chunk"""
+        senders = [Web3.to_checksum_address(op['sender']) for op in chunk]
+
+        # Stage 1: on-chain nonces, deposits and balances for every sender
+        paymasters = {p for p in (paymaster_of(op) for op in chunk) if p}
+        if self.sponsor is not None:
+            paymasters.add(self.sponsor.paymaster_address)
+        accounts, paymaster_deposits = fetch_account_state(
+            self.w3, self.entrypoint_address, senders, paymasters, self.nonce_key
+        )
+        for sender, account in accounts.items():
+            self.nonces.seed(sender, account['nonce'], self.nonce_key)
+
+        # Stage 2: assign or validate nonces
+        ready = []
+        modified = set()  # ids of operations whose signed fields were filled in here
+        for user_op, sender in zip(chunk, senders):
+            user_op['sender'] = sender
+            if user_op.get('nonce') is None:
+                if self.signer is None and is_signed(user_op):
+                    self._reject(user_op, "Signed operation has no nonce; set it before signing")
+                    continue
+                user_op['nonce'] = self.nonces.reserve(sender, self.nonce_key)
+                modified.add(id(user_op))
+            elif user_op['nonce'] < accounts[sender]['nonce']:
+                self._reject(user_op, f"Stale nonce {user_op['nonce']} < {accounts[sender]['nonce']}")
+                continue
+            else:
+                self.nonces.observe(sender, user_op['nonce'], self.nonce_key)
+            user_op.setdefault('paymasterAndData', '0x')
+            user_op.setdefault('signature', '0x')
+            ready.append(user_op)
+
+        # Stage 3: bulk sponsorship of unsponsored operations (signed ones only
+        # when they can be re-signed; otherwise they stay self-funded)
+        if self.sponsor is not None:
+            unsponsored = [
+                op for op in ready
+                if not paymaster_of(op) and (self.signer is not None or not is_signed(op))
+            ]
+            results = self.sponsor.sponsor_user_operations(unsponsored, self.policy, quiet=True)
+            declined = {id(op) for op, result in zip(unsponsored, results) if not result.success}
+            for op, result in zip(unsponsored, results):
+                if result.success:
+                    modified.add(id(op))
+                else:
+                    self._reject(op, f"Sponsorship declined: {result.reason}")
+            ready = [op for op in ready if id(op) not in declined]
+
+        # Stage 4: prefund checks (paymaster deposit is shared by its operations)
+        funded = []
+        paymaster_committed: Dict[str, int] = {}
+        for user_op in ready:
+            if HANDLE_OPS_OVERHEAD_GAS + user_op_bundle_gas(user_op) > self.max_bundle_gas:
+                self._reject(user_op, "Exceeds max bundle gas")
+                continue
+            prefund = required_prefund(user_op)
+            paymaster = paymaster_of(user_op)
+            if paymaster:
+                committed = paymaster_committed.get(paymaster, 0) + prefund
+                if committed > paymaster_deposits.get(paymaster, 0):
+                    self._reject(user_op, f"Paymaster {paymaster} deposit too low for prefund")
+                    continue
+                paymaster_committed[paymaster] = committed
+            else:
+                account = accounts[user_op['sender']]
+                if account['deposit'] + account['balance'] < prefund:
+                    self._reject(user_op, "Sender deposit and balance below required prefund")
+                    continue
+            funded.append(user_op)
+
+        hashes = [compute_user_op_hash(op, self.entrypoint_address, self.chain_id) for op in funded]
+
+        # Stage 5: sign now that every field the signature covers is final
+        if self.signer is not None:
+            failed = set()
+            failed_senders = set()
+            for i, (user_op, user_op_hash) in enumerate(zip(funded, hashes)):
+                if id(user_op) in modified or not is_signed(user_op):
+                    try:
+                        user_op['signature'] = self.signer(user_op, user_op_hash)
+                    except Exception as e:
+                        failed.add(i)
+                        failed_senders.add(user_op['sender'])
+                        self._reject(user_op, f"Signing failed: {e}", user_op_hash)
+                        self.nonces.invalidate(user_op['sender'], self.nonce_key)
+            # Other nonces of that sender would leave a gap, so drop them too
+            for i, op in enumerate(funded):
+                if i not in failed and op['sender'] in failed_senders:
+                    failed.add(i)
+                    self._reject(op, "Another nonce from this sender could not be signed", hashes[i])
+            funded = [op for i, op in enumerate(funded) if i not in failed]
+            hashes = [h for i, h in enumerate(hashes) if i not in failed]
+
+        # Stage 6: simulate each sender's next operation concurrently; later
+        # nonces cannot be simulated until their predecessors land on-chain
+        if self.simulate and funded:
+            heads = [
+                i for i, op in enumerate(funded)
+                if op['nonce'] == self.nonces.chain_nonce(op['sender'], self.nonce_key)
+            ]
+            results = simulate_user_operations(
+                self.w3,
+                self.entrypoint_address,
+                [funded[i] for i in heads],
+                [hashes[i] for i in heads],
+                self.max_workers
+            )
+            failed = set()
+            failed_senders = set()
+            for i, result in zip(heads, results):
+                if not result.success:
+                    failed.add(i)
+                    failed_senders.add(funded[i]['sender'])
+                    self._reject(funded[i], f"Simulation failed: {result.error}", hashes[i])
+                    self.nonces.invalidate(funded[i]['sender'], self.nonce_key)
+            # Later nonces of a failed sender would leave a gap, so drop them too
+            for i, op in enumerate(funded):
+                if i not in failed and op['sender'] in failed_senders:
+                    failed.add(i)
+                    self._reject(op, "Earlier nonce from this sender failed simulation", hashes[i])
+            funded = [op for i, op in enumerate(funded) if i not in failed]
+            hashes = [h for i, h in enumerate(hashes) if i not in failed]
+
+        return funded, hashes
+
+    def process(self, user_ops: Iterable[Dict]) -> Iterator[Bundle]:
+        """
+        Consume a stream of UserOperations and yield bundles as they fill
+
+        Operations may omit 'nonce' (assigned from the cache) when they are
+        unsigned or a signer is configured. Rejections are collected in
+        self.stats.rejected instead of raising.
+
+        Args:
+            user_ops: Iterable of UserOperation dicts
+
+        Yields:
+            Bundle objects ready for EntryPointInteraction.submit_bundle
+        """
+        pending: List[Tuple[Dict, str]] = []
+        chunk: List[Dict] = []
+
+        def drain(final: bool) -> Iterator[Bundle]:
+            nonlocal pending
+            ops = [op for op, _ in pending]
+            hashes = [h for _, h in pending]
+            bundles, pending = pack_bundles(ops, hashes, self.max_bundle_gas, self.max_bundle_size)
+            # Keep the last partial bundle open unless the stream ended
+            if not final and bundles and len(bundles[-1].user_ops) < self.max_bundle_size:
+                tail = bundles.pop()
+                pending = list(zip(tail.user_ops, tail.user_op_hashes)) + pending
+            for bundle in bundles:
+                self.stats.bundles += 1
+                self.stats.bundled += len(bundle.user_ops)
+                yield bundle
+
+        for user_op in user_ops:
+            self.stats.received += 1
+            chunk.append(dict(user_op))
+            if len(chunk) >= self.chunk_size:
+                ops, hashes = self._prepare(chunk)
+                pending.extend(zip(ops, hashes))
+                chunk = []
+                yield from drain(final=False)
+
+        if chunk:
+            ops, hashes = self._prepare(chunk)
+            pending.extend(zip(ops, hashes))
+
+        # Flush everything, including queued later nonces of the same senders
+        while pending:
+            before = len(pending)
+            yield from drain(final=True)
+            if len(pending) == before:
+                for user_op, user_op_hash in pending:
+                    self._reject(user_op, "Could not be bundled", user_op_hash)
+                break
+
+
+def main():
+    """Bundle UserOperations from JSON input (stdin)"""
+    try:
+        input_data = json.loads(sys.stdin.read())
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON input"}))
+        sys.exit(1)
+
+    rpc_url = input_data.get("rpc_url") or os.getenv("RPC_URL", "https://eth.llamarpc.com")
+    user_ops = input_data.get("user_ops", [])
+    if not user_ops:
+        print(json.dumps({"error": "Missing required parameter: user_ops"}))
+        sys.exit(1)
+
+    try:
+        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        pipeline = BundlePipeline(
+            w3=w3,
+            entrypoint_address=input_data.get("entrypoint", ENTRYPOINT_V06_ADDRESS),
+            max_bundle_gas=int(input_data.get("max_bundle_gas", DEFAULT_MAX_BUNDLE_GAS)),
+            max_bundle_size=int(input_data.get("max_bundle_size", DEFAULT_MAX_BUNDLE_SIZE)),
+            simulate=bool(input_data.get("simulate", True))
+        )
+        bundles = [bundle.to_dict() for bundle in pipeline.process(user_ops)]
+        print(json.dumps({
+            "success": True,
+            "chain_id": pipeline.chain_id,
+            "bundles": bundles,
+            "stats": pipeline.stats.to_dict()
+        }, indent=2))
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
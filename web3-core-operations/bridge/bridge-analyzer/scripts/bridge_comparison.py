@@ -14,13 +14,9 @@ Version: 1.0.0
 import json
 import sys
 import time
-import urllib.request
-import urllib.error
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-BRIDGES_API = "https://bridges.llama.fi/bridges?includeChains=true"
-
-USER_AGENT = "BridgeAnalyzer/1.0"
+from bridge_dataset import BridgeDataset, as_dataset, fetch_bridges
 
 # Chain name normalization mapping
 CHAIN_ALIASES: Dict[str, str] = {
@@ -60,47 +56,6 @@ CHAIN_ALIASES: Dict[str, str] = {
 }
 
 
-def _fetch_json(url: str, max_retries: int = 3, timeout: int = 20) -> Dict[str, Any]:
-    """Fetch JSON from URL with retry logic and 429 handling.
-
-    Args:
-        url: The URL to fetch.
-        max_retries: Maximum number of retry attempts.
-        timeout: Request timeout in seconds.
-
-    Returns:
-        Parsed JSON response as a dictionary.
-
-    Raises:
-        SystemExit: On unrecoverable fetch errors.
-    """
-    for attempt in range(max_retries):
-        try:
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": USER_AGENT,
-                    "Accept": "application/json",
-                },
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 429 and attempt < max_retries - 1:
-                wait = 2 ** (attempt + 1)
-                time.sleep(wait)
-                continue
-            _error_exit(f"HTTP error {e.code} fetching {url}")
-        except urllib.error.URLError as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            _error_exit(f"URL error: {e.reason}")
-        except Exception as e:
-            _error_exit(f"Unexpected error: {str(e)}")
-    _error_exit("Max retries exceeded")
-
-
 def _error_exit(message: str) -> None:
     """Print error JSON and exit."""
     output = {
@@ -177,41 +132,24 @@ def _format_bridge(bridge: Dict[str, Any], rank: int) -> Dict[str, Any]:
     }
 
 
-def _rank_bridges(bridges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Assign volume rank to each bridge.
-
-    Args:
-        bridges: List of bridge data from DeFiLlama.
-
-    Returns:
-        The same list sorted by 24h volume descending.
-    """
-    return sorted(
-        bridges,
-        key=lambda b: float(b.get("volumePrevDay", 0) or 0),
-        reverse=True,
-    )
-
-
 def compare_specific(
-    all_bridges: List[Dict[str, Any]],
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
     names: List[str],
     sort_by: str = "volume",
 ) -> Dict[str, Any]:
     """Compare specific bridges by name.
 
     Args:
-        all_bridges: All bridge data from API.
+        all_bridges: Bridge dataset, or all bridge data from API.
         names: List of bridge names to compare.
         sort_by: Sort key -- 'volume' or 'chains_count'.
 
     Returns:
         Comparison result dictionary.
     """
-    ranked = _rank_bridges(all_bridges)
-    rank_map: Dict[int, int] = {}
-    for idx, b in enumerate(ranked):
-        rank_map[b.get("id", idx)] = idx + 1
+    dataset = as_dataset(all_bridges)
+    all_bridges = dataset.bridges
+    rank_map = dataset.rank_map
 
     matched = []
     not_found = []
@@ -245,34 +183,32 @@ def compare_specific(
 
 
 def compare_top(
-    all_bridges: List[Dict[str, Any]],
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
     top_n: int = 10,
     sort_by: str = "volume",
 ) -> Dict[str, Any]:
     """Get top N bridges by volume or chain count.
 
     Args:
-        all_bridges: All bridge data from API.
+        all_bridges: Bridge dataset, or all bridge data from API.
         top_n: Number of top bridges to return.
         sort_by: Sort key -- 'volume' or 'chains_count'.
 
     Returns:
         Top N comparison result dictionary.
     """
+    dataset = as_dataset(all_bridges)
     if sort_by == "chains_count":
         sorted_bridges = sorted(
-            all_bridges,
+            dataset.bridges,
             key=lambda b: len(b.get("chains", [])),
             reverse=True,
         )
     else:
-        sorted_bridges = _rank_bridges(all_bridges)
+        sorted_bridges = dataset.volume_ranked
 
-    # Build rank map by volume regardless of sort
-    volume_ranked = _rank_bridges(all_bridges)
-    rank_map: Dict[int, int] = {}
-    for idx, b in enumerate(volume_ranked):
-        rank_map[b.get("id", idx)] = idx + 1
+    # Rank map by volume regardless of sort (precomputed on the dataset)
+    rank_map = dataset.rank_map
 
     top_n = min(top_n, len(sorted_bridges))
     bridges = []
@@ -290,14 +226,14 @@ def compare_top(
 
 
 def compare_by_chain(
-    all_bridges: List[Dict[str, Any]],
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
     chain: str,
     sort_by: str = "volume",
 ) -> Dict[str, Any]:
     """Get bridges supporting a specific chain.
 
     Args:
-        all_bridges: All bridge data from API.
+        all_bridges: Bridge dataset, or all bridge data from API.
         chain: Chain name to filter by.
         sort_by: Sort key -- 'volume' or 'chains_count'.
 
@@ -306,20 +242,15 @@ def compare_by_chain(
     """
     normalized = _normalize_chain(chain)
 
-    # Build rank map
-    volume_ranked = _rank_bridges(all_bridges)
-    rank_map: Dict[int, int] = {}
-    for idx, b in enumerate(volume_ranked):
-        rank_map[b.get("id", idx)] = idx + 1
+    dataset = as_dataset(all_bridges)
+    rank_map = dataset.rank_map
 
+    # Case-insensitive chain matching via the chain index
     matched = []
-    for bridge in all_bridges:
-        chains = bridge.get("chains", [])
-        # Case-insensitive chain matching
-        chain_names_lower = [c.lower() for c in chains]
-        if normalized.lower() in chain_names_lower:
-            rank = rank_map.get(bridge.get("id"), 0)
-            matched.append(_format_bridge(bridge, rank))
+    for i in dataset.bridges_for_chain(normalized):
+        bridge = dataset.bridges[i]
+        rank = rank_map.get(bridge.get("id"), 0)
+        matched.append(_format_bridge(bridge, rank))
 
     if sort_by == "chains_count":
         matched.sort(key=lambda b: b["chains_count"], reverse=True)
@@ -397,22 +328,27 @@ def main() -> None:
 
     sort_by = data.get("sort_by", "volume")
 
-    # Fetch bridge data from DeFiLlama
-    api_data = _fetch_json(BRIDGES_API)
-    all_bridges = api_data.get("bridges", [])
+    # Fetch bridge data from DeFiLlama (shared disk cache)
+    try:
+        all_bridges = fetch_bridges()
+    except ConnectionError as e:
+        _error_exit(str(e))
+        return
 
     if not all_bridges:
         _error_exit("No bridge data returned from DeFiLlama API.")
         return
 
+    dataset = BridgeDataset(all_bridges)
+
     # Route to appropriate comparison function
     if "bridges" in data:
-        result = compare_specific(all_bridges, data["bridges"], sort_by)
+        result = compare_specific(dataset, data["bridges"], sort_by)
     elif "chain" in data:
-        result = compare_by_chain(all_bridges, data["chain"], sort_by)
+        result = compare_by_chain(dataset, data["chain"], sort_by)
     else:
         top_n = int(data.get("top", 10))
-        result = compare_top(all_bridges, top_n, sort_by)
+        result = compare_top(dataset, top_n, sort_by)
 
     result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
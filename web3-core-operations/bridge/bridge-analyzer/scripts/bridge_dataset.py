@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Bridge Dataset
+Shared, cached DeFiLlama bridge dataset for the bridge-analyzer scripts.
+
+The bridges list is fetched once and cached on disk (BRIDGE_ANALYZER_CACHE,
+default ~/.cache/spoon-bridge-analyzer) so consecutive script runs reuse it.
+On top of the raw list, BridgeDataset precomputes:
+
+  - a chain -> bridge inverted index (lowercased chain names)
+  - a sorted 24h volume array for O(log n) percentile lookups via bisect
+  - a volume rank per bridge
+  - curated security/design entries resolved once per bridge
+
+Author: Nihal Nihalani
+Version: 1.0.0
+"""
+
+import bisect
+import json
+import os
+import tempfile
+import time
+import urllib.request
+import urllib.error
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+BRIDGES_API = "https://bridges.llama.fi/bridges?includeChains=true"
+
+USER_AGENT = "BridgeAnalyzer/1.0"
+
+# Seconds a cached bridges list stays fresh
+DEFAULT_MAX_AGE = 300
+
+
+def _cache_path() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-bridge-analyzer")
+    return os.path.join(os.getenv("BRIDGE_ANALYZER_CACHE", default), "bridges.json")
+
+
+def _fetch_json(url: str, max_retries: int = 3, timeout: int = 20) -> Dict[str, Any]:
+    """Fetch JSON from URL with retry logic and 429 handling.
+
+    Args:
+        url: The URL to fetch.
+        max_retries: Maximum number of retry attempts.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        Parsed JSON response as a dictionary.
+
+    Raises:
+        ConnectionError: On unrecoverable fetch errors.
+    """
+    for attempt in range(max_retries):
+        try:
+            req = urllib.request.Request(
+                url,
+                headers={
+                    "User-Agent": USER_AGENT,
+                    "Accept": "application/json",
+                },
+            )
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code == 429 and attempt < max_retries - 1:
+                time.sleep(2 ** (attempt + 1))
+                continue
+            raise ConnectionError(f"HTTP error {e.code} fetching {url}") from e
+        except urllib.error.URLError as e:
+            if attempt < max_retries - 1:
+                time.sleep(2)
+                continue
+            raise ConnectionError(f"URL error: {e.reason}") from e
+        except Exception as e:
+            raise ConnectionError(f"Unexpected error: {str(e)}") from e
+    raise ConnectionError("Max retries exceeded")
+
+
+def fetch_bridges(max_age: float = DEFAULT_MAX_AGE) -> List[Dict[str, Any]]:
+    """Return the DeFiLlama bridges list, served from the disk cache when fresh.
+
+    Args:
+        max_age: Maximum cache age in seconds; 0 forces a refetch.
+
+    Returns:
+        List of bridge dictionaries.
+
+    Raises:
+        ConnectionError: If the API cannot be reached and no cache exists.
+    """
+    path = _cache_path()
+    cached: Optional[Dict[str, Any]] = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+
+    if cached and time.time() - float(cached.get("fetched_at", 0)) < max_age:
+        return cached.get("bridges", [])
+
+    try:
+        bridges = _fetch_json(BRIDGES_API).get("bridges", [])
+    except ConnectionError:
+        # Stale data beats no data for risk/route analysis
+        if cached and cached.get("bridges"):
+            return cached["bridges"]
+        raise
+
+    if bridges:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": time.time(), "bridges": bridges}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return bridges
+
+
+def match_curated_key(bridge_name: str, keys: Sequence[str]) -> Optional[str]:
+    """Fuzzy-match a bridge name against curated database keys (first match wins).
+
+    Args:
+        bridge_name: Bridge name from DeFiLlama.
+        keys: Curated keys in priority order.
+
+    Returns:
+        Matching key or None.
+    """
+    name_lower = bridge_name.lower()
+    for key in keys:
+        if key.lower() in name_lower or name_lower in key.lower():
+            return key
+    return None
+
+
+def volume_percentile(volume: float, sorted_volumes: Sequence[float]) -> float:
+    """Fraction of volumes <= volume, via binary search on a sorted array."""
+    if not sorted_volumes:
+        return 0.0
+    return bisect.bisect_right(sorted_volumes, volume) / len(sorted_volumes)
+
+
+class BridgeDataset:
+    """Indexed view over the DeFiLlama bridges list.
+
+    Args:
+        bridges: Bridge data from DeFiLlama.
+        security: Curated security database (name -> entry) to pre-resolve.
+        design: Curated design database (name -> design type) to pre-resolve.
+    """
+
+    def __init__(
+        self,
+        bridges: List[Dict[str, Any]],
+        security: Optional[Mapping[str, Dict[str, Any]]] = None,
+        design: Optional[Mapping[str, str]] = None,
+    ):
+        self.bridges = bridges
+        self.volumes: List[float] = [float(b.get("volumePrevDay", 0) or 0) for b in bridges]
+        self.sorted_volumes: List[float] = sorted(self.volumes)
+        self.max_volume: float = self.sorted_volumes[-1] if self.sorted_volumes else 0.0
+
+        self._position: Dict[int, int] = {id(b): i for i, b in enumerate(bridges)}
+
+        # Volume rank (1 = highest), keyed like the original rank maps: id or list position
+        self.volume_ranked: List[Dict[str, Any]] = sorted(
+            bridges, key=lambda b: float(b.get("volumePrevDay", 0) or 0), reverse=True
+        )
+        self.rank_map: Dict[Any, int] = {}
+        for idx, b in enumerate(self.volume_ranked):
+            self.rank_map[b.get("id", idx)] = idx + 1
+
+        # Chain -> bridge positions (ascending, so results keep API order)
+        self.chain_index: Dict[str, List[int]] = {}
+        self.chain_sets: List[frozenset] = []
+        for i, b in enumerate(bridges):
+            chains_lower = frozenset(c.lower() for c in b.get("chains", []))
+            self.chain_sets.append(chains_lower)
+            for chain in chains_lower:
+                self.chain_index.setdefault(chain, []).append(i)
+
+        # Tables the lookups were resolved against; scripts check identity before trusting them
+        self.security_table = security
+        self.design_table = design
+        self.security: List[Optional[Dict[str, Any]]] = [None] * len(bridges)
+        self.design: List[str] = ["unknown"] * len(bridges)
+        if security is not None:
+            keys = list(security)
+            resolved: Dict[str, Optional[str]] = {}
+            for i, b in enumerate(bridges):
+                name = b.get("name", "Unknown")
+                if name not in resolved:
+                    resolved[name] = match_curated_key(name, keys)
+                key = resolved[name]
+                self.security[i] = security[key] if key else None
+        if design is not None:
+            keys = list(design)
+            resolved = {}
+            for i, b in enumerate(bridges):
+                name = b.get("name", "Unknown")
+                if name not in resolved:
+                    resolved[name] = match_curated_key(name, keys)
+                key = resolved[name]
+                self.design[i] = design[key] if key else "unknown"
+
+        # Route graph, built lazily by route_optimizer.get_route_graph()
+        self._route_graph: Optional[Any] = None
+
+    def __len__(self) -> int:
+        return len(self.bridges)
+
+    def index_of(self, bridge: Dict[str, Any]) -> Optional[int]:
+        """Position of a bridge dict from this dataset, or None."""
+        return self._position.get(id(bridge))
+
+    def volume_percentile(self, volume: float) -> float:
+        """Fraction of bridges with 24h volume <= volume (O(log n))."""
+        return volume_percentile(volume, self.sorted_volumes)
+
+    def bridges_for_chain(self, chain: str) -> List[int]:
+        """Positions of bridges supporting a chain (case-insensitive)."""
+        return self.chain_index.get(chain.lower(), [])
+
+    def bridges_between(self, source_chain: str, dest_chain: str) -> List[int]:
+        """Positions of bridges supporting both chains, in API order."""
+        src = self.bridges_for_chain(source_chain)
+        dst = self.bridges_for_chain(dest_chain)
+        # Walk the shorter posting list and probe the other chain's set
+        if len(src) <= len(dst):
+            smaller, other = src, dest_chain.lower()
+        else:
+            smaller, other = dst, source_chain.lower()
+        return [i for i in smaller if other in self.chain_sets[i]]
+
+
+def as_dataset(
+    bridges: Union[BridgeDataset, List[Dict[str, Any]]],
+    security: Optional[Mapping[str, Dict[str, Any]]] = None,
+    design: Optional[Mapping[str, str]] = None,
+) -> BridgeDataset:
+    """Return bridges as a BridgeDataset, building one if given a raw list."""
+    if isinstance(bridges, BridgeDataset):
+        return bridges
+    return BridgeDataset(bridges, security, design)
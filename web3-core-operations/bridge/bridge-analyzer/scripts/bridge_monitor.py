@@ -20,13 +20,9 @@ Version: 1.0.0
 import json
 import sys
 import time
-import urllib.request
-import urllib.error
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-BRIDGES_API = "https://bridges.llama.fi/bridges?includeChains=true"
-
-USER_AGENT = "BridgeAnalyzer/1.0"
+from bridge_dataset import BridgeDataset, as_dataset, fetch_bridges, match_curated_key
 
 # Default alert threshold (percentage) for volume changes
 DEFAULT_ALERT_THRESHOLD = 20
@@ -98,34 +94,6 @@ BRIDGE_SECURITY: Dict[str, Dict[str, Any]] = {
 }
 
 
-def _fetch_json(url: str, max_retries: int = 3, timeout: int = 20) -> Dict[str, Any]:
-    """Fetch JSON from URL with retry logic and 429 handling."""
-    for attempt in range(max_retries):
-        try:
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": USER_AGENT,
-                    "Accept": "application/json",
-                },
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 429 and attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
-                continue
-            _error_exit(f"HTTP error {e.code} fetching {url}")
-        except urllib.error.URLError as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            _error_exit(f"URL error: {e.reason}")
-        except Exception as e:
-            _error_exit(f"Unexpected error: {str(e)}")
-    _error_exit("Max retries exceeded")
-
-
 def _error_exit(message: str) -> None:
     """Print error JSON and exit."""
     output = {
@@ -152,11 +120,19 @@ def _match_bridge(bridge_data: Dict[str, Any], search_name: str) -> bool:
 
 def _find_security_entry(bridge_name: str) -> Optional[Dict[str, Any]]:
     """Find security database entry for a bridge (fuzzy match)."""
-    name_lower = bridge_name.lower()
-    for key, entry in BRIDGE_SECURITY.items():
-        if key.lower() in name_lower or name_lower in key.lower():
-            return entry
-    return None
+    key = match_curated_key(bridge_name, list(BRIDGE_SECURITY))
+    return BRIDGE_SECURITY[key] if key else None
+
+
+def _security_for(
+    bridge: Dict[str, Any],
+    dataset: Optional[BridgeDataset],
+) -> Optional[Dict[str, Any]]:
+    """Security entry for a bridge, pre-resolved when it belongs to the dataset."""
+    idx = dataset.index_of(bridge) if dataset is not None else None
+    if idx is None or dataset.security_table is not BRIDGE_SECURITY:
+        return _find_security_entry(bridge.get("name", "Unknown"))
+    return dataset.security[idx]
 
 
 def _compute_hourly_ratio(volume_24h: float, volume_1h: float) -> float:
@@ -182,12 +158,14 @@ def _compute_hourly_ratio(volume_24h: float, volume_1h: float) -> float:
 def _detect_anomalies(
     bridge: Dict[str, Any],
     median_volume: float,
+    dataset: Optional[BridgeDataset] = None,
 ) -> List[Dict[str, Any]]:
     """Detect anomalies for a single bridge.
 
     Args:
         bridge: Bridge data from DeFiLlama.
         median_volume: Median 24h volume across all bridges.
+        dataset: Indexed dataset with pre-resolved security entries.
 
     Returns:
         List of anomaly dictionaries.
@@ -198,7 +176,7 @@ def _detect_anomalies(
     volume_1h = float(bridge.get("lastHourlyVolume", 0) or 0)
 
     anomalies: List[Dict[str, Any]] = []
-    security = _find_security_entry(name)
+    security = _security_for(bridge, dataset)
 
     # Check for compromised status
     if security and security.get("status") == "compromised":
@@ -270,11 +248,15 @@ def _detect_anomalies(
     return anomalies
 
 
-def _format_bridge_metrics(bridge: Dict[str, Any]) -> Dict[str, Any]:
+def _format_bridge_metrics(
+    bridge: Dict[str, Any],
+    dataset: Optional[BridgeDataset] = None,
+) -> Dict[str, Any]:
     """Format bridge data into monitoring metrics.
 
     Args:
         bridge: Bridge data from DeFiLlama.
+        dataset: Indexed dataset with pre-resolved security entries.
 
     Returns:
         Formatted metrics dictionary.
@@ -296,7 +278,7 @@ def _format_bridge_metrics(bridge: Dict[str, Any]) -> Dict[str, Any]:
     else:
         status = "normal"
 
-    security = _find_security_entry(name)
+    security = _security_for(bridge, dataset)
     security_flag = None
     if security:
         if security.get("status") == "compromised":
@@ -318,22 +300,23 @@ def _format_bridge_metrics(bridge: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def monitor_specific(
-    all_bridges: List[Dict[str, Any]],
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
     bridge_name: str,
     median_volume: float,
 ) -> Dict[str, Any]:
     """Monitor a specific bridge.
 
     Args:
-        all_bridges: All bridge data from DeFiLlama.
+        all_bridges: Bridge dataset, or all bridge data from DeFiLlama.
         bridge_name: Bridge name to monitor.
         median_volume: Median volume across all bridges.
 
     Returns:
         Monitoring result dictionary.
     """
+    dataset = as_dataset(all_bridges, BRIDGE_SECURITY)
     matched = None
-    for bridge in all_bridges:
+    for bridge in dataset.bridges:
         if _match_bridge(bridge, bridge_name):
             matched = bridge
             break
@@ -344,8 +327,8 @@ def monitor_specific(
             "success": False,
         }
 
-    metrics = _format_bridge_metrics(matched)
-    anomalies = _detect_anomalies(matched, median_volume)
+    metrics = _format_bridge_metrics(matched, dataset)
+    anomalies = _detect_anomalies(matched, median_volume, dataset)
 
     return {
         "summary": {
@@ -358,26 +341,23 @@ def monitor_specific(
 
 
 def monitor_all(
-    all_bridges: List[Dict[str, Any]],
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
     alert_threshold: float,
     median_volume: float,
 ) -> Dict[str, Any]:
     """Monitor all bridges and flag anomalies.
 
     Args:
-        all_bridges: All bridge data from DeFiLlama.
+        all_bridges: Bridge dataset, or all bridge data from DeFiLlama.
         alert_threshold: Percentage threshold for flagging volume changes.
         median_volume: Median volume across all bridges.
 
     Returns:
         Monitoring result dictionary.
     """
-    # Sort by volume descending for output
-    sorted_bridges = sorted(
-        all_bridges,
-        key=lambda b: float(b.get("volumePrevDay", 0) or 0),
-        reverse=True,
-    )
+    # Sorted by volume descending for output (precomputed on the dataset)
+    dataset = as_dataset(all_bridges, BRIDGE_SECURITY)
+    sorted_bridges = dataset.volume_ranked
 
     all_anomalies: List[Dict[str, Any]] = []
     bridge_metrics: List[Dict[str, Any]] = []
@@ -387,10 +367,10 @@ def monitor_all(
         volume_24h = float(bridge.get("volumePrevDay", 0) or 0)
         total_volume += volume_24h
 
-        metrics = _format_bridge_metrics(bridge)
+        metrics = _format_bridge_metrics(bridge, dataset)
         bridge_metrics.append(metrics)
 
-        anomalies = _detect_anomalies(bridge, median_volume)
+        anomalies = _detect_anomalies(bridge, median_volume, dataset)
         all_anomalies.extend(anomalies)
 
     # Sort anomalies by severity (CRITICAL first)
@@ -475,29 +455,33 @@ def main() -> None:
         _error_exit(error)
         return
 
-    # Fetch bridge data
-    api_data = _fetch_json(BRIDGES_API)
-    all_bridges = api_data.get("bridges", [])
+    # Fetch bridge data (shared disk cache)
+    try:
+        all_bridges = fetch_bridges()
+    except ConnectionError as e:
+        _error_exit(str(e))
+        return
 
     if not all_bridges:
         _error_exit("No bridge data returned from DeFiLlama API.")
         return
 
+    dataset = BridgeDataset(all_bridges, BRIDGE_SECURITY)
+
     # Compute median volume for anomaly detection baseline
-    volumes = [float(b.get("volumePrevDay", 0) or 0) for b in all_bridges]
-    active_volumes = [v for v in volumes if v > MIN_VOLUME_FOR_MONITORING]
+    active_volumes = [v for v in dataset.volumes if v > MIN_VOLUME_FOR_MONITORING]
     median_volume = _compute_median(active_volumes)
 
     timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
     if "bridge_name" in data:
-        result = monitor_specific(all_bridges, data["bridge_name"], median_volume)
+        result = monitor_specific(dataset, data["bridge_name"], median_volume)
         if "error" in result:
             _error_exit(result["error"])
             return
     else:
         alert_threshold = float(data.get("alert_threshold", DEFAULT_ALERT_THRESHOLD))
-        result = monitor_all(all_bridges, alert_threshold, median_volume)
+        result = monitor_all(dataset, alert_threshold, median_volume)
 
     result["timestamp"] = timestamp
 
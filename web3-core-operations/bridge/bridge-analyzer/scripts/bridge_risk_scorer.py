@@ -19,13 +19,9 @@ Version: 1.0.0
 import json
 import sys
 import time
-import urllib.request
-import urllib.error
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-BRIDGES_API = "https://bridges.llama.fi/bridges?includeChains=true"
-
-USER_AGENT = "BridgeAnalyzer/1.0"
+from bridge_dataset import BridgeDataset, as_dataset, fetch_bridges, match_curated_key, volume_percentile
 
 # --- Curated Security Database ---
 
@@ -172,34 +168,6 @@ WEIGHT_DESIGN = 0.15
 WEIGHT_AUDIT = 0.15
 
 
-def _fetch_json(url: str, max_retries: int = 3, timeout: int = 20) -> Dict[str, Any]:
-    """Fetch JSON from URL with retry logic and 429 handling."""
-    for attempt in range(max_retries):
-        try:
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": USER_AGENT,
-                    "Accept": "application/json",
-                },
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 429 and attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
-                continue
-            _error_exit(f"HTTP error {e.code} fetching {url}")
-        except urllib.error.URLError as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            _error_exit(f"URL error: {e.reason}")
-        except Exception as e:
-            _error_exit(f"Unexpected error: {str(e)}")
-    _error_exit("Max retries exceeded")
-
-
 def _error_exit(message: str) -> None:
     """Print error JSON and exit."""
     output = {
@@ -233,11 +201,8 @@ def _find_security_entry(bridge_name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Security database entry or None.
     """
-    name_lower = bridge_name.lower()
-    for key, entry in BRIDGE_SECURITY.items():
-        if key.lower() in name_lower or name_lower in key.lower():
-            return entry
-    return None
+    key = match_curated_key(bridge_name, list(BRIDGE_SECURITY))
+    return BRIDGE_SECURITY[key] if key else None
 
 
 def _find_design_type(bridge_name: str) -> str:
@@ -249,37 +214,27 @@ def _find_design_type(bridge_name: str) -> str:
     Returns:
         Design type string.
     """
-    name_lower = bridge_name.lower()
-    for key, design in BRIDGE_DESIGN.items():
-        if key.lower() in name_lower or name_lower in key.lower():
-            return design
-    return "unknown"
+    key = match_curated_key(bridge_name, list(BRIDGE_DESIGN))
+    return BRIDGE_DESIGN[key] if key else "unknown"
 
 
-def _score_volume(volume_24h: float, all_volumes: List[float]) -> float:
+def _score_volume(volume_24h: float, sorted_volumes: Sequence[float]) -> float:
     """Score bridge volume relative to all bridges (0-10, lower is safer).
 
     High volume bridges are more battle-tested and liquid.
 
     Args:
         volume_24h: Bridge's 24h volume.
-        all_volumes: List of all bridge 24h volumes for percentile calc.
+        sorted_volumes: All bridge 24h volumes, ascending, for percentile calc.
 
     Returns:
         Volume risk score (0-10).
     """
-    if not all_volumes or max(all_volumes) == 0:
+    if not sorted_volumes or sorted_volumes[-1] == 0:
         return 5.0
 
-    # Sort volumes to find percentile
-    sorted_vols = sorted(all_volumes)
-    total = len(sorted_vols)
-    rank = 0
-    for i, v in enumerate(sorted_vols):
-        if volume_24h >= v:
-            rank = i + 1
-
-    percentile = rank / total
+    # Binary search on the pre-sorted volume array
+    percentile = volume_percentile(volume_24h, sorted_volumes)
 
     # Higher percentile = higher volume = lower risk
     if percentile >= 0.9:
@@ -493,6 +448,9 @@ def score_bridge(
 ) -> Dict[str, Any]:
     """Calculate comprehensive risk score for a bridge.
 
+    To score many bridges, build a BridgeDataset once and use
+    score_bridge_in_dataset() instead of passing the volume list each time.
+
     Args:
         bridge: Bridge data from DeFiLlama API.
         all_volumes: List of all bridge 24h volumes for comparison.
@@ -501,15 +459,56 @@ def score_bridge(
         Complete risk assessment dictionary.
     """
     name = bridge.get("name", "Unknown")
+    return _score(
+        bridge,
+        sorted(all_volumes),
+        _find_security_entry(name),
+        _find_design_type(name),
+    )
+
+
+def score_bridge_in_dataset(
+    bridge: Dict[str, Any],
+    dataset: Union[BridgeDataset, List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Risk-score a bridge against a prebuilt dataset.
+
+    The dataset's sorted volumes and pre-resolved security/design entries are
+    reused, so scoring a batch costs O(log n) per bridge.
+
+    Args:
+        bridge: Bridge data from DeFiLlama API.
+        dataset: Bridge dataset (or raw bridge list) for volume comparison.
+
+    Returns:
+        Complete risk assessment dictionary.
+    """
+    dataset = as_dataset(dataset, BRIDGE_SECURITY, BRIDGE_DESIGN)
+    idx = dataset.index_of(bridge)
+    if idx is not None and dataset.security_table is BRIDGE_SECURITY and dataset.design_table is BRIDGE_DESIGN:
+        security_entry = dataset.security[idx]
+        design_type = dataset.design[idx]
+    else:
+        name = bridge.get("name", "Unknown")
+        security_entry = _find_security_entry(name)
+        design_type = _find_design_type(name)
+    return _score(bridge, dataset.sorted_volumes, security_entry, design_type)
+
+
+def _score(
+    bridge: Dict[str, Any],
+    sorted_volumes: Sequence[float],
+    security_entry: Optional[Dict[str, Any]],
+    design_type: str,
+) -> Dict[str, Any]:
+    """Build the risk assessment from resolved curated entries."""
+    name = bridge.get("name", "Unknown")
     display_name = bridge.get("displayName", name)
     volume_24h = float(bridge.get("volumePrevDay", 0) or 0)
     chains = bridge.get("chains", [])
 
-    security_entry = _find_security_entry(name)
-    design_type = _find_design_type(name)
-
     # Calculate individual scores
-    vol_score = _score_volume(volume_24h, all_volumes)
+    vol_score = _score_volume(volume_24h, sorted_volumes)
     chain_score = _score_chains(len(chains))
     sec_score, sec_details = _score_security(security_entry)
     design_score = _score_design(design_type)
@@ -611,15 +610,18 @@ def main() -> None:
         _error_exit(error)
         return
 
-    # Fetch bridge data
-    api_data = _fetch_json(BRIDGES_API)
-    all_bridges = api_data.get("bridges", [])
+    # Fetch bridge data (shared disk cache)
+    try:
+        all_bridges = fetch_bridges()
+    except ConnectionError as e:
+        _error_exit(str(e))
+        return
 
     if not all_bridges:
         _error_exit("No bridge data returned from DeFiLlama API.")
         return
 
-    all_volumes = [float(b.get("volumePrevDay", 0) or 0) for b in all_bridges]
+    dataset = BridgeDataset(all_bridges, BRIDGE_SECURITY, BRIDGE_DESIGN)
 
     timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
@@ -636,7 +638,7 @@ def main() -> None:
             _error_exit(f"Bridge '{search_name}' not found in DeFiLlama data.")
             return
 
-        result = score_bridge(matched, all_volumes)
+        result = score_bridge_in_dataset(matched, dataset)
         result["timestamp"] = timestamp
 
         print(json.dumps({"success": True, "data": result}, indent=2))
@@ -644,15 +646,11 @@ def main() -> None:
     else:
         # Score top N bridges
         top_n = int(data["top"])
-        sorted_bridges = sorted(
-            all_bridges,
-            key=lambda b: float(b.get("volumePrevDay", 0) or 0),
-            reverse=True,
-        )[:top_n]
+        sorted_bridges = dataset.volume_ranked[:top_n]
 
         results = []
         for bridge in sorted_bridges:
-            results.append(score_bridge(bridge, all_volumes))
+            results.append(score_bridge_in_dataset(bridge, dataset))
 
         output = {
             "success": True,
@@ -12,16 +12,13 @@ Author: Nihal Nihalani
 Version: 1.0.0
 """
 
+import heapq
 import json
 import sys
 import time
-import urllib.request
-import urllib.error
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-BRIDGES_API = "https://bridges.llama.fi/bridges?includeChains=true"
-
-USER_AGENT = "BridgeAnalyzer/1.0"
+from bridge_dataset import BridgeDataset, as_dataset, fetch_bridges, match_curated_key
 
 # Chain name normalization mapping
 CHAIN_ALIASES: Dict[str, str] = {
@@ -160,33 +157,11 @@ COST_SCORES: Dict[str, float] = {
 
 VALID_PRIORITIES = {"safety", "cost", "speed"}
 
-
-def _fetch_json(url: str, max_retries: int = 3, timeout: int = 20) -> Dict[str, Any]:
-    """Fetch JSON from URL with retry logic and 429 handling."""
-    for attempt in range(max_retries):
-        try:
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": USER_AGENT,
-                    "Accept": "application/json",
-                },
-            )
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 429 and attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
-                continue
-            _error_exit(f"HTTP error {e.code} fetching {url}")
-        except urllib.error.URLError as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            _error_exit(f"URL error: {e.reason}")
-        except Exception as e:
-            _error_exit(f"Unexpected error: {str(e)}")
-    _error_exit("Max retries exceeded")
+PRIORITY_FOCUS: Dict[str, str] = {
+    "safety": "safety",
+    "cost": "cost efficiency",
+    "speed": "speed",
+}
 
 
 def _error_exit(message: str) -> None:
@@ -210,44 +185,42 @@ def _normalize_chain(chain: str) -> str:
 
 def _find_security_entry(bridge_name: str) -> Optional[Dict[str, Any]]:
     """Find security database entry for a bridge (fuzzy match)."""
-    name_lower = bridge_name.lower()
-    for key, entry in BRIDGE_SECURITY.items():
-        if key.lower() in name_lower or name_lower in key.lower():
-            return entry
-    return None
+    key = match_curated_key(bridge_name, list(BRIDGE_SECURITY))
+    return BRIDGE_SECURITY[key] if key else None
 
 
 def _find_design_type(bridge_name: str) -> str:
     """Find bridge design type from curated database."""
-    name_lower = bridge_name.lower()
-    for key, design in BRIDGE_DESIGN.items():
-        if key.lower() in name_lower or name_lower in key.lower():
-            return design
-    return "unknown"
+    key = match_curated_key(bridge_name, list(BRIDGE_DESIGN))
+    return BRIDGE_DESIGN[key] if key else "unknown"
+
+
+def _lookup(dataset: BridgeDataset, bridge: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Pre-resolved (security entry, design type) for a bridge in the dataset."""
+    idx = dataset.index_of(bridge)
+    if idx is None or dataset.security_table is not BRIDGE_SECURITY or dataset.design_table is not BRIDGE_DESIGN:
+        name = bridge.get("name", "Unknown")
+        return _find_security_entry(name), _find_design_type(name)
+    return dataset.security[idx], dataset.design[idx]
 
 
-def _compute_risk_score(bridge: Dict[str, Any], all_volumes: List[float]) -> float:
+def _compute_risk_score(bridge: Dict[str, Any], dataset: BridgeDataset) -> float:
     """Compute a simplified risk score for route ranking.
 
     Args:
         bridge: Bridge data from DeFiLlama.
-        all_volumes: All bridge volumes for percentile comparison.
+        dataset: Indexed bridge dataset for percentile comparison.
 
     Returns:
         Risk score 0-10.
     """
-    name = bridge.get("name", "Unknown")
     volume_24h = float(bridge.get("volumePrevDay", 0) or 0)
-    chains_count = len(bridge.get("chains", []))
 
-    security = _find_security_entry(name)
-    design_type = _find_design_type(name)
+    security, design_type = _lookup(dataset, bridge)
 
     # Volume score
-    if all_volumes and max(all_volumes) > 0:
-        sorted_vols = sorted(all_volumes)
-        rank = sum(1 for v in sorted_vols if volume_24h >= v)
-        percentile = rank / len(sorted_vols)
+    if dataset.max_volume > 0:
+        percentile = dataset.volume_percentile(volume_24h)
         if percentile >= 0.9:
             vol_score = 0.5
         elif percentile >= 0.75:
@@ -311,10 +284,38 @@ def _classify_risk(score: float) -> str:
         return "CRITICAL"
 
 
+def _weighted_composite(
+    safety_score: float,
+    liquidity_score: float,
+    speed_score: float,
+    cost_score: float,
+    priority: str,
+) -> Tuple[float, str]:
+    """Weight 0-100 component scores by user priority.
+
+    Returns:
+        Tuple of (composite score 0-100, recommendation focus).
+    """
+    if priority == "safety":
+        composite = safety_score * 0.50 + liquidity_score * 0.25 + speed_score * 0.15 + cost_score * 0.10
+        rec_focus = "safety"
+    elif priority == "cost":
+        composite = cost_score * 0.35 + liquidity_score * 0.30 + safety_score * 0.25 + speed_score * 0.10
+        rec_focus = "cost efficiency"
+    elif priority == "speed":
+        composite = speed_score * 0.40 + safety_score * 0.25 + liquidity_score * 0.20 + cost_score * 0.15
+        rec_focus = "speed"
+    else:
+        composite = safety_score * 0.40 + liquidity_score * 0.30 + speed_score * 0.15 + cost_score * 0.15
+        rec_focus = "balanced"
+
+    return round(min(composite, 100.0), 1), rec_focus
+
+
 def _compute_composite_score(
     bridge: Dict[str, Any],
     risk_score: float,
-    all_volumes: List[float],
+    dataset: BridgeDataset,
     priority: str,
 ) -> Tuple[float, str]:
     """Compute a composite route score based on user priority.
@@ -324,25 +325,22 @@ def _compute_composite_score(
     Args:
         bridge: Bridge data from DeFiLlama.
         risk_score: Pre-computed risk score.
-        all_volumes: All volumes for comparison.
+        dataset: Indexed bridge dataset for volume comparison.
         priority: User priority (safety, cost, speed).
 
     Returns:
         Tuple of (composite score 0-100, recommendation text).
     """
-    name = bridge.get("name", "Unknown")
-    display_name = bridge.get("displayName", name)
     volume_24h = float(bridge.get("volumePrevDay", 0) or 0)
-    design_type = _find_design_type(name)
+    _, design_type = _lookup(dataset, bridge)
     design_attrs = DESIGN_ATTRIBUTES.get(design_type, DESIGN_ATTRIBUTES["unknown"])
 
     # Safety score (invert risk: 0 risk = 100 safety)
     safety_score = max(0, (10.0 - risk_score) * 10.0)
 
     # Volume/liquidity score (higher volume = better cost/less slippage)
-    if all_volumes and max(all_volumes) > 0:
-        max_vol = max(all_volumes)
-        liquidity_score = min((volume_24h / max_vol) * 100.0, 100.0)
+    if dataset.max_volume > 0:
+        liquidity_score = min((volume_24h / dataset.max_volume) * 100.0, 100.0)
     else:
         liquidity_score = 50.0
 
@@ -354,21 +352,9 @@ def _compute_composite_score(
     cost_raw = COST_SCORES.get(design_attrs["cost_efficiency"], 5.0)
     cost_score = max(0, (10.0 - cost_raw) * 10.0)
 
-    # Weight by priority
-    if priority == "safety":
-        composite = safety_score * 0.50 + liquidity_score * 0.25 + speed_score * 0.15 + cost_score * 0.10
-        rec_focus = "safety"
-    elif priority == "cost":
-        composite = cost_score * 0.35 + liquidity_score * 0.30 + safety_score * 0.25 + speed_score * 0.10
-        rec_focus = "cost efficiency"
-    elif priority == "speed":
-        composite = speed_score * 0.40 + safety_score * 0.25 + liquidity_score * 0.20 + cost_score * 0.15
-        rec_focus = "speed"
-    else:
-        composite = safety_score * 0.40 + liquidity_score * 0.30 + speed_score * 0.15 + cost_score * 0.15
-        rec_focus = "balanced"
-
-    composite = round(min(composite, 100.0), 1)
+    composite, rec_focus = _weighted_composite(
+        safety_score, liquidity_score, speed_score, cost_score, priority
+    )
 
     # Generate recommendation
     risk_level = _classify_risk(risk_score)
@@ -387,15 +373,18 @@ def _compute_composite_score(
 
 
 def find_routes(
-    all_bridges: List[Dict[str, Any]],
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
     source_chain: str,
     dest_chain: str,
     priority: str = "safety",
 ) -> Dict[str, Any]:
     """Find and rank bridge routes between two chains.
 
+    Pass a prebuilt BridgeDataset to answer many route queries without
+    re-indexing the bridge list.
+
     Args:
-        all_bridges: All bridge data from DeFiLlama.
+        all_bridges: Bridge dataset, or the raw bridge list from DeFiLlama.
         source_chain: Normalized source chain name.
         dest_chain: Normalized destination chain name.
         priority: Ranking priority (safety, cost, speed).
@@ -403,15 +392,10 @@ def find_routes(
     Returns:
         Routes result dictionary.
     """
-    all_volumes = [float(b.get("volumePrevDay", 0) or 0) for b in all_bridges]
+    dataset = as_dataset(all_bridges, BRIDGE_SECURITY, BRIDGE_DESIGN)
 
-    # Find bridges that support both chains
-    candidates = []
-    for bridge in all_bridges:
-        chains = bridge.get("chains", [])
-        chains_lower = [c.lower() for c in chains]
-        if source_chain.lower() in chains_lower and dest_chain.lower() in chains_lower:
-            candidates.append(bridge)
+    # Find bridges that support both chains via the chain index
+    candidates = [dataset.bridges[i] for i in dataset.bridges_between(source_chain, dest_chain)]
 
     if not candidates:
         return {
@@ -429,15 +413,14 @@ def find_routes(
         name = bridge.get("name", "Unknown")
         display_name = bridge.get("displayName", name)
         volume_24h = float(bridge.get("volumePrevDay", 0) or 0)
-        design_type = _find_design_type(name)
-        risk_score = _compute_risk_score(bridge, all_volumes)
+        security, design_type = _lookup(dataset, bridge)
+        risk_score = _compute_risk_score(bridge, dataset)
         risk_level = _classify_risk(risk_score)
 
         composite, recommendation = _compute_composite_score(
-            bridge, risk_score, all_volumes, priority
+            bridge, risk_score, dataset, priority
         )
 
-        security = _find_security_entry(name)
         audits = security.get("audits", []) if security else []
         status = security.get("status", "unknown") if security else "unknown"
 
@@ -470,6 +453,363 @@ def find_routes(
     }
 
 
+# --- Multi-hop routing ---
+
+MAX_HOPS = 3
+# Bridges kept per chain pair (after Pareto pruning) when expanding multi-hop paths
+EDGE_CANDIDATES = 3
+MAX_CACHED_QUERIES = 4096
+
+
+def _dominates(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    """True if objective vector a is no worse than b everywhere and better somewhere."""
+    return all(x <= y for x, y in zip(a, b)) and a != b
+
+
+def _pareto_filter(items: List[Any], key) -> List[Any]:
+    """Keep the items whose objective vectors are not dominated by another item."""
+    vectors = [key(item) for item in items]
+    return [
+        item for item, vec in zip(items, vectors)
+        if not any(_dominates(other, vec) for other in vectors)
+    ]
+
+
+class RouteGraph:
+    """Weighted chain graph over a bridge dataset, built once per dataset refresh.
+
+    Nodes are chains; each bridge adds an edge between every pair of chains it
+    supports, carrying its risk score, cost and latency (design-type units) and
+    liquidity. Per chain pair only Pareto-optimal bridges are kept, pre-sorted for
+    each priority, and all-pairs hop distances are precomputed to prune searches.
+    Route queries are memoized.
+
+    Args:
+        dataset: Indexed bridge dataset.
+        edge_candidates: Bridges per chain pair expanded in multi-hop search.
+    """
+
+    def __init__(self, dataset: BridgeDataset, edge_candidates: int = EDGE_CANDIDATES):
+        self.dataset = dataset
+        self.edge_candidates = edge_candidates
+        self.chain_names: Dict[str, str] = {}
+        self.edges: Dict[int, Dict[str, Any]] = {}
+        self.neighbors: Dict[str, set] = {}
+        self._query_cache: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+        pair_bridges: Dict[Tuple[str, str], List[int]] = {}
+        for i, bridge in enumerate(dataset.bridges):
+            edge = self._edge_metrics(i, bridge)
+            # Compromised/critical bridges never serve as a hop
+            if edge["risk_level"] == "CRITICAL":
+                continue
+            self.edges[i] = edge
+            chains = sorted(dataset.chain_sets[i])
+            for chain in bridge.get("chains", []):
+                self.chain_names.setdefault(chain.lower(), chain)
+            for a_idx, a in enumerate(chains):
+                for b in chains[a_idx + 1:]:
+                    pair_bridges.setdefault((a, b), []).append(i)
+                    self.neighbors.setdefault(a, set()).add(b)
+                    self.neighbors.setdefault(b, set()).add(a)
+
+        # Per pair: Pareto-optimal bridges, ranked for every priority
+        self.pair_ranked: Dict[str, Dict[Tuple[str, str], List[int]]] = {p: {} for p in VALID_PRIORITIES}
+        for pair, indices in pair_bridges.items():
+            front = _pareto_filter(indices, key=lambda i: self.edges[i]["objectives"])
+            for priority in VALID_PRIORITIES:
+                self.pair_ranked[priority][pair] = sorted(
+                    front, key=lambda i: -self.edges[i]["composite"][priority]
+                )[:edge_candidates]
+
+        # All-pairs hop distances (BFS from every chain), capped at MAX_HOPS
+        self.hop_distance: Dict[str, Dict[str, int]] = {}
+        for start in self.neighbors:
+            dist = {start: 0}
+            frontier = [start]
+            for depth in range(1, MAX_HOPS + 1):
+                nxt = []
+                for chain in frontier:
+                    for nb in self.neighbors[chain]:
+                        if nb not in dist:
+                            dist[nb] = depth
+                            nxt.append(nb)
+                frontier = nxt
+            self.hop_distance[start] = dist
+
+        # Optimistic (component-wise best) hop overall and into each chain, for search bounds
+        self.ideal_edge = self._ideal(self.edges.values())
+        incident: Dict[str, List[Dict[str, Any]]] = {}
+        for (a, b), indices in pair_bridges.items():
+            for i in indices:
+                incident.setdefault(a, []).append(self.edges[i])
+                incident.setdefault(b, []).append(self.edges[i])
+        self.ideal_into: Dict[str, Dict[str, Any]] = {
+            chain: self._ideal(edges) for chain, edges in incident.items()
+        }
+
+    def _edge_metrics(self, i: int, bridge: Dict[str, Any]) -> Dict[str, Any]:
+        _, design_type = _lookup(self.dataset, bridge)
+        design_attrs = DESIGN_ATTRIBUTES.get(design_type, DESIGN_ATTRIBUTES["unknown"])
+        risk_score = _compute_risk_score(bridge, self.dataset)
+        volume_24h = float(bridge.get("volumePrevDay", 0) or 0)
+        if self.dataset.max_volume > 0:
+            liquidity = min((volume_24h / self.dataset.max_volume) * 100.0, 100.0)
+        else:
+            liquidity = 50.0
+        edge = {
+            "index": i,
+            "bridge": bridge.get("displayName", bridge.get("name", "Unknown")),
+            "bridge_id": bridge.get("id"),
+            "design_type": design_type,
+            "risk_score": risk_score,
+            "risk_level": _classify_risk(risk_score),
+            "latency": SPEED_SCORES.get(design_attrs["speed"], 6.0),
+            "cost": COST_SCORES.get(design_attrs["cost_efficiency"], 5.0),
+            "liquidity": liquidity,
+        }
+        edge["objectives"] = (edge["risk_score"], edge["cost"], edge["latency"], -edge["liquidity"])
+        metrics = _path_metrics([edge])
+        edge["composite"] = {p: _score_path(metrics, p) for p in VALID_PRIORITIES}
+        return edge
+
+    @staticmethod
+    def _ideal(edges) -> Dict[str, Any]:
+        edges = list(edges)
+        if not edges:
+            return {"risk_score": 0.0, "cost": 0.0, "latency": 0.0, "liquidity": 100.0}
+        return {
+            "risk_score": min(e["risk_score"] for e in edges),
+            "cost": min(e["cost"] for e in edges),
+            "latency": min(e["latency"] for e in edges),
+            "liquidity": max(e["liquidity"] for e in edges),
+        }
+
+    def _pair(self, a: str, b: str, priority: str) -> List[int]:
+        return self.pair_ranked[priority].get((a, b) if a < b else (b, a), [])
+
+    def routes(
+        self,
+        source_chain: str,
+        dest_chain: str,
+        priority: str = "safety",
+        max_hops: int = MAX_HOPS,
+        k: int = 5,
+    ) -> Dict[str, Any]:
+        """Best k routes of 1..max_hops hops plus their Pareto frontier.
+
+        Direct and 2-hop routes are enumerated over the precomputed per-pair
+        bridge lists. 3-hop routes use branch-and-bound: adding a hop can only
+        raise risk, cost and latency and lower bottleneck liquidity, so a prefix
+        completed with the most optimistic remaining hop(s) gives an upper bound,
+        and prefixes that cannot beat the current k-th best score are skipped.
+        The Pareto frontier covers all 1-2 hop routes plus the 3-hop routes the
+        search evaluates.
+        """
+        src, dst = source_chain.lower(), dest_chain.lower()
+        max_hops = max(1, min(int(max_hops), MAX_HOPS))
+        cache_key = (src, dst, priority, max_hops, k)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        best: List[Tuple[float, int, int, List[Tuple[str, str, int]], Dict[str, Any]]] = []
+        frontier: List[Tuple[Tuple[float, ...], List[Tuple[str, str, int]], Dict[str, Any]]] = []
+        counter = [0]
+
+        def record(hops: List[Tuple[str, str, int]]) -> None:
+            metrics = _path_metrics([self.edges[i] for _, _, i in hops])
+            score = _score_path(metrics, priority)
+            counter[0] += 1
+            entry = (score, -len(hops), -counter[0], hops, metrics)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[:3] > best[0][:3]:
+                heapq.heapreplace(best, entry)
+            vec = metrics["objectives"]
+            if any(_dominates(f[0], vec) or f[0] == vec for f in frontier):
+                return
+            frontier[:] = [f for f in frontier if not _dominates(vec, f[0])]
+            frontier.append((vec, hops, metrics))
+
+        def kth_best() -> float:
+            return best[0][0] if len(best) >= k else -1.0
+
+        reachable = src != dst and self.hop_distance.get(src, {}).get(dst, MAX_HOPS + 1) <= max_hops
+        if reachable:
+            for i in self._pair(src, dst, priority):
+                record([(src, dst, i)])
+
+        if reachable and max_hops >= 2:
+            for mid in self.neighbors[src] & self.neighbors.get(dst, set()):
+                for i in self._pair(src, mid, priority):
+                    for j in self._pair(mid, dst, priority):
+                        record([(src, mid, i), (mid, dst, j)])
+
+        if reachable and max_hops >= 3:
+            ideal_dst = self.ideal_into.get(dst)
+            dst_neighbors = self.neighbors.get(dst, set())
+            for m1 in self.neighbors[src]:
+                if m1 == dst:
+                    continue
+                for i in self._pair(src, m1, priority):
+                    leg1 = self.edges[i]
+                    bound = _score_path(_path_metrics([leg1, self.ideal_edge, ideal_dst]), priority)
+                    if bound <= kth_best():
+                        continue
+                    for m2 in self.neighbors[m1] & dst_neighbors:
+                        if m2 == src:
+                            continue
+                        for j in self._pair(m1, m2, priority):
+                            bound = _score_path(_path_metrics([leg1, self.edges[j], ideal_dst]), priority)
+                            if bound <= kth_best():
+                                continue
+                            for l in self._pair(m2, dst, priority):
+                                record([(src, m1, i), (m1, m2, j), (m2, dst, l)])
+
+        ranked = sorted(best, reverse=True)
+        frontier_ids = {id(f[1]) for f in frontier}
+        routes = [
+            self._format_route(hops, metrics, score, priority, idx + 1, id(hops) in frontier_ids)
+            for idx, (score, _, _, hops, metrics) in enumerate(ranked)
+        ]
+        pareto = sorted(
+            (self._format_route(hops, metrics, _score_path(metrics, priority), priority, 0, True)
+             for _, hops, metrics in frontier),
+            key=lambda r: (-r["composite_score"], r["hops"]),
+        )
+        for r in pareto:
+            r.pop("rank", None)
+
+        result = {
+            "source_chain": self.chain_names.get(src, source_chain),
+            "destination_chain": self.chain_names.get(dst, dest_chain),
+            "priority": priority,
+            "max_hops": max_hops,
+            "routes": routes,
+            "total_routes": len(routes),
+            "pareto_frontier": pareto,
+        }
+        if not routes:
+            result["message"] = (
+                f"No route within {max_hops} hop(s) between {source_chain} and {dest_chain}."
+            )
+        if len(self._query_cache) >= MAX_CACHED_QUERIES:
+            self._query_cache.clear()
+        self._query_cache[cache_key] = result
+        return result
+
+    def _format_route(
+        self,
+        hops: List[Tuple[str, str, int]],
+        metrics: Dict[str, float],
+        score: float,
+        priority: str,
+        rank: int,
+        pareto_optimal: bool,
+    ) -> Dict[str, Any]:
+        risk_level = _classify_risk(metrics["risk_score"])
+        rec_focus = PRIORITY_FOCUS.get(priority, "balanced")
+        n_hops = len(hops)
+        if risk_level in ("CRITICAL", "HIGH"):
+            recommendation = f"Not recommended -- {risk_level} compounded risk across {n_hops} hop(s)"
+        elif n_hops == 1:
+            recommendation = f"Direct route -- single bridge ranked for {rec_focus}"
+        else:
+            recommendation = f"{n_hops}-hop route for {rec_focus} -- each hop adds bridge risk and latency"
+        name = lambda chain: self.chain_names.get(chain, chain)
+        return {
+            "rank": rank,
+            "hops": n_hops,
+            "path": [name(hops[0][0])] + [name(b) for _, b, _ in hops],
+            "legs": [
+                {
+                    "from": name(a),
+                    "to": name(b),
+                    "bridge": self.edges[i]["bridge"],
+                    "bridge_id": self.edges[i]["bridge_id"],
+                    "design_type": self.edges[i]["design_type"],
+                    "risk_score": self.edges[i]["risk_score"],
+                    "risk_level": self.edges[i]["risk_level"],
+                }
+                for a, b, i in hops
+            ],
+            "risk_score": metrics["risk_score"],
+            "risk_level": risk_level,
+            "cost_units": metrics["cost"],
+            "latency_units": metrics["latency"],
+            "liquidity_score": round(metrics["liquidity"], 1),
+            "composite_score": score,
+            "pareto_optimal": pareto_optimal,
+            "recommendation": recommendation,
+        }
+
+
+def _path_metrics(legs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-hop metrics: risk compounds, cost/latency add, liquidity is the bottleneck."""
+    survive = 1.0
+    for leg in legs:
+        survive *= max(0.0, 1.0 - leg["risk_score"] / 10.0)
+    risk = round(10.0 * (1.0 - survive), 1)
+    cost = sum(leg["cost"] for leg in legs)
+    latency = sum(leg["latency"] for leg in legs)
+    liquidity = min(leg["liquidity"] for leg in legs)
+    return {
+        "risk_score": risk,
+        "cost": cost,
+        "latency": latency,
+        "liquidity": liquidity,
+        "objectives": (risk, cost, latency, -liquidity),
+    }
+
+
+def _score_path(metrics: Dict[str, Any], priority: str) -> float:
+    """Composite 0-100 score of a path; equals _compute_composite_score for one hop."""
+    safety_score = max(0, (10.0 - metrics["risk_score"]) * 10.0)
+    speed_score = max(0, (10.0 - metrics["latency"]) * 10.0)
+    cost_score = max(0, (10.0 - metrics["cost"]) * 10.0)
+    composite, _ = _weighted_composite(
+        safety_score, metrics["liquidity"], speed_score, cost_score, priority
+    )
+    return composite
+
+
+def get_route_graph(dataset: BridgeDataset) -> RouteGraph:
+    """Route graph for a dataset, built on first use and cached with it."""
+    # Stored on the dataset itself: the graph references its dataset, so a
+    # dataset-keyed cache would keep every dataset alive
+    graph = dataset._route_graph
+    if graph is None:
+        graph = RouteGraph(dataset)
+        dataset._route_graph = graph
+    return graph
+
+
+def find_multihop_routes(
+    all_bridges: Union[BridgeDataset, List[Dict[str, Any]]],
+    source_chain: str,
+    dest_chain: str,
+    priority: str = "safety",
+    max_hops: int = MAX_HOPS,
+    k: int = 5,
+) -> Dict[str, Any]:
+    """Find the best 1..max_hops bridge routes between two chains.
+
+    Args:
+        all_bridges: Bridge dataset, or the raw bridge list from DeFiLlama.
+        source_chain: Normalized source chain name.
+        dest_chain: Normalized destination chain name.
+        priority: Ranking priority (safety, cost, speed).
+        max_hops: Maximum number of bridge hops (1-3).
+        k: Number of ranked routes to return.
+
+    Returns:
+        Routes result dictionary with ranked routes and the Pareto frontier.
+    """
+    dataset = as_dataset(all_bridges, BRIDGE_SECURITY, BRIDGE_DESIGN)
+    return get_route_graph(dataset).routes(source_chain, dest_chain, priority, max_hops, k)
+
+
 def validate_input(data: Dict[str, Any]) -> Optional[str]:
     """Validate input parameters.
 
@@ -498,6 +838,14 @@ def validate_input(data: Dict[str, Any]) -> Optional[str]:
     if priority not in VALID_PRIORITIES:
         return f"'priority' must be one of: {', '.join(sorted(VALID_PRIORITIES))}."
 
+    if "max_hops" in data:
+        try:
+            max_hops = int(data["max_hops"])
+        except (ValueError, TypeError):
+            return "'max_hops' must be a valid integer."
+        if max_hops < 1 or max_hops > MAX_HOPS:
+            return f"'max_hops' must be between 1 and {MAX_HOPS}."
+
     return None
 
 
@@ -521,15 +869,25 @@ def main() -> None:
     dest_chain = _normalize_chain(data["destination_chain"])
     priority = data.get("priority", "safety")
 
-    # Fetch bridge data
-    api_data = _fetch_json(BRIDGES_API)
-    all_bridges = api_data.get("bridges", [])
+    # Fetch bridge data (shared disk cache)
+    try:
+        all_bridges = fetch_bridges()
+    except ConnectionError as e:
+        _error_exit(str(e))
+        return
 
     if not all_bridges:
         _error_exit("No bridge data returned from DeFiLlama API.")
         return
 
-    result = find_routes(all_bridges, source_chain, dest_chain, priority)
+    dataset = BridgeDataset(all_bridges, BRIDGE_SECURITY, BRIDGE_DESIGN)
+    result = find_routes(dataset, source_chain, dest_chain, priority)
+
+    max_hops = int(data.get("max_hops", 1))
+    if max_hops > 1:
+        multi_hop = find_multihop_routes(dataset, source_chain, dest_chain, priority, max_hops)
+        result["multi_hop_routes"] = multi_hop["routes"]
+        result["pareto_frontier"] = multi_hop["pareto_frontier"]
     result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
     print(json.dumps({"success": True, "data": result}, indent=2))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Unit tests for the route graph cache in route_optimizer."""
+
+import gc
+import weakref
+
+from bridge_dataset import BridgeDataset
+from route_optimizer import (
+    BRIDGE_DESIGN,
+    BRIDGE_SECURITY,
+    find_multihop_routes,
+    get_route_graph,
+)
+
+
+def _bridges():
+    return [
+        {"id": 1, "name": "Stargate", "displayName": "Stargate",
+         "volumePrevDay": 5_000_000, "chains": ["Ethereum", "Arbitrum", "Base"]},
+        {"id": 2, "name": "Across", "displayName": "Across",
+         "volumePrevDay": 2_000_000, "chains": ["Arbitrum", "Optimism"]},
+        {"id": 3, "name": "Hop", "displayName": "Hop",
+         "volumePrevDay": 500_000, "chains": ["Base", "Optimism", "Polygon"]},
+    ]
+
+
+def test_graph_is_built_once_per_dataset():
+    dataset = BridgeDataset(_bridges(), BRIDGE_SECURITY, BRIDGE_DESIGN)
+    assert get_route_graph(dataset) is get_route_graph(dataset)
+
+    other = BridgeDataset(_bridges(), BRIDGE_SECURITY, BRIDGE_DESIGN)
+    assert get_route_graph(other) is not get_route_graph(dataset)
+
+
+def test_cached_graph_does_not_keep_dataset_alive():
+    dataset = BridgeDataset(_bridges(), BRIDGE_SECURITY, BRIDGE_DESIGN)
+    get_route_graph(dataset)
+    ref = weakref.ref(dataset)
+
+    del dataset
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_cached_graph_gives_same_routes():
+    dataset = BridgeDataset(_bridges(), BRIDGE_SECURITY, BRIDGE_DESIGN)
+    first = find_multihop_routes(dataset, "Ethereum", "Optimism", "safety")
+    second = find_multihop_routes(dataset, "Ethereum", "Optimism", "safety")
+    fresh = find_multihop_routes(_bridges(), "Ethereum", "Optimism", "safety")
+
+    assert first["routes"] == second["routes"] == fresh["routes"]
+    assert first["routes"]
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Log Backfill - Chunked, resumable, concurrent eth_getLogs backfill
+Splits arbitrary block ranges into adaptive chunks, fetches them in parallel
+and streams events in block order as NDJSON with a resumable checkpoint
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from web3 import Web3
+
+# Chunk sizing (blocks per eth_getLogs call)
+DEFAULT_INITIAL_CHUNK = 2000
+MIN_CHUNK = 1
+MAX_CHUNK = 200_000
+# Most providers cap a getLogs response at ~10k logs; aim well below that
+TARGET_LOGS_PER_CHUNK = 5000
+
+DEFAULT_MAX_WORKERS = 4
+MAX_RETRIES = 4
+RETRY_BACKOFF = 0.5
+
+# Seconds between checkpoint writes (always written on exit)
+CHECKPOINT_INTERVAL = 1.0
+
+# Provider error fragments meaning "this window is too big, ask for less"
+RANGE_ERROR_HINTS = (
+    "more than",
+    "too many",
+    "limit exceeded",
+    "exceeds",
+    "exceed maximum",
+    "block range",
+    "range is too",
+    "range too",
+    "response size",
+    "timeout",
+    "timed out",
+    "-32005",
+)
+
+# e.g. Alchemy: "... this block range should work: [0x10, 0x1f]"
+SUGGESTED_RANGE = re.compile(r"\[(0x[0-9a-fA-F]+),\s*(0x[0-9a-fA-F]+)\]")
+
+
+class RangeTooLarge(Exception):
+    """Provider rejected a getLogs window as too large."""
+
+    def __init__(self, message: str, suggested_end: Optional[int] = None):
+        super().__init__(message)
+        self.suggested_end = suggested_end
+
+
+def _hex(value: Any) -> str:
+    """0x-prefixed hex string for raw RPC strings, bytes or HexBytes."""
+    if isinstance(value, str):
+        return value
+    return "0x" + bytes(value).hex()
+
+
+def _int(value: Any) -> int:
+    """Integer from a raw RPC quantity (hex string) or an already-decoded int."""
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value)
+
+
+_CHECKSUM_CACHE: Dict[str, str] = {}
+
+
+def _checksum(address: Any) -> str:
+    address = _hex(address)
+    cached = _CHECKSUM_CACHE.get(address)
+    if cached is None:
+        cached = _CHECKSUM_CACHE[address] = Web3.to_checksum_address(address)
+    return cached
+
+
+def format_log(log: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a raw or web3-decoded log into the skill's JSON event shape."""
+    return {
+        "address": _checksum(log["address"]),
+        "topics": [_hex(t) for t in log["topics"]],
+        "data": _hex(log["data"]),
+        "blockNumber": _int(log["blockNumber"]),
+        "transactionHash": _hex(log["transactionHash"]),
+        "transactionIndex": _int(log["transactionIndex"]),
+        "blockHash": _hex(log["blockHash"]),
+        "logIndex": _int(log["logIndex"]),
+        "removed": bool(log.get("removed", False)),
+    }
+
+
+def build_topic_filter(*topics: Optional[str]) -> List[Optional[str]]:
+    """Positional eth_getLogs topic filter from topic0..topic3.
+
+    Missing or malformed topics become wildcards (None); trailing wildcards
+    are dropped.
+    """
+    normalized: List[Optional[str]] = []
+    for topic in topics:
+        if topic:
+            if not topic.startswith("0x"):
+                topic = "0x" + topic
+            normalized.append(topic.lower() if len(topic) == 66 else None)
+        else:
+            normalized.append(None)
+    while normalized and normalized[-1] is None:
+        normalized.pop()
+    return normalized
+
+
+def _range_error(message: str) -> Optional[RangeTooLarge]:
+    lowered = message.lower()
+    if not any(hint in lowered for hint in RANGE_ERROR_HINTS):
+        return None
+    suggested_end = None
+    match = SUGGESTED_RANGE.search(message)
+    if match:
+        suggested_end = int(match.group(2), 16)
+    return RangeTooLarge(message, suggested_end)
+
+
+def get_logs_raw(w3: Web3, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """eth_getLogs through the provider, skipping web3's result formatters.
+
+    Raises:
+        RangeTooLarge: If the provider rejects the block window.
+        ConnectionError: On any other RPC error.
+    """
+    try:
+        response = w3.provider.make_request("eth_getLogs", [params])
+    except Exception as e:
+        range_error = _range_error(str(e))
+        if range_error:
+            raise range_error from e
+        raise ConnectionError(f"eth_getLogs failed: {e}") from e
+
+    error = response.get("error")
+    if error:
+        message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+        code = error.get("code") if isinstance(error, dict) else None
+        range_error = _range_error(f"{message} ({code})")
+        if range_error:
+            raise range_error
+        raise ConnectionError(f"eth_getLogs error: {message}")
+    return response.get("result") or []
+
+
+class LogBackfill:
+    """Adaptive, concurrent eth_getLogs scanner over [from_block, to_block].
+
+    Chunks shrink when the provider reports too many results (splitting the
+    failed window, or cutting at the provider's suggested range) and double
+    while chunks come back sparse. Up to max_workers chunks are in flight;
+    results are reordered so iter_chunks() yields contiguous block ranges.
+
+    Args:
+        w3: Connected Web3 instance.
+        address: Contract address.
+        topics: Positional topic filter (see build_topic_filter).
+        from_block: First block to scan.
+        to_block: Last block to scan (inclusive).
+        max_workers: Maximum concurrent eth_getLogs requests.
+        initial_chunk: Starting chunk size in blocks.
+        max_chunk: Upper bound for chunk growth.
+        target_logs: Logs per chunk the sizing aims for.
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        address: str,
+        topics: Optional[List[Optional[str]]],
+        from_block: int,
+        to_block: int,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        initial_chunk: int = DEFAULT_INITIAL_CHUNK,
+        max_chunk: int = MAX_CHUNK,
+        target_logs: int = TARGET_LOGS_PER_CHUNK,
+    ):
+        self.w3 = w3
+        self.address = address
+        self.topics = topics or None
+        self.from_block = from_block
+        self.to_block = to_block
+        self.max_workers = max(1, max_workers)
+        self.max_chunk = max(MIN_CHUNK, max_chunk)
+        self.chunk = max(MIN_CHUNK, min(initial_chunk, self.max_chunk))
+        self.target_logs = max(1, target_logs)
+        self.stats = {"requests": 0, "chunks": 0, "splits": 0, "retries": 0}
+
+    def _fetch(self, start: int, end: int) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            "address": self.address,
+            "fromBlock": hex(start),
+            "toBlock": hex(end),
+        }
+        if self.topics:
+            params["topics"] = self.topics
+        for attempt in range(MAX_RETRIES):
+            self.stats["requests"] += 1
+            try:
+                return [format_log(log) for log in get_logs_raw(self.w3, params)]
+            except ConnectionError:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(RETRY_BACKOFF * (2 ** attempt) * (1 + random.random()))
+        return []
+
+    def _adapt(self, span: int, count: int) -> None:
+        if count > self.target_logs:
+            self.chunk = max(MIN_CHUNK, min(self.chunk, span * self.target_logs // count))
+        elif count < self.target_logs // 4 and span >= self.chunk:
+            self.chunk = min(self.max_chunk, self.chunk * 2)
+
+    def iter_chunks(self) -> Iterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """Yield (start, end, events) for contiguous ranges in block order.
+
+        Raises:
+            ConnectionError: If a chunk keeps failing after retries, or a
+                single block exceeds the provider's result limit.
+        """
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        inflight: Dict[Future, Tuple[int, int]] = {}
+        ready: Dict[int, Tuple[int, List[Dict[str, Any]]]] = {}
+        next_submit = next_emit = self.from_block
+        # Bound reordering memory: completed-but-unemitted chunks count toward the window
+        window = 2 * self.max_workers
+        try:
+            while True:
+                while next_submit <= self.to_block and len(inflight) + len(ready) < window:
+                    end = min(next_submit + self.chunk - 1, self.to_block)
+                    inflight[pool.submit(self._fetch, next_submit, end)] = (next_submit, end)
+                    next_submit = end + 1
+                if not inflight:
+                    break
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end = inflight.pop(future)
+                    try:
+                        events = future.result()
+                    except RangeTooLarge as e:
+                        if start == end:
+                            raise ConnectionError(
+                                f"Block {start} alone exceeds the provider's log limit: {e}"
+                            ) from e
+                        mid = e.suggested_end
+                        if mid is None or not start <= mid < end:
+                            mid = (start + end) // 2
+                        self.chunk = max(MIN_CHUNK, min(self.chunk, mid - start + 1))
+                        self.stats["splits"] += 1
+                        inflight[pool.submit(self._fetch, start, mid)] = (start, mid)
+                        inflight[pool.submit(self._fetch, mid + 1, end)] = (mid + 1, end)
+                        continue
+                    self.stats["chunks"] += 1
+                    self._adapt(end - start + 1, len(events))
+                    ready[start] = (end, events)
+
+                while next_emit in ready:
+                    end, events = ready.pop(next_emit)
+                    yield next_emit, end, events
+                    next_emit = end + 1
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _cache_dir() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-contract-event-tail")
+    return os.getenv("CONTRACT_EVENT_TAIL_CACHE", default)
+
+
+def checkpoint_path_for(
+    chain: str,
+    address: str,
+    topics: Optional[List[Optional[str]]],
+    from_block: int,
+    output: Optional[str],
+) -> str:
+    """Default checkpoint file for a backfill job."""
+    key = json.dumps(
+        [chain.lower(), address.lower(), topics or [], from_block, os.path.abspath(output) if output else None]
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(_cache_dir(), f"backfill-{digest}.json")
+
+
+def _load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def run_backfill(
+    w3: Web3,
+    chain: str,
+    address: str,
+    from_block: int,
+    to_block: int,
+    topics: Optional[List[Optional[str]]] = None,
+    stream: Optional[IO[str]] = None,
+    output: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    resume: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    initial_chunk: int = DEFAULT_INITIAL_CHUNK,
+) -> Dict[str, Any]:
+    """Backfill events for a contract, streaming them as NDJSON.
+
+    Events are written one JSON object per line, in (block, log index) order,
+    to `output` (appended) or to `stream`. Progress is checkpointed after
+    flushed chunks; re-running with the same parameters resumes from the
+    next unscanned block. For file output the checkpoint records the byte
+    offset, and a resumed run truncates anything written after it, so no
+    event is duplicated.
+
+    Args:
+        w3: Connected Web3 instance.
+        chain: Chain key (part of the checkpoint identity).
+        address: Checksummed contract address.
+        from_block: First block (>= 0).
+        to_block: Last block; negative or beyond head means the current head.
+        topics: Positional topic filter.
+        stream: Text stream used when no output file is given.
+        output: NDJSON file path.
+        checkpoint: Checkpoint file path (default: derived under the cache dir).
+        resume: Continue from an existing checkpoint.
+        max_workers: Maximum concurrent eth_getLogs requests.
+        initial_chunk: Starting chunk size in blocks.
+
+    Returns:
+        Summary dictionary (success, ranges scanned, event counts, throughput).
+    """
+    started = time.time()
+    current_block = w3.eth.block_number
+    from_block = max(0, from_block)
+    if to_block < 0 or to_block > current_block:
+        to_block = current_block
+
+    checkpoint = checkpoint or checkpoint_path_for(chain, address, topics, from_block, output)
+    state = _load_checkpoint(checkpoint) if resume else None
+    start_block = from_block
+    events_written = 0
+    offset: Optional[int] = None
+    if state and state.get("contract", "").lower() == address.lower() and state.get("from_block") == from_block:
+        start_block = max(from_block, int(state.get("next_block", from_block)))
+        events_written = int(state.get("events_written", 0))
+        offset = state.get("output_offset")
+
+    sink: IO[str]
+    if output:
+        sink = open(output, "a", encoding="utf-8")
+        if offset is not None and sink.tell() > offset:
+            sink.truncate(offset)
+            sink.seek(offset)
+        elif offset is None:
+            # No checkpoint for this file: start it over
+            sink.truncate(0)
+            sink.seek(0)
+    else:
+        sink = stream or sys.stdout
+
+    def checkpoint_state(next_block: int) -> Dict[str, Any]:
+        return {
+            "chain": chain,
+            "contract": address,
+            "topics": topics or [],
+            "from_block": from_block,
+            "next_block": next_block,
+            "events_written": events_written,
+            "output": output,
+            "output_offset": sink.tell() if output else None,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    summary: Dict[str, Any] = {
+        "success": True,
+        "chain": chain,
+        "contract": address,
+        "from_block": from_block,
+        "to_block": to_block,
+        "resumed_from": start_block if start_block != from_block else None,
+        "current_block": current_block,
+    }
+    scanner = LogBackfill(
+        w3, address, topics, start_block, to_block,
+        max_workers=max_workers, initial_chunk=initial_chunk,
+    )
+    new_events = 0
+    next_block = start_block
+    last_checkpoint = 0.0
+    try:
+        for _, end, events in scanner.iter_chunks():
+            if events:
+                sink.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events))
+                sink.flush()
+                new_events += len(events)
+                events_written += len(events)
+            next_block = end + 1
+            now = time.time()
+            if now - last_checkpoint >= CHECKPOINT_INTERVAL:
+                _save_checkpoint(checkpoint, checkpoint_state(next_block))
+                last_checkpoint = now
+    except ConnectionError as e:
+        summary.update({
+            "success": False,
+            "error": "rpc_error",
+            "message": str(e),
+            "resume_hint": f"Re-run with the same parameters to resume from block {next_block}",
+        })
+    finally:
+        if start_block <= to_block:
+            _save_checkpoint(checkpoint, checkpoint_state(next_block))
+        if output:
+            sink.close()
+
+    elapsed = time.time() - started
+    blocks_scanned = next_block - start_block
+    summary.update({
+        "next_block": next_block,
+        "blocks_scanned": blocks_scanned,
+        "events": new_events,
+        "events_written": events_written,
+        "requests": scanner.stats["requests"],
+        "chunks": scanner.stats["chunks"],
+        "splits": scanner.stats["splits"],
+        "retries": scanner.stats["retries"],
+        "final_chunk_size": scanner.chunk,
+        "elapsed_seconds": round(elapsed, 3),
+        "blocks_per_second": round(blocks_scanned / elapsed, 1) if elapsed > 0 else None,
+        "output": output,
+        "checkpoint": checkpoint,
+    })
+    return summary
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Log Tail - Live, reorg-aware contract event tailing
+Polls the chain head, fetches only the new block window and emits
+removed=true corrections when a reorg replaces already-delivered blocks
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from web3 import Web3
+
+from log_backfill import LogBackfill, format_log, get_logs_raw
+
+# Blocks of hashes/events kept for reorg detection and rollback
+DEFAULT_REORG_DEPTH = 128
+# Larger gaps (e.g. starting from an old block) are caught up with the chunked backfill
+MAX_LIVE_WINDOW = 2000
+DEFAULT_MAX_BUFFER = 1000
+MAX_CONSECUTIVE_ERRORS = 10
+
+_STOP = object()
+
+
+class DeepReorgError(Exception):
+    """Reorg deeper than the tracked block window."""
+
+
+def _int(value: Any) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class EventTail:
+    """Follow a contract's events from the chain head, correcting for reorgs.
+
+    Each poll costs one eth_getBlockByNumber("latest") call when no block was
+    produced, and otherwise one canonical-hash check for the last processed
+    block plus one eth_getLogs for the new window. A block hash commits to
+    its ancestry, so if the last processed block is still canonical nothing
+    below it changed. On mismatch the tail walks back through tracked hashes to
+    the common ancestor, re-emits the orphaned events with removed=true (newest
+    first, like eth_subscribe) and refetches the new canonical blocks.
+
+    Args:
+        w3: Connected Web3 instance.
+        address: Contract address.
+        topics: Positional topic filter (see log_backfill.build_topic_filter).
+        from_block: First block to deliver; default starts at the current head.
+        confirmations: Blocks to stay behind the head (0 = deliver immediately,
+            relying on removed corrections).
+        poll_interval: Seconds between head polls.
+        max_buffer: Maximum undelivered events queued for a slow consumer.
+        reorg_depth: Blocks of history tracked for reorg detection.
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        address: str,
+        topics: Optional[List[Optional[str]]] = None,
+        from_block: Optional[int] = None,
+        confirmations: int = 0,
+        poll_interval: float = 1.0,
+        max_buffer: int = DEFAULT_MAX_BUFFER,
+        reorg_depth: int = DEFAULT_REORG_DEPTH,
+    ):
+        self.w3 = w3
+        self.address = address
+        self.topics = topics or None
+        self.confirmations = max(0, confirmations)
+        self.poll_interval = max(0.05, poll_interval)
+        self.max_buffer = max(1, max_buffer)
+        self.reorg_depth = max(1, reorg_depth)
+        self.last: Optional[int] = None if from_block is None else from_block - 1
+        self._head_hash: Optional[str] = None
+        self._hashes: "OrderedDict[int, str]" = OrderedDict()
+        self._delivered: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._stopped = False
+        self.stats: Dict[str, Any] = {
+            "polls": 0,
+            "new_heads": 0,
+            "events": 0,
+            "removed": 0,
+            "reorgs": 0,
+            "max_reorg_depth": 0,
+            "rpc_errors": 0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0,
+            "latency_samples": 0,
+        }
+
+    def _rpc(self, method: str, params: List[Any]) -> Any:
+        try:
+            response = self.w3.provider.make_request(method, params)
+        except Exception as e:
+            raise ConnectionError(f"{method} failed: {e}") from e
+        if response.get("error"):
+            raise ConnectionError(f"{method} error: {response['error']}")
+        return response.get("result")
+
+    def _header(self, block: Union[int, str]) -> Dict[str, Any]:
+        tag = hex(block) if isinstance(block, int) else block
+        result = self._rpc("eth_getBlockByNumber", [tag, False])
+        if not result:
+            raise ConnectionError(f"Block {block} not available")
+        return {
+            "number": _int(result["number"]),
+            "hash": result["hash"],
+            "timestamp": _int(result["timestamp"]),
+        }
+
+    def _find_ancestor(self, head_number: int) -> int:
+        """Highest tracked block whose hash is still canonical."""
+        for number in reversed(list(self._hashes)):
+            if number > head_number:
+                continue
+            if self._header(number)["hash"] == self._hashes[number]:
+                return number
+        raise DeepReorgError(
+            f"Reorg deeper than the {self.reorg_depth} tracked blocks; restart from a checkpoint"
+        )
+
+    def _rollback(self, ancestor: int) -> List[Dict[str, Any]]:
+        """Forget blocks above ancestor and return removed=true corrections."""
+        corrections: List[Dict[str, Any]] = []
+        orphaned = [n for n in self._delivered if n > ancestor]
+        for number in reversed(orphaned):
+            for event in reversed(self._delivered.pop(number)):
+                corrections.append(dict(event, removed=True))
+        for number in [n for n in self._hashes if n > ancestor]:
+            del self._hashes[number]
+        depth = (self.last or ancestor) - ancestor
+        self.stats["reorgs"] += 1
+        self.stats["max_reorg_depth"] = max(self.stats["max_reorg_depth"], depth)
+        self.stats["removed"] += len(corrections)
+        self.last = ancestor
+        return corrections
+
+    def _fetch_window(self, start: int, end: int) -> List[Dict[str, Any]]:
+        if end - start + 1 > MAX_LIVE_WINDOW:
+            scanner = LogBackfill(self.w3, self.address, self.topics, start, end)
+            return [e for _, _, events in scanner.iter_chunks() for e in events]
+        params: Dict[str, Any] = {"address": self.address, "fromBlock": hex(start), "toBlock": hex(end)}
+        if self.topics:
+            params["topics"] = self.topics
+        return [format_log(log) for log in get_logs_raw(self.w3, params)]
+
+    def _track(self, number: int, block_hash: str) -> None:
+        self._hashes[number] = block_hash
+        self._hashes.move_to_end(number)
+
+    def _prune(self) -> None:
+        floor = (self.last or 0) - self.reorg_depth
+        while self._hashes and next(iter(self._hashes)) < floor:
+            self._hashes.popitem(last=False)
+        while self._delivered and next(iter(self._delivered)) < floor:
+            self._delivered.popitem(last=False)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Advance to the current head once; return new events and corrections in order.
+
+        Raises:
+            ConnectionError: On RPC failures (state is unchanged; poll again).
+            DeepReorgError: If the reorg is deeper than reorg_depth.
+        """
+        self.stats["polls"] += 1
+        head = self._header("latest")
+        if head["hash"] == self._head_hash:
+            return []
+        self.stats["new_heads"] += 1
+        target = head["number"] - self.confirmations
+        if self.last is None:
+            self.last = target
+            self._head_hash = head["hash"]
+            if target == head["number"]:
+                self._track(target, head["hash"])
+            return []
+
+        out: List[Dict[str, Any]] = []
+        tracked = self._hashes.get(self.last)
+        if tracked is not None:
+            if self.last > head["number"]:
+                # Reorg onto a shorter chain
+                reorged = True
+            else:
+                current = head if self.last == head["number"] else self._header(self.last)
+                reorged = current["hash"] != tracked
+            if reorged:
+                out.extend(self._rollback(self._find_ancestor(head["number"])))
+
+        if target <= self.last:
+            self._head_hash = head["hash"]
+            return out
+
+        tip = head if target == head["number"] else self._header(target)
+        events = self._fetch_window(self.last + 1, target)
+        # Logs and header must come from the same fork; otherwise retry on the next poll
+        if any(e["blockNumber"] == target and e["blockHash"] != tip["hash"] for e in events):
+            return out
+
+        for event in events:
+            self._track(event["blockNumber"], event["blockHash"])
+            self._delivered.setdefault(event["blockNumber"], []).append(event)
+        self._track(target, tip["hash"])
+        self.last = target
+        self._head_hash = head["hash"]
+        self._prune()
+
+        if events:
+            latency_ms = max(0.0, (time.time() - tip["timestamp"]) * 1000)
+            self.stats["latency_ms_total"] += latency_ms * len(events)
+            self.stats["latency_samples"] += len(events)
+            self.stats["latency_ms_max"] = max(self.stats["latency_ms_max"], latency_ms)
+        self.stats["events"] += len(events)
+        out.extend(events)
+        return out
+
+    def stop(self) -> None:
+        """Ask a running events()/run() loop to finish after the current poll."""
+        self._stopped = True
+
+    async def _produce(self, queue: "asyncio.Queue[Any]", errors: List[BaseException]) -> None:
+        loop = asyncio.get_running_loop()
+        consecutive_errors = 0
+        try:
+            while not self._stopped:
+                started = loop.time()
+                try:
+                    batch = await asyncio.to_thread(self.poll)
+                    consecutive_errors = 0
+                except ConnectionError:
+                    self.stats["rpc_errors"] += 1
+                    consecutive_errors += 1
+                    if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                        raise
+                    await asyncio.sleep(min(30.0, self.poll_interval * (2 ** consecutive_errors)))
+                    continue
+                for event in batch:
+                    # Blocks when the consumer falls max_buffer events behind
+                    await queue.put(event)
+                await asyncio.sleep(max(0.0, self.poll_interval - (loop.time() - started)))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            try:
+                queue.put_nowait(_STOP)
+            except asyncio.QueueFull:
+                pass
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Async iterator over live events (and removed=true corrections).
+
+        Raises:
+            ConnectionError: After repeated consecutive RPC failures.
+            DeepReorgError: If a reorg exceeds the tracked depth.
+        """
+        self._stopped = False
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.max_buffer)
+        errors: List[BaseException] = []
+        producer = asyncio.create_task(self._produce(queue, errors))
+        try:
+            while True:
+                if producer.done() and queue.empty():
+                    break
+                item = await queue.get()
+                if item is _STOP:
+                    break
+                yield item
+        finally:
+            self._stopped = True
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        if errors:
+            raise errors[0]
+
+    async def run(
+        self,
+        callback: Callable[[Dict[str, Any]], Union[None, Awaitable[None]]],
+    ) -> None:
+        """Deliver every event to callback (sync or async) until stop() is called."""
+        async for event in self.events():
+            result = callback(event)
+            if inspect.isawaitable(result):
+                await result
+
+    def summary(self) -> Dict[str, Any]:
+        samples = self.stats["latency_samples"]
+        return {
+            "last_block": self.last,
+            "polls": self.stats["polls"],
+            "new_heads": self.stats["new_heads"],
+            "events": self.stats["events"],
+            "removed": self.stats["removed"],
+            "reorgs": self.stats["reorgs"],
+            "max_reorg_depth": self.stats["max_reorg_depth"],
+            "rpc_errors": self.stats["rpc_errors"],
+            "avg_block_to_emit_ms": round(self.stats["latency_ms_total"] / samples, 1) if samples else None,
+            "max_block_to_emit_ms": round(self.stats["latency_ms_max"], 1) if samples else None,
+        }
+
+
+async def stream_tail(
+    tail: EventTail,
+    stream: Any,
+    duration: float = 0,
+    max_events: int = 0,
+) -> Dict[str, Any]:
+    """Write tailed events to a text stream as NDJSON.
+
+    Args:
+        tail: Configured EventTail.
+        stream: Writable text stream (flushed per event).
+        duration: Seconds to run; 0 runs until cancelled.
+        max_events: Stop after this many lines; 0 for no limit.
+
+    Returns:
+        Tail summary dictionary.
+    """
+    written = 0
+    started = time.time()
+
+    async def consume() -> None:
+        nonlocal written
+        async for event in tail.events():
+            stream.write(json.dumps(event, separators=(",", ":")) + "\n")
+            stream.flush()
+            written += 1
+            if max_events and written >= max_events:
+                tail.stop()
+                break
+
+    error: Optional[str] = None
+    try:
+        if duration > 0:
+            await asyncio.wait_for(consume(), timeout=duration)
+        else:
+            await consume()
+    except asyncio.TimeoutError:
+        pass
+    except (ConnectionError, DeepReorgError) as e:
+        error = str(e)
+
+    summary: Dict[str, Any] = {"success": error is None, "lines_written": written}
+    if error:
+        summary.update({"error": "rpc_error", "message": error})
+    summary.update(tail.summary())
+    summary["elapsed_seconds"] = round(time.time() - started, 3)
+    return summary
@@ -5,6 +5,7 @@ Uses direct RPC eth_getLogs for real blockchain event queries
 No API keys required
 """
 
+import asyncio
 import json
 import sys
 from typing import Dict, List, Optional, Any
@@ -13,6 +14,15 @@ from web3 import Web3
 from eth_abi import decode
 import re
 
+from log_backfill import (
+    DEFAULT_INITIAL_CHUNK,
+    DEFAULT_MAX_WORKERS,
+    build_topic_filter,
+    format_log,
+    run_backfill,
+)
+from log_tail import DEFAULT_MAX_BUFFER, DEFAULT_REORG_DEPTH, EventTail, stream_tail
+
 # Chain configurations with RPC endpoints
 CHAIN_CONFIGS = {
     "ethereum": {
@@ -113,71 +123,27 @@ def get_event_logs(
         if to_block < 0 or to_block > current_block:
             to_block = current_block
         
-        # Limit to 5000 block range for performance
-        if (to_block - from_block) > 5000:
+        # Limit to 5000 block range for performance (use action "backfill" for larger ranges)
+        truncated = (to_block - from_block) > 5000
+        if truncated:
             to_block = from_block + 5000
         
-        # Build filter topics
-        topics = []
-        for topic in [topic0, topic1, topic2, topic3]:
-            if topic:
-                # Normalize topic (ensure it's a valid 32-byte hex string)
-                if not topic.startswith('0x'):
-                    topic = '0x' + topic
-                if len(topic) != 66:  # 0x + 64 hex chars
-                    continue
-                topics.append(topic)
-        
-        # Create filter dict
+        # Build positional topic filter
         filter_dict = {
             "address": contract_address,
             "fromBlock": from_block,
             "toBlock": to_block
         }
         
+        topics = build_topic_filter(topic0, topic1, topic2, topic3)
         if topics:
-            filter_dict["topics"] = [topics] if len(topics) == 1 else [topics[:1], topics[1:] if len(topics) > 1 else None]
+            filter_dict["topics"] = topics
         
         # Get logs via RPC
         logs = w3.eth.get_logs(filter_dict)
         
         # Parse logs with metadata
-        parsed_logs = []
-        for log in logs:
-            # Clean up topics and data to hex strings
-            topics = []
-            for topic in log["topics"]:
-                if isinstance(topic, bytes):
-                    topics.append('0x' + topic.hex())
-                else:
-                    topics.append(str(topic))
-            
-            data_str = log["data"]
-            if isinstance(data_str, bytes):
-                data_str = '0x' + data_str.hex()
-            else:
-                data_str = str(data_str)
-            
-            tx_hash_str = str(log["transactionHash"])
-            if isinstance(log["transactionHash"], bytes):
-                tx_hash_str = '0x' + log["transactionHash"].hex()
-            
-            block_hash_str = str(log["blockHash"])
-            if isinstance(log["blockHash"], bytes):
-                block_hash_str = '0x' + log["blockHash"].hex()
-            
-            parsed_log = {
-                "address": str(log["address"]),
-                "topics": topics,
-                "data": data_str,
-                "blockNumber": log["blockNumber"],
-                "transactionHash": tx_hash_str,
-                "transactionIndex": log["transactionIndex"],
-                "blockHash": block_hash_str,
-                "logIndex": log["logIndex"],
-                "removed": log["removed"]
-            }
-            parsed_logs.append(parsed_log)
+        parsed_logs = [format_log(log) for log in logs]
         
         return {
             "success": True,
@@ -189,6 +155,7 @@ def get_event_logs(
             "block_range": to_block - from_block + 1,
             "current_block": current_block,
             "total_events": len(logs),
+            "truncated": truncated,
             "events": parsed_logs,
             "filters_applied": {
                 "topic0": topic0,
@@ -304,13 +271,80 @@ def main():
                 contract, from_block, to_block, chain,
                 topic0, topic1, topic2, topic3
             )
+        elif action == "backfill":
+            if not Web3.is_address(contract):
+                print(json.dumps({
+                    "success": False,
+                    "error": "validation_error",
+                    "message": "Invalid contract address format"
+                }, indent=2))
+                sys.exit(1)
+            output = input_data.get("output")
+            w3, config = get_web3_instance(chain)
+            summary = run_backfill(
+                w3,
+                chain.lower(),
+                Web3.to_checksum_address(contract),
+                int(input_data.get("from_block", 0)),
+                int(input_data.get("to_block", -1)),
+                topics=build_topic_filter(
+                    input_data.get("topic0"), input_data.get("topic1"),
+                    input_data.get("topic2"), input_data.get("topic3")
+                ),
+                output=output,
+                checkpoint=input_data.get("checkpoint"),
+                resume=bool(input_data.get("resume", True)),
+                max_workers=int(input_data.get("max_workers", DEFAULT_MAX_WORKERS)),
+                initial_chunk=int(input_data.get("chunk_size", DEFAULT_INITIAL_CHUNK)),
+            )
+            summary["chain"] = config["name"]
+            if output:
+                print(json.dumps(summary, indent=2))
+            else:
+                # Events were streamed as NDJSON; the summary is the last line
+                print(json.dumps({"summary": summary}))
+            sys.exit(0 if summary["success"] else 1)
+        elif action == "tail":
+            if not Web3.is_address(contract):
+                print(json.dumps({
+                    "success": False,
+                    "error": "validation_error",
+                    "message": "Invalid contract address format"
+                }, indent=2))
+                sys.exit(1)
+            w3, config = get_web3_instance(chain)
+            from_block = input_data.get("from_block")
+            # Poll several times per block so delivery lags the head by a fraction of a block
+            default_interval = min(2.0, max(0.1, config["block_time"] / 4))
+            tail = EventTail(
+                w3,
+                Web3.to_checksum_address(contract),
+                topics=build_topic_filter(
+                    input_data.get("topic0"), input_data.get("topic1"),
+                    input_data.get("topic2"), input_data.get("topic3")
+                ),
+                from_block=int(from_block) if from_block is not None else None,
+                confirmations=int(input_data.get("confirmations", 0)),
+                poll_interval=float(input_data.get("poll_interval", default_interval)),
+                max_buffer=int(input_data.get("max_buffer", DEFAULT_MAX_BUFFER)),
+                reorg_depth=int(input_data.get("reorg_depth", DEFAULT_REORG_DEPTH)),
+            )
+            summary = asyncio.run(stream_tail(
+                tail,
+                sys.stdout,
+                duration=float(input_data.get("duration", 60)),
+                max_events=int(input_data.get("max_events", 0)),
+            ))
+            summary["chain"] = config["name"]
+            print(json.dumps({"summary": summary}))
+            sys.exit(0 if summary["success"] else 1)
         elif action == "info":
             result = get_contract_info(contract, chain)
         else:
             print(json.dumps({
                 "success": False,
                 "error": "unknown_action",
-                "message": f"Unknown action: {action}. Supported: get_logs, info, events, chains"
+                "message": f"Unknown action: {action}. Supported: get_logs, backfill, tail, info, events, chains"
             }, indent=2))
             sys.exit(1)
         
@@ -2,7 +2,10 @@
 """
 DAO Health — Calculate comprehensive DAO health metrics.
 
-Uses the Snapshot GraphQL API (free, public, no API key required).
+Uses the Snapshot GraphQL API (free, public, no API key required). Spaces,
+proposals and votes are synced into the local governance store; comparison
+mode syncs every space concurrently, then scores all of them in one
+vectorized pass over columnar proposal and vote arrays.
 
 Input (JSON via stdin):
     {
@@ -25,69 +28,16 @@ Output (JSON via stdout):
 import json
 import sys
 import time
-import urllib.error
-import urllib.request
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-SNAPSHOT_API = "https://hub.snapshot.org/graphql"
-
-SPACE_QUERY = """
-query Space($id: String!) {
-  space(id: $id) {
-    id
-    name
-    about
-    members
-    proposals_count
-    followers_count
-    voting {
-      delay
-      period
-      quorum
-    }
-    strategies {
-      name
-    }
-  }
-}
-"""
-
-RECENT_PROPOSALS_QUERY = """
-query RecentProposals($space: String!, $first: Int) {
-  proposals(
-    where: { space: $space }
-    first: $first
-    orderBy: "created"
-    orderDirection: desc
-  ) {
-    id
-    title
-    state
-    scores
-    scores_total
-    votes
-    quorum
-    start
-    end
-    space { id members }
-  }
-}
-"""
+import governance_metrics as metrics
+import numpy as np
+from governance_store import SnapshotAPIError, get_store
 
-VOTES_QUERY = """
-query Votes($proposal: String!, $first: Int) {
-  votes(
-    where: { proposal: $proposal }
-    first: $first
-    orderBy: "vp"
-    orderDirection: desc
-  ) {
-    voter
-    vp
-  }
-}
-"""
+# Closed proposals sampled for voting power concentration
+DECENTRALIZATION_SAMPLE = 3
+MAX_COMPARE = 50
 
 # Health score weights
 WEIGHTS = {
@@ -99,44 +49,6 @@ WEIGHTS = {
 }
 
 
-def _graphql_query(query: str, variables: Optional[Dict] = None, retries: int = 3) -> Dict[str, Any]:
-    """Execute a GraphQL query against Snapshot Hub with retry logic."""
-    payload = json.dumps({"query": query, "variables": variables or {}}).encode()
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "SpoonOS-GovernanceIntel/1.0",
-    }
-
-    last_error: Optional[Exception] = None
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(
-                SNAPSHOT_API,
-                data=payload,
-                headers=headers,
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode())
-                if "errors" in data:
-                    return {"error": data["errors"][0].get("message", "GraphQL error")}
-                return data
-        except urllib.error.HTTPError as exc:
-            last_error = exc
-            if exc.code == 429:
-                time.sleep(2 ** attempt)
-                continue
-            break
-        except (urllib.error.URLError, OSError) as exc:
-            last_error = exc
-            if attempt < retries - 1:
-                time.sleep(1.5 ** attempt)
-                continue
-            break
-
-    return {"error": f"API request failed after {retries} attempts: {last_error}"}
-
-
 def _ts_to_date(ts: int) -> str:
     """Convert UNIX timestamp to date string."""
     return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
@@ -144,11 +56,11 @@ def _ts_to_date(ts: int) -> str:
 
 def _fetch_space_info(space_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
     """Fetch space metadata."""
-    resp = _graphql_query(SPACE_QUERY, {"id": space_id})
-    if "error" in resp:
-        return None, {"status": "error", "error": resp["error"]}
+    try:
+        space = get_store().sync_space(space_id)
+    except SnapshotAPIError as exc:
+        return None, {"status": "error", "error": str(exc)}
 
-    space = (resp.get("data") or {}).get("space")
     if not space:
         return None, {
             "status": "error",
@@ -160,33 +72,51 @@ def _fetch_space_info(space_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
 
 
 def _fetch_recent_proposals(space_id: str, count: int = 50) -> List[Dict[str, Any]]:
-    """Fetch recent proposals for a space."""
-    resp = _graphql_query(RECENT_PROPOSALS_QUERY, {
-        "space": space_id,
-        "first": min(count, 100),
-    })
+    """Sync new proposals for a space, then return the `count` most recent."""
+    store = get_store()
+    try:
+        store.sync_proposals(space_id)
+    except SnapshotAPIError:
+        pass
+    return store.recent_proposals(space_id, count)
 
-    if "error" in resp:
-        return []
 
-    return (resp.get("data") or {}).get("proposals") or []
+def _decentralization_sample(proposals: List[Dict]) -> List[Dict]:
+    """Most recent closed proposals with enough votes to measure concentration."""
+    closed = [p for p in proposals if p.get("state") == "closed" and p.get("votes", 0) > 10]
+    return closed[:DECENTRALIZATION_SAMPLE]
 
 
-def _fetch_top_voters(proposal_id: str, count: int = 50) -> List[Dict[str, Any]]:
-    """Fetch top voters for a proposal."""
-    resp = _graphql_query(VOTES_QUERY, {
-        "proposal": proposal_id,
-        "first": count,
-    })
+def _prefetch_space(space_id: str) -> None:
+    """Sync everything analyze_dao_health reads for a space into the store."""
+    store = get_store()
+    if not store.sync_space(space_id):
+        return
+    store.sync_proposals(space_id)
+    sample = _decentralization_sample(store.recent_proposals(space_id, 50))
+    store.sync_many(store.sync_votes, [p["id"] for p in sample])
 
-    if "error" in resp:
-        return []
 
-    return (resp.get("data") or {}).get("votes") or []
+def _proposal_columns(proposals_by_space: List[List[Dict]]) -> Dict[str, Any]:
+    """Recent proposals of every space as flat arrays; `seg` is the space index."""
+    flat = [p for proposals in proposals_by_space for p in proposals]
+    scores = [p.get("scores") or [] for p in flat]
+    return {
+        "k": len(proposals_by_space),
+        "seg": metrics.segment_ids([len(p) for p in proposals_by_space]),
+        "count": np.array([len(p) for p in proposals_by_space], dtype=np.int64),
+        "start": np.array([p.get("start", 0) or 0 for p in flat], dtype=np.int64),
+        "closed": np.array([p.get("state") == "closed" for p in flat], dtype=bool),
+        "votes": np.array([p.get("votes", 0) or 0 for p in flat], dtype=np.float64),
+        "quorum": np.array([p.get("quorum", 0) or 0 for p in flat], dtype=np.float64),
+        "scores_total": np.array([p.get("scores_total", 0) or 0 for p in flat], dtype=np.float64),
+        "has_scores": np.array([bool(s) for s in scores], dtype=bool),
+        "max_score": np.array([max(s) if s else 0 for s in scores], dtype=np.float64),
+    }
 
 
-def _calculate_activity_score(proposals: List[Dict], months: int = 3) -> Dict[str, Any]:
-    """Calculate activity score based on proposals per month.
+def _calculate_activity_scores(cols: Dict[str, Any], months: int = 3) -> List[Dict[str, Any]]:
+    """Calculate activity score per space based on proposals per month.
 
     Scoring:
       - 4+ proposals/month: 100
@@ -194,78 +124,69 @@ def _calculate_activity_score(proposals: List[Dict], months: int = 3) -> Dict[st
       - 1-2: linear 30-60
       - <1: linear 0-30
     """
-    if not proposals:
-        return {"score": 0, "proposals_per_month": 0.0, "total_proposals": 0}
-
-    now = int(time.time())
-    cutoff = now - (months * 30 * 86400)
-
-    recent = [p for p in proposals if p.get("start", 0) >= cutoff]
-    proposals_per_month = len(recent) / months if months > 0 else 0
-
-    if proposals_per_month >= 4:
-        score = 100
-    elif proposals_per_month >= 2:
-        score = 60 + (proposals_per_month - 2) * 20
-    elif proposals_per_month >= 1:
-        score = 30 + (proposals_per_month - 1) * 30
-    else:
-        score = proposals_per_month * 30
+    cutoff = int(time.time()) - (months * 30 * 86400)
+    recent = metrics.segment_sum((cols["start"] >= cutoff).astype(np.float64), cols["seg"], cols["k"])
+    per_month = recent / months if months > 0 else recent * 0
+    score = np.select(
+        [per_month >= 4, per_month >= 2, per_month >= 1],
+        [np.full_like(per_month, 100), 60 + (per_month - 2) * 20, 30 + (per_month - 1) * 30],
+        per_month * 30,
+    )
 
-    return {
-        "score": round(min(100, max(0, score))),
-        "proposals_per_month": round(proposals_per_month, 1),
-        "total_proposals": len(proposals),
-        "recent_proposals": len(recent),
-        "period_months": months,
-    }
+    results = []
+    for i in range(cols["k"]):
+        if not cols["count"][i]:
+            results.append({"score": 0, "proposals_per_month": 0.0, "total_proposals": 0})
+            continue
+        results.append({
+            "score": round(min(100.0, max(0.0, float(score[i])))),
+            "proposals_per_month": round(float(per_month[i]), 1),
+            "total_proposals": int(cols["count"][i]),
+            "recent_proposals": int(recent[i]),
+            "period_months": months,
+        })
+    return results
 
 
-def _calculate_participation_score(
-    proposals: List[Dict], member_count: int
-) -> Dict[str, Any]:
-    """Calculate participation score based on average voter turnout.
+def _calculate_participation_scores(cols: Dict[str, Any], member_counts: List[int]) -> List[Dict[str, Any]]:
+    """Calculate participation score per space based on average voter turnout.
 
     Scoring:
       - Uses voter count relative to member count
       - Also considers absolute voter numbers
     """
-    if not proposals or member_count <= 0:
-        return {"score": 0, "avg_voters": 0, "members": member_count}
-
-    closed = [p for p in proposals if p.get("state") == "closed"]
-    if not closed:
-        return {"score": 0, "avg_voters": 0, "members": member_count}
-
-    voter_counts = [p.get("votes", 0) for p in closed]
-    avg_voters = sum(voter_counts) / len(voter_counts)
-    max_voters = max(voter_counts) if voter_counts else 0
+    seg, k, closed = cols["seg"], cols["k"], cols["closed"]
+    members = np.array(member_counts, dtype=np.float64)
+    closed_n = metrics.segment_sum(closed.astype(np.float64), seg, k)
+    avg_voters = metrics.segment_sum(cols["votes"] * closed, seg, k) / np.maximum(closed_n, 1)
+    max_voters = metrics.segment_max(np.where(closed, cols["votes"], 0), seg, k)
 
     # Participation rate (capped at 1.0 for very active DAOs)
-    participation_rate = min(avg_voters / member_count, 1.0)
-
-    # Score: blend of relative and absolute participation
-    # High relative participation is great even for small DAOs
-    relative_score = participation_rate * 100
-
-    # Bonus for absolute numbers (more than 100 voters is healthy)
-    absolute_bonus = min(avg_voters / 500, 1.0) * 20
-
-    score = min(100, relative_score * 0.8 + absolute_bonus)
-
-    return {
-        "score": round(max(0, score)),
-        "avg_voters": round(avg_voters, 1),
-        "max_voters": max_voters,
-        "members": member_count,
-        "participation_rate": round(participation_rate, 4),
-    }
+    participation_rate = np.minimum(avg_voters / np.maximum(members, 1), 1.0)
+    # Blend of relative participation and a bonus for absolute numbers (500+ voters)
+    score = np.minimum(100, participation_rate * 100 * 0.8 + np.minimum(avg_voters / 500, 1.0) * 20)
+
+    results = []
+    for i in range(k):
+        if not cols["count"][i] or member_counts[i] <= 0 or not closed_n[i]:
+            results.append({"score": 0, "avg_voters": 0, "members": member_counts[i]})
+            continue
+        results.append({
+            "score": round(max(0.0, float(score[i]))),
+            "avg_voters": round(float(avg_voters[i]), 1),
+            "max_voters": int(max_voters[i]),
+            "members": member_counts[i],
+            "participation_rate": round(float(participation_rate[i]), 4),
+        })
+    return results
 
 
-def _calculate_decentralization_score(proposals: List[Dict]) -> Dict[str, Any]:
-    """Calculate decentralization score based on voting power concentration.
+def _calculate_decentralization_scores(samples: List[List[Dict]]) -> List[Dict[str, Any]]:
+    """Calculate decentralization score per space based on voting power concentration.
 
-    Samples the most recent closed proposal to check top-10 voter concentration.
+    Samples up to 3 recent closed proposals per space and measures top-10
+    voter concentration against each proposal's full vote set. All sampled
+    proposals of all spaces are scored in one vectorized pass.
 
     Scoring:
       - Top 10 < 30%: 100 (highly decentralized)
@@ -273,134 +194,107 @@ def _calculate_decentralization_score(proposals: List[Dict]) -> Dict[str, Any]:
       - Top 10 50-70%: 30-60
       - Top 10 > 70%: 0-30
     """
-    closed = [p for p in proposals if p.get("state") == "closed" and p.get("votes", 0) > 10]
-
-    if not closed:
-        return {"score": 50, "top_10_concentration": None, "sampled_proposals": 0}
-
-    # Sample up to 3 recent closed proposals
-    sample = closed[:3]
-    concentrations: List[float] = []
-
-    for proposal in sample:
-        proposal_id = proposal.get("id", "")
-        top_voters = _fetch_top_voters(proposal_id, count=50)
-
-        if not top_voters:
-            continue
-
-        total_vp = sum(v.get("vp", 0) for v in top_voters)
-        if total_vp == 0:
-            continue
-
-        top_10_vp = sum(v.get("vp", 0) for v in top_voters[:10])
-        concentration = (top_10_vp / total_vp) * 100
-        concentrations.append(concentration)
-
-        time.sleep(0.3)
-
-    if not concentrations:
-        return {"score": 50, "top_10_concentration": None, "sampled_proposals": 0}
-
-    avg_concentration = sum(concentrations) / len(concentrations)
+    store = get_store()
+    ids = [p.get("id", "") for sample in samples for p in sample]
+    store.sync_many(store.sync_votes, ids)
+    batch = metrics.batch_concentration([store.proposal_vote_power(pid) for pid in ids])
+
+    # Proposals without votes or voting power are skipped
+    seg = metrics.segment_ids([len(sample) for sample in samples])
+    valid = ~np.isnan(batch["top_share_pct"])
+    k = len(samples)
+    sampled = metrics.segment_sum(valid.astype(np.float64), seg, k)
+    divisor = np.maximum(sampled, 1)
+    avg_concentration = metrics.segment_sum(np.where(valid, batch["top_share_pct"], 0), seg, k) / divisor
+    avg_nakamoto = metrics.segment_sum(np.where(valid, batch["nakamoto"], 0), seg, k) / divisor
+    avg_hhi = metrics.segment_sum(np.where(valid, batch["hhi"], 0), seg, k) / divisor
 
     # Score: inverse of concentration
-    if avg_concentration < 30:
-        score = 100
-    elif avg_concentration < 50:
-        score = 100 - (avg_concentration - 30) * 2
-    elif avg_concentration < 70:
-        score = 60 - (avg_concentration - 50) * 1.5
-    else:
-        score = max(0, 30 - (avg_concentration - 70))
+    c = avg_concentration
+    score = np.select(
+        [c < 30, c < 50, c < 70],
+        [np.full_like(c, 100), 100 - (c - 30) * 2, 60 - (c - 50) * 1.5],
+        np.maximum(0, 30 - (c - 70)),
+    )
 
-    return {
-        "score": round(max(0, min(100, score))),
-        "top_10_concentration": round(avg_concentration, 1),
-        "sampled_proposals": len(concentrations),
-    }
+    results = []
+    for i in range(k):
+        if not sampled[i]:
+            results.append({"score": 50, "top_10_concentration": None, "sampled_proposals": 0})
+            continue
+        results.append({
+            "score": round(max(0.0, min(100.0, float(score[i])))),
+            "top_10_concentration": round(float(avg_concentration[i]), 1),
+            "nakamoto_coefficient": round(float(avg_nakamoto[i]), 1),
+            "hhi": round(float(avg_hhi[i]), 1),
+            "sampled_proposals": int(sampled[i]),
+        })
+    return results
 
 
-def _calculate_quorum_score(proposals: List[Dict]) -> Dict[str, Any]:
-    """Calculate quorum achievement rate.
+def _calculate_quorum_scores(cols: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Calculate quorum achievement rate per space.
 
     Scoring: percentage of proposals that reached quorum.
     """
-    closed = [p for p in proposals if p.get("state") == "closed"]
-
-    if not closed:
-        return {"score": 0, "quorum_rate": 0.0, "proposals_with_quorum": 0, "total_closed": 0}
-
-    quorum_met = 0
-    quorum_applicable = 0
-
-    for p in closed:
-        quorum = p.get("quorum", 0)
-        scores_total = p.get("scores_total", 0)
-
-        if quorum > 0:
-            quorum_applicable += 1
-            if scores_total >= quorum:
-                quorum_met += 1
+    seg, k, closed = cols["seg"], cols["k"], cols["closed"]
+    applicable = closed & (cols["quorum"] > 0)
+    met = applicable & (cols["scores_total"] >= cols["quorum"])
+    closed_n = metrics.segment_sum(closed.astype(np.float64), seg, k)
+    applicable_n = metrics.segment_sum(applicable.astype(np.float64), seg, k)
+    met_n = metrics.segment_sum(met.astype(np.float64), seg, k)
 
-    if quorum_applicable == 0:
-        # No quorum set — assume healthy (neutral score)
-        return {
-            "score": 70,
-            "quorum_rate": None,
-            "note": "No quorum requirement set for this space",
-            "total_closed": len(closed),
-        }
-
-    quorum_rate = quorum_met / quorum_applicable
-    score = quorum_rate * 100
-
-    return {
-        "score": round(score),
-        "quorum_rate": round(quorum_rate, 2),
-        "proposals_with_quorum": quorum_met,
-        "quorum_applicable": quorum_applicable,
-        "total_closed": len(closed),
-    }
+    results: List[Dict[str, Any]] = []
+    for i in range(k):
+        if not closed_n[i]:
+            results.append({"score": 0, "quorum_rate": 0.0, "proposals_with_quorum": 0, "total_closed": 0})
+        elif not applicable_n[i]:
+            # No quorum set — assume healthy (neutral score)
+            results.append({
+                "score": 70,
+                "quorum_rate": None,
+                "note": "No quorum requirement set for this space",
+                "total_closed": int(closed_n[i]),
+            })
+        else:
+            quorum_rate = float(met_n[i] / applicable_n[i])
+            results.append({
+                "score": round(quorum_rate * 100),
+                "quorum_rate": round(quorum_rate, 2),
+                "proposals_with_quorum": int(met_n[i]),
+                "quorum_applicable": int(applicable_n[i]),
+                "total_closed": int(closed_n[i]),
+            })
+    return results
 
 
-def _calculate_proposal_success_score(proposals: List[Dict]) -> Dict[str, Any]:
-    """Calculate proposal success rate.
+def _calculate_proposal_success_scores(cols: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Calculate proposal success rate per space.
 
     Success = proposals where a clear winning choice emerged and quorum was met.
     Scoring: success rate * 100.
     """
-    closed = [p for p in proposals if p.get("state") == "closed"]
-
-    if not closed:
-        return {"score": 0, "success_rate": 0.0, "successful": 0, "total_closed": 0}
-
-    successful = 0
-    for p in closed:
-        scores = p.get("scores") or []
-        scores_total = p.get("scores_total", 0)
-        quorum = p.get("quorum", 0)
-
-        if not scores or scores_total == 0:
+    seg, k, closed = cols["seg"], cols["k"], cols["closed"]
+    total, quorum = cols["scores_total"], cols["quorum"]
+    # Quorum met (or no quorum) and at least 40% for one choice
+    quorum_ok = np.where(quorum > 0, total >= quorum, True)
+    successful = closed & cols["has_scores"] & (total != 0) & quorum_ok & (cols["max_score"] > total * 0.4)
+    closed_n = metrics.segment_sum(closed.astype(np.float64), seg, k)
+    success_n = metrics.segment_sum(successful.astype(np.float64), seg, k)
+
+    results = []
+    for i in range(k):
+        if not closed_n[i]:
+            results.append({"score": 0, "success_rate": 0.0, "successful": 0, "total_closed": 0})
             continue
-
-        # A proposal is "successful" if quorum was met (or no quorum) and a choice won clearly
-        quorum_ok = scores_total >= quorum if quorum > 0 else True
-        max_score = max(scores)
-        clear_winner = max_score > scores_total * 0.4  # At least 40% for one choice
-
-        if quorum_ok and clear_winner:
-            successful += 1
-
-    success_rate = successful / len(closed) if closed else 0
-    score = success_rate * 100
-
-    return {
-        "score": round(min(100, score)),
-        "success_rate": round(success_rate, 2),
-        "successful": successful,
-        "total_closed": len(closed),
-    }
+        success_rate = float(success_n[i] / closed_n[i])
+        results.append({
+            "score": round(min(100.0, success_rate * 100)),
+            "success_rate": round(success_rate, 2),
+            "successful": int(success_n[i]),
+            "total_closed": int(closed_n[i]),
+        })
+    return results
 
 
 def _get_rating(score: int) -> str:
@@ -417,61 +311,79 @@ def _get_rating(score: int) -> str:
         return "CRITICAL"
 
 
-def analyze_dao_health(space_id: str) -> Dict[str, Any]:
-    """Calculate comprehensive DAO health metrics for a single space."""
-    # Fetch space info
-    space, error = _fetch_space_info(space_id)
-    if error:
-        return error
-
-    member_count = len(space.get("members") or [])
-    proposals = _fetch_recent_proposals(space_id, count=50)
-
-    # Calculate component scores
-    activity = _calculate_activity_score(proposals)
-    participation = _calculate_participation_score(proposals, member_count)
-    decentralization = _calculate_decentralization_score(proposals)
-    quorum = _calculate_quorum_score(proposals)
-    success = _calculate_proposal_success_score(proposals)
-
-    # Weighted overall score
-    health_score = round(
-        activity["score"] * WEIGHTS["activity"]
-        + participation["score"] * WEIGHTS["participation"]
-        + decentralization["score"] * WEIGHTS["decentralization"]
-        + quorum["score"] * WEIGHTS["quorum_achievement"]
-        + success["score"] * WEIGHTS["proposal_success"]
+def _analyze_spaces(space_ids: List[str]) -> List[Dict[str, Any]]:
+    """Health results (or error dicts) for many spaces, scored in one vectorized pass."""
+    spaces: List[Dict[str, Any]] = []
+    outputs: List[Optional[Dict[str, Any]]] = []
+    for space_id in space_ids:
+        space, error = _fetch_space_info(space_id)
+        outputs.append(error)
+        if space is not None:
+            spaces.append(dict(space, id=space_id))
+
+    proposals_by_space = [_fetch_recent_proposals(s["id"], count=50) for s in spaces]
+    member_counts = [len(s.get("members") or []) for s in spaces]
+
+    # Calculate component scores for every space at once
+    cols = _proposal_columns(proposals_by_space)
+    activity = _calculate_activity_scores(cols)
+    participation = _calculate_participation_scores(cols, member_counts)
+    decentralization = _calculate_decentralization_scores(
+        [_decentralization_sample(p) for p in proposals_by_space]
     )
+    quorum = _calculate_quorum_scores(cols)
+    success = _calculate_proposal_success_scores(cols)
 
-    rating = _get_rating(health_score)
+    scored = iter(range(len(spaces)))
+    for slot, output in enumerate(outputs):
+        if output is not None:
+            continue
+        i = next(scored)
+        space = spaces[i]
+
+        # Weighted overall score
+        health_score = round(
+            activity[i]["score"] * WEIGHTS["activity"]
+            + participation[i]["score"] * WEIGHTS["participation"]
+            + decentralization[i]["score"] * WEIGHTS["decentralization"]
+            + quorum[i]["score"] * WEIGHTS["quorum_achievement"]
+            + success[i]["score"] * WEIGHTS["proposal_success"]
+        )
 
-    voting_config = space.get("voting") or {}
-    strategies = space.get("strategies") or []
+        voting_config = space.get("voting") or {}
+        strategies = space.get("strategies") or []
+
+        outputs[slot] = {
+            "status": "success",
+            "space": space["id"],
+            "space_name": space.get("name", ""),
+            "health_score": health_score,
+            "rating": _get_rating(health_score),
+            "breakdown": {
+                "activity": activity[i],
+                "participation": participation[i],
+                "decentralization": decentralization[i],
+                "quorum_achievement": quorum[i],
+                "proposal_success": success[i],
+            },
+            "metadata": {
+                "members": member_counts[i],
+                "followers": space.get("followers_count", 0),
+                "total_proposals": space.get("proposals_count", 0),
+                "strategies_count": len(strategies),
+                "strategies": [s.get("name", "") for s in strategies[:5]],
+                "voting_delay": voting_config.get("delay", 0),
+                "voting_period": voting_config.get("period", 0),
+                "quorum_setting": voting_config.get("quorum", 0),
+            },
+        }
 
-    return {
-        "status": "success",
-        "space": space_id,
-        "space_name": space.get("name", ""),
-        "health_score": health_score,
-        "rating": rating,
-        "breakdown": {
-            "activity": activity,
-            "participation": participation,
-            "decentralization": decentralization,
-            "quorum_achievement": quorum,
-            "proposal_success": success,
-        },
-        "metadata": {
-            "members": member_count,
-            "followers": space.get("followers_count", 0),
-            "total_proposals": space.get("proposals_count", 0),
-            "strategies_count": len(strategies),
-            "strategies": [s.get("name", "") for s in strategies[:5]],
-            "voting_delay": voting_config.get("delay", 0),
-            "voting_period": voting_config.get("period", 0),
-            "quorum_setting": voting_config.get("quorum", 0),
-        },
-    }
+    return [o for o in outputs if o is not None]
+
+
+def analyze_dao_health(space_id: str) -> Dict[str, Any]:
+    """Calculate comprehensive DAO health metrics for a single space."""
+    return _analyze_spaces([space_id])[0]
 
 
 def compare_daos(space_ids: List[str]) -> Dict[str, Any]:
@@ -479,15 +391,15 @@ def compare_daos(space_ids: List[str]) -> Dict[str, Any]:
     results: List[Dict[str, Any]] = []
     errors: List[str] = []
 
-    for space_id in space_ids:
-        result = analyze_dao_health(space_id)
+    # Sync all spaces concurrently, then score them together from the local store
+    get_store().sync_many(_prefetch_space, space_ids)
+
+    for space_id, result in zip(space_ids, _analyze_spaces(space_ids)):
         if result.get("status") == "success":
             results.append(result)
         else:
             errors.append(f"{space_id}: {result.get('error', 'unknown error')}")
 
-        time.sleep(0.5)
-
     if not results:
         return {
             "status": "error",
@@ -552,8 +464,8 @@ def validate_input(data: Dict[str, Any]) -> Optional[str]:
     if compare:
         if not isinstance(compare, list) or len(compare) < 2:
             return "Invalid 'compare': must be a list of at least 2 space IDs."
-        if len(compare) > 10:
-            return "Too many spaces to compare. Maximum is 10."
+        if len(compare) > MAX_COMPARE:
+            return f"Too many spaces to compare. Maximum is {MAX_COMPARE}."
 
     return None
 
@@ -2,7 +2,9 @@
 """
 Delegate Profiler — Profile a delegate or voter's governance participation.
 
-Uses the Snapshot GraphQL API (free, public, no API key required).
+Uses the Snapshot GraphQL API (free, public, no API key required). Voter
+history is synced incrementally into the local governance store; cross-DAO
+scans sync every space concurrently under one rate limiter.
 
 Input (JSON via stdin):
     {
@@ -27,13 +29,10 @@ Output (JSON via stdout):
 import json
 import re
 import sys
-import time
-import urllib.error
-import urllib.request
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-SNAPSHOT_API = "https://hub.snapshot.org/graphql"
+from governance_store import SnapshotAPIError, get_store
 
 TOP_DAOS: List[str] = [
     "aave.eth",
@@ -50,105 +49,6 @@ TOP_DAOS: List[str] = [
     "compound-governance.eth",
 ]
 
-VOTER_HISTORY_QUERY = """
-query VoterHistory($voter: String!, $space: String, $first: Int, $skip: Int) {
-  votes(
-    where: { voter: $voter, space: $space }
-    first: $first
-    skip: $skip
-    orderBy: "created"
-    orderDirection: desc
-  ) {
-    proposal {
-      id
-      title
-      choices
-      state
-      scores
-      scores_total
-      space { id name }
-    }
-    choice
-    vp
-    created
-  }
-}
-"""
-
-VOTER_HISTORY_NO_SPACE_QUERY = """
-query VoterHistory($voter: String!, $first: Int, $skip: Int) {
-  votes(
-    where: { voter: $voter }
-    first: $first
-    skip: $skip
-    orderBy: "created"
-    orderDirection: desc
-  ) {
-    proposal {
-      id
-      title
-      choices
-      state
-      scores
-      scores_total
-      space { id name }
-    }
-    choice
-    vp
-    created
-  }
-}
-"""
-
-SPACE_PROPOSALS_COUNT_QUERY = """
-query SpaceInfo($id: String!) {
-  space(id: $id) {
-    id
-    name
-    proposals_count
-  }
-}
-"""
-
-
-def _graphql_query(query: str, variables: Optional[Dict] = None, retries: int = 3) -> Dict[str, Any]:
-    """Execute a GraphQL query against Snapshot Hub with retry logic."""
-    payload = json.dumps({"query": query, "variables": variables or {}}).encode()
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "SpoonOS-GovernanceIntel/1.0",
-    }
-
-    last_error: Optional[Exception] = None
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(
-                SNAPSHOT_API,
-                data=payload,
-                headers=headers,
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode())
-                if "errors" in data:
-                    return {"error": data["errors"][0].get("message", "GraphQL error")}
-                return data
-        except urllib.error.HTTPError as exc:
-            last_error = exc
-            if exc.code == 429:
-                time.sleep(2 ** attempt)
-                continue
-            break
-        except (urllib.error.URLError, OSError) as exc:
-            last_error = exc
-            if attempt < retries - 1:
-                time.sleep(1.5 ** attempt)
-                continue
-            break
-
-    return {"error": f"API request failed after {retries} attempts: {last_error}"}
-
-
 def _shorten_address(addr: str) -> str:
     """Shorten an Ethereum address for display."""
     if not addr or len(addr) < 10:
@@ -211,53 +111,18 @@ def _determine_winning_choice(proposal: Dict[str, Any]) -> Optional[str]:
 def _fetch_voter_votes(
     voter: str, space_id: Optional[str] = None, limit: int = 100
 ) -> List[Dict[str, Any]]:
-    """Fetch votes for a voter, with optional space filter and pagination."""
-    all_votes: List[Dict[str, Any]] = []
-    skip = 0
-    page_size = min(limit, 1000)
-
-    while len(all_votes) < limit:
-        if space_id:
-            query = VOTER_HISTORY_QUERY
-            variables: Dict[str, Any] = {
-                "voter": voter,
-                "space": space_id,
-                "first": min(page_size, limit - len(all_votes)),
-                "skip": skip,
-            }
-        else:
-            query = VOTER_HISTORY_NO_SPACE_QUERY
-            variables = {
-                "voter": voter,
-                "first": min(page_size, limit - len(all_votes)),
-                "skip": skip,
-            }
-
-        resp = _graphql_query(query, variables)
-        if "error" in resp:
-            break
-
-        votes = (resp.get("data") or {}).get("votes") or []
-        if not votes:
-            break
-
-        all_votes.extend(votes)
-        skip += len(votes)
-
-        if len(votes) < page_size:
-            break
-
-        time.sleep(0.3)
-
-    return all_votes
+    """Sync a voter's new votes into the local store, then return the latest `limit`."""
+    store = get_store()
+    store.sync_voter(voter, space_id)
+    return store.voter_votes(voter, space_id, limit=limit)
 
 
 def _get_space_proposal_count(space_id: str) -> int:
     """Get the total proposal count for a space."""
-    resp = _graphql_query(SPACE_PROPOSALS_COUNT_QUERY, {"id": space_id})
-    if "error" in resp:
+    try:
+        space = get_store().sync_space(space_id)
+    except SnapshotAPIError:
         return 0
-    space = (resp.get("data") or {}).get("space")
     if not space:
         return 0
     return space.get("proposals_count", 0)
@@ -294,7 +159,10 @@ def profile_voter(
         return _profile_cross_dao(voter, limit)
 
     # Single space or all spaces
-    votes = _fetch_voter_votes(voter, space_id=space_id, limit=limit)
+    try:
+        votes = _fetch_voter_votes(voter, space_id=space_id, limit=limit)
+    except SnapshotAPIError as exc:
+        return {"status": "error", "error": str(exc)}
 
     if not votes:
         return {
@@ -422,8 +290,12 @@ def _profile_cross_dao(voter: str, limit: int) -> Dict[str, Any]:
     total_vp = 0.0
     active_spaces: List[str] = []
 
+    # One concurrent sync per space, sharing the store's rate limiter
+    store = get_store()
+    sync_errors = store.sync_many(lambda space: store.sync_voter(voter, space), TOP_DAOS)
+
     for space_id in TOP_DAOS:
-        votes = _fetch_voter_votes(voter, space_id=space_id, limit=min(limit, 50))
+        votes = store.voter_votes(voter, space_id, limit=limit)
         if votes:
             vote_count = len(votes)
             vp_sum = sum(v.get("vp", 0) for v in votes)
@@ -439,8 +311,6 @@ def _profile_cross_dao(voter: str, limit: int) -> Dict[str, Any]:
                 "latest_vote": _ts_to_date(votes[0].get("created", 0)),
             })
 
-        time.sleep(0.3)
-
     if not all_space_profiles:
         return {
             "status": "success",
@@ -458,7 +328,7 @@ def _profile_cross_dao(voter: str, limit: int) -> Dict[str, Any]:
     # Sort by vote count
     all_space_profiles.sort(key=lambda x: -x["votes"])
 
-    return {
+    result: Dict[str, Any] = {
         "status": "success",
         "voter": _shorten_address(voter),
         "voter_full": voter,
@@ -473,6 +343,11 @@ def _profile_cross_dao(voter: str, limit: int) -> Dict[str, Any]:
         "most_active_space": all_space_profiles[0]["space"] if all_space_profiles else None,
     }
 
+    if sync_errors:
+        result["warnings"] = [f"{space}: {err}" for space, err in sync_errors.items()]
+
+    return result
+
 
 def validate_input(data: Dict[str, Any]) -> Optional[str]:
     """Validate input parameters. Returns error message or None."""
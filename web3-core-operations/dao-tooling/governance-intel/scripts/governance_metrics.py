@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Governance Metrics — Vectorized voting power analytics over columnar vote arrays.
+
+A proposal's votes are held as parallel NumPy arrays (voting power, choice,
+timestamp, voter id) sorted by voting power, so distribution, whale, Gini,
+HHI, Nakamoto and timing metrics are single array passes instead of loops
+over vote dicts. Many proposals (e.g. dozens of DAOs in a comparison) are
+scored together by concatenating their voting power into one segmented array.
+
+Used by voting_analyzer and dao_health.
+"""
+
+import json
+import sys
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    print(json.dumps({
+        "status": "error",
+        "error": "numpy required for governance analytics. Install with: pip install numpy",
+    }))
+    sys.exit(1)
+
+# Share of total voting power a coalition must exceed to control an outcome
+NAKAMOTO_THRESHOLD = 0.5
+DEFAULT_CURVE_BUCKETS = 10
+
+
+def _parse_choice(raw: Any) -> Any:
+    if isinstance(raw, str):
+        if raw.isdigit():
+            return int(raw)
+        return json.loads(raw)
+    return raw
+
+
+class VoteColumns:
+    """A proposal's votes as parallel arrays, highest voting power first.
+
+    Attributes:
+        voters: Distinct voter addresses; `voter_id` indexes into it.
+        vp: Voting power per vote (float64, descending).
+        choice: 1-based single choice, 0 for weighted/ranked/other ballots.
+        created: Vote timestamp (int64).
+        w_row, w_choice, w_weight: One entry per (vote, choice) pair of
+            weighted ballots (raw Snapshot weights, as cast).
+        ballots: Raw non-single-choice ballots keyed by row.
+    """
+
+    def __init__(
+        self,
+        voters: Sequence[str],
+        choices: Sequence[Any],
+        vp: Sequence[float],
+        created: Sequence[int],
+    ):
+        vp_arr = np.asarray(vp, dtype=np.float64)
+        order = np.argsort(-vp_arr, kind="stable")
+        self.vp = vp_arr[order]
+        self.created = np.asarray(created, dtype=np.int64)[order]
+
+        self._voter_by_row = np.asarray(list(voters), dtype=object)[order]
+        uniques, self.voter_id = np.unique(self._voter_by_row.astype(str), return_inverse=True)
+        self.voters: List[str] = uniques.tolist()
+
+        single = np.zeros(len(vp_arr), dtype=np.int32)
+        other: List[int] = []
+        for source, ballot in enumerate(choices):
+            if type(ballot) is int:
+                single[source] = ballot
+            else:
+                other.append(source)
+        self.choice = single[order]
+
+        # Row of each source vote after sorting
+        row_of = np.empty(len(order), dtype=np.int64)
+        row_of[order] = np.arange(len(order))
+        self.ballots: Dict[int, Any] = {}
+        w_row: List[int] = []
+        w_choice: List[int] = []
+        w_weight: List[float] = []
+        for source in other:
+            row = int(row_of[source])
+            ballot = choices[source]
+            self.ballots[row] = ballot
+            if isinstance(ballot, dict):
+                for idx, weight in ballot.items():
+                    w_row.append(row)
+                    w_choice.append(int(idx))
+                    w_weight.append(float(weight))
+        self.w_row = np.asarray(w_row, dtype=np.int64)
+        self.w_choice = np.asarray(w_choice, dtype=np.int64)
+        self.w_weight = np.asarray(w_weight, dtype=np.float64)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[str, Any, float, int]]) -> "VoteColumns":
+        """Build from (voter, choice, vp, created) rows; choice may be JSON text."""
+        if not rows:
+            return cls([], [], [], [])
+        voters, choices, vp, created = zip(*rows)
+        return cls(voters, [_parse_choice(c) for c in choices], vp, created)
+
+    @classmethod
+    def from_votes(cls, votes: Sequence[Dict[str, Any]]) -> "VoteColumns":
+        """Build from Snapshot vote dicts."""
+        return cls(
+            [v.get("voter", "") for v in votes],
+            [v.get("choice") for v in votes],
+            [v.get("vp", 0) or 0 for v in votes],
+            [v.get("created", 0) or 0 for v in votes],
+        )
+
+    def __len__(self) -> int:
+        return len(self.vp)
+
+    @property
+    def total_vp(self) -> float:
+        return float(self.vp.sum())
+
+    def voter(self, row: int) -> str:
+        return str(self._voter_by_row[row])
+
+    def choice_vp(self, n_choices: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(vote count, voting power) per choice, index 0 = choice 1.
+
+        Weighted ballots count once for every choice they weight and add
+        vp * weight to each.
+        """
+        # Column 0 collects weighted/other ballots and is dropped
+        size = n_choices + 1
+        valid = (self.choice >= 0) & (self.choice <= n_choices)
+        counts = np.bincount(self.choice[valid], minlength=size)[:size].astype(np.int64)
+        power = np.bincount(self.choice[valid], weights=self.vp[valid], minlength=size)[:size]
+        if len(self.w_row):
+            ok = (self.w_choice >= 1) & (self.w_choice <= n_choices)
+            counts += np.bincount(self.w_choice[ok], minlength=size)[:size]
+            power += np.bincount(
+                self.w_choice[ok], weights=self.vp[self.w_row[ok]] * self.w_weight[ok], minlength=size
+            )[:size]
+        return counts[1:], power[1:]
+
+
+# --------------------------------------------------------------------------- #
+# Concentration
+# --------------------------------------------------------------------------- #
+
+
+def gini(vp: np.ndarray) -> float:
+    """Gini coefficient of a voting power array (any order)."""
+    n = len(vp)
+    if n < 2:
+        return 0.0
+    total = float(vp.sum())
+    if total == 0:
+        return 0.0
+    ascending = np.sort(vp)
+    ranks = np.arange(1, n + 1, dtype=np.float64)
+    value = float(np.dot(2 * ranks - n - 1, ascending)) / (n * total)
+    return round(max(0.0, min(1.0, value)), 4)
+
+
+def top_share_pct(vp_desc: np.ndarray, n: int) -> float:
+    """Percent of total voting power held by the n largest votes."""
+    total = float(vp_desc.sum())
+    if total <= 0:
+        return 0.0
+    return round(float(vp_desc[:n].sum()) / total * 100, 1)
+
+
+def hhi(vp: np.ndarray) -> float:
+    """Herfindahl-Hirschman index of voting power shares (0-10,000)."""
+    total = float(vp.sum())
+    if total <= 0:
+        return 0.0
+    shares = vp / total
+    return round(float(np.dot(shares, shares)) * 10000, 1)
+
+
+def nakamoto_coefficient(vp_desc: np.ndarray, threshold: float = NAKAMOTO_THRESHOLD) -> int:
+    """Fewest voters whose combined voting power exceeds threshold of the total."""
+    total = float(vp_desc.sum())
+    if total <= 0:
+        return 0
+    cumulative = np.cumsum(vp_desc)
+    return int(min(len(vp_desc), np.searchsorted(cumulative, threshold * total, side="right") + 1))
+
+
+def concentration(columns: VoteColumns) -> Dict[str, Any]:
+    """Gini, top-N shares, HHI and Nakamoto coefficient for one proposal."""
+    vp = columns.vp
+    if not len(vp):
+        return {
+            "gini_coefficient": 0.0,
+            "top_10_pct": 0.0,
+            "top_25_pct": 0.0,
+            "hhi": 0.0,
+            "effective_voters": 0.0,
+            "nakamoto_coefficient": 0,
+            "total_voters": 0,
+        }
+    index = hhi(vp)
+    return {
+        "gini_coefficient": gini(vp),
+        "top_10_pct": top_share_pct(vp, 10),
+        "top_25_pct": top_share_pct(vp, 25),
+        "hhi": index,
+        "effective_voters": round(10000 / index, 1) if index > 0 else 0.0,
+        "nakamoto_coefficient": nakamoto_coefficient(vp),
+        "total_voters": len(vp),
+    }
+
+
+def batch_concentration(vp_segments: Sequence[Sequence[float]], top_n: int = 10) -> Dict[str, np.ndarray]:
+    """Concentration metrics for many proposals in one vectorized pass.
+
+    Args:
+        vp_segments: One voting power sequence per proposal (any order).
+        top_n: Largest votes counted for the top share.
+
+    Returns:
+        Arrays aligned with vp_segments: voters, total_vp, top_share_pct
+        (NaN when total is 0), gini, hhi and nakamoto.
+    """
+    k = len(vp_segments)
+    sizes = np.fromiter((len(s) for s in vp_segments), dtype=np.int64, count=k)
+    if k == 0 or sizes.sum() == 0:
+        zeros = np.zeros(k)
+        return {"voters": sizes, "total_vp": zeros, "top_share_pct": np.full(k, np.nan),
+                "gini": zeros, "hhi": zeros, "nakamoto": sizes * 0}
+
+    # Segments sorted by voting power descending (cheaper than one global lexsort)
+    vp = np.concatenate([-np.sort(-np.asarray(s, dtype=np.float64)) for s in vp_segments])
+    seg = segment_ids(sizes)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(len(vp)) - starts[seg]
+
+    total = np.bincount(seg, weights=vp, minlength=k)
+    safe_total = np.where(total > 0, total, 1.0)
+    top = np.bincount(seg[rank < top_n], weights=vp[rank < top_n], minlength=k)
+    shares = vp / safe_total[seg]
+    hhi_arr = np.bincount(seg, weights=shares * shares, minlength=k) * 10000
+
+    # Ascending position i = n - rank, so sum((2i - n - 1) x) = sum((n - 2 rank - 1) x)
+    n_row = sizes[seg]
+    gini_num = np.bincount(seg, weights=(n_row - 2 * rank - 1) * vp, minlength=k)
+    gini_arr = np.clip(gini_num / (np.maximum(sizes, 1) * safe_total), 0.0, 1.0)
+    gini_arr[(sizes < 2) | (total <= 0)] = 0.0
+
+    # Running total within each segment; votes not yet past the threshold precede the Nakamoto voter
+    running = np.cumsum(vp) - np.concatenate(([0.0], np.cumsum(total)[:-1]))[seg]
+    below = running <= NAKAMOTO_THRESHOLD * total[seg]
+    nakamoto = np.minimum(np.bincount(seg, weights=below, minlength=k).astype(np.int64) + 1, sizes)
+    nakamoto[total <= 0] = 0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        top_pct = np.where(total > 0, top / safe_total * 100, np.nan)
+    return {
+        "voters": sizes,
+        "total_vp": total,
+        "top_share_pct": top_pct,
+        "gini": gini_arr,
+        "hhi": np.where(total > 0, hhi_arr, 0.0),
+        "nakamoto": nakamoto,
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Timing
+# --------------------------------------------------------------------------- #
+
+
+def timing(columns: VoteColumns, start: int, end: int) -> Dict[str, Any]:
+    """Early vs late (split at the voting period midpoint) voter and VP shares."""
+    if not len(columns) or start >= end:
+        return {
+            "early_voters_pct": 0.0,
+            "late_voters_pct": 0.0,
+            "early_vp_pct": 0.0,
+            "late_vp_pct": 0.0,
+        }
+    midpoint = start + (end - start) // 2
+    early = columns.created <= midpoint
+    early_count = int(early.sum())
+    late_count = len(columns) - early_count
+    total_vp = columns.total_vp
+    early_vp = float(columns.vp[early].sum())
+    late_vp = total_vp - early_vp
+    total_count = len(columns)
+    return {
+        "early_voters_pct": round(early_count / total_count * 100, 1),
+        "late_voters_pct": round(late_count / total_count * 100, 1),
+        "early_vp_pct": round(early_vp / total_vp * 100, 1) if total_vp > 0 else 0.0,
+        "late_vp_pct": round(late_vp / total_vp * 100, 1) if total_vp > 0 else 0.0,
+        "early_voters": early_count,
+        "late_voters": late_count,
+    }
+
+
+def vp_curve(
+    columns: VoteColumns, start: int, end: int, buckets: int = DEFAULT_CURVE_BUCKETS
+) -> List[Dict[str, Any]]:
+    """Cumulative share of voters and voting power at the end of each time bucket.
+
+    The voting period is split into equal buckets; votes outside it are
+    clamped into the first/last bucket.
+    """
+    if not len(columns) or start >= end or buckets < 1:
+        return []
+    edges = np.linspace(start, end, buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, columns.created, side="right") - 1, 0, buckets - 1)
+    cum_votes = np.cumsum(np.bincount(bucket, minlength=buckets))
+    cum_vp = np.cumsum(np.bincount(bucket, weights=columns.vp, minlength=buckets))
+    total_vp = float(cum_vp[-1])
+    curve = []
+    for i in range(buckets):
+        curve.append({
+            "until": int(edges[i + 1]),
+            "elapsed_pct": round((i + 1) / buckets * 100, 1),
+            "cum_voters_pct": round(float(cum_votes[i]) / len(columns) * 100, 1),
+            "cum_vp_pct": round(float(cum_vp[i]) / total_vp * 100, 1) if total_vp > 0 else 0.0,
+        })
+    return curve
+
+
+def segment_ids(sizes: Sequence[int]) -> np.ndarray:
+    """Segment index per row for rows grouped into consecutive segments."""
+    return np.repeat(np.arange(len(sizes)), np.asarray(sizes, dtype=np.int64))
+
+
+def segment_sum(values: np.ndarray, seg: np.ndarray, k: int) -> np.ndarray:
+    """Per-segment sums of values."""
+    return np.bincount(seg, weights=values, minlength=k)[:k]
+
+
+def segment_max(values: np.ndarray, seg: np.ndarray, k: int, empty: float = 0.0) -> np.ndarray:
+    """Per-segment maxima of values (empty for segments with no rows)."""
+    out = np.full(k, -np.inf)
+    np.maximum.at(out, seg, values)
+    out[np.isinf(out)] = empty
+    return out
+
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+Governance Store — Local SQLite cache of Snapshot spaces, proposals and votes.
+
+Uses the Snapshot GraphQL API (free, public, no API key required).
+
+Votes and proposals are paged by `created` timestamp (cursor pagination), so a
+sync only fetches what was created since the previous one, and closed
+proposals whose votes were synced after they ended are never refetched.
+Per-space / per-proposal syncs run concurrently behind one shared rate
+limiter. voting_analyzer, delegate_profiler and dao_health read their data
+from this store.
+
+Environment:
+    GOVERNANCE_INTEL_DB       SQLite path (default ~/.cache/spoon-governance-intel/governance.db)
+    SNAPSHOT_RATE_LIMIT       Requests per second across all threads (default 3)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+SNAPSHOT_API = "https://hub.snapshot.org/graphql"
+
+PAGE_SIZE = 1000
+# Snapshot rejects skip offsets above this
+MAX_SKIP = 5000
+DEFAULT_MAX_AGE = 300
+DEFAULT_MAX_WORKERS = 6
+
+SPACE_QUERY = """
+query Space($id: String!) {
+  space(id: $id) {
+    id
+    name
+    about
+    members
+    proposals_count
+    followers_count
+    voting {
+      delay
+      period
+      quorum
+    }
+    strategies {
+      name
+    }
+  }
+}
+"""
+
+PROPOSAL_FIELDS = """
+    id
+    title
+    choices
+    start
+    end
+    state
+    scores
+    scores_total
+    votes
+    quorum
+    created
+    author
+    space { id name }
+"""
+
+PROPOSALS_SINCE_QUERY = """
+query Proposals($space: String!, $first: Int, $skip: Int, $created_gte: Int) {
+  proposals(
+    where: { space: $space, created_gte: $created_gte }
+    first: $first
+    skip: $skip
+    orderBy: "created"
+    orderDirection: asc
+  ) {%s  }
+}
+""" % PROPOSAL_FIELDS
+
+PROPOSALS_BY_ID_QUERY = """
+query ProposalsById($ids: [String], $first: Int) {
+  proposals(where: { id_in: $ids }, first: $first) {%s  }
+}
+""" % PROPOSAL_FIELDS
+
+VOTES_SINCE_QUERY = """
+query Votes($proposal: String!, $first: Int, $skip: Int, $created_gte: Int) {
+  votes(
+    where: { proposal: $proposal, created_gte: $created_gte }
+    first: $first
+    skip: $skip
+    orderBy: "created"
+    orderDirection: asc
+  ) {
+    id
+    voter
+    choice
+    vp
+    created
+  }
+}
+"""
+
+VOTER_VOTES_SINCE_QUERY = """
+query VoterVotes($voter: String!, $space: String, $first: Int, $skip: Int, $created_gte: Int) {
+  votes(
+    where: { voter: $voter, space: $space, created_gte: $created_gte }
+    first: $first
+    skip: $skip
+    orderBy: "created"
+    orderDirection: asc
+  ) {
+    id
+    voter
+    choice
+    vp
+    created
+    proposal {%s    }
+  }
+}
+""" % PROPOSAL_FIELDS
+
+VOTER_ALL_VOTES_SINCE_QUERY = VOTER_VOTES_SINCE_QUERY.replace(
+    "$space: String, ", ""
+).replace("space: $space, ", "")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spaces (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS proposals (
+    id TEXT PRIMARY KEY,
+    space TEXT,
+    title TEXT,
+    choices TEXT,
+    start INTEGER,
+    end INTEGER,
+    state TEXT,
+    scores TEXT,
+    scores_total REAL,
+    votes INTEGER,
+    quorum REAL,
+    created INTEGER,
+    author TEXT,
+    space_name TEXT,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS proposals_space_created ON proposals(space, created);
+CREATE TABLE IF NOT EXISTS votes (
+    id TEXT PRIMARY KEY,
+    proposal TEXT NOT NULL,
+    space TEXT,
+    voter TEXT NOT NULL,
+    choice TEXT,
+    vp REAL,
+    created INTEGER
+);
+CREATE INDEX IF NOT EXISTS votes_proposal_vp ON votes(proposal, vp DESC);
+-- votes_proposal_voter (UNIQUE) is created by GovernanceStore._ensure_vote_key
+CREATE INDEX IF NOT EXISTS votes_voter_created ON votes(voter, created);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    cursor INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class SnapshotAPIError(Exception):
+    """Snapshot Hub returned an error or could not be reached."""
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every request a store makes."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = max(0.1, rate)
+        self.capacity = burst if burst is not None else max(1.0, self.rate * 2)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _default_db_path() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-governance-intel", "governance.db")
+    return os.getenv("GOVERNANCE_INTEL_DB", default)
+
+
+class GovernanceStore:
+    """SQLite-backed Snapshot cache with incremental, concurrent sync.
+
+    Args:
+        path: SQLite database path (":memory:" for a throwaway store).
+        rate_limiter: Shared limiter; defaults to SNAPSHOT_RATE_LIMIT req/s.
+    """
+
+    def __init__(self, path: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None):
+        self.path = path or _default_db_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._ensure_vote_key()
+        self.lock = threading.RLock()
+        self.limiter = rate_limiter or RateLimiter(float(os.getenv("SNAPSHOT_RATE_LIMIT", "3")))
+        self.requests = 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _ensure_vote_key(self) -> None:
+        """Make votes unique per (proposal, voter) so a changed vote replaces the old one."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'votes_proposal_voter'"
+        ).fetchone()
+        if exists:
+            return
+        # Stores written before the key can hold several votes per voter: keep the newest
+        self.conn.execute(
+            "DELETE FROM votes WHERE EXISTS (SELECT 1 FROM votes newer "
+            "WHERE newer.proposal = votes.proposal AND newer.voter = votes.voter "
+            "AND (newer.created > votes.created "
+            "OR (newer.created = votes.created AND newer.rowid > votes.rowid)))"
+        )
+        self.conn.execute("CREATE UNIQUE INDEX votes_proposal_voter ON votes(proposal, voter)")
+        self.conn.commit()
+
+    # ------------------------------------------------------------------ #
+    # Network
+    # ------------------------------------------------------------------ #
+
+    def _query(self, query: str, variables: Optional[Dict] = None, retries: int = 4) -> Dict[str, Any]:
+        """Execute a GraphQL query through the shared rate limiter.
+
+        Raises:
+            SnapshotAPIError: On GraphQL errors or after retries are exhausted.
+        """
+        payload = json.dumps({"query": query, "variables": variables or {}}).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "SpoonOS-GovernanceIntel/1.0",
+        }
+        last_error: Optional[Exception] = None
+        for attempt in range(retries):
+            self.limiter.acquire()
+            with self.lock:
+                self.requests += 1
+            try:
+                req = urllib.request.Request(SNAPSHOT_API, data=payload, headers=headers, method="POST")
+                with urllib.request.urlopen(req, timeout=30) as resp:
+                    data = json.loads(resp.read().decode())
+                if "errors" in data:
+                    raise SnapshotAPIError(data["errors"][0].get("message", "GraphQL error"))
+                return data.get("data") or {}
+            except urllib.error.HTTPError as exc:
+                last_error = exc
+                if exc.code == 429 or exc.code >= 500:
+                    time.sleep(2 ** attempt)
+                    continue
+                break
+            except (urllib.error.URLError, OSError) as exc:
+                last_error = exc
+                if attempt < retries - 1:
+                    time.sleep(1.5 ** attempt)
+                    continue
+                break
+        raise SnapshotAPIError(f"API request failed after {retries} attempts: {last_error}")
+
+    def _paginate(
+        self, query: str, variables: Dict[str, Any], field: str, cursor: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages ordered by created asc, starting at created >= cursor.
+
+        The cursor advances to the last page's timestamp; skip only counts rows
+        sharing that timestamp, so it stays small however long the history is.
+        Rows at the cursor may be returned again; the upserts absorb them.
+        """
+        skip = 0
+        while True:
+            data = self._query(query, dict(variables, first=PAGE_SIZE, skip=skip, created_gte=cursor))
+            rows = data.get(field) or []
+            if rows:
+                yield rows
+            if len(rows) < PAGE_SIZE:
+                return
+            last = int(rows[-1].get("created", cursor))
+            at_last = sum(1 for r in rows if int(r.get("created", 0)) == last)
+            if last == cursor:
+                skip += len(rows)
+                if skip > MAX_SKIP:
+                    # More than MAX_SKIP rows in one second; step past it
+                    cursor, skip = cursor + 1, 0
+            else:
+                cursor, skip = last, at_last
+
+    # ------------------------------------------------------------------ #
+    # Sync state
+    # ------------------------------------------------------------------ #
+
+    def _state(self, key: str) -> Tuple[int, bool, float]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT cursor, complete, synced_at FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return 0, False, 0.0
+        return int(row["cursor"]), bool(row["complete"]), float(row["synced_at"])
+
+    def _set_state(self, key: str, cursor: int, complete: bool = False) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO sync_state(key, cursor, complete, synced_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET cursor = excluded.cursor, "
+                "complete = excluded.complete, synced_at = excluded.synced_at",
+                (key, cursor, int(complete), time.time()),
+            )
+            self.conn.commit()
+
+    def _fresh(self, key: str, max_age: float) -> bool:
+        _, complete, synced_at = self._state(key)
+        return complete or (time.time() - synced_at) < max_age
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+
+    def _upsert_proposals(self, proposals: Sequence[Dict[str, Any]]) -> None:
+        now = time.time()
+        rows = []
+        for p in proposals:
+            space = p.get("space") or {}
+            rows.append((
+                p["id"], space.get("id"), p.get("title"), json.dumps(p.get("choices") or []),
+                p.get("start"), p.get("end"), p.get("state"), json.dumps(p.get("scores") or []),
+                p.get("scores_total"), p.get("votes"), p.get("quorum"), p.get("created"),
+                p.get("author"), space.get("name"), now,
+            ))
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO proposals(id, space, title, choices, start, end, state, scores, scores_total, "
+                "votes, quorum, created, author, space_name, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET space = COALESCE(excluded.space, space), "
+                "title = COALESCE(excluded.title, title), choices = excluded.choices, "
+                "start = COALESCE(excluded.start, start), end = COALESCE(excluded.end, end), "
+                "state = COALESCE(excluded.state, state), scores = excluded.scores, "
+                "scores_total = COALESCE(excluded.scores_total, scores_total), "
+                "votes = COALESCE(excluded.votes, votes), quorum = COALESCE(excluded.quorum, quorum), "
+                "created = COALESCE(excluded.created, created), author = COALESCE(excluded.author, author), "
+                "space_name = COALESCE(excluded.space_name, space_name), synced_at = excluded.synced_at",
+                rows,
+            )
+            self.conn.commit()
+
+    def _insert_votes(self, votes: Sequence[Dict[str, Any]], proposal_id: Optional[str] = None,
+                      space: Optional[str] = None) -> int:
+        """Upsert votes by (proposal, voter); a re-cast vote replaces an older one.
+
+        Returns:
+            Number of votes inserted or replaced.
+        """
+        rows = []
+        for v in votes:
+            proposal = v.get("proposal") or {}
+            rows.append((
+                v["id"],
+                proposal_id or proposal.get("id"),
+                space or (proposal.get("space") or {}).get("id"),
+                (v.get("voter") or "").lower(),
+                json.dumps(v.get("choice")),
+                float(v.get("vp") or 0),
+                int(v.get("created") or 0),
+            ))
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT INTO votes(id, proposal, space, voter, choice, vp, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(proposal, voter) DO UPDATE SET id = excluded.id, "
+                "space = COALESCE(excluded.space, space), choice = excluded.choice, "
+                "vp = excluded.vp, created = excluded.created "
+                "WHERE excluded.created > votes.created "
+                "OR (excluded.created = votes.created AND excluded.id != votes.id)",
+                rows,
+            )
+            self.conn.commit()
+            return self.conn.total_changes - before
+
+    # ------------------------------------------------------------------ #
+    # Sync
+    # ------------------------------------------------------------------ #
+
+    def sync_space(self, space_id: str, max_age: float = DEFAULT_MAX_AGE) -> Optional[Dict[str, Any]]:
+        """Space metadata, refetched when older than max_age. None if not found."""
+        with self.lock:
+            row = self.conn.execute("SELECT data, synced_at FROM spaces WHERE id = ?", (space_id,)).fetchone()
+        if row and time.time() - row["synced_at"] < max_age:
+            return json.loads(row["data"])
+        space = self._query(SPACE_QUERY, {"id": space_id}).get("space")
+        if not space:
+            return None
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO spaces(id, data, synced_at) VALUES (?, ?, ?)",
+                (space_id, json.dumps(space), time.time()),
+            )
+            self.conn.commit()
+        return space
+
+    def sync_proposals(self, space_id: str, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """Fetch proposals created since the last sync and refresh unfinished ones.
+
+        Returns:
+            Number of proposals fetched.
+        """
+        key = f"proposals:{space_id}"
+        if self._fresh(key, max_age):
+            return 0
+        cursor, _, _ = self._state(key)
+        sync_started = time.time()
+        fetched = 0
+        for page in self._paginate(PROPOSALS_SINCE_QUERY, {"space": space_id}, "proposals", cursor):
+            self._upsert_proposals(page)
+            fetched += len(page)
+            cursor = max(cursor, int(page[-1].get("created") or cursor))
+            self._set_state(key, cursor)
+
+        # Scores and state keep changing until a proposal closes
+        with self.lock:
+            open_ids = [r["id"] for r in self.conn.execute(
+                "SELECT id FROM proposals WHERE space = ? AND state != 'closed' AND synced_at < ?",
+                (space_id, sync_started),
+            )]
+        for i in range(0, len(open_ids), PAGE_SIZE):
+            batch = open_ids[i:i + PAGE_SIZE]
+            data = self._query(PROPOSALS_BY_ID_QUERY, {"ids": batch, "first": len(batch)})
+            self._upsert_proposals(data.get("proposals") or [])
+        self._set_state(key, cursor)
+        return fetched
+
+    def sync_proposal(self, proposal_id: str, max_age: float = DEFAULT_MAX_AGE) -> Optional[Dict[str, Any]]:
+        """Proposal row, refetched unless it is closed or was synced within max_age."""
+        proposal = self.get_proposal(proposal_id)
+        if proposal and (proposal["state"] == "closed" or time.time() - proposal["synced_at"] < max_age):
+            return proposal
+        data = self._query(PROPOSALS_BY_ID_QUERY, {"ids": [proposal_id], "first": 1})
+        rows = data.get("proposals") or []
+        if not rows:
+            return proposal
+        self._upsert_proposals(rows)
+        return self.get_proposal(proposal_id)
+
+    def sync_votes(self, proposal_id: str, max_age: float = DEFAULT_MAX_AGE) -> int:
+        """Fetch votes cast since the last sync for a proposal.
+
+        Once a closed proposal has been synced past its end time it is marked
+        complete and never fetched again.
+
+        Returns:
+            Number of votes stored or replaced by a newer one.
+        """
+        key = f"votes:{proposal_id}"
+        if self._fresh(key, max_age):
+            return 0
+        proposal = self.sync_proposal(proposal_id, max_age)
+        if not proposal:
+            raise LookupError(f"Proposal '{proposal_id}' not found.")
+        sync_started = int(time.time())
+        cursor, _, _ = self._state(key)
+        added = 0
+        for page in self._paginate(VOTES_SINCE_QUERY, {"proposal": proposal_id}, "votes", cursor):
+            added += self._insert_votes(page, proposal_id, proposal["space"])
+            cursor = max(cursor, int(page[-1].get("created") or cursor))
+            self._set_state(key, cursor)
+        complete = proposal["state"] == "closed" and sync_started > int(proposal.get("end") or 0)
+        self._set_state(key, cursor, complete)
+        return added
+
+    def sync_voter(self, voter: str, space_id: Optional[str] = None,
+                   max_age: float = DEFAULT_MAX_AGE) -> int:
+        """Fetch a voter's votes (with their proposals) cast since the last sync.
+
+        Returns:
+            Number of votes stored or replaced by a newer one.
+        """
+        voter = voter.lower()
+        key = f"voter:{voter}:{space_id or '*'}"
+        if self._fresh(key, max_age):
+            return 0
+        cursor, _, _ = self._state(key)
+        if space_id:
+            query, variables = VOTER_VOTES_SINCE_QUERY, {"voter": voter, "space": space_id}
+        else:
+            query, variables = VOTER_ALL_VOTES_SINCE_QUERY, {"voter": voter}
+        added = 0
+        for page in self._paginate(query, variables, "votes", cursor):
+            self._upsert_proposals([v["proposal"] for v in page if v.get("proposal")])
+            added += self._insert_votes(page)
+            cursor = max(cursor, int(page[-1].get("created") or cursor))
+            self._set_state(key, cursor)
+        self._set_state(key, cursor)
+        return added
+
+    def sync_many(
+        self,
+        fn: Callable[..., Any],
+        items: Sequence[Any],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs: Any,
+    ) -> Dict[Any, str]:
+        """Run fn(item, **kwargs) for every item concurrently (sharing the rate limiter).
+
+        Returns:
+            Mapping item -> error message for the items that failed.
+        """
+        errors: Dict[Any, str] = {}
+        if not items:
+            return errors
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+            futures = {pool.submit(fn, item, **kwargs): item for item in items}
+            for future, item in futures.items():
+                try:
+                    future.result()
+                except (SnapshotAPIError, LookupError) as exc:
+                    errors[item] = str(exc)
+        return errors
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _proposal_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "choices": json.loads(row["choices"] or "[]"),
+            "start": row["start"] or 0,
+            "end": row["end"] or 0,
+            "state": row["state"] or "",
+            "scores": json.loads(row["scores"] or "[]"),
+            "scores_total": row["scores_total"] or 0,
+            "votes": row["votes"] or 0,
+            "quorum": row["quorum"] or 0,
+            "created": row["created"] or 0,
+            "author": row["author"],
+            "space": row["space"],
+            "space_name": row["space_name"],
+            "synced_at": row["synced_at"] or 0,
+        }
+
+    def get_space(self, space_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM spaces WHERE id = ?", (space_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_proposal(self, proposal_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM proposals WHERE id = ?", (proposal_id,)).fetchone()
+        return self._proposal_dict(row) if row else None
+
+    def recent_proposals(self, space_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recently created proposals for a space (newest first)."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM proposals WHERE space = ? ORDER BY created DESC LIMIT ?",
+                (space_id, limit),
+            ).fetchall()
+        return [self._proposal_dict(r) for r in rows]
+
+    def proposal_votes(self, proposal_id: str) -> List[Dict[str, Any]]:
+        """All stored votes for a proposal, highest voting power first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT voter, choice, vp, created FROM votes WHERE proposal = ? ORDER BY vp DESC",
+                (proposal_id,),
+            ).fetchall()
+        return [
+            {"voter": r["voter"], "choice": json.loads(r["choice"]), "vp": r["vp"], "created": r["created"]}
+            for r in rows
+        ]
+
+    def proposal_vote_rows(self, proposal_id: str) -> List[Tuple[str, str, float, int]]:
+        """(voter, choice JSON, vp, created) tuples for columnar analysis, highest VP first."""
+        with self.lock:
+            return [tuple(r) for r in self.conn.execute(
+                "SELECT voter, choice, vp, created FROM votes WHERE proposal = ? ORDER BY vp DESC",
+                (proposal_id,),
+            )]
+
+    def proposal_vote_power(self, proposal_id: str) -> List[float]:
+        """Voting power of every stored vote on a proposal, highest first."""
+        with self.lock:
+            return [r[0] for r in self.conn.execute(
+                "SELECT vp FROM votes WHERE proposal = ? ORDER BY vp DESC", (proposal_id,)
+            )]
+
+    def voter_votes(self, voter: str, space_id: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A voter's stored votes, newest first, each with its proposal nested
+        (the shape of Snapshot's votes { proposal { ... } } query)."""
+        sql = ("SELECT v.choice AS vote_choice, v.vp AS vote_vp, v.created AS vote_created, p.* "
+               "FROM votes v JOIN proposals p ON p.id = v.proposal WHERE v.voter = ?")
+        params: List[Any] = [voter.lower()]
+        if space_id:
+            sql += " AND v.space = ?"
+            params.append(space_id)
+        sql += " ORDER BY v.created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        votes = []
+        for r in rows:
+            proposal = self._proposal_dict(r)
+            proposal["space"] = {"id": r["space"], "name": r["space_name"]}
+            votes.append({
+                "choice": json.loads(r["vote_choice"]),
+                "vp": r["vote_vp"],
+                "created": r["vote_created"],
+                "proposal": proposal,
+            })
+        return votes
+
+
+_DEFAULT_STORE: Optional[GovernanceStore] = None
+
+
+def get_store() -> GovernanceStore:
+    """Process-wide store (one connection and rate limiter per process)."""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = GovernanceStore()
+    return _DEFAULT_STORE
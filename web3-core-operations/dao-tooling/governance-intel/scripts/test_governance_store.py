@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Unit tests for vote storage in governance_store."""
+
+import sqlite3
+
+from governance_store import GovernanceStore
+
+
+def _vote(vote_id, voter, choice, vp, created):
+    return {"id": vote_id, "voter": voter, "choice": choice, "vp": vp, "created": created}
+
+
+def test_changed_vote_replaces_the_old_one():
+    store = GovernanceStore(":memory:")
+    assert store._insert_votes([_vote("0xa", "0xAlice", 1, 100.0, 1000)], "prop-1", "ens.eth") == 1
+
+    # Re-voting on Snapshot yields a new vote id with a later timestamp
+    assert store._insert_votes([_vote("0xb", "0xalice", 2, 120.0, 2000)], "prop-1", "ens.eth") == 1
+
+    votes = store.proposal_votes("prop-1")
+    assert votes == [{"voter": "0xalice", "choice": 2, "vp": 120.0, "created": 2000}]
+    assert store.proposal_vote_power("prop-1") == [120.0]
+
+
+def test_reingesting_votes_is_idempotent():
+    store = GovernanceStore(":memory:")
+    page = [_vote("0xa", "0xalice", 1, 100.0, 1000), _vote("0xc", "0xbob", 2, 50.0, 1100)]
+    assert store._insert_votes(page, "prop-1", "ens.eth") == 2
+    assert store._insert_votes(page, "prop-1", "ens.eth") == 0
+    assert len(store.proposal_votes("prop-1")) == 2
+
+
+def test_older_vote_does_not_overwrite_newer():
+    store = GovernanceStore(":memory:")
+    store._insert_votes([_vote("0xb", "0xalice", 2, 120.0, 2000)], "prop-1", "ens.eth")
+    assert store._insert_votes([_vote("0xa", "0xalice", 1, 100.0, 1000)], "prop-1", "ens.eth") == 0
+    assert store.proposal_votes("prop-1")[0]["choice"] == 2
+
+
+def test_same_voter_on_different_proposals_is_kept():
+    store = GovernanceStore(":memory:")
+    store._insert_votes([_vote("0xa", "0xalice", 1, 100.0, 1000)], "prop-1", "ens.eth")
+    store._insert_votes([_vote("0xb", "0xalice", 2, 100.0, 1000)], "prop-2", "ens.eth")
+    assert len(store.proposal_votes("prop-1")) == 1
+    assert len(store.proposal_votes("prop-2")) == 1
+
+
+def test_existing_store_is_deduplicated_on_open(tmp_path):
+    path = str(tmp_path / "governance.db")
+    # A store written before votes were keyed by (proposal, voter)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE votes (id TEXT PRIMARY KEY, proposal TEXT NOT NULL, space TEXT, "
+        "voter TEXT NOT NULL, choice TEXT, vp REAL, created INTEGER);"
+    )
+    conn.executemany(
+        "INSERT INTO votes VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("0xa", "prop-1", "ens.eth", "0xalice", "1", 100.0, 1000),
+            ("0xb", "prop-1", "ens.eth", "0xalice", "2", 120.0, 2000),
+            ("0xc", "prop-1", "ens.eth", "0xbob", "1", 50.0, 1500),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    store = GovernanceStore(path)
+    votes = {v["voter"]: v for v in store.proposal_votes("prop-1")}
+    assert set(votes) == {"0xalice", "0xbob"}
+    assert votes["0xalice"]["choice"] == 2
+    store.close()
+
+    # Reopening keeps the key without deleting anything else
+    store = GovernanceStore(path)
+    assert len(store.proposal_votes("prop-1")) == 2
+    store.close()
@@ -2,7 +2,10 @@
 """
 Voting Analyzer — Analyze voting patterns, whale influence, and outcome predictability.
 
-Uses the Snapshot GraphQL API (free, public, no API key required).
+Uses the Snapshot GraphQL API (free, public, no API key required). Votes are
+synced incrementally into the local governance store and analyzed from there,
+so proposals with 100k+ votes are fetched once and re-analyzed offline.
+Analytics run vectorized over columnar vote arrays (see governance_metrics).
 
 Input (JSON via stdin):
     {
@@ -19,117 +22,19 @@ Output (JSON via stdout):
         "vote_distribution": {...},
         "whale_analysis": {...},
         "participation": {...},
-        "concentration": {...},
-        "timing": {...}
+        "concentration": {...},             // Gini, top-N, HHI, Nakamoto
+        "timing": {...}                     // early/late split + cumulative VP curve
     }
 """
 
 import json
-import math
 import sys
-import time
-import urllib.error
-import urllib.request
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-SNAPSHOT_API = "https://hub.snapshot.org/graphql"
-
-PROPOSALS_QUERY = """
-query Proposals($space: String!, $first: Int) {
-  proposals(
-    where: { space: $space }
-    first: $first
-    orderBy: "created"
-    orderDirection: desc
-  ) {
-    id
-    title
-    choices
-    start
-    end
-    state
-    scores
-    scores_total
-    votes
-    quorum
-    space { id name members }
-  }
-}
-"""
-
-VOTES_QUERY = """
-query Votes($proposal: String!, $first: Int, $skip: Int) {
-  votes(
-    where: { proposal: $proposal }
-    first: $first
-    skip: $skip
-    orderBy: "vp"
-    orderDirection: desc
-  ) {
-    voter
-    choice
-    vp
-    created
-  }
-}
-"""
-
-PROPOSAL_BY_ID_QUERY = """
-query Proposal($id: String!) {
-  proposal(id: $id) {
-    id
-    title
-    choices
-    start
-    end
-    state
-    scores
-    scores_total
-    votes
-    quorum
-    space { id name members }
-  }
-}
-"""
-
-
-def _graphql_query(query: str, variables: Optional[Dict] = None, retries: int = 3) -> Dict[str, Any]:
-    """Execute a GraphQL query against Snapshot Hub with retry logic."""
-    payload = json.dumps({"query": query, "variables": variables or {}}).encode()
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "SpoonOS-GovernanceIntel/1.0",
-    }
-
-    last_error: Optional[Exception] = None
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(
-                SNAPSHOT_API,
-                data=payload,
-                headers=headers,
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode())
-                if "errors" in data:
-                    return {"error": data["errors"][0].get("message", "GraphQL error")}
-                return data
-        except urllib.error.HTTPError as exc:
-            last_error = exc
-            if exc.code == 429:
-                time.sleep(2 ** attempt)
-                continue
-            break
-        except (urllib.error.URLError, OSError) as exc:
-            last_error = exc
-            if attempt < retries - 1:
-                time.sleep(1.5 ** attempt)
-                continue
-            break
-
-    return {"error": f"API request failed after {retries} attempts: {last_error}"}
+import governance_metrics as metrics
+from governance_metrics import VoteColumns
+from governance_store import SnapshotAPIError, get_store
 
 
 def _shorten_address(addr: str) -> str:
@@ -146,15 +51,13 @@ def _ts_to_iso(ts: int) -> str:
 
 def _resolve_proposal_id(space_id: str, proposal_index: int) -> Tuple[Optional[str], Optional[Dict]]:
     """Resolve a proposal ID from space_id and index."""
-    resp = _graphql_query(PROPOSALS_QUERY, {
-        "space": space_id,
-        "first": proposal_index + 5,
-    })
-
-    if "error" in resp:
-        return None, {"status": "error", "error": resp["error"]}
+    store = get_store()
+    try:
+        store.sync_proposals(space_id)
+    except SnapshotAPIError as exc:
+        return None, {"status": "error", "error": str(exc)}
 
-    proposals = (resp.get("data") or {}).get("proposals") or []
+    proposals = store.recent_proposals(space_id, limit=proposal_index + 5)
     if proposal_index >= len(proposals):
         return None, {
             "status": "error",
@@ -166,12 +69,12 @@ def _resolve_proposal_id(space_id: str, proposal_index: int) -> Tuple[Optional[s
 
 
 def _fetch_proposal(proposal_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
-    """Fetch proposal details by ID."""
-    resp = _graphql_query(PROPOSAL_BY_ID_QUERY, {"id": proposal_id})
-    if "error" in resp:
-        return None, {"status": "error", "error": resp["error"]}
+    """Fetch proposal details by ID (served from the local store when closed)."""
+    try:
+        proposal = get_store().sync_proposal(proposal_id)
+    except SnapshotAPIError as exc:
+        return None, {"status": "error", "error": str(exc)}
 
-    proposal = (resp.get("data") or {}).get("proposal")
     if not proposal:
         return None, {
             "status": "error",
@@ -179,90 +82,42 @@ def _fetch_proposal(proposal_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
             "details": "Verify the proposal ID on snapshot.org.",
         }
 
+    proposal = dict(proposal, space={"id": proposal["space"], "name": proposal["space_name"]})
     return proposal, None
 
 
-def _fetch_all_votes(proposal_id: str, max_votes: int = 1000) -> List[Dict[str, Any]]:
-    """Fetch all votes for a proposal with pagination."""
-    all_votes: List[Dict[str, Any]] = []
-    skip = 0
-    page_size = 1000
-
-    while len(all_votes) < max_votes:
-        resp = _graphql_query(VOTES_QUERY, {
-            "proposal": proposal_id,
-            "first": min(page_size, max_votes - len(all_votes)),
-            "skip": skip,
-        })
-
-        if "error" in resp:
-            break
-
-        votes = (resp.get("data") or {}).get("votes") or []
-        if not votes:
-            break
-
-        all_votes.extend(votes)
-        skip += len(votes)
-
-        if len(votes) < page_size:
-            break
-
-        time.sleep(0.3)
-
-    return all_votes
-
-
-def _calculate_gini(values: List[float]) -> float:
-    """Calculate the Gini coefficient for a list of values."""
-    if not values or len(values) < 2:
-        return 0.0
-
-    sorted_vals = sorted(values)
-    n = len(sorted_vals)
-    total = sum(sorted_vals)
-
-    if total == 0:
-        return 0.0
+def _fetch_vote_columns(proposal_id: str) -> VoteColumns:
+    """Sync new votes into the local store, then load all votes as columns (highest VP first)."""
+    store = get_store()
+    store.sync_votes(proposal_id)
+    return VoteColumns.from_rows(store.proposal_vote_rows(proposal_id))
 
-    cumulative_sum = 0.0
-    weighted_sum = 0.0
-    for i, val in enumerate(sorted_vals):
-        cumulative_sum += val
-        weighted_sum += (2 * (i + 1) - n - 1) * val
 
-    gini = weighted_sum / (n * total)
-    return round(max(0.0, min(1.0, gini)), 4)
+def _choice_name(columns: VoteColumns, row: int, choices: List[str]) -> str:
+    """Choice label for one vote; weighted ballots show their highest-weighted choice."""
+    choice_idx = int(columns.choice[row])
+    if 1 <= choice_idx <= len(choices):
+        return choices[choice_idx - 1]
+    ballot = columns.ballots.get(row)
+    if isinstance(ballot, dict) and ballot:
+        max_choice = max(ballot.items(), key=lambda x: x[1])
+        idx = int(max_choice[0])
+        if 1 <= idx <= len(choices):
+            return f"{choices[idx - 1]} (weighted)"
+    return "Unknown"
 
 
-def _analyze_vote_distribution(
-    votes: List[Dict[str, Any]], choices: List[str]
-) -> Dict[str, Any]:
+def _analyze_vote_distribution(columns: VoteColumns, choices: List[str]) -> Dict[str, Any]:
     """Analyze vote distribution across choices."""
+    # Snapshot uses 1-based choice indexing; weighted ballots add vp * weight per choice
+    counts, power = columns.choice_vp(len(choices))
+    total_vp = columns.total_vp
+
     choice_votes: Dict[str, Dict[str, Any]] = {}
-    for choice in choices:
-        choice_votes[choice] = {"count": 0, "vp": 0.0}
-
-    total_vp = 0.0
-
-    for vote in votes:
-        vp = vote.get("vp", 0)
-        total_vp += vp
-        choice_idx = vote.get("choice")
-
-        # Snapshot uses 1-based choice indexing for single-choice
-        if isinstance(choice_idx, int) and 1 <= choice_idx <= len(choices):
-            choice_name = choices[choice_idx - 1]
-            choice_votes[choice_name]["count"] += 1
-            choice_votes[choice_name]["vp"] += vp
-        elif isinstance(choice_idx, dict):
-            # Weighted voting: choice is a dict like {1: 0.6, 2: 0.4}
-            for idx_str, weight in choice_idx.items():
-                idx = int(idx_str)
-                if 1 <= idx <= len(choices):
-                    choice_name = choices[idx - 1]
-                    choice_votes[choice_name]["count"] += 1
-                    choice_votes[choice_name]["vp"] += vp * weight
+    for i, choice in enumerate(choices):
+        data = choice_votes.setdefault(choice, {"count": 0, "vp": 0.0})
+        data["count"] += int(counts[i])
+        data["vp"] += float(power[i])
 
     distribution = {}
     for choice_name, data in choice_votes.items():
@@ -276,42 +131,30 @@ def _analyze_vote_distribution(
     return distribution
 
 
-def _analyze_whales(votes: List[Dict[str, Any]], choices: List[str], top_n: int = 10) -> Dict[str, Any]:
+def _analyze_whales(columns: VoteColumns, choices: List[str], top_n: int = 10) -> Dict[str, Any]:
     """Analyze whale influence — top voters by voting power."""
-    if not votes:
+    if not len(columns):
         return {
             "top_10_share_pct": 0.0,
             "whale_dominant": False,
             "top_voters": [],
         }
 
-    # Votes are already sorted by VP (desc) from the query
-    total_vp = sum(v.get("vp", 0) for v in votes)
-    top_votes = votes[:top_n]
-    top_vp = sum(v.get("vp", 0) for v in top_votes)
-    top_share = round((top_vp / total_vp) * 100, 1) if total_vp > 0 else 0.0
+    # Columns are sorted by VP (desc)
+    total_vp = columns.total_vp
+    top_share = metrics.top_share_pct(columns.vp, top_n)
 
     top_voters = []
-    for v in top_votes:
-        choice_idx = v.get("choice")
-        choice_name = "Unknown"
-        if isinstance(choice_idx, int) and 1 <= choice_idx <= len(choices):
-            choice_name = choices[choice_idx - 1]
-        elif isinstance(choice_idx, dict):
-            # Weighted: show the highest-weighted choice
-            max_choice = max(choice_idx.items(), key=lambda x: x[1])
-            idx = int(max_choice[0])
-            if 1 <= idx <= len(choices):
-                choice_name = f"{choices[idx - 1]} (weighted)"
-
-        vp = v.get("vp", 0)
+    for row in range(min(top_n, len(columns))):
+        vp = float(columns.vp[row])
+        voter = columns.voter(row)
         pct = round((vp / total_vp) * 100, 1) if total_vp > 0 else 0.0
 
         top_voters.append({
-            "voter": _shorten_address(v.get("voter", "")),
-            "voter_full": v.get("voter", ""),
+            "voter": _shorten_address(voter),
+            "voter_full": voter,
             "vp": round(vp, 2),
-            "choice": choice_name,
+            "choice": _choice_name(columns, row, choices),
             "pct_of_total": pct,
         })
 
@@ -322,78 +165,18 @@ def _analyze_whales(votes: List[Dict[str, Any]], choices: List[str], top_n: int
     }
 
 
-def _analyze_concentration(votes: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Calculate concentration metrics including Gini coefficient."""
-    vp_values = [v.get("vp", 0) for v in votes]
-
-    if not vp_values:
-        return {
-            "gini_coefficient": 0.0,
-            "top_10_pct": 0.0,
-            "top_25_pct": 0.0,
-            "total_voters": 0,
-        }
-
-    total_vp = sum(vp_values)
-    sorted_vp = sorted(vp_values, reverse=True)
-
-    top_10 = sorted_vp[:10]
-    top_10_pct = round((sum(top_10) / total_vp) * 100, 1) if total_vp > 0 else 0.0
-
-    top_25 = sorted_vp[:25]
-    top_25_pct = round((sum(top_25) / total_vp) * 100, 1) if total_vp > 0 else 0.0
-
-    gini = _calculate_gini(vp_values)
-
-    return {
-        "gini_coefficient": gini,
-        "top_10_pct": top_10_pct,
-        "top_25_pct": top_25_pct,
-        "total_voters": len(vp_values),
-    }
-
-
-def _analyze_timing(
-    votes: List[Dict[str, Any]], proposal_start: int, proposal_end: int
-) -> Dict[str, Any]:
-    """Analyze voting timing patterns: early vs late voters."""
-    if not votes or proposal_start >= proposal_end:
-        return {
-            "early_voters_pct": 0.0,
-            "late_voters_pct": 0.0,
-            "early_vp_pct": 0.0,
-            "late_vp_pct": 0.0,
-        }
-
-    midpoint = proposal_start + (proposal_end - proposal_start) // 2
-
-    early_count = 0
-    late_count = 0
-    early_vp = 0.0
-    late_vp = 0.0
-
-    for vote in votes:
-        created = vote.get("created", 0)
-        vp = vote.get("vp", 0)
-
-        if created <= midpoint:
-            early_count += 1
-            early_vp += vp
-        else:
-            late_count += 1
-            late_vp += vp
+def _analyze_concentration(columns: VoteColumns) -> Dict[str, Any]:
+    """Calculate concentration metrics: Gini, top-N shares, HHI and Nakamoto coefficient."""
+    return metrics.concentration(columns)
 
-    total_count = early_count + late_count
-    total_vp = early_vp + late_vp
 
-    return {
-        "early_voters_pct": round((early_count / total_count) * 100, 1) if total_count > 0 else 0.0,
-        "late_voters_pct": round((late_count / total_count) * 100, 1) if total_count > 0 else 0.0,
-        "early_vp_pct": round((early_vp / total_vp) * 100, 1) if total_vp > 0 else 0.0,
-        "late_vp_pct": round((late_vp / total_vp) * 100, 1) if total_vp > 0 else 0.0,
-        "early_voters": early_count,
-        "late_voters": late_count,
-    }
+def _analyze_timing(columns: VoteColumns, proposal_start: int, proposal_end: int) -> Dict[str, Any]:
+    """Analyze voting timing patterns: early vs late voters and the cumulative VP curve."""
+    timing = metrics.timing(columns, proposal_start, proposal_end)
+    curve = metrics.vp_curve(columns, proposal_start, proposal_end)
+    if curve:
+        timing["vp_curve"] = [dict(point, until=_ts_to_iso(point["until"])) for point in curve]
+    return timing
 
 
 def _determine_outcome_analysis(
@@ -449,10 +232,13 @@ def analyze_proposal(proposal_id: str) -> Dict[str, Any]:
     choices = proposal.get("choices", [])
     space = proposal.get("space") or {}
 
-    # Fetch votes
-    votes = _fetch_all_votes(proposal_id)
+    # Fetch votes (incremental sync into the local store; no vote cap)
+    try:
+        columns = _fetch_vote_columns(proposal_id)
+    except (SnapshotAPIError, LookupError) as exc:
+        return {"status": "error", "error": str(exc)}
 
-    if not votes:
+    if not len(columns):
         return {
             "status": "success",
             "proposal": {
@@ -472,17 +258,17 @@ def analyze_proposal(proposal_id: str) -> Dict[str, Any]:
         }
 
     # Run analysis
-    distribution = _analyze_vote_distribution(votes, choices)
-    whale_analysis = _analyze_whales(votes, choices)
-    concentration = _analyze_concentration(votes)
+    distribution = _analyze_vote_distribution(columns, choices)
+    whale_analysis = _analyze_whales(columns, choices)
+    concentration = _analyze_concentration(columns)
     timing = _analyze_timing(
-        votes,
+        columns,
         proposal.get("start", 0),
         proposal.get("end", 0),
     )
     outcome_analysis = _determine_outcome_analysis(whale_analysis, distribution, timing)
 
-    total_vp = sum(v.get("vp", 0) for v in votes)
+    total_vp = columns.total_vp
 
     # Quorum info
     quorum = proposal.get("quorum", 0)
@@ -510,7 +296,7 @@ def analyze_proposal(proposal_id: str) -> Dict[str, Any]:
         "vote_distribution": distribution,
         "whale_analysis": whale_analysis,
         "participation": {
-            "total_voters": len(votes),
+            "total_voters": len(columns),
             "total_vp": round(total_vp, 2),
         },
         "concentration": concentration,
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Farcaster Bulk Engine - Concurrent Neynar Requests
+Shared request engine for CastManager and ReactionManager
+
+REAL IMPLEMENTATION - No Mocks/Simulations
+- Token-bucket rate limiting sized to the Neynar plan quotas
+- Bounded request concurrency
+- Retry with exponential backoff, full jitter and Retry-After support
+- Cursor-driven pagination that streams items as pages arrive
+"""
+
+import os
+import time
+import queue
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# Neynar rate limits in requests per minute: (per endpoint, global per API key)
+# https://docs.neynar.com/reference/what-are-the-rate-limits-on-neynar-apis
+NEYNAR_RATE_LIMITS = {
+    "starter": (300, 500),
+    "growth": (600, 1000),
+    "scale": (1200, 2000),
+}
+
+DEFAULT_PLAN = "starter"
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 4
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Requests without side effects; anything else may have been applied even if
+# the response was a 5xx or timed out, so it is only resent on 429 or when the
+# connection was refused before the request went out
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 30.0  # seconds
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Callers reserve a token and sleep for the returned delay, so the bucket
+    can be shared across event loops and threads without an async lock.
+    """
+
+    def __init__(self, rpm: float, burst: Optional[float] = None):
+        """
+        Args:
+            rpm: Sustained rate in requests per minute
+            burst: Bucket capacity (defaults to one second of traffic)
+        """
+        self.rate = rpm / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    async def acquire(self):
+        """Wait until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class RateLimiter:
+    """Global and per-endpoint token buckets for one API key"""
+
+    def __init__(self, plan: str = DEFAULT_PLAN, rpm: Optional[float] = None):
+        """
+        Args:
+            plan: Neynar plan name ('starter', 'growth', 'scale')
+            rpm: Override for the global requests per minute
+        """
+        if plan not in NEYNAR_RATE_LIMITS:
+            raise ValueError(f"Unknown Neynar plan: {plan}")
+        endpoint_rpm, global_rpm = NEYNAR_RATE_LIMITS[plan]
+        if rpm:
+            global_rpm = rpm
+            endpoint_rpm = min(endpoint_rpm, rpm)
+        self.plan = plan
+        self.endpoint_rpm = endpoint_rpm
+        self.global_bucket = TokenBucket(global_rpm)
+        self._endpoints: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, path: str) -> TokenBucket:
+        """Get the bucket for an endpoint path"""
+        with self._lock:
+            if path not in self._endpoints:
+                self._endpoints[path] = TokenBucket(self.endpoint_rpm)
+            return self._endpoints[path]
+
+    async def acquire(self, path: str):
+        """Wait for both the endpoint and the global quota"""
+        await self.endpoint(path).acquire()
+        await self.global_bucket.acquire()
+
+# Quotas are enforced per API key, so managers sharing a key share a limiter
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def shared_limiter(
+    api_key: str,
+    plan: Optional[str] = None,
+    rpm: Optional[float] = None
+) -> RateLimiter:
+    """
+    Get the process-wide rate limiter for an API key
+
+    Args:
+        api_key: Neynar API key
+        plan: Neynar plan (defaults to NEYNAR_PLAN or 'starter')
+        rpm: Global requests per minute override (defaults to NEYNAR_RPM)
+
+    Returns:
+        RateLimiter shared by every engine using this key
+    """
+    with _LIMITERS_LOCK:
+        if api_key not in _LIMITERS:
+            plan = plan or os.getenv("NEYNAR_PLAN", DEFAULT_PLAN).lower()
+            rpm = rpm or float(os.getenv("NEYNAR_RPM", "0")) or None
+            _LIMITERS[api_key] = RateLimiter(plan=plan, rpm=rpm)
+        return _LIMITERS[api_key]
+
+def _retry_after(response: Optional[requests.Response]) -> float:
+    """Parse a Retry-After header in seconds (0 if absent)"""
+    if response is None:
+        return 0.0
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+def _connection_refused(error: BaseException) -> bool:
+    """True if the request never reached the server (connect refused or failed)"""
+    seen = set()
+    pending: List[Any] = [error]
+    while pending:
+        exc = pending.pop()
+        if not isinstance(exc, BaseException) or id(exc) in seen:
+            continue
+        seen.add(id(exc))
+        if isinstance(exc, (ConnectionRefusedError, NewConnectionError)):
+            return True
+        pending.extend([getattr(exc, "reason", None), exc.__cause__, exc.__context__, *exc.args])
+    return False
+
+class BulkEngine:
+    """
+    Async request engine for the Neynar API
+
+    Features:
+    - Shared token-bucket rate limiting per API key
+    - Bounded concurrency (requests run on a worker pool)
+    - Retry with jittered backoff: GETs on 429/5xx and connection errors,
+      writes only on 429 or a refused connection
+    - Streaming cursor pagination
+    - Sync wrappers for non-async callers
+
+    The worker pool is released by close(); engines are also context managers.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        limiter: RateLimiter,
+        max_concurrency: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize Bulk Engine
+
+        Args:
+            session: Authenticated requests session
+            base_url: Neynar API base URL
+            limiter: Rate limiter for the session's API key
+            max_concurrency: Maximum in-flight requests (defaults to NEYNAR_MAX_CONCURRENCY or 8)
+            max_retries: Retries per request on throttling or transient errors
+            timeout: Per-request timeout in seconds
+        """
+        self.session = session
+        self.base_url = base_url
+        self.limiter = limiter
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("NEYNAR_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._loop = None
+        self._slots = None
+
+    def close(self):
+        """Shut down the worker pool; in-flight requests finish first"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BulkEngine":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency slots bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        bucket: Optional[TokenBucket] = None
+    ) -> Dict:
+        """
+        Send one rate-limited request with retries
+
+        Args:
+            method: HTTP method
+            path: Endpoint path relative to the base URL (e.g. '/reaction')
+            params: Query parameters
+            json: JSON body
+            bucket: Extra caller-supplied throttle applied on top of the plan quota
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            requests.exceptions.HTTPError: Non-retryable status or retries exhausted
+                (5xx responses to non-GET requests are not retried)
+            requests.exceptions.RequestException: Connection failure after retries
+        """
+        loop = asyncio.get_running_loop()
+        url = f"{self.base_url}{path}"
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            response = None
+            async with self._semaphore():
+                if bucket:
+                    await bucket.acquire()
+                await self.limiter.acquire(path)
+
+                try:
+                    response = await loop.run_in_executor(
+                        self._executor,
+                        lambda: self.session.request(
+                            method, url, params=params, json=json, timeout=self.timeout
+                        )
+                    )
+                    retryable = response.status_code == 429 or (
+                        idempotent and response.status_code in RETRY_STATUS_CODES
+                    )
+                    if not retryable:
+                        response.raise_for_status()
+                        return response.json()
+                    if last_attempt:
+                        response.raise_for_status()
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    if last_attempt or not (idempotent or _connection_refused(e)):
+                        raise
+
+            # Back off outside the slot so other requests can use it meanwhile.
+            # Full jitter, but never earlier than the server asked for
+            backoff = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+            await asyncio.sleep(max(backoff, _retry_after(response)))
+
+    async def map(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: List[Any]
+    ) -> List[Any]:
+        """
+        Run an async function over items concurrently
+
+        Concurrency and rate are bounded by request(); exceptions are
+        returned in place of results so one failure does not cancel the rest.
+
+        Returns:
+            Results in input order
+        """
+        return await asyncio.gather(*(func(item) for item in items), return_exceptions=True)
+
+    async def paginate(
+        self,
+        path: str,
+        params: Dict,
+        items_key: str,
+        limit: Optional[int] = None,
+        page_size: int = 100
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream items from a cursor-paginated endpoint
+
+        The next page is requested as soon as its cursor is known, so it
+        downloads while the caller consumes the current page.
+
+        Args:
+            path: Endpoint path
+            params: Query parameters (without limit/cursor)
+            items_key: Response key holding the page items (e.g. 'casts')
+            limit: Maximum items to yield (None for all)
+            page_size: Items per page (endpoint maximum)
+
+        Yields:
+            Raw item dictionaries in API order
+        """
+        def page_params(cursor: Optional[str], remaining: Optional[int]) -> Dict:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = dict(params, limit=size)
+            if cursor:
+                page["cursor"] = cursor
+            return page
+
+        yielded = 0
+        pending = asyncio.ensure_future(self.request("GET", path, params=page_params(None, limit)))
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                items = data.get(items_key, [])
+                cursor = (data.get("next") or {}).get("cursor")
+
+                if items and cursor:
+                    remaining = None if limit is None else limit - yielded - len(items)
+                    if remaining is None or remaining > 0:
+                        pending = asyncio.ensure_future(
+                            self.request("GET", path, params=page_params(cursor, remaining))
+                        )
+
+                for item in items:
+                    if limit is not None and yielded >= limit:
+                        return
+                    yielded += 1
+                    yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Already inside an event loop (e.g. a notebook): use a helper thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+    def iterate(self, stream: Callable[[], AsyncIterator[Any]]) -> Iterator[Any]:
+        """
+        Consume an async stream from synchronous code
+
+        The stream runs on a background event loop and items are handed
+        over as they arrive; closing the iterator stops the stream.
+
+        Args:
+            stream: Factory returning the async iterator to drain
+        """
+        done = object()
+        items: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+
+        async def drain():
+            async for item in stream():
+                items.put(item)
+                if stop.is_set():
+                    break
+
+        def pump():
+            try:
+                asyncio.run(drain())
+            except BaseException as e:
+                items.put(e)
+            finally:
+                items.put(done)
+
+        worker = threading.Thread(target=pump, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = items.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
@@ -8,19 +8,26 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real cast publishing via HTTP API
 - Real cast deletion and lookup
 - Real channel and reply management
+- Streaming cursor pagination for search and user feeds
 """
 
 import os
 import json
 import time
 import uuid
-from typing import Dict, List, Optional, Union
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
 from dataclasses import dataclass, asdict
 import requests
 
+from bulk_engine import BulkEngine, shared_limiter
+
 # Neynar API configuration
 NEYNAR_API_BASE = "https://api.neynar.com/v2/farcaster"
 
+# Maximum page sizes per paginated endpoint
+SEARCH_PAGE_SIZE = 100
+USER_CASTS_PAGE_SIZE = 150
+
 @dataclass
 class CastEmbed:
     """Embed in a cast (URL, cast reference, or image)"""
@@ -66,12 +73,14 @@ class CastManager:
     - Delete your own casts
     - Lookup casts by hash or URL
     - Search casts by keyword
+    - Stream search results and user feeds page by page
     """
     
     def __init__(
         self,
         api_key: str,
-        signer_uuid: Optional[str] = None
+        signer_uuid: Optional[str] = None,
+        max_concurrency: Optional[int] = None
     ):
         """
         Initialize Cast Manager
@@ -79,6 +88,7 @@ class CastManager:
         Args:
             api_key: Neynar API key
             signer_uuid: UUID of the signer (required for posting)
+            max_concurrency: Maximum in-flight requests for paginated reads
         """
         self.api_key = api_key
         self.signer_uuid = signer_uuid
@@ -88,6 +98,12 @@ class CastManager:
             'x-api-key': self.api_key,
             'Content-Type': 'application/json'
         })
+        self.engine = BulkEngine(
+            self.session,
+            self.base_url,
+            shared_limiter(api_key),
+            max_concurrency=max_concurrency
+        )
         
         print("=" * 70)
         print("FARCASTER CAST MANAGER")
@@ -99,6 +115,17 @@ class CastManager:
             print("⚠️  Read-only mode (no signer UUID)")
         print()
     
+    def close(self):
+        """Release the request engine's worker pool and the HTTP session"""
+        self.engine.close()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def publish_cast(
         self,
         text: str,
@@ -313,7 +340,7 @@ class CastManager:
         
         Args:
             query: Search query
-            limit: Maximum results (default 25, max 100)
+            limit: Maximum results (paged by cursor beyond 100)
             priority_mode: Prioritize quality over recency
         
         Returns:
@@ -323,41 +350,17 @@ class CastManager:
         print(f"   Query: '{query}'")
         print(f"   Limit: {limit}")
         
+        casts = []
         try:
-            response = self.session.get(
-                f"{self.base_url}/cast/search",
-                params={
-                    "q": query,
-                    "limit": limit,
-                    "priority_mode": str(priority_mode).lower()
-                }
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            casts_data = data.get("casts", [])
-            
-            print(f"   ✅ Found {len(casts_data)} results")
-            
-            casts = []
-            for cast_data in casts_data:
-                casts.append(Cast(
-                    hash=cast_data["hash"],
-                    author_fid=cast_data["author"]["fid"],
-                    text=cast_data["text"],
-                    timestamp=cast_data.get("timestamp", ""),
-                    likes_count=cast_data.get("reactions", {}).get("likes_count", 0),
-                    recasts_count=cast_data.get("reactions", {}).get("recasts_count", 0)
-                ))
-            
-            return casts
-            
+            for cast in self.iter_search_casts(query, limit=limit, priority_mode=priority_mode):
+                casts.append(cast)
         except requests.exceptions.HTTPError as e:
             print(f"   ❌ HTTP Error: {e.response.status_code}")
-            return []
         except Exception as e:
             print(f"   ❌ Error: {e}")
-            return []
+        
+        print(f"   ✅ Found {len(casts)} results")
+        return casts
     
     def get_user_casts(
         self,
@@ -370,7 +373,7 @@ class CastManager:
         
         Args:
             fid: Farcaster ID of the user
-            limit: Maximum results
+            limit: Maximum results (paged by cursor beyond 150)
             include_replies: Include reply casts
         
         Returns:
@@ -380,40 +383,119 @@ class CastManager:
         print(f"   FID: {fid}")
         print(f"   Limit: {limit}")
         
+        casts = []
         try:
-            response = self.session.get(
-                f"{self.base_url}/feed/user/casts",
-                params={
-                    "fid": fid,
-                    "limit": limit,
-                    "include_replies": str(include_replies).lower()
-                }
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            casts_data = data.get("casts", [])
-            
-            print(f"   ✅ Found {len(casts_data)} casts")
-            
-            casts = []
-            for cast_data in casts_data:
-                casts.append(Cast(
-                    hash=cast_data["hash"],
-                    author_fid=cast_data["author"]["fid"],
-                    text=cast_data["text"],
-                    timestamp=cast_data.get("timestamp", ""),
-                    channel_id=cast_data.get("channel", {}).get("id")
-                ))
-            
-            return casts
-            
+            for cast in self.iter_user_casts(fid, limit=limit, include_replies=include_replies):
+                casts.append(cast)
         except requests.exceptions.HTTPError as e:
             print(f"   ❌ HTTP Error: {e.response.status_code}")
-            return []
         except Exception as e:
             print(f"   ❌ Error: {e}")
-            return []
+        
+        print(f"   ✅ Found {len(casts)} casts")
+        return casts
+    
+    def iter_search_casts(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        priority_mode: bool = True
+    ) -> Iterator[Cast]:
+        """
+        Iterate over search results as pages arrive
+        
+        Args:
+            query: Search query
+            limit: Maximum results (None to follow the cursor to the end)
+            priority_mode: Prioritize quality over recency
+        
+        Yields:
+            Cast objects
+        """
+        return self.engine.iterate(
+            lambda: self.stream_search_casts(query, limit=limit, priority_mode=priority_mode)
+        )
+    
+    def iter_user_casts(
+        self,
+        fid: int,
+        limit: Optional[int] = None,
+        include_replies: bool = False
+    ) -> Iterator[Cast]:
+        """
+        Iterate over a user's casts as pages arrive
+        
+        Args:
+            fid: Farcaster ID of the user
+            limit: Maximum results (None for the full history)
+            include_replies: Include reply casts
+        
+        Yields:
+            Cast objects, newest first
+        """
+        return self.engine.iterate(
+            lambda: self.stream_user_casts(fid, limit=limit, include_replies=include_replies)
+        )
+    
+    async def stream_search_casts(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        priority_mode: bool = True
+    ) -> AsyncIterator[Cast]:
+        """
+        Async stream of search results, following the response cursor
+        
+        Yields:
+            Cast objects
+        """
+        pages = self.engine.paginate(
+            "/cast/search",
+            {"q": query, "priority_mode": str(priority_mode).lower()},
+            items_key="casts",
+            limit=limit,
+            page_size=SEARCH_PAGE_SIZE
+        )
+        async for cast_data in pages:
+            yield self._parse_cast(cast_data)
+    
+    async def stream_user_casts(
+        self,
+        fid: int,
+        limit: Optional[int] = None,
+        include_replies: bool = False
+    ) -> AsyncIterator[Cast]:
+        """
+        Async stream of a user's casts, following the response cursor
+        
+        Yields:
+            Cast objects, newest first
+        """
+        pages = self.engine.paginate(
+            "/feed/user/casts",
+            {"fid": fid, "include_replies": str(include_replies).lower()},
+            items_key="casts",
+            limit=limit,
+            page_size=USER_CASTS_PAGE_SIZE
+        )
+        async for cast_data in pages:
+            yield self._parse_cast(cast_data)
+    
+    @staticmethod
+    def _parse_cast(cast_data: Dict) -> Cast:
+        """Build a Cast from a Neynar cast object"""
+        reactions = cast_data.get("reactions") or {}
+        return Cast(
+            hash=cast_data["hash"],
+            author_fid=cast_data["author"]["fid"],
+            text=cast_data["text"],
+            timestamp=cast_data.get("timestamp", ""),
+            channel_id=(cast_data.get("channel") or {}).get("id"),
+            parent_hash=cast_data.get("parent_hash"),
+            replies_count=(cast_data.get("replies") or {}).get("count", 0),
+            likes_count=reactions.get("likes_count", 0),
+            recasts_count=reactions.get("recasts_count", 0)
+        )
 
 def main():
     """Example usage of Cast Manager"""
@@ -470,6 +552,7 @@ def main():
     print("\n" + "=" * 70)
     print("✅ Examples complete")
     print("=" * 70)
+    manager.close()
 
 if __name__ == "__main__":
     main()
@@ -8,6 +8,7 @@ REAL IMPLEMENTATION - No Mocks/Simulations
 - Real like/unlike operations
 - Real recast/unrecast operations
 - Real reaction aggregation
+- Concurrent, rate-limited bulk reactions
 """
 
 import os
@@ -15,6 +16,8 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 import requests
 
+from bulk_engine import BulkEngine, TokenBucket, shared_limiter
+
 # Neynar API configuration
 NEYNAR_API_BASE = "https://api.neynar.com/v2/farcaster"
 
@@ -59,12 +62,14 @@ class ReactionManager:
     - Unlike and unrecast
     - Get reaction counts and details
     - List reactions for a cast
+    - Bulk reactions through the shared rate-limited engine
     """
     
     def __init__(
         self,
         api_key: str,
-        signer_uuid: Optional[str] = None
+        signer_uuid: Optional[str] = None,
+        max_concurrency: Optional[int] = None
     ):
         """
         Initialize Reaction Manager
@@ -72,6 +77,7 @@ class ReactionManager:
         Args:
             api_key: Neynar API key
             signer_uuid: UUID of the signer (required for reacting)
+            max_concurrency: Maximum in-flight requests for bulk operations
         """
         self.api_key = api_key
         self.signer_uuid = signer_uuid
@@ -81,6 +87,12 @@ class ReactionManager:
             'x-api-key': self.api_key,
             'Content-Type': 'application/json'
         })
+        self.engine = BulkEngine(
+            self.session,
+            self.base_url,
+            shared_limiter(api_key),
+            max_concurrency=max_concurrency
+        )
         
         print("=" * 70)
         print("FARCASTER REACTION MANAGER")
@@ -92,6 +104,17 @@ class ReactionManager:
             print("⚠️  Read-only mode (no signer UUID)")
         print()
     
+    def close(self):
+        """Release the request engine's worker pool and the HTTP session"""
+        self.engine.close()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def like_cast(
         self,
         cast_hash: str,
@@ -437,35 +460,124 @@ class ReactionManager:
     def bulk_like_casts(
         self,
         cast_hashes: List[str],
-        delay_ms: int = 100
+        delay_ms: Optional[int] = None
     ) -> Dict[str, bool]:
         """
-        Like multiple casts
+        Like multiple casts concurrently
         
         Args:
             cast_hashes: List of cast hashes to like
-            delay_ms: Delay between requests (rate limiting)
+            delay_ms: Optional minimum spacing between requests, on top of
+                the plan rate limit
         
         Returns:
             Dictionary mapping cast hash to success status
         """
-        import time
+        return self.bulk_react(cast_hashes, reaction_type="like", delay_ms=delay_ms)
+    
+    def bulk_recast(
+        self,
+        cast_hashes: List[str],
+        delay_ms: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """
+        Recast multiple casts concurrently
         
-        print(f"🔥 Bulk Liking {len(cast_hashes)} Casts")
+        Args:
+            cast_hashes: List of cast hashes to recast
+            delay_ms: Optional minimum spacing between requests
         
-        results = {}
-        for i, cast_hash in enumerate(cast_hashes, 1):
-            print(f"\n   [{i}/{len(cast_hashes)}] Processing...")
-            success = self.like_cast(cast_hash)
-            results[cast_hash] = success
-            
-            if i < len(cast_hashes) and delay_ms > 0:
-                time.sleep(delay_ms / 1000.0)
+        Returns:
+            Dictionary mapping cast hash to success status
+        """
+        return self.bulk_react(cast_hashes, reaction_type="recast", delay_ms=delay_ms)
+    
+    def bulk_react(
+        self,
+        cast_hashes: List[str],
+        reaction_type: str = "like",
+        remove: bool = False,
+        delay_ms: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """
+        Add or remove a reaction on many casts
+        
+        Requests run concurrently through the shared engine, which enforces
+        the Neynar quota for this API key and retries throttled requests.
+        
+        Args:
+            cast_hashes: List of cast hashes
+            reaction_type: 'like' or 'recast'
+            remove: Remove the reaction instead of adding it
+            delay_ms: Optional minimum spacing between requests
+        
+        Returns:
+            Dictionary mapping cast hash to success status
+        """
+        if not self.signer_uuid:
+            print("❌ Cannot react: No signer UUID configured")
+            return {cast_hash: False for cast_hash in cast_hashes}
+        
+        action = "Removing" if remove else "Adding"
+        print(f"🔥 Bulk {action} {reaction_type.capitalize()} on {len(cast_hashes)} Casts")
+        
+        results = self.engine.run(
+            self.bulk_react_async(cast_hashes, reaction_type, remove, delay_ms)
+        )
         
         successful = sum(1 for v in results.values() if v)
-        print(f"\n   ✅ Completed: {successful}/{len(cast_hashes)} successful")
+        print(f"   ✅ Completed: {successful}/{len(cast_hashes)} successful")
         
         return results
+    
+    async def bulk_react_async(
+        self,
+        cast_hashes: List[str],
+        reaction_type: str = "like",
+        remove: bool = False,
+        delay_ms: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """
+        Async variant of bulk_react for callers running their own event loop
+        
+        Returns:
+            Dictionary mapping cast hash to success status
+        """
+        method = "DELETE" if remove else "POST"
+        throttle = TokenBucket(60000.0 / delay_ms, burst=1) if delay_ms else None
+        unique_hashes = list(dict.fromkeys(cast_hashes))
+        
+        async def react(cast_hash: str) -> bool:
+            body = {
+                "signer_uuid": self.signer_uuid,
+                "reaction_type": reaction_type,
+                "target": cast_hash
+            }
+            try:
+                data = await self.engine.request(method, "/reaction", json=body, bucket=throttle)
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code
+                if status == 409 and not remove:
+                    print(f"   ℹ️  {cast_hash[:20]}... already {reaction_type}d")
+                elif status == 404 and remove:
+                    print(f"   ℹ️  {cast_hash[:20]}... no {reaction_type} found to remove")
+                else:
+                    print(f"   ❌ {cast_hash[:20]}... HTTP Error: {status}")
+                return False
+            except Exception as e:
+                print(f"   ❌ {cast_hash[:20]}... Error: {e}")
+                return False
+            
+            if not data.get("success"):
+                print(f"   ❌ {cast_hash[:20]}... Failed: {data.get('message', 'Unknown error')}")
+                return False
+            return True
+        
+        outcomes = await self.engine.map(react, unique_hashes)
+        return {
+            cast_hash: outcome is True
+            for cast_hash, outcome in zip(unique_hashes, outcomes)
+        }
 
 def main():
     """Example usage of Reaction Manager"""
@@ -518,6 +630,7 @@ def main():
     print("\n" + "=" * 70)
     print("✅ Examples complete")
     print("=" * 70)
+    manager.close()
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """
 Base Fee Predict – Base fee history, simple prediction, and when-to-send advice.
-Uses eth_feeHistory. stdin JSON → stdout JSON.
+Uses the shared eth_feeHistory store (fee_history.py). stdin JSON → stdout JSON.
 """
 
 import json
 import sys
 from typing import Any, Dict, List
 
-from common import CHAIN_CONFIG, get_rpc_url, rpc_post
+from common import CHAIN_CONFIG
+from fee_history import DEFAULT_CAPACITY, get_fee_history
 
 
 def wei_to_gwei(wei: int) -> float:
@@ -18,29 +19,25 @@ def wei_to_gwei(wei: int) -> float:
 def base_fee_predict(chain: str, blocks: int = 20) -> Dict[str, Any]:
     if chain not in CHAIN_CONFIG:
         raise ValueError(f"Unsupported chain: {chain}")
-    rpc_url = get_rpc_url(chain)
-    # eth_feeHistory: blockCount, newestBlock, rewardPercentiles (optional)
-    raw = rpc_post(
-        rpc_url,
-        "eth_feeHistory",
-        [hex(blocks), "latest", [25.0, 50.0, 75.0]],
-    )
-    if not raw:
+    # Shared, incrementally synced store: only blocks newer than the cache are fetched
+    store = get_fee_history(chain, min_blocks=blocks)
+    window = store.window(blocks)
+    base_fees: List[float] = [wei_to_gwei(b) for b in window["base_fees"]]
+    if not base_fees:
         raise RuntimeError("Empty eth_feeHistory response")
 
-    base_fees: List[float] = []
-    for b in raw.get("baseFeePerGas", []):
-        base_fees.append(wei_to_gwei(int(b, 16)))
-    reward = raw.get("reward") or []
+    avg = sum(base_fees) / len(base_fees)
+    min_bf = min(base_fees)
+    max_bf = max(base_fees)
+    last = base_fees[-1]
 
-    avg = sum(base_fees) / len(base_fees) if base_fees else 0
-    min_bf = min(base_fees) if base_fees else 0
-    max_bf = max(base_fees) if base_fees else 0
-    last = base_fees[-1] if base_fees else 0
-
-    # Simple "next block" prediction: use recent average (last 5) or overall avg
-    recent = base_fees[-5:] if len(base_fees) >= 5 else base_fees
-    next_pred = sum(recent) / len(recent) if recent else avg
+    # Next block via EIP-1559 (gasUsed vs target of the head block); fall back to recent mean
+    next_wei = store.predict_next_base_fee()
+    if next_wei is not None:
+        next_pred = wei_to_gwei(next_wei)
+    else:
+        recent = base_fees[-5:]
+        next_pred = sum(recent) / len(recent)
 
     # When-to-send heuristic (Ethereum-focused; L2s usually cheap)
     level = "LOW"
@@ -64,14 +61,17 @@ def base_fee_predict(chain: str, blocks: int = 20) -> Dict[str, Any]:
             "last": round(last, 2),
             "next_block_prediction": round(next_pred, 2),
         },
+        "base_fee_forecast_gwei": [round(wei_to_gwei(v), 2) for v in store.forecast_base_fee(5)],
         "base_fee_level": level,
         "when_to_send": when_hint,
     }
-    if reward and len(reward) == len(base_fees):
-        # Use 50th percentile tip as reference
-        tips = [wei_to_gwei(int(r[1], 16)) for r in reward if r and len(r) > 1]
-        if tips:
-            out["priority_fee_50pct_gwei"] = round(sum(tips) / len(tips), 2)
+    tips = store.tip_forecast(blocks)
+    if tips:
+        out["priority_fee_50pct_gwei"] = round(tips.get("p50", 0.0), 2)
+        out["priority_fee_forecast_gwei"] = tips
+    seasonality = store.seasonality()
+    if seasonality.get("hours_covered"):
+        out["seasonality"] = seasonality
     return out
 
 
@@ -80,7 +80,7 @@ def main() -> None:
         inp = json.loads(sys.stdin.read())
         chain = inp.get("chain", "ethereum")
         blocks = int(inp.get("blocks", 20))
-        blocks = max(5, min(200, blocks))
+        blocks = max(5, min(DEFAULT_CAPACITY, blocks))
         result = base_fee_predict(chain, blocks)
         print(json.dumps(result, indent=2))
     except json.JSONDecodeError:
@@ -17,6 +17,8 @@ CHAIN_CONFIG: Dict[str, Dict[str, Any]] = {
         "api_key_env": "ETHERSCAN_API_KEY",
         "native_symbol": "ETH",
         "block_time": 12,
+        "eip1559_elasticity": 2,
+        "eip1559_denominator": 8,
     },
     "polygon": {
         "chain_id": 137,
@@ -25,6 +27,8 @@ CHAIN_CONFIG: Dict[str, Dict[str, Any]] = {
         "api_key_env": "POLYGONSCAN_API_KEY",
         "native_symbol": "POL",
         "block_time": 2,
+        "eip1559_elasticity": 2,
+        "eip1559_denominator": 16,
     },
     "arbitrum": {
         "chain_id": 42161,
@@ -41,6 +45,8 @@ CHAIN_CONFIG: Dict[str, Dict[str, Any]] = {
         "api_key_env": "OPTIMISM_API_KEY",
         "native_symbol": "ETH",
         "block_time": 2,
+        "eip1559_elasticity": 6,
+        "eip1559_denominator": 250,
     },
     "base": {
         "chain_id": 8453,
@@ -49,6 +55,8 @@ CHAIN_CONFIG: Dict[str, Dict[str, Any]] = {
         "api_key_env": "BASESCAN_API_KEY",
         "native_symbol": "ETH",
         "block_time": 2,
+        "eip1559_elasticity": 6,
+        "eip1559_denominator": 250,
     },
 }
 
@@ -16,6 +16,7 @@ from common import (
     get_rpc_url,
     rpc_post,
 )
+from fee_history import get_fee_history
 
 
 def wei_to_gwei(wei: int) -> float:
@@ -43,6 +44,15 @@ def get_gas_oracle(chain: str) -> Dict[str, Any]:
     }
 
 
+def next_base_fee_gwei(chain: str) -> Optional[float]:
+    """Next-block base fee from the shared fee-history store (EIP-1559), if available."""
+    try:
+        nxt = get_fee_history(chain, min_blocks=1).predict_next_base_fee()
+    except Exception:
+        return None
+    return wei_to_gwei(nxt) if nxt is not None else None
+
+
 def estimate_optimize(
     chain: str,
     to: str,
@@ -72,7 +82,9 @@ def estimate_optimize(
     suggested_limit = int(estimated * buffer_pct)
 
     oracle = get_gas_oracle(chain)
-    base_gwei = oracle.get("base_fee_gwei")
+    base_gwei = next_base_fee_gwei(chain)
+    if base_gwei is None:
+        base_gwei = oracle.get("base_fee_gwei")
     std_gwei = oracle.get("standard", 25.0)
     if base_gwei is None:
         base_gwei = std_gwei * 0.7
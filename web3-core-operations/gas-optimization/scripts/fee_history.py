@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Fee History – Long-lived, incrementally synced eth_feeHistory store shared by the gas scripts.
+
+Blocks are kept in fixed-size ring buffers and persisted to a local cache file, so
+base_fee_predict, estimate_optimize and optimization_report reuse the same data instead
+of each issuing its own eth_feeHistory. Each sync only fetches blocks newer than the
+cached head. On top of the store: EIP-1559 next-block base fee, multi-block forecast,
+percentile priority-fee forecasts and UTC hour-of-day seasonality.
+stdin JSON → stdout JSON.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from common import CHAIN_CONFIG, get_rpc_url, rpc_post
+
+# Priority-fee percentiles requested for every block
+REWARD_PERCENTILES = [10.0, 25.0, 50.0, 75.0, 90.0]
+DEFAULT_CAPACITY = 4096
+# Most nodes cap eth_feeHistory blockCount at 1024
+FEE_HISTORY_MAX_BLOCKS = 1024
+# Nominal gas limit used to turn gasUsedRatio back into integer gas for the EIP-1559 formula
+NOMINAL_GAS_LIMIT = 10**9
+CACHE_VERSION = 1
+
+
+def wei_to_gwei(wei: int) -> float:
+    return wei / 1e9
+
+
+def get_cache_dir() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-gas-optimization")
+    return os.getenv("GAS_FEE_HISTORY_CACHE", default)
+
+
+def next_base_fee(
+    parent_base_fee: int,
+    gas_used: int,
+    gas_limit: int,
+    elasticity: int = 2,
+    denominator: int = 8,
+) -> int:
+    """EIP-1559 base fee of the child block, in wei (integer math as in the spec)."""
+    gas_target = gas_limit // elasticity
+    if gas_target == 0 or gas_used == gas_target:
+        return parent_base_fee
+    if gas_used > gas_target:
+        delta = parent_base_fee * (gas_used - gas_target) // gas_target // denominator
+        return parent_base_fee + max(delta, 1)
+    delta = parent_base_fee * (gas_target - gas_used) // gas_target // denominator
+    return max(parent_base_fee - delta, 0)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class FeeHistoryStore:
+    """Ring-buffered fee history for one chain, persisted to a JSON cache file."""
+
+    def __init__(self, chain: str, capacity: int = DEFAULT_CAPACITY, cache_dir: Optional[str] = None):
+        if chain not in CHAIN_CONFIG:
+            raise ValueError(f"Unsupported chain: {chain}")
+        self.chain = chain
+        self.capacity = max(FEE_HISTORY_MAX_BLOCKS, int(capacity))
+        self.cache_path = os.path.join(cache_dir or get_cache_dir(), f"fee_history_{chain}.json")
+        cfg = CHAIN_CONFIG[chain]
+        self.block_time = float(cfg["block_time"])
+        self.elasticity: Optional[int] = cfg.get("eip1559_elasticity")
+        self.denominator: Optional[int] = cfg.get("eip1559_denominator")
+
+        self.head: Optional[int] = None
+        self.base_fees: Deque[int] = deque(maxlen=self.capacity)
+        self.gas_used_ratios: Deque[float] = deque(maxlen=self.capacity)
+        self.rewards: Deque[List[int]] = deque(maxlen=self.capacity)
+        self.pending_base_fee: Optional[int] = None
+        self.updated_at = 0.0
+        # Hour-of-day accumulators outlive the ring buffers; counted_range avoids double counting
+        self.hour_sum = [0.0] * 24
+        self.hour_count = [0] * 24
+        self.counted_range: Optional[List[int]] = None
+
+    # ------------------------------------------------------------------ persistence
+
+    @classmethod
+    def load(cls, chain: str, capacity: int = DEFAULT_CAPACITY, cache_dir: Optional[str] = None) -> "FeeHistoryStore":
+        store = cls(chain, capacity, cache_dir)
+        try:
+            with open(store.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return store
+        if data.get("version") != CACHE_VERSION or data.get("chain") != chain:
+            return store
+        if data.get("reward_percentiles") != REWARD_PERCENTILES:
+            return store
+        store.head = data.get("head")
+        store.base_fees.extend(data.get("base_fees", []))
+        store.gas_used_ratios.extend(data.get("gas_used_ratios", []))
+        store.rewards.extend(data.get("rewards", []))
+        store.pending_base_fee = data.get("pending_base_fee")
+        store.updated_at = float(data.get("updated_at", 0))
+        seasonality = data.get("seasonality") or {}
+        if len(seasonality.get("sum", [])) == 24 and len(seasonality.get("count", [])) == 24:
+            store.hour_sum = [float(v) for v in seasonality["sum"]]
+            store.hour_count = [int(v) for v in seasonality["count"]]
+        store.counted_range = data.get("counted_range")
+        if not (len(store.base_fees) == len(store.gas_used_ratios) == len(store.rewards)):
+            return cls(chain, capacity, cache_dir)
+        return store
+
+    def save(self) -> None:
+        data = {
+            "version": CACHE_VERSION,
+            "chain": self.chain,
+            "head": self.head,
+            "reward_percentiles": REWARD_PERCENTILES,
+            "base_fees": list(self.base_fees),
+            "gas_used_ratios": list(self.gas_used_ratios),
+            "rewards": list(self.rewards),
+            "pending_base_fee": self.pending_base_fee,
+            "updated_at": self.updated_at,
+            "seasonality": {"sum": self.hour_sum, "count": self.hour_count},
+            "counted_range": self.counted_range,
+        }
+        directory = os.path.dirname(self.cache_path)
+        os.makedirs(directory, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".fee_history_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    # ------------------------------------------------------------------ syncing
+
+    def __len__(self) -> int:
+        return len(self.base_fees)
+
+    @property
+    def oldest(self) -> Optional[int]:
+        if self.head is None or not self.base_fees:
+            return None
+        return self.head - len(self.base_fees) + 1
+
+    def _fetch_range(self, rpc_url: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """Fetch blocks [start, end] in eth_feeHistory-sized chunks, oldest first."""
+        blocks: List[Dict[str, Any]] = []
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(end, chunk_start + FEE_HISTORY_MAX_BLOCKS - 1)
+            count = chunk_end - chunk_start + 1
+            raw = rpc_post(rpc_url, "eth_feeHistory", [hex(count), hex(chunk_end), REWARD_PERCENTILES])
+            if not raw:
+                raise RuntimeError("Empty eth_feeHistory response")
+            oldest = int(raw["oldestBlock"], 16)
+            fees = raw.get("baseFeePerGas") or []
+            ratios = raw.get("gasUsedRatio") or []
+            rewards = raw.get("reward") or []
+            for i, ratio in enumerate(ratios):
+                blocks.append({
+                    "number": oldest + i,
+                    "base_fee": int(fees[i], 16) if i < len(fees) else 0,
+                    "ratio": float(ratio),
+                    "reward": [int(r, 16) for r in rewards[i]] if i < len(rewards) and rewards[i] else [],
+                })
+            if len(fees) > len(ratios) and oldest + len(ratios) - 1 == chunk_end:
+                blocks[-1]["next_base_fee"] = int(fees[len(ratios)], 16)
+            chunk_start = chunk_end + 1
+        return blocks
+
+    def _count_seasonality(self, blocks: List[Dict[str, Any]], anchor_block: int, anchor_ts: int) -> None:
+        lo, hi = self.counted_range if self.counted_range else (None, None)
+        for b in blocks:
+            n = b["number"]
+            if lo is not None and lo <= n <= hi:
+                continue
+            ts = anchor_ts - (anchor_block - n) * self.block_time
+            hour = int(ts // 3600) % 24
+            self.hour_sum[hour] += wei_to_gwei(b["base_fee"])
+            self.hour_count[hour] += 1
+        numbers = [b["number"] for b in blocks]
+        if numbers:
+            new_lo = min(numbers) if lo is None else min(lo, min(numbers))
+            new_hi = max(numbers) if hi is None else max(hi, max(numbers))
+            self.counted_range = [new_lo, new_hi]
+
+    def sync(self, min_blocks: int = 20, max_age: Optional[float] = None) -> "FeeHistoryStore":
+        """
+        Bring the store up to the chain head, fetching only blocks it does not have yet.
+        Skips the RPC entirely if the cache is younger than max_age (default: one block time)
+        and already holds min_blocks.
+        """
+        min_blocks = max(1, min(int(min_blocks), self.capacity))
+        if max_age is None:
+            max_age = self.block_time
+        if len(self) >= min_blocks and time.time() - self.updated_at < max_age:
+            return self
+
+        rpc_url = get_rpc_url(self.chain)
+        latest = int(rpc_post(rpc_url, "eth_blockNumber", []), 16)
+        anchor = rpc_post(rpc_url, "eth_getBlockByNumber", [hex(latest), False]) or {}
+        anchor_ts = int(anchor.get("timestamp", hex(int(time.time()))), 16)
+
+        if self.head is None or latest - self.head >= self.capacity or latest < self.head:
+            # Empty store, gap larger than the ring, or node behind our cache: start fresh
+            self.head = None
+            self.base_fees.clear()
+            self.gas_used_ratios.clear()
+            self.rewards.clear()
+            start = max(0, latest - min_blocks + 1)
+        else:
+            start = self.head + 1
+
+        if start <= latest:
+            new_blocks = self._fetch_range(rpc_url, start, latest)
+            self._count_seasonality(new_blocks, latest, anchor_ts)
+            for b in new_blocks:
+                if self.head is not None and b["number"] != self.head + 1:
+                    continue
+                self.base_fees.append(b["base_fee"])
+                self.gas_used_ratios.append(b["ratio"])
+                self.rewards.append(b["reward"])
+                self.head = b["number"]
+                self.pending_base_fee = b.get("next_base_fee")
+
+        # Backfill older blocks if the caller wants a longer window than we hold
+        oldest = self.oldest
+        missing = min_blocks - len(self)
+        if oldest is not None and missing > 0 and oldest > 0:
+            old_start = max(0, oldest - missing)
+            old_blocks = self._fetch_range(rpc_url, old_start, oldest - 1)
+            self._count_seasonality(old_blocks, latest, anchor_ts)
+            for b in reversed(old_blocks):
+                if len(self) >= self.capacity or b["number"] != self.oldest - 1:
+                    break
+                self.base_fees.appendleft(b["base_fee"])
+                self.gas_used_ratios.appendleft(b["ratio"])
+                self.rewards.appendleft(b["reward"])
+
+        self.updated_at = time.time()
+        try:
+            self.save()
+        except OSError:
+            pass
+        return self
+
+    # ------------------------------------------------------------------ analytics
+
+    def window(self, blocks: int) -> Dict[str, List[Any]]:
+        """Last `blocks` entries of each buffer, oldest first."""
+        n = min(max(0, int(blocks)), len(self))
+        skip = len(self) - n
+        return {
+            "base_fees": list(self.base_fees)[skip:],
+            "gas_used_ratios": list(self.gas_used_ratios)[skip:],
+            "rewards": list(self.rewards)[skip:],
+        }
+
+    def _next_from(self, base_fee: int, ratio: float) -> int:
+        if self.elasticity is None or self.denominator is None:
+            return base_fee
+        gas_used = int(round(ratio * NOMINAL_GAS_LIMIT))
+        return next_base_fee(base_fee, gas_used, NOMINAL_GAS_LIMIT, self.elasticity, self.denominator)
+
+    def predict_next_base_fee(self) -> Optional[int]:
+        """Next block base fee (wei): as reported by the node, else derived via EIP-1559."""
+        if self.pending_base_fee is not None:
+            return self.pending_base_fee
+        if not self.base_fees:
+            return None
+        return self._next_from(self.base_fees[-1], self.gas_used_ratios[-1])
+
+    def forecast_base_fee(self, horizon: int = 5, ratio_window: int = 20) -> List[int]:
+        """
+        Expected base fee (wei) for the next `horizon` blocks. Block 1 is exact; later blocks
+        assume each block fills at the recent mean gasUsedRatio.
+        """
+        first = self.predict_next_base_fee()
+        if first is None:
+            return []
+        recent = self.window(ratio_window)["gas_used_ratios"]
+        ratio = sum(recent) / len(recent) if recent else 0.5
+        path = [first]
+        for _ in range(max(0, horizon - 1)):
+            path.append(self._next_from(path[-1], ratio))
+        return path
+
+    def tip_forecast(self, blocks: int = 20) -> Dict[str, float]:
+        """Median priority fee (gwei) per reward percentile over recent non-empty blocks."""
+        win = self.window(blocks)
+        columns: Dict[str, List[float]] = {}
+        for ratio, reward in zip(win["gas_used_ratios"], win["rewards"]):
+            if ratio <= 0 or len(reward) != len(REWARD_PERCENTILES):
+                continue
+            for pct, r in zip(REWARD_PERCENTILES, reward):
+                columns.setdefault(f"p{int(pct)}", []).append(wei_to_gwei(r))
+        return {key: round(_percentile(vals, 50.0), 4) for key, vals in columns.items()}
+
+    def seasonality(self) -> Dict[str, Any]:
+        """Average base fee (gwei) per UTC hour, with cheapest/most expensive observed hours."""
+        hourly = {
+            f"{h:02d}": round(self.hour_sum[h] / self.hour_count[h], 2)
+            for h in range(24)
+            if self.hour_count[h]
+        }
+        if not hourly:
+            return {"hourly_avg_gwei": {}, "hours_covered": 0}
+        ordered = sorted(hourly.items(), key=lambda kv: kv[1])
+        return {
+            "hourly_avg_gwei": hourly,
+            "hours_covered": len(hourly),
+            "cheapest_hours_utc": [h for h, _ in ordered[:3]],
+            "priciest_hours_utc": [h for h, _ in ordered[-3:][::-1]],
+        }
+
+    def summary(self, blocks: int = 20) -> Dict[str, Any]:
+        fees = [wei_to_gwei(b) for b in self.window(blocks)["base_fees"]]
+        if not fees:
+            return {}
+        nxt = self.predict_next_base_fee()
+        return {
+            "blocks": len(fees),
+            "head_block": self.head,
+            "avg_gwei": round(sum(fees) / len(fees), 2),
+            "min_gwei": round(min(fees), 2),
+            "max_gwei": round(max(fees), 2),
+            "last_gwei": round(fees[-1], 2),
+            "next_block_gwei": round(wei_to_gwei(nxt), 2) if nxt is not None else None,
+        }
+
+
+def get_fee_history(chain: str, min_blocks: int = 20, max_age: Optional[float] = None) -> FeeHistoryStore:
+    """Load the shared store for `chain` and sync it to the head."""
+    return FeeHistoryStore.load(chain).sync(min_blocks=min_blocks, max_age=max_age)
+
+
+def fee_history(chain: str, blocks: int = 200, horizon: int = 5) -> Dict[str, Any]:
+    store = get_fee_history(chain, blocks)
+    return {
+        "success": True,
+        "chain": chain,
+        "cached_blocks": len(store),
+        "cache_file": store.cache_path,
+        "summary": store.summary(blocks),
+        "forecast_gwei": [round(wei_to_gwei(v), 4) for v in store.forecast_base_fee(horizon)],
+        "priority_fee_forecast_gwei": store.tip_forecast(min(blocks, 50)),
+        "seasonality": store.seasonality(),
+    }
+
+
+def main() -> None:
+    try:
+        inp = json.loads(sys.stdin.read())
+        chain = inp.get("chain", "ethereum")
+        blocks = max(1, min(DEFAULT_CAPACITY, int(inp.get("blocks", 200))))
+        horizon = max(1, min(50, int(inp.get("horizon", 5))))
+        result = fee_history(chain, blocks, horizon)
+        print(json.dumps(result, indent=2))
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON input"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
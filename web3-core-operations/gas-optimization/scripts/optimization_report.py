@@ -15,9 +15,8 @@ from common import (
     GAS_LIMITS,
     fetch_api,
     get_eth_price,
-    get_rpc_url,
-    rpc_post,
 )
+from fee_history import get_fee_history
 
 
 def wei_to_gwei(wei: int) -> float:
@@ -43,19 +42,18 @@ def get_gas_oracle(chain: str) -> Dict[str, Any]:
 
 def fee_history_summary(chain: str, blocks: int = 15) -> Dict[str, Any]:
     try:
-        rpc_url = get_rpc_url(chain)
-        raw = rpc_post(rpc_url, "eth_feeHistory", [hex(blocks), "latest", [50.0]])
+        store = get_fee_history(chain, min_blocks=blocks)
     except Exception:
         return {}
-    base_fees = raw.get("baseFeePerGas") or []
-    if not base_fees:
+    summary = store.summary(blocks)
+    if not summary:
         return {}
-    gwei = [wei_to_gwei(int(b, 16)) for b in base_fees]
     return {
-        "avg_gwei": round(sum(gwei) / len(gwei), 2),
-        "min_gwei": round(min(gwei), 2),
-        "max_gwei": round(max(gwei), 2),
-        "last_gwei": round(gwei[-1], 2),
+        "avg_gwei": summary["avg_gwei"],
+        "min_gwei": summary["min_gwei"],
+        "max_gwei": summary["max_gwei"],
+        "last_gwei": summary["last_gwei"],
+        "next_block_gwei": summary["next_block_gwei"],
     }
 
 
@@ -73,7 +71,7 @@ def optimization_report(chain: str, priority: str = "medium") -> Dict[str, Any]:
     fast = oracle.get("fast", 30)
     base = oracle.get("base_fee_gwei")
     if base is None:
-        base = fee_hist.get("last_gwei") or std * 0.7
+        base = fee_hist.get("next_block_gwei") or fee_hist.get("last_gwei") or std * 0.7
 
     prio_map = {"low": low, "standard": std, "medium": std, "fast": fast}
     selected = prio_map.get(priority, std)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Unit tests for the incremental fee-history store."""
+
+import pytest
+
+import fee_history
+from fee_history import FEE_HISTORY_MAX_BLOCKS, FeeHistoryStore, next_base_fee
+
+GWEI = 10**9
+
+
+class FakeChain:
+    """eth_feeHistory over a synthetic chain: block n has base fee 1 gwei + n wei."""
+
+    def __init__(self, head):
+        self.head = head
+        self.calls = []
+
+    @staticmethod
+    def base_fee(n):
+        return GWEI + n
+
+    def __call__(self, rpc_url, method, params):
+        self.calls.append((method, params))
+        if method == "eth_blockNumber":
+            return hex(self.head)
+        if method == "eth_getBlockByNumber":
+            return {"timestamp": hex(1_700_000_000)}
+        count, newest = int(params[0], 16), int(params[1], 16)
+        oldest = newest - count + 1
+        blocks = range(oldest, newest + 1)
+        return {
+            "oldestBlock": hex(oldest),
+            "baseFeePerGas": [hex(self.base_fee(n)) for n in range(oldest, newest + 2)],
+            "gasUsedRatio": [0.5 for _ in blocks],
+            "reward": [[hex(n)] * len(params[2]) for n in blocks],
+        }
+
+    def fetched(self):
+        """(oldest, newest) of every eth_feeHistory call."""
+        return [
+            (int(p[1], 16) - int(p[0], 16) + 1, int(p[1], 16))
+            for method, p in self.calls if method == "eth_feeHistory"
+        ]
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    fake = FakeChain(head=1000)
+    monkeypatch.setattr(fee_history, "rpc_post", fake)
+    return fake
+
+
+def _store(tmp_path):
+    return FeeHistoryStore.load("ethereum", cache_dir=str(tmp_path))
+
+
+def test_next_base_fee_follows_eip1559():
+    assert next_base_fee(100 * GWEI, 30_000_000, 30_000_000) == 112_500_000_000
+    assert next_base_fee(100 * GWEI, 0, 30_000_000) == 87_500_000_000
+    assert next_base_fee(100 * GWEI, 15_000_000, 30_000_000) == 100 * GWEI
+    assert next_base_fee(7, 15_000_001, 30_000_000) == 8  # increase is at least 1 wei
+
+
+def test_sync_fetches_only_new_blocks(tmp_path, chain):
+    store = _store(tmp_path).sync(min_blocks=20, max_age=0)
+    assert chain.fetched() == [(981, 1000)]
+    assert store.head == 1000 and len(store) == 20
+
+    chain.head = 1003
+    chain.calls.clear()
+    store.sync(min_blocks=20, max_age=0)
+
+    assert chain.fetched() == [(1001, 1003)]
+    assert store.head == 1003 and len(store) == 23
+    assert list(store.base_fees)[-3:] == [chain.base_fee(n) for n in (1001, 1002, 1003)]
+    assert store.predict_next_base_fee() == chain.base_fee(1004)
+
+
+def test_fresh_cache_skips_rpc(tmp_path, chain):
+    _store(tmp_path).sync(min_blocks=20)
+    chain.calls.clear()
+
+    reloaded = _store(tmp_path).sync(min_blocks=20, max_age=60)
+
+    assert chain.calls == []
+    assert reloaded.head == 1000
+    assert reloaded.window(20)["base_fees"] == [chain.base_fee(n) for n in range(981, 1001)]
+
+
+def test_backfills_when_a_longer_window_is_requested(tmp_path, chain):
+    store = _store(tmp_path).sync(min_blocks=20, max_age=0)
+    chain.calls.clear()
+
+    store.sync(min_blocks=50, max_age=0)
+
+    assert chain.fetched() == [(951, 980)]
+    assert store.oldest == 951 and len(store) == 50
+    assert list(store.base_fees) == [chain.base_fee(n) for n in range(951, 1001)]
+
+
+def test_gap_larger_than_ring_starts_fresh(tmp_path, chain):
+    store = _store(tmp_path).sync(min_blocks=20, max_age=0)
+    chain.head += store.capacity + 10
+    chain.calls.clear()
+
+    store.sync(min_blocks=20, max_age=0)
+
+    assert chain.fetched() == [(chain.head - 19, chain.head)]
+    assert store.oldest == chain.head - 19
+
+
+def test_large_ranges_are_chunked(tmp_path, chain):
+    chain.head = 5000
+    store = _store(tmp_path).sync(min_blocks=1500, max_age=0)
+
+    assert chain.fetched() == [(3501, 3501 + FEE_HISTORY_MAX_BLOCKS - 1), (3501 + FEE_HISTORY_MAX_BLOCKS, 5000)]
+    assert len(store) == 1500
+    assert list(store.base_fees) == [chain.base_fee(n) for n in range(3501, 5001)]
+
+
+def test_seasonality_counts_each_block_once(tmp_path, chain):
+    store = _store(tmp_path).sync(min_blocks=20, max_age=0)
+    store.sync(min_blocks=50, max_age=0)
+    chain.head += 5
+    store.sync(min_blocks=50, max_age=0)
+
+    assert sum(store.hour_count) == 55
+    assert store.counted_range == [951, 1005]
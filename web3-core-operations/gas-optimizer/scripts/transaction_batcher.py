@@ -3,9 +3,11 @@ Transaction Batcher - Batch multiple transactions using Multicall
 """
 
 import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from web3 import Web3
-from eth_abi import encode
-from typing import List, Dict, Any
+from eth_abi import encode, decode
+from typing import List, Dict, Any, Optional
 
 
 class TransactionBatcher:
@@ -29,6 +31,16 @@ class TransactionBatcher:
         "stateMutability": "payable",
         "type": "function"
     }]
+    AGGREGATE3_SELECTOR = Web3.keccak(text='aggregate3((address,bool,bytes)[])')[:4]
+    
+    # Batch sizing: multicall base cost, per-call wrapper overhead, fallback block gas limit
+    MULTICALL_BASE_GAS = 26000
+    PER_CALL_OVERHEAD = 5000
+    DEFAULT_BLOCK_GAS_LIMIT = 30_000_000
+    
+    # JSON-RPC batching: calls per HTTP request and max parallel requests
+    RPC_BATCH_SIZE = 100
+    MAX_CONCURRENCY = 8
     
     def __init__(self):
         self.infura_key = os.getenv('INFURA_KEY', '')
@@ -56,15 +68,28 @@ class TransactionBatcher:
         self,
         transactions: List[Dict[str, Any]],
         chain_id: int = 1,
-        allow_failure: bool = False
+        allow_failure: bool = False,
+        from_address: Optional[str] = None,
+        simulate: bool = False,
+        state_overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_block_fraction: float = 0.5
     ) -> Dict[str, Any]:
         """
         Batch multiple transactions into single multicall
         
+        All member estimates, the multicall estimate, the block gas limit and the
+        optional simulation go out as one JSON-RPC batch (split into concurrent
+        sub-batches of RPC_BATCH_SIZE). Batches that would exceed
+        max_block_fraction of the block gas limit are split automatically.
+        
         Args:
             transactions: List of tx dicts with 'to', 'data', 'value'
             chain_id: Network chain ID
             allow_failure: Allow individual calls to fail
+            from_address: Sender used for estimation and simulation
+            simulate: eth_call each aggregate3 and decode per-call results
+            state_overrides: eth_call state override set (e.g. sender balance)
+            max_block_fraction: Max share of the block gas limit per batch
             
         Returns:
             Batched transaction data with gas savings
@@ -85,69 +110,234 @@ class TransactionBatcher:
         total_value = 0
         
         for tx in transactions:
-            call = {
-                'target': Web3.to_checksum_address(tx['to']),
-                'allowFailure': allow_failure,
-                'callData': tx.get('data', '0x')
-            }
-            calls.append(call)
-            total_value += int(tx.get('value', 0))
+            calls.append((
+                Web3.to_checksum_address(tx['to']),
+                allow_failure,
+                Web3.to_bytes(hexstr=tx.get('data') or '0x')
+            ))
+            total_value += self._to_int(tx.get('value', 0))
         
-        # Create multicall contract instance
-        multicall = w3.eth.contract(
-            address=Web3.to_checksum_address(self.MULTICALL3_ADDRESS),
-            abi=self.MULTICALL3_ABI
-        )
+        sender = Web3.to_checksum_address(from_address) if from_address else None
         
-        # Estimate gas for individual transactions
-        individual_gas = 0
-        for tx in transactions:
-            try:
-                gas = w3.eth.estimate_gas({
-                    'to': Web3.to_checksum_address(tx['to']),
-                    'data': tx.get('data', '0x'),
-                    'value': int(tx.get('value', 0))
-                })
-                individual_gas += gas
-            except:
-                individual_gas += 100000  # Fallback estimate
-        
-        # Estimate gas for batched transaction
-        try:
-            batched_gas = multicall.functions.aggregate3(
-                [(c['target'], c['allowFailure'], c['callData']) for c in calls]
-            ).estimate_gas({'value': total_value})
-        except Exception as e:
-            batched_gas = individual_gas * 0.7  # Conservative estimate
+        # Round trip 1: every member, the full multicall, block gas limit, simulation
+        full_data = self._encode_aggregate3(calls)
+        requests_batch = [
+            ('eth_estimateGas', [self._rpc_tx(tx['to'], tx.get('data') or '0x', self._to_int(tx.get('value', 0)), sender)])
+            for tx in transactions
+        ]
+        requests_batch.append(('eth_estimateGas', [self._rpc_tx(self.MULTICALL3_ADDRESS, full_data, total_value, sender)]))
+        requests_batch.append(('eth_getBlockByNumber', ['latest', False]))
+        if simulate:
+            requests_batch.append(self._simulation_request(full_data, total_value, sender, state_overrides))
+        responses = self._rpc_batch(chain_id, requests_batch)
+        
+        n = len(transactions)
+        member_gas = [self._hex_result(r, 100000) for r in responses[:n]]  # Fallback estimate
+        individual_gas = sum(member_gas)
+        full_estimate = responses[n]
+        block = (responses[n + 1] or {}).get('result') or {}
+        block_gas_limit = self._to_int(block.get('gasLimit', 0)) or self.DEFAULT_BLOCK_GAS_LIMIT
         
+        chunks = self._split_by_gas(member_gas, int(block_gas_limit * max_block_fraction))
+        
+        if len(chunks) == 1:
+            chunk_data = [full_data]
+            chunk_values = [total_value]
+            estimates = [full_estimate]
+            simulations = [responses[n + 2]] if simulate else [None]
+        else:
+            # Round trip 2: re-estimate (and simulate) each split batch, encoded once each
+            chunk_data = [self._encode_aggregate3([calls[i] for i in chunk]) for chunk in chunks]
+            chunk_values = [
+                sum(self._to_int(transactions[i].get('value', 0)) for i in chunk) for chunk in chunks
+            ]
+            chunk_requests = [
+                ('eth_estimateGas', [self._rpc_tx(self.MULTICALL3_ADDRESS, data, value, sender)])
+                for data, value in zip(chunk_data, chunk_values)
+            ]
+            if simulate:
+                chunk_requests.extend(
+                    self._simulation_request(data, value, sender, state_overrides)
+                    for data, value in zip(chunk_data, chunk_values)
+                )
+            chunk_responses = self._rpc_batch(chain_id, chunk_requests)
+            estimates = chunk_responses[:len(chunks)]
+            simulations = chunk_responses[len(chunks):] if simulate else [None] * len(chunks)
+        
+        batches = []
+        for chunk, data, value, estimate, simulation in zip(chunks, chunk_data, chunk_values, estimates, simulations):
+            chunk_individual = sum(member_gas[i] for i in chunk)
+            batch = {
+                'transaction_indices': chunk,
+                'gas_estimate': self._hex_result(estimate, int(chunk_individual * 0.7)),  # Conservative estimate
+                'batched_transaction': {
+                    'to': self.MULTICALL3_ADDRESS,
+                    'data': data,
+                    'value': value,
+                    'chainId': chain_id
+                }
+            }
+            if simulate:
+                batch['simulation'] = self._decode_simulation(simulation, chunk)
+            batches.append(batch)
+        
+        batched_gas = sum(b['gas_estimate'] for b in batches)
         gas_saved = individual_gas - batched_gas
         savings_percentage = (gas_saved / individual_gas) * 100 if individual_gas > 0 else 0
         
-        # Build the batched transaction
-        batched_tx = {
-            'to': self.MULTICALL3_ADDRESS,
-            'data': multicall.functions.aggregate3(
-                [(c['target'], c['allowFailure'], c['callData']) for c in calls]
-            ).build_transaction({'value': total_value, 'gas': 0})['data'],
-            'value': total_value,
-            'chainId': chain_id
-        }
-        
-        return {
+        result = {
             'success': True,
             'chain_id': chain_id,
             'transactions_batched': len(transactions),
             'multicall_address': self.MULTICALL3_ADDRESS,
             'gas_estimates': {
                 'individual_total': individual_gas,
+                'individual': member_gas,
                 'batched': batched_gas,
                 'saved': gas_saved,
                 'savings_percentage': round(savings_percentage, 2)
             },
-            'batched_transaction': batched_tx,
+            'block_gas_limit': block_gas_limit,
+            'batch_count': len(batches),
+            'batches': batches,
+            # Kept for single-multicall callers; None when the set was split
+            'batched_transaction': batches[0]['batched_transaction'] if len(batches) == 1 else None,
             'total_value': total_value,
             'allow_failure': allow_failure
         }
+        if simulate:
+            result['simulation_verified'] = all(b['simulation']['verified'] for b in batches)
+        return result
+    
+    def _encode_aggregate3(self, calls: List[tuple]) -> str:
+        """ABI-encode aggregate3(calls) calldata in a single pass"""
+        return '0x' + (self.AGGREGATE3_SELECTOR + encode(['(address,bool,bytes)[]'], [calls])).hex()
+    
+    def _rpc_tx(self, to: str, data: str, value: int, sender: Optional[str]) -> Dict[str, Any]:
+        tx = {'to': Web3.to_checksum_address(to), 'data': data, 'value': hex(value)}
+        if sender:
+            tx['from'] = sender
+        return tx
+    
+    def _simulation_request(
+        self,
+        data: str,
+        value: int,
+        sender: Optional[str],
+        state_overrides: Optional[Dict[str, Dict[str, Any]]]
+    ) -> tuple:
+        params = [self._rpc_tx(self.MULTICALL3_ADDRESS, data, value, sender), 'latest']
+        if state_overrides:
+            params.append(state_overrides)
+        return ('eth_call', params)
+    
+    def _decode_simulation(self, response: Optional[Dict[str, Any]], indices: List[int]) -> Dict[str, Any]:
+        """Decode aggregate3 eth_call output into per-transaction success flags"""
+        if not response or 'error' in response or response.get('result') is None:
+            error = (response or {}).get('error', {})
+            return {
+                'verified': False,
+                'error': error.get('message', 'Simulation failed') if isinstance(error, dict) else str(error)
+            }
+        try:
+            (results,) = decode(['(bool,bytes)[]'], Web3.to_bytes(hexstr=response['result']))
+        except Exception as e:
+            return {'verified': False, 'error': f"Could not decode aggregate3 result: {e}"}
+        calls = [
+            {'index': i, 'success': ok, 'return_data': '0x' + ret.hex()}
+            for i, (ok, ret) in zip(indices, results)
+        ]
+        return {
+            'verified': all(c['success'] for c in calls),
+            'failed_indices': [c['index'] for c in calls if not c['success']],
+            'calls': calls
+        }
+    
+    def _split_by_gas(self, member_gas: List[int], gas_budget: int) -> List[List[int]]:
+        """Greedily pack transaction indices into batches that fit the gas budget"""
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_gas = self.MULTICALL_BASE_GAS
+        for i, gas in enumerate(member_gas):
+            # The 21k intrinsic cost is paid once by the multicall, not per inner call
+            call_gas = max(gas - 21000, 0) + self.PER_CALL_OVERHEAD
+            if current and current_gas + call_gas > gas_budget:
+                chunks.append(current)
+                current = []
+                current_gas = self.MULTICALL_BASE_GAS
+            current.append(i)
+            current_gas += call_gas
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _rpc_batch(self, chain_id: int, calls: List[tuple]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Send JSON-RPC calls as batch requests, RPC_BATCH_SIZE per HTTP request,
+        with the sub-batches posted concurrently. Falls back to concurrent single
+        requests when the endpoint rejects batching.
+        
+        Returns:
+            One response dict ('result' or 'error') per call, in order
+        """
+        rpc_url = self.rpc_urls[chain_id]
+        payloads = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        groups = [payloads[i:i + self.RPC_BATCH_SIZE] for i in range(0, len(payloads), self.RPC_BATCH_SIZE)]
+        
+        w3 = self.web3_instances[chain_id]
+        
+        def post_group(group: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+            try:
+                response = requests.post(rpc_url, json=group, timeout=30)
+                data = response.json()
+                if isinstance(data, list):
+                    return data
+            except Exception:
+                pass
+            return None
+        
+        def post_single(payload: Dict[str, Any]) -> Dict[str, Any]:
+            return dict(self._make_request(w3, payload['method'], payload['params']), id=payload['id'])
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENCY, len(groups)) or 1) as pool:
+            responses: List[Dict[str, Any]] = []
+            rejected: List[Dict[str, Any]] = []
+            for group, data in zip(groups, pool.map(post_group, groups)):
+                if data is None:
+                    rejected.extend(group)
+                else:
+                    responses.extend(data)
+        if rejected:
+            # Endpoint rejected batching: one flat pool of single requests
+            with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENCY, len(rejected))) as pool:
+                responses.extend(pool.map(post_single, rejected))
+        by_id = {r.get('id'): r for r in responses if isinstance(r, dict)}
+        return [by_id.get(i) for i in range(len(calls))]
+    
+    @staticmethod
+    def _make_request(w3: Web3, method: str, params: List[Any]) -> Dict[str, Any]:
+        try:
+            return dict(w3.provider.make_request(method, params))
+        except Exception as e:
+            return {'error': {'message': str(e)}}
+    
+    @staticmethod
+    def _hex_result(response: Optional[Dict[str, Any]], fallback: int) -> int:
+        if not response or response.get('result') is None:
+            return fallback
+        try:
+            return int(response['result'], 16)
+        except (TypeError, ValueError):
+            return fallback
+    
+    @staticmethod
+    def _to_int(value: Any) -> int:
+        if isinstance(value, str):
+            return int(value, 16) if value.startswith('0x') else int(value or 0)
+        return int(value or 0)
     
     def estimate_batch_savings(
         self,
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+NFT Collection Rarity Indexer
+Ingests every token's traits once (concurrently, with a local cache) and
+ranks the whole collection by statistical rarity, information content and
+rarity score using NumPy over a token x trait-type frequency matrix
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    print(json.dumps({"error": "numpy required for collection rarity. Install with: pip install numpy"}))
+    sys.exit(1)
+
+from nft_rarity import OPENSEA_API_V2, fetch_json, get_rarity_tier
+
+PAGE_LIMIT = 200
+DEFAULT_MAX_WORKERS = 8
+MAX_RETRIES = 5
+# Save the metadata cache every N newly fetched tokens so interrupted ingests resume
+CACHE_SAVE_EVERY = 500
+
+# Category used for tokens that lack a trait type (counts as a trait, like rarity.tools)
+MISSING_VALUE = "<none>"
+TRAIT_COUNT_TYPE = "Trait Count"
+
+METRICS = ("rarity_score", "information_content", "statistical")
+
+
+def _cache_dir() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "spoon-nft")
+    return os.getenv("NFT_RARITY_CACHE", default)
+
+
+def _cache_prefix(collection: str, chain: str) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in collection.lower())
+    return os.path.join(_cache_dir(), f"{chain}_{safe}")
+
+
+def _atomic_write(path: str, write) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _fetch_with_retry(url: str, api_key: Optional[str]) -> dict:
+    """fetch_json with exponential backoff on rate limiting (HTTP 429) and 5xx."""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return fetch_json(url, api_key)
+        except ConnectionError as e:
+            message = str(e)
+            retryable = "429" in message or "API error: 5" in message or "Failed to fetch" in message
+            if not retryable or attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(min(30, 2 ** attempt))
+    raise ConnectionError("Max retries exceeded")
+
+
+def _is_address(collection: str) -> bool:
+    return collection.startswith("0x") and len(collection) == 42
+
+
+def fetch_total_supply(collection: str, chain: str, api_key: Optional[str]) -> Optional[int]:
+    """Current total supply from OpenSea collection stats, or None if unavailable.
+
+    Args:
+        collection: OpenSea collection slug or contract address.
+        chain: Chain name for contract-address collections.
+        api_key: OpenSea API key.
+    """
+    try:
+        slug = collection
+        if _is_address(collection):
+            contract = _fetch_with_retry(f"{OPENSEA_API_V2}/chain/{chain}/contract/{collection}", api_key)
+            slug = contract.get("collection") or ""
+            if not slug:
+                return None
+        data = _fetch_with_retry(f"{OPENSEA_API_V2}/collections/{urllib.parse.quote(slug)}", api_key)
+    except ConnectionError:
+        return None
+    supply = data.get("total_supply")
+    return int(supply) if isinstance(supply, (int, float)) else None
+
+
+def list_collection_tokens(
+    collection: str, chain: str, api_key: Optional[str]
+) -> List[Tuple[str, str]]:
+    """All (contract, identifier) pairs in a collection via cursor pagination.
+
+    Args:
+        collection: OpenSea collection slug or contract address.
+        chain: Chain name for contract-address collections.
+        api_key: OpenSea API key.
+
+    Returns:
+        List of (contract address, token identifier) tuples.
+    """
+    if _is_address(collection):
+        base = f"{OPENSEA_API_V2}/chain/{chain}/contract/{collection}/nfts"
+    else:
+        base = f"{OPENSEA_API_V2}/collection/{urllib.parse.quote(collection)}/nfts"
+
+    tokens: List[Tuple[str, str]] = []
+    cursor: Optional[str] = None
+    while True:
+        params = {"limit": PAGE_LIMIT}
+        if cursor:
+            params["next"] = cursor
+        data = _fetch_with_retry(f"{base}?{urllib.parse.urlencode(params)}", api_key)
+        for nft in data.get("nfts", []):
+            contract = nft.get("contract") or (collection if _is_address(collection) else "")
+            tokens.append((contract, str(nft.get("identifier"))))
+        cursor = data.get("next")
+        if not cursor:
+            return tokens
+
+
+def ingest_collection(
+    collection: str,
+    chain: str = "ethereum",
+    api_key: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    refresh: bool = False,
+    total_supply: Optional[int] = None,
+) -> Tuple[Dict[str, List[List[str]]], bool]:
+    """Token traits for a whole collection, fetched once and cached on disk.
+
+    Token identifiers are listed with cursor pagination; per-token metadata
+    (which carries the traits) is fetched concurrently. Already-cached tokens
+    are skipped and progress is saved periodically, so an interrupted ingest
+    resumes where it stopped. A complete cache is reused only while the
+    collection's total supply matches the one recorded with it; otherwise the
+    token list is fetched again, burned tokens are dropped and new ones added.
+
+    Args:
+        collection: OpenSea collection slug or contract address.
+        chain: Blockchain network.
+        api_key: OpenSea API key.
+        max_workers: Concurrent metadata requests.
+        refresh: Ignore the cache and refetch everything.
+        total_supply: Current supply (see fetch_total_supply); None skips the check.
+
+    Returns:
+        (mapping token_id -> [[trait_type, value], ...], whether every listed
+        token was fetched). Tokens that still fail after retries are left out
+        and retried on the next call.
+    """
+    path = _cache_prefix(collection, chain) + ".json"
+    cache: Dict[str, Any] = {}
+    if not refresh:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    tokens: Dict[str, List[List[str]]] = cache.get("tokens", {})
+    if cache.get("complete") and (total_supply is None or cache.get("total_supply") == total_supply):
+        return tokens, True
+
+    def save(complete: bool) -> None:
+        payload = json.dumps({"collection": collection, "chain": chain, "complete": complete,
+                              "total_supply": total_supply, "updated_at": time.time(),
+                              "tokens": tokens}).encode("utf-8")
+        _atomic_write(path, lambda f: f.write(payload))
+
+    listing = list_collection_tokens(collection, chain, api_key)
+    listed = {token_id for _, token_id in listing}
+    for token_id in [tid for tid in tokens if tid not in listed]:
+        del tokens[token_id]
+    missing = [(contract, token_id) for contract, token_id in listing if token_id not in tokens]
+
+    def fetch(contract: str, token_id: str) -> Tuple[str, List[List[str]]]:
+        url = f"{OPENSEA_API_V2}/chain/{chain}/contract/{contract}/nfts/{urllib.parse.quote(token_id)}"
+        nft = _fetch_with_retry(url, api_key).get("nft", {})
+        traits = [
+            [str(t.get("trait_type", "Unknown")), str(t.get("value", "Unknown"))]
+            for t in nft.get("traits") or []
+        ]
+        return token_id, traits
+
+    fetched = failed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [pool.submit(fetch, contract, token_id) for contract, token_id in missing]
+            for future in as_completed(futures):
+                try:
+                    token_id, traits = future.result()
+                except ConnectionError:
+                    failed += 1
+                    continue
+                tokens[token_id] = traits
+                fetched += 1
+                if fetched % CACHE_SAVE_EVERY == 0:
+                    save(False)
+    except BaseException:
+        save(False)
+        raise
+    save(failed == 0)
+    return tokens, failed == 0
+
+
+def _competition_ranks(values: "np.ndarray", descending: bool) -> "np.ndarray":
+    """Competition ranks (1 = rarest); ties share the best rank."""
+    keys = -values if descending else values
+    sorted_keys = np.sort(keys)
+    return np.searchsorted(sorted_keys, keys, side="left").astype(np.int64) + 1
+
+
+class CollectionRarityIndex:
+    """Precomputed rarity metrics and ranks for every token in a collection.
+
+    Trait values are encoded per trait type into an (N tokens x T trait types)
+    code matrix; np.bincount gives value counts per column and fancy indexing
+    turns them into a frequency matrix F in one pass. From F:
+
+      - statistical rarity: prod(F) per token (lower is rarer), ranked on
+        sum(log2 F) since the product underflows for large trait sets
+      - information content: -sum(log2 F), normalized by collection entropy
+      - rarity score: sum(1 / F) (rarity.tools style)
+      - score/tier: the per-trait log-scale score used by nft_rarity
+
+    Tokens missing a trait type get a "<none>" value for it, and the number of
+    traits is included as its own trait type. Lookups are O(1) by token id.
+
+    Args:
+        tokens: Mapping token_id -> [[trait_type, value], ...].
+        include_trait_count: Treat the number of traits as a trait type.
+    """
+
+    def __init__(self, tokens: Dict[str, List[List[str]]], include_trait_count: bool = True):
+        self.token_ids: List[str] = list(tokens)
+        self.position: Dict[str, int] = {tid: i for i, tid in enumerate(self.token_ids)}
+        n = len(self.token_ids)
+
+        trait_types: Dict[str, int] = {}
+        for traits in tokens.values():
+            for trait_type, _ in traits:
+                trait_types.setdefault(trait_type, len(trait_types))
+        if include_trait_count:
+            trait_types.setdefault(TRAIT_COUNT_TYPE, len(trait_types))
+        self.trait_types: List[str] = list(trait_types)
+        t = len(self.trait_types)
+
+        # Code 0 in every column is MISSING_VALUE
+        self.values: List[List[str]] = [[MISSING_VALUE] for _ in range(t)]
+        lookup: List[Dict[str, int]] = [{MISSING_VALUE: 0} for _ in range(t)]
+        codes = np.zeros((n, t), dtype=np.int32)
+        self.trait_totals = np.zeros(n, dtype=np.int32)
+        for row, tid in enumerate(self.token_ids):
+            traits = tokens[tid]
+            for trait_type, value in traits:
+                col = trait_types[trait_type]
+                code = lookup[col].get(value)
+                if code is None:
+                    code = lookup[col][value] = len(self.values[col])
+                    self.values[col].append(value)
+                codes[row, col] = code
+            self.trait_totals[row] = len(traits)
+        if include_trait_count:
+            col = trait_types[TRAIT_COUNT_TYPE]
+            for row in range(n):
+                value = str(int(self.trait_totals[row]))
+                code = lookup[col].get(value)
+                if code is None:
+                    code = lookup[col][value] = len(self.values[col])
+                    self.values[col].append(value)
+                codes[row, col] = code
+        self.codes = codes
+        self.complete = True
+        # Collection supply the index was built against, if known
+        self.total_supply: Optional[int] = None
+        self._compute()
+
+    def _compute(self) -> None:
+        n, t = self.codes.shape
+        self.counts: List["np.ndarray"] = [
+            np.bincount(self.codes[:, j], minlength=len(self.values[j])) for j in range(t)
+        ]
+        if n == 0 or t == 0:
+            freq = np.ones((n, t))
+        else:
+            freq = np.column_stack([self.counts[j][self.codes[:, j]] for j in range(t)]) / n
+        self.freq = freq
+
+        log_f = np.log2(freq) if freq.size else freq
+        self.statistical_log2 = log_f.sum(axis=1) if t else np.zeros(n)
+        # Display value only: exp2 underflows to 0.0 below 2**-1074
+        self.statistical = np.exp2(self.statistical_log2)
+        entropy = 0.0
+        for j in range(t):
+            p = self.counts[j][self.counts[j] > 0] / max(n, 1)
+            entropy += float(-(p * np.log2(p)).sum())
+        self.entropy = entropy
+        ic = -log_f.sum(axis=1) if t else np.zeros(n)
+        self.information_content = ic / entropy if entropy > 0 else ic
+        self.rarity_score = (1.0 / freq).sum(axis=1) if t else np.zeros(n)
+
+        # Same per-trait scale as calculate_trait_rarity, over the token's real traits
+        present = self.codes != 0
+        if TRAIT_COUNT_TYPE in self.trait_types:
+            present[:, self.trait_types.index(TRAIT_COUNT_TYPE)] = False
+        trait_score = np.clip(-np.log10(freq + 0.001) * 2.5, 0, 10) * present
+        num_traits = present.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.score = np.where(num_traits > 0, trait_score.sum(axis=1) / (num_traits * 10) * 100, 0.0)
+
+        self.ranks: Dict[str, "np.ndarray"] = {
+            "rarity_score": _competition_ranks(self.rarity_score, descending=True),
+            "information_content": _competition_ranks(self.information_content, descending=True),
+            "statistical": _competition_ranks(self.statistical_log2, descending=False),
+        }
+        self.order: Dict[str, "np.ndarray"] = {
+            metric: np.argsort(ranks, kind="stable") for metric, ranks in self.ranks.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def lookup(self, token_id: str) -> Optional[Dict[str, Any]]:
+        """Ranks and metrics for one token, or None if it is not indexed."""
+        row = self.position.get(str(token_id))
+        if row is None:
+            return None
+        return self._record(row, traits=True)
+
+    def top(self, n: int = 10, metric: str = "rarity_score") -> List[Dict[str, Any]]:
+        """The n rarest tokens by the given metric."""
+        return [self._record(int(row), traits=False) for row in self.order[metric][:n]]
+
+    def _record(self, row: int, traits: bool) -> Dict[str, Any]:
+        supply = len(self.token_ids)
+        record: Dict[str, Any] = {
+            "token_id": self.token_ids[row],
+            "ranks": {metric: int(self.ranks[metric][row]) for metric in METRICS},
+            "rarity_score": round(float(self.rarity_score[row]), 2),
+            "information_content": round(float(self.information_content[row]), 4),
+            "statistical_rarity": float(self.statistical[row]),
+            "statistical_rarity_log2": round(float(self.statistical_log2[row]), 4),
+            "percentile": round(100.0 * (1 - (int(self.ranks["rarity_score"][row]) - 1) / supply), 2),
+            "score": round(float(self.score[row]), 2),
+            "tier": get_rarity_tier(float(self.score[row])),
+        }
+        if traits:
+            breakdown = []
+            for col, trait_type in enumerate(self.trait_types):
+                code = int(self.codes[row, col])
+                count = int(self.counts[col][code])
+                breakdown.append({
+                    "trait_type": trait_type,
+                    "value": self.values[col][code],
+                    "count": count,
+                    "rarity_pct": round(count / supply * 100, 2),
+                    "rarity_score": round(supply / count, 2),
+                })
+            breakdown.sort(key=lambda t: t["count"])
+            record["traits"] = breakdown
+        return record
+
+    def save(self, path: str) -> None:
+        """Persist the index (codes and value tables) to an .npz file."""
+        meta = json.dumps({"token_ids": self.token_ids, "trait_types": self.trait_types,
+                           "values": self.values, "total_supply": self.total_supply}).encode("utf-8")
+
+        def write(f) -> None:
+            np.savez_compressed(f, codes=self.codes, trait_totals=self.trait_totals,
+                                meta=np.frombuffer(meta, dtype=np.uint8))
+
+        _atomic_write(path, write)
+
+    @classmethod
+    def load(cls, path: str) -> "CollectionRarityIndex":
+        """Load an index written by save(); metrics are recomputed vectorized."""
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            index = cls.__new__(cls)
+            index.codes = data["codes"]
+            index.trait_totals = data["trait_totals"]
+        index.token_ids = meta["token_ids"]
+        index.trait_types = meta["trait_types"]
+        index.values = meta["values"]
+        index.total_supply = meta.get("total_supply")
+        index.position = {tid: i for i, tid in enumerate(index.token_ids)}
+        index.complete = True
+        index._compute()
+        return index
+
+
+def get_collection_index(
+    collection: str,
+    chain: str = "ethereum",
+    api_key: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    refresh: bool = False,
+) -> CollectionRarityIndex:
+    """Load the collection's rarity index from disk, ingesting and building it if needed.
+
+    Cached indexes are rebuilt when the collection's current total supply
+    differs from the one they were built against (mints, burns, reveals).
+    """
+    index_path = _cache_prefix(collection, chain) + ".npz"
+    total_supply = fetch_total_supply(collection, chain, api_key)
+    if not refresh and os.path.exists(index_path):
+        try:
+            index = CollectionRarityIndex.load(index_path)
+            if total_supply is None or index.total_supply == total_supply:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+    tokens, complete = ingest_collection(collection, chain, api_key, max_workers, refresh, total_supply)
+    if not tokens:
+        raise ValueError(f"No tokens found for collection: {collection}")
+    index = CollectionRarityIndex(tokens)
+    index.complete = complete
+    index.total_supply = total_supply
+    if complete:
+        try:
+            index.save(index_path)
+        except OSError:
+            pass
+    return index
+
+
+def rank_collection(
+    collection: str,
+    chain: str = "ethereum",
+    token_ids: Optional[List[str]] = None,
+    top: int = 10,
+    metric: str = "rarity_score",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    refresh: bool = False,
+) -> dict:
+    """Rank tokens within their collection"""
+    api_key = os.getenv("OPENSEA_API_KEY")
+    started = time.time()
+    index = get_collection_index(collection, chain, api_key, max_workers, refresh)
+
+    result: Dict[str, Any] = {
+        "success": True,
+        "collection": collection,
+        "chain": chain,
+        "supply": len(index),
+        "trait_types": len(index.trait_types),
+        "complete": index.complete,
+        "metric": metric,
+        "elapsed_seconds": round(time.time() - started, 3),
+    }
+    if token_ids:
+        result["tokens"] = [index.lookup(tid) or {"token_id": tid, "error": "Token not in collection index"}
+                            for tid in token_ids]
+    if top:
+        result["top"] = index.top(top, metric)
+    return result
+
+
+def main():
+    try:
+        input_data = json.loads(sys.stdin.read())
+
+        collection = input_data.get("collection")
+        if not collection:
+            print(json.dumps({"error": "Missing required parameter: collection"}))
+            sys.exit(1)
+
+        metric = input_data.get("metric", "rarity_score")
+        if metric not in METRICS:
+            print(json.dumps({"error": f"Invalid metric. Use one of: {', '.join(METRICS)}"}))
+            sys.exit(1)
+
+        token_ids = input_data.get("token_ids") or []
+        if input_data.get("token_id") is not None:
+            token_ids = [input_data["token_id"]] + list(token_ids)
+
+        result = rank_collection(
+            collection,
+            chain=input_data.get("chain", "ethereum"),
+            token_ids=[str(t) for t in token_ids],
+            top=int(input_data.get("top", 0 if token_ids else 10)),
+            metric=metric,
+            max_workers=int(input_data.get("max_workers", DEFAULT_MAX_WORKERS)),
+            refresh=bool(input_data.get("refresh", False)),
+        )
+        print(json.dumps(result, indent=2))
+
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON input"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
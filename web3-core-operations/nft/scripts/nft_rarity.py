@@ -128,8 +128,8 @@ def get_nft_metadata(collection: str, token_id: str, api_key: str = None) -> dic
     raise ValueError(f"NFT not found: {collection} #{token_id}")
 
 
-def calculate_rarity(collection: str, token_id: str) -> dict:
-    """Calculate rarity for a specific NFT"""
+def calculate_rarity(collection: str, token_id: str, collection_rank: bool = False) -> dict:
+    """Calculate rarity for a specific NFT (optionally ranked within its collection)"""
     api_key = os.getenv("OPENSEA_API_KEY")
 
     # Get NFT metadata
@@ -148,7 +148,7 @@ def calculate_rarity(collection: str, token_id: str) -> dict:
     # Calculate rarity
     rarity_result = calculate_statistical_rarity(traits, total_supply)
 
-    return {
+    result = {
         "success": True,
         "nft": {
             "collection": collection,
@@ -171,6 +171,21 @@ def calculate_rarity(collection: str, token_id: str) -> dict:
         }
     }
 
+    if collection_rank:
+        # Imported lazily: the collection index needs numpy and a full ingest
+        from collection_rarity import get_collection_index
+
+        index = get_collection_index(collection, api_key=api_key)
+        ranked = index.lookup(token_id)
+        result["collection_rank"] = {
+            "supply": len(index),
+            "ranks": ranked["ranks"],
+            "rarity_score": ranked["rarity_score"],
+            "percentile": ranked["percentile"],
+        } if ranked else None
+
+    return result
+
 
 def get_recommendation(score: float, tier: str) -> str:
     """Get investment recommendation based on rarity"""
@@ -197,7 +212,7 @@ def main():
             print(json.dumps({"error": "Missing required parameters: collection, token_id"}))
             sys.exit(1)
 
-        result = calculate_rarity(collection, str(token_id))
+        result = calculate_rarity(collection, str(token_id), bool(input_data.get("collection_rank", False)))
         print(json.dumps(result, indent=2))
 
     except json.JSONDecodeError:
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Portfolio Snapshot Script
+Reads native and ERC20 balances for many wallets across chains via Multicall3
+"""
+
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+AGGREGATE3_SELECTOR = "82ad56cb"  # aggregate3((address,bool,bytes)[])
+GET_ETH_BALANCE_SELECTOR = "4d2301cc"  # getEthBalance(address) on Multicall3
+BALANCE_OF_SELECTOR = "70a08231"  # balanceOf(address)
+
+# Calls per aggregate3 (keeps each eth_call well under node gas caps)
+MAX_CALLS_PER_AGGREGATE = 500
+# aggregate3 eth_calls sent per JSON-RPC batch request
+RPC_BATCH_SIZE = 10
+MAX_CHAIN_WORKERS = 8
+MAX_BATCH_WORKERS = 4
+MAX_WALLETS = 10000
+
+# RPC URLs sourced from Chainlist.org; override with <CHAIN>_RPC_URL (RPC_URL for ethereum)
+CHAIN_CONFIG = {
+    "ethereum": {"chain_id": 1, "rpc_url": "https://eth.llamarpc.com", "native_symbol": "ETH"},
+    "polygon": {"chain_id": 137, "rpc_url": "https://polygon-rpc.com", "native_symbol": "POL"},
+    "arbitrum": {"chain_id": 42161, "rpc_url": "https://arb1.arbitrum.io/rpc", "native_symbol": "ETH"},
+    "optimism": {"chain_id": 10, "rpc_url": "https://mainnet.optimism.io", "native_symbol": "ETH"},
+    "base": {"chain_id": 8453, "rpc_url": "https://mainnet.base.org", "native_symbol": "ETH"},
+}
+
+# Default token set per chain: symbol -> (address, decimals)
+DEFAULT_TOKENS = {
+    "ethereum": {
+        "USDC": ("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", 6),
+        "USDT": ("0xdAC17F958D2ee523a2206206994597C13D831ec7", 6),
+        "DAI": ("0x6B175474E89094C44Da98b954EeacdeCB5BE3830", 18),
+        "WETH": ("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", 18),
+        "WBTC": ("0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599", 8),
+    },
+    "polygon": {
+        "USDC": ("0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174", 6),
+        "USDT": ("0xc2132D05D31c914a87C6611C10748AEb04B58e8F", 6),
+        "WETH": ("0x7ceB23fD6bC0adD59E62ac25578270cFf1b9f619", 18),
+    },
+    "arbitrum": {
+        "USDC": ("0xaf88d065e77c8cC2239327C5EDb3A432268e5831", 6),
+        "USDT": ("0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9", 6),
+        "WETH": ("0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", 18),
+    },
+    "optimism": {
+        "USDC": ("0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85", 6),
+        "USDT": ("0x94b008aA00579c1307B0EF2c499aD98a8ce58e58", 6),
+        "WETH": ("0x4200000000000000000000000000000000000006", 18),
+    },
+    "base": {
+        "USDC": ("0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", 6),
+        "WETH": ("0x4200000000000000000000000000000000000006", 18),
+    },
+}
+
+
+def get_rpc_url(chain: str) -> Optional[str]:
+    """RPC endpoint for a chain (environment override first)"""
+    config = CHAIN_CONFIG.get(chain)
+    if not config:
+        return None
+    override = os.getenv(f"{chain.upper()}_RPC_URL")
+    if not override and chain == "ethereum":
+        override = os.getenv("RPC_URL")
+    return override or config["rpc_url"]
+
+
+def rpc_batch(rpc_url: str, calls: List[Tuple[str, list]]) -> List[dict]:
+    """Send JSON-RPC calls as one batch request; responses are returned in call order.
+
+    Providers that reject batches are retried one request per call.
+    """
+    payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    body = json.dumps(payload if len(payload) > 1 else payload[0]).encode()
+    req = urllib.request.Request(rpc_url, data=body, headers={
+        "Content-Type": "application/json",
+        "User-Agent": "PortfolioSnapshot/1.0",
+    })
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            data = json.loads(response.read().decode())
+    except urllib.error.URLError as e:
+        raise ConnectionError(f"RPC request failed: {e}")
+
+    if isinstance(data, dict):
+        if len(calls) == 1:
+            return [data]
+        # Batch not supported: one request per call
+        return [rpc_batch(rpc_url, [call])[0] for call in calls]
+
+    by_id = {item.get("id"): item for item in data}
+    return [by_id.get(i, {"error": {"message": "missing response"}}) for i in range(len(calls))]
+
+
+def _word(value: int) -> str:
+    return format(value, "064x")
+
+
+def _address_word(address: str) -> str:
+    return address.lower().replace("0x", "").zfill(64)
+
+
+def encode_aggregate3(calls: List[Tuple[str, str]]) -> str:
+    """ABI-encode aggregate3 for (target, calldata_hex) calls, all with allowFailure=true"""
+    heads = []
+    tails = []
+    offset = 32 * len(calls)
+    for target, data in calls:
+        data = data.replace("0x", "")
+        padded = data + "0" * (-len(data) % 64)
+        tail = _address_word(target) + _word(1) + _word(0x60) + _word(len(data) // 2) + padded
+        heads.append(_word(offset))
+        tails.append(tail)
+        offset += len(tail) // 2
+    return "0x" + AGGREGATE3_SELECTOR + _word(0x20) + _word(len(calls)) + "".join(heads) + "".join(tails)
+
+
+def decode_aggregate3(result_hex: str) -> List[Tuple[bool, bytes]]:
+    """Decode aggregate3's (bool success, bytes returnData)[] result"""
+    raw = bytes.fromhex(result_hex.replace("0x", ""))
+
+    def word(pos: int) -> int:
+        return int.from_bytes(raw[pos:pos + 32], "big")
+
+    array_start = word(0)
+    count = word(array_start)
+    heads = array_start + 32
+    results = []
+    for i in range(count):
+        tuple_start = heads + word(heads + 32 * i)
+        success = word(tuple_start) != 0
+        data_start = tuple_start + word(tuple_start + 32)
+        length = word(data_start)
+        results.append((success, raw[data_start + 32:data_start + 32 + length]))
+    return results
+
+
+def _to_uint(success: bool, data: bytes) -> Optional[int]:
+    if not success or len(data) < 32:
+        return None
+    return int.from_bytes(data[:32], "big")
+
+
+def resolve_tokens(chain: str, tokens: Optional[Dict[str, object]] = None) -> Dict[str, Tuple[str, int]]:
+    """Token set for a chain: explicit {symbol: address | [address, decimals]} or the defaults"""
+    if tokens is None:
+        return dict(DEFAULT_TOKENS.get(chain, {}))
+    resolved = {}
+    for symbol, spec in tokens.items():
+        if isinstance(spec, (list, tuple)):
+            resolved[symbol] = (spec[0], int(spec[1]))
+        else:
+            default = DEFAULT_TOKENS.get(chain, {}).get(symbol)
+            resolved[symbol] = (str(spec), default[1] if default else 18)
+    return resolved
+
+
+def snapshot_chain(
+    chain: str,
+    wallets: List[str],
+    tokens: Optional[Dict[str, Tuple[str, int]]] = None,
+    block: Optional[int] = None,
+) -> dict:
+    """Native + ERC20 balances of every wallet on one chain at one block
+
+    All calls go through Multicall3 aggregate3 (getEthBalance for the native
+    balance, balanceOf per token), chunked to MAX_CALLS_PER_AGGREGATE calls
+    and sent as JSON-RPC batches pinned to the same block number.
+    """
+    config = CHAIN_CONFIG.get(chain)
+    if not config:
+        raise ValueError(f"Unsupported chain: {chain}")
+    rpc_url = get_rpc_url(chain)
+    tokens = resolve_tokens(chain) if tokens is None else tokens
+    symbols = list(tokens)
+
+    if block is None:
+        head = rpc_batch(rpc_url, [("eth_blockNumber", [])])[0]
+        if "result" not in head:
+            raise ConnectionError(f"eth_blockNumber failed on {chain}: {head.get('error')}")
+        block = int(head["result"], 16)
+    block_tag = hex(block)
+
+    # Call layout: per wallet, native balance then one balanceOf per token
+    per_wallet = 1 + len(symbols)
+    calls = []
+    for wallet in wallets:
+        calls.append((MULTICALL3_ADDRESS, GET_ETH_BALANCE_SELECTOR + _address_word(wallet)))
+        for symbol in symbols:
+            calls.append((tokens[symbol][0], BALANCE_OF_SELECTOR + _address_word(wallet)))
+
+    chunks = [calls[i:i + MAX_CALLS_PER_AGGREGATE] for i in range(0, len(calls), MAX_CALLS_PER_AGGREGATE)]
+    requests = [
+        ("eth_call", [{"to": MULTICALL3_ADDRESS, "data": encode_aggregate3(chunk)}, block_tag])
+        for chunk in chunks
+    ]
+    batches = [requests[i:i + RPC_BATCH_SIZE] for i in range(0, len(requests), RPC_BATCH_SIZE)]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_BATCH_WORKERS, len(batches)))) as pool:
+        responses = [r for batch in pool.map(lambda b: rpc_batch(rpc_url, b), batches) for r in batch]
+
+    values: List[Optional[int]] = []
+    for response in responses:
+        if "result" not in response:
+            raise ConnectionError(f"aggregate3 failed on {chain}: {response.get('error')}")
+        values.extend(_to_uint(ok, data) for ok, data in decode_aggregate3(response["result"]))
+
+    balances = {}
+    failed_calls = 0
+    for w, wallet in enumerate(wallets):
+        row = values[w * per_wallet:(w + 1) * per_wallet]
+        failed_calls += sum(1 for v in row if v is None)
+        balances[wallet] = {
+            "native": (row[0] or 0) / 1e18,
+            "tokens": {
+                symbol: (row[1 + t] or 0) / (10 ** tokens[symbol][1])
+                for t, symbol in enumerate(symbols)
+            },
+        }
+
+    return {
+        "chain": chain,
+        "chain_id": config["chain_id"],
+        "block": block,
+        "native_symbol": config["native_symbol"],
+        "tokens": {symbol: tokens[symbol][0] for symbol in symbols},
+        "calls": len(calls),
+        "eth_calls": len(requests),
+        "http_requests": len(batches),
+        "failed_calls": failed_calls,
+        "balances": balances,
+    }
+
+
+def snapshot_portfolio(
+    wallets: List[str],
+    chains: List[str],
+    tokens: Optional[Dict[str, Dict[str, object]]] = None,
+    blocks: Optional[Dict[str, int]] = None,
+) -> Dict[str, dict]:
+    """Snapshot every chain concurrently; failed chains map to {"error": ...}"""
+    tokens = tokens or {}
+    blocks = blocks or {}
+
+    def run(chain: str) -> dict:
+        try:
+            chain_tokens = resolve_tokens(chain, tokens.get(chain))
+            return snapshot_chain(chain, wallets, chain_tokens, blocks.get(chain))
+        except Exception as e:
+            return {"chain": chain, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_CHAIN_WORKERS, len(chains)))) as pool:
+        return dict(zip(chains, pool.map(run, chains)))
+
+
+def validate_address(address: str) -> bool:
+    return isinstance(address, str) and address.startswith("0x") and len(address) == 42
+
+
+def build_snapshot(
+    wallets: List[str],
+    chains: List[str],
+    tokens: Optional[Dict[str, Dict[str, object]]] = None,
+    blocks: Optional[Dict[str, int]] = None,
+    include_zero: bool = False,
+) -> dict:
+    """Multi-wallet, multi-chain balance snapshot with per-chain totals"""
+    if not wallets:
+        raise ValueError("At least one wallet is required")
+    if len(wallets) > MAX_WALLETS:
+        raise ValueError(f"Too many wallets: {len(wallets)} (max {MAX_WALLETS})")
+    invalid = [w for w in wallets if not validate_address(w)]
+    if invalid:
+        raise ValueError(f"Invalid address format: {invalid[0]}")
+    unsupported = [c for c in chains if c not in CHAIN_CONFIG]
+    if unsupported:
+        raise ValueError(f"Unsupported chain: {unsupported[0]}")
+
+    started = time.time()
+    results = snapshot_portfolio(wallets, chains, tokens, blocks)
+
+    chain_summary = {}
+    holdings: Dict[str, Dict[str, dict]] = {wallet: {} for wallet in wallets}
+    for chain, result in results.items():
+        if "error" in result:
+            chain_summary[chain] = {"error": result["error"]}
+            continue
+
+        native_total = 0.0
+        token_totals = {symbol: 0.0 for symbol in result["tokens"]}
+        for wallet, balance in result["balances"].items():
+            native_total += balance["native"]
+            for symbol, amount in balance["tokens"].items():
+                token_totals[symbol] += amount
+
+            held_tokens = {s: a for s, a in balance["tokens"].items() if include_zero or a > 0}
+            if include_zero or balance["native"] > 0 or held_tokens:
+                holdings[wallet][chain] = {
+                    "native": round(balance["native"], 6),
+                    "tokens": {s: round(a, 6) for s, a in held_tokens.items()},
+                }
+
+        chain_summary[chain] = {
+            "block": result["block"],
+            "native_symbol": result["native_symbol"],
+            "native_total": round(native_total, 6),
+            "token_totals": {s: round(a, 6) for s, a in token_totals.items()},
+            "calls": result["calls"],
+            "eth_calls": result["eth_calls"],
+            "http_requests": result["http_requests"],
+            "failed_calls": result["failed_calls"],
+        }
+
+    return {
+        "success": any("error" not in s for s in chain_summary.values()),
+        "wallets": len(wallets),
+        "chains": chain_summary,
+        "holdings": {w: h for w, h in holdings.items() if h or include_zero},
+        "elapsed_seconds": round(time.time() - started, 3),
+    }
+
+
+def main():
+    try:
+        input_data = json.loads(sys.stdin.read())
+
+        wallets = input_data.get("wallets") or ([input_data["address"]] if input_data.get("address") else [])
+        chains = input_data.get("chains", ["ethereum"])
+        tokens = input_data.get("tokens")
+        blocks = input_data.get("blocks")
+        include_zero = input_data.get("include_zero", False)
+
+        if not wallets:
+            print(json.dumps({"error": "Missing required parameter: wallets (or address)"}))
+            sys.exit(1)
+
+        result = build_snapshot(wallets, chains, tokens, blocks, include_zero)
+        print(json.dumps(result, indent=2))
+
+    except json.JSONDecodeError:
+        print(json.dumps({"error": "Invalid JSON input"}))
+        sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
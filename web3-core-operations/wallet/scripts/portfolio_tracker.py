@@ -12,6 +12,8 @@ import urllib.error
 from typing import Optional, List, Dict
 from datetime import datetime
 
+from portfolio_snapshot import snapshot_portfolio
+
 # Chain configurations
 CHAIN_CONFIG = {
     "ethereum": {
@@ -46,6 +48,26 @@ CHAIN_CONFIG = {
     }
 }
 
+STABLECOINS = {
+    "ethereum": {
+        "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+        "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        "DAI": "0x6B175474E89094C44Da98b954EeacdeCB5BE3830"
+    },
+    "polygon": {
+        "USDC": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+        "USDT": "0xc2132D05D31c914a87C6611C10748AEb04B58e8F"
+    },
+    "arbitrum": {
+        "USDC": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
+        "USDT": "0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9"
+    }
+}
+
+
+def stablecoin_decimals(symbol: str) -> int:
+    return 6 if symbol in ["USDC", "USDT"] else 18
+
 
 def fetch_json(url: str, headers: dict = None) -> dict:
     """Fetch JSON from URL"""
@@ -116,21 +138,7 @@ def get_native_balance(address: str, chain: str) -> float:
 
 def get_stablecoin_balances(address: str, chain: str) -> Dict[str, float]:
     """Get stablecoin balances"""
-    stablecoins = {
-        "ethereum": {
-            "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-            "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
-            "DAI": "0x6B175474E89094C44Da98b954EeacdeCB5BE3830"
-        },
-        "polygon": {
-            "USDC": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
-            "USDT": "0xc2132D05D31c914a87C6611C10748AEb04B58e8F"
-        },
-        "arbitrum": {
-            "USDC": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
-            "USDT": "0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9"
-        }
-    }
+    stablecoins = STABLECOINS
 
     chain_stables = stablecoins.get(chain, {})
     balances = {}
@@ -154,7 +162,7 @@ def get_stablecoin_balances(address: str, chain: str) -> Dict[str, float]:
             data = fetch_api(config["api_url"], params, api_key)
 
             if data.get("status") == "1":
-                decimals = 6 if symbol in ["USDC", "USDT"] else 18
+                decimals = stablecoin_decimals(symbol)
                 balance = int(data.get("result", 0)) / (10 ** decimals)
                 if balance > 0:
                     balances[symbol] = balance
@@ -172,25 +180,37 @@ def track_portfolio(address: str, chains: List[str]) -> dict:
     # Get current prices
     prices = get_eth_price()
 
+    # Native + stablecoin balances for every chain at once: one Multicall3
+    # aggregate3 per chain, chains queried concurrently
+    supported = [chain for chain in chains if chain in CHAIN_CONFIG]
+    tokens = {
+        chain: {symbol: [contract, stablecoin_decimals(symbol)] for symbol, contract in STABLECOINS.get(chain, {}).items()}
+        for chain in supported
+    }
+    snapshots = snapshot_portfolio([address], supported, tokens)
+
     # Track balances per chain
     chain_balances = {}
     total_usd = 0
     total_native = 0
     total_stables = 0
 
-    for chain in chains:
-        config = CHAIN_CONFIG.get(chain)
-        if not config:
-            continue
+    for chain in supported:
+        config = CHAIN_CONFIG[chain]
+        snapshot = snapshots.get(chain, {})
+
+        if "error" in snapshot:
+            # RPC unavailable: fall back to the explorer API
+            native_balance = get_native_balance(address, chain)
+            stables = get_stablecoin_balances(address, chain)
+        else:
+            balance = snapshot["balances"][address]
+            native_balance = balance["native"]
+            stables = {symbol: amount for symbol, amount in balance["tokens"].items() if amount > 0}
 
-        # Get native balance
-        native_balance = get_native_balance(address, chain)
         native_symbol = config["native_symbol"]
         native_price = prices.get(native_symbol, 0)
         native_usd = native_balance * native_price
-
-        # Get stablecoin balances
-        stables = get_stablecoin_balances(address, chain)
         stables_total = sum(stables.values())
 
         chain_balances[chain] = {
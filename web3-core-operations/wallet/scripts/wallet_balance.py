@@ -11,6 +11,8 @@ import urllib.request
 import urllib.error
 from typing import Optional, List, Dict
 
+from portfolio_snapshot import snapshot_chain
+
 # Chain configurations
 CHAIN_CONFIG = {
     "ethereum": {
@@ -154,12 +156,24 @@ def get_token_balances(address: str, chain: str) -> List[Dict]:
                 }
                 token_addresses.add(token_addr)
 
-    # Get balances for discovered tokens
+    # Get balances for all discovered tokens in one Multicall3 request
     token_balances = []
-    for token_addr, info in list(token_info.items())[:20]:  # Limit to 20 tokens
+    if token_info:
+        tokens = {addr: (addr, info["decimals"]) for addr, info in token_info.items()}
         try:
-            balance = get_token_balance(address, token_addr, chain, info["decimals"])
+            balances = snapshot_chain(chain, [address], tokens)["balances"][address]["tokens"]
+        except Exception:
+            # RPC unavailable: fall back to per-token explorer requests
+            balances = {}
+            for token_addr, info in list(token_info.items())[:20]:  # Limit to 20 tokens
+                try:
+                    balances[token_addr] = get_token_balance(address, token_addr, chain, info["decimals"])
+                except:
+                    continue
+
+        for token_addr, balance in balances.items():
             if balance > 0:
+                info = token_info[token_addr]
                 token_balances.append({
                     "address": info["address"],
                     "symbol": info["symbol"],
@@ -167,8 +181,6 @@ def get_token_balances(address: str, chain: str) -> List[Dict]:
                     "balance": balance,
                     "decimals": info["decimals"]
                 })
-        except:
-            continue
 
     # Sort by balance (assuming similar value, this is a rough sort)
     token_balances.sort(key=lambda x: x["balance"], reverse=True)